@@ -0,0 +1,134 @@
+"""
+L2 저장: 기존 ORM read-then-write 경로 vs repository.bulk 집합 upsert 비교 벤치마크
+
+N_COMPANIES 개 회사의 재무(3개 연도) / 뉴스(카테고리 5개 × 기사 10개) / 요약을
+두 번 저장(최초 insert + 재저장 update)하면서 DB 왕복(cursor execute) 횟수와 시간을 잽니다.
+
+    python -m benchmarks.bench_bulk_upsert
+    BENCH_DATABASE_URL=mysql+pymysql://... python -m benchmarks.bench_bulk_upsert   # MySQL 대상
+"""
+
+import os
+import tempfile
+import time
+from datetime import datetime
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "corpview_bench_bulk.sqlite3")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_PATH}")
+
+import pytz  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from core.database import Base  # noqa: E402
+from models import CompanyOverviews, FinancialStatement, CachedNewsArticle, Summary  # noqa: E402
+from repository import financials_repository, news_repository, summary_repository  # noqa: E402
+from schemas.summary import SummaryCreate  # noqa: E402
+
+SEOUL_TZ = pytz.timezone("Asia/Seoul")
+N_COMPANIES = 300
+CATEGORIES = ["전체", "채용", "주가", "노사", "IT"]
+
+
+def make_financials(i: int):
+    return {
+        str(year): {
+            "매출액": 1000 + i, "영업이익": 100, "당기순이익": 50, "자산총계": 5000, "자본총계": 2500,
+            "ratio": {"영업이익률": 10.0},
+        }
+        for year in (2022, 2023, 2024)
+    }
+
+
+def make_news(code: str):
+    return {
+        cat: [
+            {"id": f"{j}", "title": f"뉴스 {j}", "link": f"https://news.example.com/{code}/{cat}/{j}",
+             "pubDate": "Mon, 13 Oct 2025 10:00:00 +0900"}
+            for j in range(10)
+        ]
+        for cat in CATEGORIES
+    }
+
+
+# --- 기존 구현 (비교용) ---
+
+def legacy_upsert_financials(db, corp_code, financial_data):
+    """연도별 SELECT + ORM insert/update"""
+    for year, data in financial_data.items():
+        existing = db.query(FinancialStatement).filter_by(corp_code=corp_code, year=int(year)).first()
+        statement = existing or FinancialStatement(corp_code=corp_code, year=int(year))
+        statement.revenue = data.get("매출액")
+        statement.operating_profit = data.get("영업이익")
+        statement.net_income = data.get("당기순이익")
+        statement.total_assets = data.get("자산총계")
+        statement.total_equity = data.get("자본총계")
+        statement.ratios = data.get("ratio")
+        if existing is None:
+            db.add(statement)
+
+
+def legacy_upsert_news(db, corp_code, news_data):
+    """회사 기사 전체 DELETE 후 ORM 으로 한 건씩 INSERT"""
+    now = datetime.now(SEOUL_TZ)
+    db.query(CachedNewsArticle).filter(CachedNewsArticle.corp_code == corp_code).delete(synchronize_session=False)
+    db.add_all(CachedNewsArticle(**row) for row in news_repository._build_rows(corp_code, news_data, now))
+
+
+def legacy_upsert_summary(db, data):
+    """SELECT 후 update / insert"""
+    db_obj = db.query(Summary).filter(Summary.company_name == data.company_name).first()
+    if db_obj:
+        db_obj.summary_text = data.summary_text
+        db_obj.updated_at = datetime.now(SEOUL_TZ)
+    else:
+        db.add(Summary(**data.dict()))
+
+
+LEGACY = (legacy_upsert_financials, legacy_upsert_news, legacy_upsert_summary)
+BULK = (financials_repository.upsert_financials, news_repository.upsert_news_articles, summary_repository.upsert_summary)
+
+
+def run(Session, codes, upserts):
+    upsert_financials, upsert_news, upsert_summary = upserts
+    with Session() as db:
+        for i, code in enumerate(codes):
+            upsert_financials(db, code, make_financials(i))
+            upsert_news(db, code, make_news(code))
+            upsert_summary(db, SummaryCreate(company_name=f"벤치회사{i}", summary_text=f"요약 {time.time()}"))
+            db.commit()
+
+
+def main():
+    url = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{DB_PATH}")
+    engine = create_engine(url)
+    Session = sessionmaker(bind=engine)
+    codes = [f"{i:08d}" for i in range(N_COMPANIES)]
+
+    round_trips = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(*_):
+        round_trips["n"] += 1
+
+    print(f"companies={N_COMPANIES}  rows/company: financials=3 news={len(CATEGORIES) * 10} summary=1")
+    print(f"{'path':<10}{'pass':<8}{'round trips':>14}{'per company':>14}{'seconds':>10}")
+    for label, upserts in (("legacy", LEGACY), ("bulk", BULK)):
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        with Session() as db:
+            db.add_all(CompanyOverviews(corp_code=code, corp_name=f"벤치회사{i}") for i, code in enumerate(codes))
+            db.commit()
+
+        for phase in ("insert", "update"):
+            round_trips["n"] = 0
+            start = time.monotonic()
+            run(Session, codes, upserts)
+            seconds = time.monotonic() - start
+            n = round_trips["n"]
+            print(f"{label:<10}{phase:<8}{n:>14,}{n / N_COMPANIES:>14.1f}{seconds:>10.2f}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Redis 캐시 값 코덱: 네임스페이스별 저장 크기 / 인코딩·디코딩 시간 비교
+
+details 경로가 Redis 에 쓰는 값(재무 / 뉴스 / AI 요약 / 회사 개황 / 전체 응답)을 N_COMPANIES 개 회사분
+실제 형태대로 만들어, 도입 이전 형식(JSON 텍스트, ensure_ascii)과 코덱 조합별 저장 바이트를 비교합니다.
+BENCH_FROM_DB=1 이면 DATABASE_URL 의 L2 테이블(재무 / 뉴스 / 요약)에서 값을 만듭니다.
+(Redis 는 필요 없음. msgpack / lz4 조합은 해당 라이브러리가 설치된 경우에만)
+
+    python -m benchmarks.bench_cache_codec
+    BENCH_FROM_DB=1 DATABASE_URL=mysql+pymysql://... python -m benchmarks.bench_cache_codec
+"""
+
+import os
+import json
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "corpview_bench_codec.sqlite3")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_PATH}")
+
+from core.codec import CacheCodec, _AVAILABLE, MSGPACK, LZ4  # noqa: E402
+from core.database import SessionLocal  # noqa: E402
+from models import CompanyOverviews, FinancialStatement, CachedNewsArticle, Summary  # noqa: E402
+from schemas.company import CompanyInfo  # noqa: E402
+from schemas.details import CompanyDetailResponse, DetailMeta  # noqa: E402
+from services.details_service import _validate_financials, _validate_news  # noqa: E402
+from services.news_service import CATEGORIES  # noqa: E402
+from utils.utils import _format_financials_from_orm, _format_news_from_orm  # noqa: E402
+
+N_COMPANIES = 300
+ARTICLES_PER_CATEGORY = 5
+YEARS = (2022, 2023, 2024)
+COMBOS = [
+    ("json", "none"), ("orjson", "none"), ("msgpack", "none"),
+    ("orjson", "zstd"), ("orjson", "lz4"), ("msgpack", "zstd"),
+]
+WORDS = [
+    "채용", "신입", "경력", "공채", "반도체", "배터리", "실적", "영업이익", "분기", "전망", "투자", "확대",
+    "주가", "상승", "하락", "노사", "임금", "협상", "AI", "클라우드", "데이터센터", "수주", "글로벌", "공장",
+]
+
+
+def _title(rng: random.Random, name: str) -> str:
+    return f"{name}, " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 9)))
+
+
+def synthetic_companies(rng: random.Random):
+    """(corp_code, 회사명, 재무, 뉴스, 요약) — 캐시에 들어가는 dict 형태 그대로"""
+    now = datetime.now()
+    for i in range(N_COMPANIES):
+        corp_code, name = str(100000 + i), f"벤치{i}전자"
+        financial_data = {}
+        for year in YEARS:
+            revenue = rng.randint(10_000, 300_000_000) * 1000
+            operating_profit = int(revenue * rng.uniform(-0.05, 0.2))
+            net_income = int(operating_profit * rng.uniform(0.5, 0.9))
+            total_equity = int(revenue * rng.uniform(0.3, 1.5))
+            financial_data[str(year)] = {
+                "매출액": revenue, "영업이익": operating_profit, "당기순이익": net_income,
+                "자산총계": int(total_equity * rng.uniform(1.2, 2.5)), "자본총계": total_equity,
+                "ratio": {
+                    "영업이익률": round(operating_profit / revenue * 100, 2),
+                    "순이익률": round(net_income / revenue * 100, 2),
+                    "ROE": round(net_income / total_equity * 100, 2),
+                },
+            }
+        news_data = {
+            category: [
+                {
+                    "id": f"{corp_code}-{category}-{j}",
+                    "title": _title(rng, name),
+                    "link": f"https://n.news.naver.com/mnews/article/{rng.randint(1, 999):03d}/{rng.randint(10**9, 10**10)}",
+                    "pubDate": (now - timedelta(hours=rng.randint(1, 500))).strftime("%a, %d %b %Y %H:%M:%S +0900"),
+                }
+                for j in range(ARTICLES_PER_CATEGORY)
+            ]
+            for category in CATEGORIES
+        }
+        summary = " ".join(_title(rng, name) + "." for _ in range(12))
+        yield corp_code, name, financial_data, news_data, summary
+
+
+def db_companies():
+    with SessionLocal() as db:
+        companies = db.query(CompanyOverviews).limit(N_COMPANIES).all()
+        for company in companies:
+            financials = db.query(FinancialStatement).filter(FinancialStatement.corp_code == company.corp_code).all()
+            articles = db.query(CachedNewsArticle).filter(CachedNewsArticle.corp_code == company.corp_code).all()
+            summary = db.query(Summary).filter(Summary.company_name == company.corp_name).first()
+            if financials:
+                yield (
+                    str(int(company.corp_code)), company.corp_name,
+                    _format_financials_from_orm(financials), _format_news_from_orm(articles),
+                    summary.summary_text if summary else "",
+                )
+
+
+def cache_values(companies):
+    """네임스페이스별 (키, 값, dumps, swr 여부, 이전 형식 문자열)"""
+    soft_expires_at = time.time() + 600
+    for corp_code, name, financial_data, news_data, summary in companies:
+        info = CompanyInfo(
+            corp_code=int(corp_code), corp_name=name, adres="서울특별시 중구 세종대로 1",
+            corp_cls="Y", est_dt="19690113", hm_url="https://www.example.co.kr", induty_name="통신 및 방송 장비 제조업",
+        )
+        entry = {"input_hash": "f" * 64, "text": summary, "generated_at": soft_expires_at}
+        body = CompanyDetailResponse(
+            company_info=info,
+            financial_data=_validate_financials(financial_data),
+            news_data=_validate_news(news_data),
+            ai_summary=summary,
+            meta=DetailMeta(sections={"financial_data": "fresh", "news_data": "fresh", "ai_summary": "fresh"}),
+        ).json()
+        yield ("details:financials", financial_data, None, True,
+               f"swr1:{soft_expires_at:.3f}|{json.dumps(financial_data)}")
+        yield ("details:news", news_data, None, True, f"swr1:{soft_expires_at:.3f}|{json.dumps(news_data)}")
+        yield "details:summary", entry, None, False, json.dumps(entry)
+        yield "details:info", info, lambda m: m.json(), False, info.json()
+        yield "details:response", (corp_code, body), lambda v: f"{v[0]}|{v[1]}", False, f"{corp_code}|{body}"
+
+
+def main():
+    source = db_companies() if os.getenv("BENCH_FROM_DB") else synthetic_companies(random.Random(42))
+    values = list(cache_values(source))
+    print(f"values={len(values):,} (namespaces x companies)")
+
+    legacy = defaultdict(int)
+    for namespace, _, _, _, text in values:
+        legacy[namespace] += len(text.encode())
+
+    combos = [
+        (ser, comp) for ser, comp in COMBOS
+        if (ser != "msgpack" or _AVAILABLE[MSGPACK]) and (comp != "lz4" or _AVAILABLE[LZ4])
+    ]
+    sizes, timings = {}, {}
+    for ser, comp in combos:
+        codec = CacheCodec(ser, comp)
+        per_namespace = defaultdict(int)
+        start = time.perf_counter()
+        encoded = []
+        for namespace, value, dumps, swr, _ in values:
+            raw = codec.encode(f"{namespace}:x", value, dumps, soft_expires_at=time.time() if swr else None)
+            per_namespace[namespace] += len(raw)
+            encoded.append((namespace, raw, dumps))
+        encode_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for namespace, raw, dumps in encoded:
+            codec.decode(f"{namespace}:x", raw, None if dumps is None else str)
+        decode_s = time.perf_counter() - start
+        sizes[(ser, comp)] = per_namespace
+        timings[(ser, comp)] = (encode_s / len(values) * 1e6, decode_s / len(values) * 1e6)
+
+    header = f"{'namespace':<20}{'legacy KB':>11}" + "".join(f"{ser + '+' + comp:>16}" for ser, comp in combos)
+    print(header)
+    for namespace in legacy:
+        row = f"{namespace:<20}{legacy[namespace] / 1024:>11.1f}"
+        for combo in combos:
+            size = sizes[combo][namespace]
+            row += f"{size / 1024:>9.1f} ({1 - size / legacy[namespace]:>4.0%})"
+        print(row)
+    total = sum(legacy.values())
+    row = f"{'total':<20}{total / 1024:>11.1f}"
+    for combo in combos:
+        size = sum(sizes[combo].values())
+        row += f"{size / 1024:>9.1f} ({1 - size / total:>4.0%})"
+    print(row)
+    print(f"{'encode/decode us':<31}" + "".join(f"{f'{enc:.1f}/{dec:.1f}':>16}" for enc, dec in timings.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+회사명 검색: DB ILIKE '%kw%' 경로 vs 인메모리 검색 인덱스 비교 벤치마크
+
+DART 전체 기업 수와 비슷한 ~100k 개의 회사명을 만들어 SQLite 에 넣고,
+프론트엔드 키 입력처럼 짧은 검색어(prefix / infix / 초성)를 반복 조회합니다.
+마지막으로 워커의 주기적 갱신(refresh_from_db: 전체 행 재적재 + 차이 반영) 1회 비용을
+변경 없음 / REFRESH_CHANGED 개 변경일 때 각각 잽니다.
+
+    python -m benchmarks.bench_company_search
+"""
+
+import os
+import random
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "corpview_bench_search.sqlite3")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_PATH}")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from core.database import Base, engine as app_engine  # noqa: E402
+from models import CompanyOverviews  # noqa: E402
+from repository import company_repository  # noqa: E402
+from services.company_search_index import CompanySearchIndex, IndexedCompany  # noqa: E402
+
+N_COMPANIES = 100_000
+SYLLABLES = "삼성전자현대엘지케이에스디아이티바이오제약건설화학금융증권보험물산중공업통신텍솔루션시스템"
+SUFFIXES = ["", "", "", "홀딩스", "테크", "바이오", "산업", "전자", "건설", "(주)", "코리아"]
+QUERIES = ["삼", "삼성", "삼성전", "전자", "바이오", "ㅅㅅ", "ㅅㅅㅈㅈ", "현대건", "테크", "ㅎㄷ"]
+REPEAT = 20
+REFRESH_CHANGED = 1000  # 갱신 1회 사이에 바뀐 회사 수 (이름 변경)
+
+
+app_engine.echo = False  # refresh 의 load_rows 는 앱 엔진(SessionLocal)으로 읽음
+
+
+def make_names(n: int):
+    rng = random.Random(42)
+    names = set(["삼성전자", "삼성SDI", "현대자동차", "LG전자", "SK하이닉스"])
+    while len(names) < n:
+        length = rng.randint(2, 5)
+        base = "".join(rng.choice(SYLLABLES) for _ in range(length))
+        names.add(base + rng.choice(SUFFIXES))
+    return list(names)
+
+
+def main():
+    engine = create_engine(f"sqlite:///{DB_PATH}")
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    names = make_names(N_COMPANIES)
+    with Session() as db:
+        db.bulk_insert_mappings(CompanyOverviews, [
+            {"corp_code": f"{i:08d}", "corp_name": name, "favorite_count": i % 97, "logo": ""}
+            for i, name in enumerate(names)
+        ])
+        db.commit()
+
+    index = CompanySearchIndex()
+    start = time.monotonic()
+    index.build(
+        IndexedCompany(corp_code=f"{i:08d}", corp_name=name, favorite_count=i % 97,
+                       hm_url=None, category=None, logo="")
+        for i, name in enumerate(names)
+    )
+    print(f"companies={len(names):,}  index build={time.monotonic() - start:.2f}s  {index.stats()}")
+
+    print(f"{'query':<10}{'ILIKE ms':>12}{'rows':>8}{'index ms':>12}{'top-20':>8}")
+    with Session() as db:
+        for query in QUERIES:
+            start = time.monotonic()
+            for _ in range(REPEAT):
+                rows = company_repository.search_companies_by_keyword(db, query)
+            ilike_ms = (time.monotonic() - start) / REPEAT * 1000
+
+            start = time.monotonic()
+            for _ in range(REPEAT):
+                hits = index.search(query, 20)
+            index_ms = (time.monotonic() - start) / REPEAT * 1000
+
+            print(f"{query:<10}{ilike_ms:>12.2f}{len(rows):>8}{index_ms:>12.3f}{len(hits):>8}")
+
+    refresh_cycle(index, Session)
+    engine.dispose()
+
+
+def refresh_cycle(index: CompanySearchIndex, Session):
+    """주기적 갱신 1회: DB 전체 읽기(load_rows) / 차이 비교·반영(apply_rows) 시간"""
+    for label in ("unchanged", f"{REFRESH_CHANGED} changed"):
+        if label != "unchanged":
+            with Session() as db:
+                for company in db.query(CompanyOverviews).limit(REFRESH_CHANGED):
+                    company.corp_name += "신"
+                db.commit()
+        start = time.monotonic()
+        rows = index.load_rows()
+        load_s = time.monotonic() - start
+        start = time.monotonic()
+        result = index.apply_rows(rows)
+        apply_s = time.monotonic() - start
+        print(f"refresh ({label:<13}) load_rows={load_s:.2f}s  apply_rows={apply_s:.2f}s  rows={len(rows):,}  {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+동기 Session + asyncio.to_thread  vs  AsyncSession(aiosqlite) 비교 벤치마크
+
+details 파이프라인의 캐시 미스(L1 miss → L2 조회) 트래픽을 흉내내어
+동시 요청 CONCURRENCY 개가 각각 회사/재무/뉴스/요약을 조회합니다.
+
+    python -m benchmarks.bench_db_async
+    BENCH_DATABASE_URL=mysql+pymysql://... python -m benchmarks.bench_db_async   # MySQL 대상
+
+참고: aiosqlite 는 내부적으로 연결당 스레드를 쓰므로 SQLite 수치는 하한선이며,
+스레드 풀 포화 효과는 aiomysql 대상에서 크게 드러납니다.
+"""
+
+import os
+import asyncio
+import time
+import tempfile
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "corpview_bench_db.sqlite3")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_PATH}")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker  # noqa: E402
+
+from core.database import Base, to_async_url  # noqa: E402
+from models import CompanyOverviews, FinancialStatement, CachedNewsArticle, Summary  # noqa: E402
+from repository import company_repository, financials_repository, news_repository, summary_repository  # noqa: E402
+from datetime import datetime  # noqa: E402
+
+N_COMPANIES = 2000
+CONCURRENCY = 200
+ROUNDS = 3
+
+
+def seed(sync_url: str):
+    engine = create_engine(sync_url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    now = datetime.now()
+    with Session() as db:
+        for i in range(N_COMPANIES):
+            code = f"{i:08d}"
+            name = f"벤치회사{i}"
+            db.add(CompanyOverviews(corp_code=code, corp_name=name, favorite_count=i % 50))
+            for year in (2022, 2023, 2024):
+                db.add(FinancialStatement(
+                    corp_code=code, year=year, revenue=1000 + i, operating_profit=100,
+                    net_income=50, total_assets=5000, total_equity=2500, ratios={},
+                ))
+            for cat in ("전체", "채용"):
+                for j in range(5):
+                    db.add(CachedNewsArticle(
+                        corp_code=code, category=cat, title=f"뉴스 {j}",
+                        link=f"https://news.example.com/{code}/{cat}/{j}",
+                        pub_date=now, cached_at=now,
+                    ))
+            db.add(Summary(company_name=name, summary_text="요약"))
+        db.commit()
+    engine.dispose()
+
+
+async def run_sync_path(Session, names):
+    """기존 방식: 동기 세션의 모든 호출을 asyncio.to_thread 로 위임"""
+    async def one(name):
+        db = Session()
+        try:
+            company = await asyncio.to_thread(company_repository.get_company_by_name_exact, db, name)
+            await asyncio.to_thread(financials_repository.get_financials_by_code, db, company.corp_code)
+            await asyncio.to_thread(news_repository.get_cached_news_by_code, db, company.corp_code)
+            await asyncio.to_thread(summary_repository.get_recent_summary, db, name)
+        finally:
+            await asyncio.to_thread(db.close)
+    await asyncio.gather(*(one(n) for n in names))
+
+
+async def run_async_path(AsyncSession, names):
+    """신규 방식: AsyncSession 으로 이벤트 루프에서 직접 조회"""
+    async def one(name):
+        async with AsyncSession() as db:
+            company = await company_repository.get_company_by_name_exact_async(db, name)
+            await financials_repository.get_financials_by_code_async(db, company.corp_code)
+            await news_repository.get_cached_news_by_code_async(db, company.corp_code)
+            await summary_repository.get_recent_summary_async(db, name)
+    await asyncio.gather(*(one(n) for n in names))
+
+
+async def measure(label, runner, factory, names):
+    durations = []
+    for _ in range(ROUNDS):
+        start = time.monotonic()
+        await runner(factory, names)
+        durations.append(time.monotonic() - start)
+    best = min(durations)
+    print(f"{label:<28} best={best:.3f}s  req/s={len(names) / best:,.0f}")
+
+
+async def main():
+    sync_url = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{DB_PATH}")
+    async_url = to_async_url(sync_url)
+    seed(sync_url)
+
+    names = [f"벤치회사{i}" for i in range(0, N_COMPANIES, max(1, N_COMPANIES // CONCURRENCY))][:CONCURRENCY]
+
+    sync_engine = create_engine(sync_url, pool_size=20, max_overflow=CONCURRENCY)
+    async_engine = create_async_engine(async_url, pool_size=20, max_overflow=CONCURRENCY)
+
+    print(f"companies={N_COMPANIES} concurrency={len(names)} rounds={ROUNDS}")
+    await measure("sync Session + to_thread", run_sync_path, sessionmaker(bind=sync_engine), names)
+    await measure("AsyncSession (aiosqlite)", run_async_path,
+                  async_sessionmaker(bind=async_engine, expire_on_commit=False), names)
+
+    sync_engine.dispose()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""
+details 캐시 키 프리페치 전/후: 요청당 Redis 명령 / 왕복 수와 지연
+
+섹션 캐시가 Redis 에 모두 있는 상태에서 /details-final/company-details 를 REQUESTS 번 호출합니다.
+매 요청 전에 L0 를 비워 '이 워커의 L0 에는 없고 Redis 에는 있는' 경우(다른 워커가 채운 값 /
+L0 만료)를 흉내내며, 전체 응답 캐시를 끈 경우와 켠 경우를 각각 프리페치 off / on 으로 비교합니다.
+(REDIS_URL 의 Redis 가 필요합니다)
+
+    python -m benchmarks.bench_details_prefetch
+"""
+
+import os
+import asyncio
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "corpview_bench_details_cache.sqlite3")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_PATH}")
+
+import httpx  # noqa: E402
+import redis.asyncio as redis  # noqa: E402
+
+import main  # noqa: E402
+from benchmarks.bench_details_response_cache import NAME, seed, warm  # noqa: E402
+from core.cache import local_cache, redis_pool  # noqa: E402
+from core.http_client import http_clients  # noqa: E402
+from core.tasks import drain_background  # noqa: E402
+from services import details_cache, details_service  # noqa: E402
+
+REQUESTS = 200
+
+
+async def measure(client: httpx.AsyncClient, label: str):
+    await client.get("/details-final/company-details", params={"name": NAME})  # corp_code 별칭 / 응답 캐시 준비
+    await drain_background(30)
+
+    before = details_service.details_redis_stats()
+    latencies = []
+    for _ in range(REQUESTS):
+        local_cache.clear()
+        start = time.perf_counter()
+        response = await client.get("/details-final/company-details", params={"name": NAME})
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    await drain_background(30)
+    after = details_service.details_redis_stats()
+
+    commands = (after["commands"] - before["commands"]) / REQUESTS
+    round_trips = (after["round_trips"] - before["round_trips"]) / REQUESTS
+    latencies.sort()
+    print(
+        f"{label:34} commands/req={commands:5.1f}  round_trips/req={round_trips:4.1f}  "
+        f"p50={latencies[len(latencies) // 2]:6.2f}ms  X-Cache={response.headers['X-Cache']}"
+    )
+
+
+async def main_():
+    seed()
+    async with redis.Redis(connection_pool=redis_pool) as redis_client:
+        await details_cache.invalidate_by_name(redis_client, NAME)
+        await warm(redis_client)
+
+    ttl = details_cache.DETAILS_RESPONSE_TTL or 60
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://bench") as client:
+        for response_ttl, cache_label in ((0, "응답 캐시 off"), (ttl, "응답 캐시 on")):
+            details_cache.DETAILS_RESPONSE_TTL = response_ttl
+            for prefetch in (False, True):
+                details_service.DETAILS_PREFETCH = prefetch
+                await measure(client, f"{cache_label} / prefetch {'on' if prefetch else 'off'}")
+    await http_clients.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main_())
@@ -0,0 +1,144 @@
+"""
+details 전체 응답 캐시(직렬화된 본문) 전/후 처리량 비교 벤치마크
+
+섹션 캐시(재무/뉴스/요약)가 모두 채워진 '따뜻한' 상태에서 /details-final/company-details 를
+httpx ASGITransport 로 반복 호출합니다.
+- before: DETAILS_RESPONSE_TTL=0 (섹션 캐시 3회 조회 + Pydantic 검증/조합 + 직렬화)
+- after : 전체 응답 캐시 적중 (저장된 JSON 본문을 그대로 응답)
+HTTP 처리량과 함께, 미들웨어 / 클라이언트 비용을 뺀 서비스 함수(get_company_details_body) 1회 시간도 봅니다.
+업스트림(DART / Naver / Groq)은 호출하지 않으며, REDIS_URL 의 Redis 가 필요합니다.
+
+    python -m benchmarks.bench_details_response_cache
+"""
+
+import os
+import asyncio
+import tempfile
+import time
+from datetime import datetime
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "corpview_bench_details_cache.sqlite3")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_PATH}")
+
+import httpx  # noqa: E402
+import redis.asyncio as redis  # noqa: E402
+
+import main  # noqa: E402
+from core.cache import redis_pool, swr_set  # noqa: E402
+from core.database import Base, engine, SessionLocal, AsyncSessionLocal  # noqa: E402
+from core.http_client import http_clients  # noqa: E402
+from core.tasks import drain_background  # noqa: E402
+from models import CompanyOverviews, FinancialStatement, Summary  # noqa: E402
+from services import details_cache, details_service  # noqa: E402
+from services.financial_service import FinancialService, FINANCIALS_SOFT_TTL, FINANCIALS_HARD_TTL, window_years  # noqa: E402
+from services.news_service import NEWS_SOFT_TTL, NEWS_HARD_TTL, CATEGORIES  # noqa: E402
+from services.summary_service import summary_fingerprint  # noqa: E402
+
+CORP_CODE = "00126380"
+NAME = "벤치전자"
+ARTICLES_PER_CATEGORY = 10
+REQUESTS = 2000
+CONCURRENCY = 20
+
+
+def seed():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        db.add(CompanyOverviews(corp_code=CORP_CODE, corp_name=NAME, favorite_count=3))
+        for year in window_years():
+            db.add(FinancialStatement(
+                corp_code=CORP_CODE, year=year, revenue=300_000, operating_profit=30_000, net_income=20_000,
+                total_assets=450_000, total_equity=350_000,
+                ratios={"영업이익률": 10.0, "순이익률": 6.7, "ROE": 5.7},
+            ))
+        db.commit()
+
+
+async def warm(redis_client: redis.Redis):
+    """섹션 캐시를 채웁니다. (요약은 현재 입력 지문으로 DB 에 저장해 두어 생성 없이 fresh)"""
+    corp_code = str(int(CORP_CODE))
+    financial_data = await FinancialService(redis_client, AsyncSessionLocal).get_from_l2(corp_code)
+    await swr_set(redis_client, f"details:financials:{corp_code}", financial_data, FINANCIALS_SOFT_TTL, FINANCIALS_HARD_TTL)
+
+    pub_date = datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0900")
+    news_data = {
+        category: [
+            {"id": str(i), "title": f"{NAME} {category} 뉴스 {i}", "link": f"https://news.example.com/{category}/{i}",
+             "pubDate": pub_date}
+            for i in range(ARTICLES_PER_CATEGORY)
+        ]
+        for category in CATEGORIES
+    }
+    await swr_set(redis_client, f"details:news:{NAME}", news_data, NEWS_SOFT_TTL, NEWS_HARD_TTL)
+
+    async with AsyncSessionLocal() as db:
+        db.add(Summary(
+            company_name=NAME, summary_text="벤치 요약 " * 80,
+            input_hash=summary_fingerprint(NAME, financial_data, news_data),
+        ))
+        await db.commit()
+
+
+async def measure(client: httpx.AsyncClient, label: str):
+    # 1회 호출로 (after 라면) 전체 응답 캐시를 채움
+    await client.get("/details-final/company-details", params={"name": NAME})
+    await asyncio.sleep(0.2)
+
+    latencies, caches = [], {}
+    queue = iter(range(REQUESTS))
+
+    async def worker():
+        for _ in queue:
+            start = time.perf_counter()
+            response = await client.get("/details-final/company-details", params={"name": NAME})
+            latencies.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+            caches[response.headers["X-Cache"]] = caches.get(response.headers["X-Cache"], 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(
+        f"{label:7} {REQUESTS / elapsed:8.0f} req/s  p50={latencies[len(latencies) // 2]:6.2f}ms "
+        f"p95={latencies[int(len(latencies) * 0.95)]:6.2f}ms  X-Cache={caches}"
+    )
+
+
+async def measure_service(redis_client: redis.Redis, label: str):
+    async with AsyncSessionLocal() as db:
+        await details_service.get_company_details_body(NAME, db, redis_client)
+        await asyncio.sleep(0.2)
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            body, _ = await details_service.get_company_details_body(NAME, db, redis_client)
+        elapsed = time.perf_counter() - start
+    await drain_background(30)  # 호출마다 쌓인 인기도 기록
+    print(f"{label:7} service {elapsed / REQUESTS * 1e6:8.1f}us/call  body={len(body.encode())}B")
+
+
+async def main_():
+    seed()
+    async with redis.Redis(connection_pool=redis_pool) as redis_client:
+        await redis_client.delete(f"details:response:{NAME}")
+        await warm(redis_client)
+
+        ttl = details_cache.DETAILS_RESPONSE_TTL or 60
+        details_cache.DETAILS_RESPONSE_TTL = 0
+        await measure_service(redis_client, "before")
+        details_cache.DETAILS_RESPONSE_TTL = ttl
+        await measure_service(redis_client, "after")
+        await details_cache.invalidate_by_name(redis_client, NAME)
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        details_cache.DETAILS_RESPONSE_TTL = 0
+        await measure(client, "before")
+        details_cache.DETAILS_RESPONSE_TTL = ttl
+        await measure(client, "after")
+    await http_clients.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main_())
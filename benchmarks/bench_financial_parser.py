@@ -0,0 +1,106 @@
+"""
+DART 재무 파서: 기존 pandas 경로 vs utils.financial_parser 비교 벤치마크
+
+fnlttSinglAcnt 응답과 비슷한 모양(회사당 CFS/OFS 각 ~13행)의 payload 를 만들어
+- 단일 회사: 요청마다 한 번씩 파싱 (서비스 경로)
+- 배치: 여러 회사 행을 한 번에 파싱 (fnlttMultiAcnt 적재 경로)
+의 처리 시간을 비교하고, 두 결과가 같은지 확인합니다.
+
+    python -m benchmarks.bench_financial_parser
+(pandas 가 설치돼 있어야 기존 경로와 비교합니다.)
+"""
+
+import os
+import random
+import time
+
+# utils.utils 가 models 를 임포트하므로 DB 설정만 채워 둠 (DB 는 사용하지 않음)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from utils.financial_parser import parse_financials, parse_financials_batch  # noqa: E402
+from utils.utils import clean, normalize, calculate_ratios  # noqa: E402
+
+N_COMPANIES = 2_000
+REPEAT = 3
+ACCOUNTS = [
+    "유동자산", "비유동자산", "자산총계", "유동부채", "비유동부채", "부채총계",
+    "자본금", "이익잉여금", "자본총계", "매출액", "영업이익", "법인세차감전 순이익", "당기순이익(손실)",
+]
+
+
+def make_rows(corp_code: str, rng: random.Random):
+    rows = []
+    for fs_div in ("CFS", "OFS"):
+        for account in ACCOUNTS:
+            row = {"corp_code": corp_code, "fs_div": fs_div, "account_nm": account}
+            for field in ("thstrm_amount", "frmtrm_amount", "bfefrmtrm_amount"):
+                row[field] = f"{rng.randint(1, 10**12):,}" if rng.random() > 0.05 else "-"
+            rows.append(row)
+    return rows
+
+
+def parse_with_pandas(rows):
+    """(기존 구현) pandas DataFrame + apply + iterrows"""
+    import pandas as pd
+
+    df = pd.DataFrame(rows)
+    if "fs_div" not in df.columns:
+        return {"message": "'fs_div' 정보가 없습니다."}
+    if (df["fs_div"] == "CFS").any():
+        df = df[df["fs_div"] == "CFS"]
+    elif (df["fs_div"] == "OFS").any():
+        df = df[df["fs_div"] == "OFS"]
+    else:
+        return {"message": "CFS/OFS 기준 데이터가 없습니다."}
+
+    keywords = ["매출액", "영업이익", "당기순이익", "자본총계", "자산총계"]
+    df_filtered = df[df["account_nm"].apply(lambda x: any(k in x for k in keywords))]
+
+    result = {"2022": {}, "2023": {}, "2024": {}}
+    for _, row in df_filtered.iterrows():
+        account = normalize(row["account_nm"])
+        result["2022"][account] = clean(row.get("bfefrmtrm_amount"))
+        result["2023"][account] = clean(row.get("frmtrm_amount"))
+        result["2024"][account] = clean(row.get("thstrm_amount"))
+    for year in result:
+        result[year]["ratio"] = calculate_ratios(result[year])
+    return result
+
+
+def timed(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, value
+
+
+def main():
+    rng = random.Random(42)
+    payloads = {f"{i:08d}": make_rows(f"{i:08d}", rng) for i in range(N_COMPANIES)}
+    all_rows = [row for rows in payloads.values() for row in rows]
+    print(f"companies={N_COMPANIES:,}  rows={len(all_rows):,}")
+
+    parser_s, parsed = timed(lambda: {code: parse_financials(rows, 2024) for code, rows in payloads.items()})
+    batch_s, batched = timed(lambda: parse_financials_batch(all_rows, 2024))
+    assert parsed == batched
+
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        pandas_s = None
+    else:
+        pandas_s, legacy = timed(lambda: {code: parse_with_pandas(rows) for code, rows in payloads.items()})
+        assert legacy == parsed, "pandas 경로와 결과가 다릅니다."
+
+    print(f"{'path':<22}{'total ms':>12}{'per company us':>18}")
+    for name, seconds in (("pandas (legacy)", pandas_s), ("parse_financials", parser_s), ("parse_financials_batch", batch_s)):
+        if seconds is None:
+            print(f"{name:<22}{'(pandas 없음)':>12}")
+            continue
+        print(f"{name:<22}{seconds * 1000:>12.1f}{seconds / N_COMPANIES * 1e6:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+LLM 게이트웨이: 기본 모델 지연 악화 시 대체 모델 전환 / 예산 대기열 동작 확인 벤치마크
+
+Groq 대신 httpx MockTransport 로 모델별 지연·오류율을 흉내낸 업스트림을 두고,
+동시 요청 CONCURRENCY 개씩 ROUNDS 번 요약을 요청합니다.
+중간 라운드부터 기본 모델이 느려지거나(SLOW_MS) 오류(ERROR_RATE)를 내도록 바꾸어
+p95 / 오류율 임계치를 넘은 뒤 대체 모델로 넘어가는지, 전체 요청 지연이 어떻게 변하는지 봅니다.
+(RPM / TPM 버킷은 Redis 를 쓰므로 REDIS_URL 의 Redis 가 필요합니다)
+
+    python -m benchmarks.bench_llm_gateway
+"""
+
+import os
+import asyncio
+import json
+import random
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "corpview_bench_llm.sqlite3")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_PATH}")
+
+import httpx  # noqa: E402
+import redis.asyncio as redis  # noqa: E402
+
+from core.cache import redis_pool  # noqa: E402
+from core.http_client import http_clients  # noqa: E402
+from core.llm_gateway import LLMGateway, LLMUnavailable  # noqa: E402
+
+PRIMARY, FALLBACK = "bench-primary", "bench-fallback"
+BASE_MS = {PRIMARY: 300, FALLBACK: 120}
+SLOW_MS = 3000
+ERROR_RATE = 0.3
+CONCURRENCY = 8
+ROUNDS = 6
+DEGRADE_FROM_ROUND = 2
+MESSAGES = [
+    {"role": "system", "content": "You are a professional financial analyst and summarizer."},
+    {"role": "user", "content": "회사: 벤치마크전자\n\n매출 100억 / 영업이익 10억 / 순이익 5억\n\n채용 뉴스 3건"},
+]
+
+degraded = False
+
+
+async def _fake_groq(request: httpx.Request) -> httpx.Response:
+    model = json.loads(request.content)["model"]
+    latency = BASE_MS[model]
+    if model == PRIMARY and degraded:
+        latency = SLOW_MS
+        if random.random() < ERROR_RATE:
+            await asyncio.sleep(latency / 1000 / 10)
+            return httpx.Response(503, json={"error": "overloaded"})
+    await asyncio.sleep(latency / 1000)
+    return httpx.Response(200, json={
+        "choices": [{"message": {"content": f"{model} 요약"}}],
+        "usage": {"total_tokens": 600},
+    })
+
+
+def _percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+async def main():
+    global degraded
+    http_clients._clients["groq"] = httpx.AsyncClient(transport=httpx.MockTransport(_fake_groq))
+    gateway = LLMGateway(
+        f"bench{int(time.time())}", "http://groq.invalid/v1/chat/completions", "bench",
+        [PRIMARY, FALLBACK], rpm=600, tpm=600_000, rpd=0, tpd=0, completion_reserve=512, background_reserve=0.3,
+        max_concurrency=CONCURRENCY, queue_timeout=10, timeout=5,
+        failover_p95_ms=1500, failover_error_rate=0.2, failover_cooldown=60,
+    )
+
+    async with redis.Redis(connection_pool=redis_pool) as redis_client:
+        for round_no in range(ROUNDS):
+            degraded = round_no >= DEGRADE_FROM_ROUND
+            latencies, answered_by, failed = [], {}, 0
+
+            async def one():
+                nonlocal failed
+                start = time.perf_counter()
+                try:
+                    _, model = await gateway.complete(redis_client, MESSAGES)
+                except LLMUnavailable:
+                    failed += 1
+                    return
+                latencies.append((time.perf_counter() - start) * 1000)
+                answered_by[model] = answered_by.get(model, 0) + 1
+
+            await asyncio.gather(*(one() for _ in range(CONCURRENCY)))
+            print(
+                f"round {round_no} degraded={degraded!s:5} "
+                f"p50={_percentile(latencies, 0.5):7.1f}ms p95={_percentile(latencies, 0.95):7.1f}ms "
+                f"answered={answered_by} failed={failed}"
+                if latencies else f"round {round_no} 모두 실패 ({failed})"
+            )
+
+    stats = gateway.stats()
+    print(f"\nfailovers={stats['failovers']} unavailable={stats['unavailable']}")
+    for model, health in stats["per_model"].items():
+        print(f"  {model:15} calls={health['calls']:3} errors={health['errors']:3} "
+              f"trips={health['trips']} p95={health['p95_ms']}ms tripped={health['tripped']}")
+    await http_clients.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
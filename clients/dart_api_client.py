@@ -1,23 +1,93 @@
 # /clients/dart_api_client.py
 
 import httpx
-from core.config import DART_API
+from core.config import DART_API, DART_BASE_URL, latest_bsns_year
+from core.http_client import http_clients
+from core.resilience import dart_upstream, is_transient, CircuitOpenError
 from fastapi import HTTPException
 
-async def fetch_financial_raw(code: str) -> dict:
-    """(L3) DART API 원본(raw) 데이터를 비동기로 호출합니다."""
+DART_STATUS_NO_DATA = "013"
+DART_STATUS_RATE_LIMITED = "020"
+DART_RETRYABLE_STATUSES = {DART_STATUS_RATE_LIMITED, "900"}          # 요청 제한 초과 / 정의되지 않은 오류
+DART_UNHEALTHY_STATUSES = DART_RETRYABLE_STATUSES | {"800"}          # + 시스템 점검
+DART_RATE_LIMIT_BACKOFF = 1.0                                        # 020 재시도 전 최소 대기(초)
+
+
+class DartStatusError(Exception):
+    """DART 응답의 status 가 정상(000)/데이터 없음(013)이 아님"""
+
+    def __init__(self, status: str | None, message: str | None):
+        super().__init__(f"DART API 오류: {status} {message}")
+        self.status = status
+        self.message = message
+        # 020(요청 제한 초과)은 잠시 쉬었다가 재시도
+        self.retry_after = DART_RATE_LIMIT_BACKOFF if status == DART_STATUS_RATE_LIMITED else 0.0
+
+
+def _dart_retryable(error: Exception) -> bool:
+    if isinstance(error, DartStatusError):
+        return error.status in DART_RETRYABLE_STATUSES
+    return is_transient(error)
+
+
+def _dart_failure(error: Exception) -> bool:
+    """회로 차단기에 실패로 집계할 오류 (키/파라미터 오류는 DART 상태와 무관)"""
+    if isinstance(error, DartStatusError):
+        return error.status in DART_UNHEALTHY_STATUSES
+    return is_transient(error)
+
+
+async def fetch_financial_raw(code: str, bsns_year: int | None = None, reprt_code: str = "11011") -> dict:
+    """
+    (L3) DART API 원본(raw) 데이터를 비동기로 호출합니다.
+    - 일시적 오류(네트워크/5xx/020/900)는 지터 백오프로 재시도, 회로가 열려 있으면 CircuitOpenError
+    - 013(데이터 없음)은 404, 그 외 오류는 HTTPException
+    """
     code = "00" + code if len(code) == 6 else code
-    url = f"https://opendart.fss.or.kr/api/fnlttSinglAcnt.json?crtfc_key={DART_API}&corp_code={code}&bsns_year=2024&reprt_code=11011"
-        
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url)
-            response.raise_for_status() # HTTP 오류 체크
-            data = response.json()
-            if "list" not in data:
-                raise HTTPException(status_code=404, detail="DART 재무 데이터가 없습니다.")
-            return data
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(status_code=e.response.status_code, detail=f"DART API 오류: {e.response.text}")
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"DART API 호출 중 오류: {str(e)}")
\ No newline at end of file
+    bsns_year = bsns_year or latest_bsns_year()
+    url = f"{DART_BASE_URL}/fnlttSinglAcnt.json?crtfc_key={DART_API}&corp_code={code}&bsns_year={bsns_year}&reprt_code={reprt_code}"
+
+    client = http_clients.get("dart")
+
+    async def request() -> dict:
+        response = await client.get(url)
+        response.raise_for_status() # HTTP 오류 체크
+        data = response.json()
+        if "list" not in data and data.get("status") not in (None, DART_STATUS_NO_DATA):
+            raise DartStatusError(data.get("status"), data.get("message"))
+        return data
+
+    try:
+        data = await dart_upstream.call(request, retryable=_dart_retryable, is_failure=_dart_failure, hedge=True)
+    except CircuitOpenError:
+        raise
+    except DartStatusError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail=f"DART API 오류: {e.response.text}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"DART API 호출 중 오류: {e!r}")
+
+    if "list" not in data:
+        # 013: 조회된 데이터 없음(미공시)
+        raise HTTPException(status_code=404, detail="DART 재무 데이터가 없습니다.")
+    return data
+
+async def fetch_multi_financial_raw(corp_codes: list[str], bsns_year: int, reprt_code: str) -> dict:
+    """
+    (배치 적재용) 다중회사 주요계정(fnlttMultiAcnt) 원본을 호출합니다.
+    - corp_codes 는 최대 100개 (DART 제한)
+    - DART 의 status 코드(000 정상, 013 데이터 없음, 020 요청 제한 초과 등)는 호출자가 판단
+    """
+    client = http_clients.get("dart")
+    response = await client.get(
+        f"{DART_BASE_URL}/fnlttMultiAcnt.json",
+        params={
+            "crtfc_key": DART_API,
+            "corp_code": ",".join(corp_codes),
+            "bsns_year": str(bsns_year),
+            "reprt_code": reprt_code,
+        },
+    )
+    response.raise_for_status()
+    return response.json()
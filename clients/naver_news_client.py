@@ -1,14 +1,33 @@
 # /clients/naver_news_client.py
 
+import asyncio
 import httpx
 import html
+import redis.asyncio as redis
 from fastapi import HTTPException
 from typing import List, Dict
 
-from core.config import NAVER_CLIENT_ID, NAVER_CLIENT_SECRET
+from core.config import (
+    NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, NEWS_PER_CATEGORY,
+    NAVER_RATE_PER_SEC, NAVER_BURST, NAVER_DAILY_QUOTA, NAVER_BACKGROUND_RESERVE,
+    NAVER_INTERACTIVE_WAIT, NAVER_BACKGROUND_WAIT,
+)
+from core.http_client import http_clients
+from core.rate_limit import TokenBucketScheduler, INTERACTIVE
+from core.resilience import naver_upstream, CircuitOpenError
 from schemas.news import NewsArticle # 스키마는 재사용
 from utils.utils import _make_id
 
+# 워커 전체가 공유하는 Naver 검색 API 호출 한도 (초당 / 일일)
+naver_scheduler = TokenBucketScheduler(
+    "naver",
+    rate=NAVER_RATE_PER_SEC,
+    burst=NAVER_BURST,
+    daily_limit=NAVER_DAILY_QUOTA,
+    reserve=NAVER_BACKGROUND_RESERVE,
+)
+WAIT_BY_PRIORITY = {INTERACTIVE: NAVER_INTERACTIVE_WAIT}
+
 async def fetch_news_by_query(query: str) -> List[NewsArticle]:
     """(L3) Naver News API를 비동기로 호출하고 Pydantic 모델로 반환합니다."""
     if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
@@ -18,15 +37,22 @@ async def fetch_news_by_query(query: str) -> List[NewsArticle]:
         "X-Naver-Client-Id": NAVER_CLIENT_ID,
         "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
     }
-    url = f"https://openapi.naver.com/v1/search/news.json?query={query}&display=5&sort=sim"
+    url = f"https://openapi.naver.com/v1/search/news.json?query={query}&display={NEWS_PER_CATEGORY}&sort=sim"
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status() 
-            result = response.json()
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"네이버 API 호출 오류: {str(e)}")
+    client = http_clients.get("naver")
+
+    async def request() -> dict:
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    try:
+        # 일시적 오류는 지터 백오프로 재시도, 회로가 열려 있으면 CircuitOpenError 그대로 (호출자가 L2 로 degrade)
+        result = await naver_upstream.call(request, hedge=True)
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"네이버 API 호출 오류: {str(e)}")
         
     articles = []
     for item in result.get("items", []):
@@ -37,4 +63,21 @@ async def fetch_news_by_query(query: str) -> List[NewsArticle]:
             link=item["link"],
             pubDate=item["pubDate"]
         ))
-    return articles
\ No newline at end of file
+    return articles
+
+async def fetch_news_batch(
+    redis_client: redis.Redis, queries: List[str], priority: str = INTERACTIVE
+) -> List[List[NewsArticle]]:
+    """
+    (L3) 여러 검색어를 스케줄러 허가를 받은 뒤 병렬 호출합니다.
+    - 검색어 수만큼의 토큰을 한 번에 받아, 일부만 성공한 묶음이 생기지 않도록
+    - 허가를 못 받으면 RateLimitExceeded, 회로가 열려 있으면 CircuitOpenError (호출자가 L2 로 degrade)
+    """
+    naver_upstream.breaker.check()  # 회로가 열려 있으면 한도 토큰을 쓰기 전에 거절
+    await naver_scheduler.acquire(
+        redis_client,
+        cost=len(queries),
+        priority=priority,
+        timeout=WAIT_BY_PRIORITY.get(priority, NAVER_BACKGROUND_WAIT),
+    )
+    return await asyncio.gather(*(fetch_news_by_query(query) for query in queries))
@@ -1,13 +1,283 @@
+import time
+import uuid
 import redis.asyncio as redis
-from core.config import REDIS_URL
+from contextlib import contextmanager
+from contextvars import ContextVar
+from redis.asyncio.client import Pipeline
+from redis.client import NEVER_DECODE
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+from fastapi.logger import logger
+from core.config import (
+    REDIS_URL, L0_CACHE_MAX_ENTRIES, L0_CACHE_TTL,
+    CACHE_CODEC_WRITE_VERSION, CACHE_CODEC_SERIALIZER, CACHE_CODEC_COMPRESSION,
+    CACHE_CODEC_COMPRESS_MIN_BYTES, CACHE_CODEC_ZSTD_LEVEL,
+)
+from core.codec import CacheCodec, CodecError, HEADER_BYTES
+from core.local_cache import LocalCache
+from core.pubsub import PubSubDispatcher
 
 redis_pool = redis.ConnectionPool.from_url(
     REDIS_URL, decode_responses=True
 )
 
+# --- 요청 단위 Redis 명령 / 왕복 수 집계 ---
+
+class RedisCommandCounter:
+    def __init__(self, totals: Dict[str, int] | None = None):
+        self.commands = 0
+        self.round_trips = 0
+        self.totals = totals
+
+    def add(self, commands: int):
+        """왕복 1번(명령 commands 개). totals 가 있으면 보내는 즉시 함께 더합니다."""
+        self.commands += commands
+        self.round_trips += 1
+        if self.totals is not None:
+            self.totals["commands"] += commands
+            self.totals["round_trips"] += 1
+
+
+_command_counter: ContextVar[RedisCommandCounter | None] = ContextVar("redis_command_counter", default=None)
+
+
+@contextmanager
+def count_redis_commands(totals: Dict[str, int] | None = None) -> Iterator[RedisCommandCounter]:
+    """
+    블록 안에서(그 안에서 시작한 백그라운드 작업 포함) CountingRedis 로 보낸 명령 / 왕복 수를 셉니다.
+    파이프라인은 명령 수만큼, 왕복은 1번으로 집계합니다.
+    백그라운드 작업은 블록이 끝난 뒤에도 실행되므로, 누적 집계는 totals("commands" / "round_trips")로
+    받아 명령을 보낼 때마다 더합니다. (작업이 끝나면 그 명령까지 모두 반영)
+    """
+    counter = RedisCommandCounter(totals)
+    token = _command_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _command_counter.reset(token)
+
+
+class CountingPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        counter = _command_counter.get()
+        if counter is not None and self.command_stack:
+            counter.add(len(self.command_stack))
+        return await super().execute(raise_on_error)
+
+
+class CountingRedis(redis.Redis):
+    """count_redis_commands() 안에서 명령 / 왕복 수를 세는 클라이언트 (밖에서는 redis.Redis 와 같음)"""
+
+    async def execute_command(self, *args, **options):
+        counter = _command_counter.get()
+        if counter is not None:
+            counter.add(1)
+        return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> CountingPipeline:
+        return CountingPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
 async def get_redis():
-    async with redis.Redis(connection_pool=redis_pool) as client:
+    async with CountingRedis(connection_pool=redis_pool) as client:
         try:
             yield client
         finally:
-            pass
\ No newline at end of file
+            pass
+
+
+# --- (L0) 워커 로컬 캐시 + Pub/Sub 무효화 ---
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+WORKER_ID = uuid.uuid4().hex  # 자신이 보낸 무효화 메시지는 무시하기 위한 식별자
+
+local_cache = LocalCache(max_entries=L0_CACHE_MAX_ENTRIES, default_ttl=L0_CACHE_TTL)
+pubsub = PubSubDispatcher(redis_pool)
+
+
+def _on_invalidate(data: str):
+    sender, _, key = data.partition("|")
+    if sender != WORKER_ID:
+        local_cache.invalidate(key)
+
+pubsub.subscribe(INVALIDATION_CHANNEL, _on_invalidate)
+
+
+# --- 값 코덱 ---
+# 풀은 decode_responses=True 이므로 코덱 값은 명령 단위로 NEVER_DECODE 를 붙여 bytes 로 읽습니다.
+# (락 / 토큰 버킷 / ZSET 등 코덱을 쓰지 않는 키는 기존대로 문자열)
+
+codec = CacheCodec(
+    serializer=CACHE_CODEC_SERIALIZER,
+    compression=CACHE_CODEC_COMPRESSION,
+    compress_min_bytes=CACHE_CODEC_COMPRESS_MIN_BYTES,
+    zstd_level=CACHE_CODEC_ZSTD_LEVEL,
+    write_version=CACHE_CODEC_WRITE_VERSION,
+)
+
+
+async def _get_raw(redis_client: redis.Redis, key: str) -> Tuple[bytes | None, int | None]:
+    """GET(bytes) + TTL 을 한 번의 왕복으로 (L0 보관 기간이 Redis 만료를 넘지 않도록)"""
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.execute_command("GET", key, **{NEVER_DECODE: True})
+        pipe.ttl(key)
+        raw, ttl = await pipe.execute()
+    return raw, ttl
+
+
+def _decode(key: str, raw: bytes, loads: Callable[[str], Any] | None) -> Tuple[float | None, Any] | None:
+    try:
+        return codec.decode(key, raw, loads)
+    except CodecError as e:
+        logger.warning(f"[CACHE] {e} (미스로 처리)")
+        return None
+
+
+def _l0_ttl(ttl: int | None) -> int | None:
+    return ttl if ttl and ttl > 0 else None
+
+
+async def cache_prefetch(
+    redis_client: redis.Redis,
+    keys: Dict[str, Callable[[str], Any] | None] | None = None,
+    swr_keys: Sequence[str] = (),
+) -> int:
+    """
+    L0 에 없는 키들을 한 번의 왕복(MGET + 키별 TTL 파이프라인)으로 읽어 디코딩한 뒤 L0 에 채웁니다.
+    keys 는 cache_get 으로 읽는 키와 그 loads, swr_keys 는 swr_get 으로 읽는 키입니다.
+    이후 같은 키의 cache_get / swr_get 은 L0 에서 적중하고, Redis 에도 없던 키만 각자의 조회 경로로 갑니다.
+    반환: Redis 에서 읽어 L0 에 채운 키 수
+    """
+    pending = [(key, loads, False) for key, loads in (keys or {}).items() if not local_cache.contains(key)]
+    pending += [(key, None, True) for key in swr_keys if not local_cache.contains(key)]
+    generations = [local_cache.generation(key) for key, _, _ in pending]
+    if not pending:
+        return 0
+
+    names = [key for key, _, _ in pending]
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.execute_command("MGET", *names, **{NEVER_DECODE: True})
+        for key in names:
+            pipe.ttl(key)
+        raws, *ttls = await pipe.execute()
+
+    filled = 0
+    for (key, loads, swr), generation, raw, ttl in zip(pending, generations, raws, ttls):
+        decoded = _decode(key, raw, loads) if raw is not None else None
+        if decoded is None:
+            continue
+        soft_expires_at, value = decoded
+        local_cache.set(key, (soft_expires_at or 0.0, value) if swr else value, _l0_ttl(ttl), generation)
+        filled += 1
+    return filled
+
+
+async def cache_get(
+    redis_client: redis.Redis, key: str, loads: Callable[[str], Any] | None = None
+) -> Any | None:
+    """
+    L0 -> Redis 순서로 조회하고, 디코딩된 객체를 반환합니다. (없으면 None)
+    loads 를 주면 cache_set(dumps=...) 로 저장한 문자열을 그 함수로 읽습니다.
+    """
+    hit, value = local_cache.get(key)
+    if hit:
+        return value
+
+    # 읽는 동안 무효화가 도착하면 이전 값을 L0 에 다시 넣지 않도록 세대를 먼저 받아 둠
+    generation = local_cache.generation(key)
+    raw, ttl = await _get_raw(redis_client, key)
+    if raw is None:
+        return None
+    decoded = _decode(key, raw, loads)
+    if decoded is None:
+        return None
+    value = decoded[1]
+
+    local_cache.set(key, value, _l0_ttl(ttl), generation)
+    return value
+
+
+async def cache_set(
+    redis_client: redis.Redis,
+    key: str,
+    value: Any,
+    ex: int,
+    dumps: Callable[[Any], str] | None = None,
+):
+    """Redis 에 저장하고 다른 워커의 L0 사본을 무효화합니다. (dumps 생략 시 코덱의 직렬화 사용)"""
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.set(key, codec.encode(key, value, dumps), ex=ex)
+        pipe.publish(INVALIDATION_CHANNEL, f"{WORKER_ID}|{key}")
+        await pipe.execute()
+    local_cache.set(key, value, ex)
+
+
+async def cache_delete(redis_client: redis.Redis, *keys: str):
+    """Redis 와 모든 워커의 L0 에서 키를 제거합니다."""
+    if not keys:
+        return
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.delete(*keys)
+        for key in keys:
+            pipe.publish(INVALIDATION_CHANNEL, f"{WORKER_ID}|{key}")
+        await pipe.execute()
+    for key in keys:
+        local_cache.invalidate(key)
+
+
+# --- Stale-While-Revalidate (soft / hard TTL) ---
+# Redis 값: soft 만료 epoch 를 헤더에 담은 코덱 값 (이전 형식: "swr1:{soft 만료 epoch}|{payload}"), EX = hard TTL
+# soft 만료 전: fresh / soft~hard 사이: stale 값을 바로 반환하고 백그라운드 갱신
+
+
+async def swr_get(
+    redis_client: redis.Redis, key: str, loads: Callable[[str], Any] | None = None
+) -> Tuple[Any | None, bool]:
+    """(value, is_stale) 를 반환합니다. 값이 없으면 (None, False)"""
+    hit, entry = local_cache.get(key)
+    if not hit:
+        generation = local_cache.generation(key)
+        raw, ttl = await _get_raw(redis_client, key)
+        if raw is None:
+            return None, False
+        decoded = _decode(key, raw, loads)
+        if decoded is None:
+            return None, False
+        # soft 만료 시각이 없는 값은 stale 로 취급해 한 번 갱신되도록
+        soft_expires_at, value = decoded
+        entry = (soft_expires_at or 0.0, value)
+        local_cache.set(key, entry, _l0_ttl(ttl), generation)
+
+    soft_expires_at, value = entry
+    return value, soft_expires_at <= time.time()
+
+
+async def swr_set(
+    redis_client: redis.Redis,
+    key: str,
+    value: Any,
+    soft_ttl: int,
+    hard_ttl: int,
+    dumps: Callable[[Any], str] | None = None,
+):
+    """soft TTL 만료 시각을 함께 저장하고, Redis 만료는 hard TTL 로 설정합니다."""
+    soft_expires_at = time.time() + soft_ttl
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.set(key, codec.encode(key, value, dumps, soft_expires_at), ex=hard_ttl)
+        pipe.publish(INVALIDATION_CHANNEL, f"{WORKER_ID}|{key}")
+        await pipe.execute()
+    local_cache.set(key, (soft_expires_at, value), hard_ttl)
+
+
+SWR_HEADER_BYTES = max(32, HEADER_BYTES)  # 코덱 헤더 / 이전 형식 "swr1:{epoch}.{ms}|" 를 덮는 길이
+
+
+async def swr_soft_expiries(redis_client: redis.Redis, keys: Sequence[str]) -> List[float | None]:
+    """
+    키별 soft 만료 시각(epoch)을 payload 없이 헤더만 읽어 반환합니다. (왕복 1번)
+    키가 없으면 None, soft 만료 시각이 없는 값이면 0.0 (= 이미 stale)
+    """
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.execute_command("GETRANGE", key, 0, SWR_HEADER_BYTES - 1, **{NEVER_DECODE: True})
+        headers = await pipe.execute()
+    return [codec.soft_expiry(header) if header else None for header in headers]
@@ -0,0 +1,225 @@
+# /core/codec.py
+
+"""
+캐시 값 코덱 (Redis 에 저장되는 바이트 형식).
+
+v1 프레임: [버전 0x81][플래그] [(swr) soft 만료 epoch float64] [payload]
+- 플래그 하위 4비트 = 직렬화(text / json / orjson / msgpack), 상위 3비트 = 압축(none / zstd / lz4),
+  0x80 = soft 만료 시각 포함(swr 값)
+- payload 가 CACHE_CODEC_COMPRESS_MIN_BYTES 이상이고 실제로 줄어들 때만 압축
+- 0x81 은 UTF-8 텍스트의 첫 바이트가 될 수 없으므로, 도입 이전 형식(JSON 텍스트 / "swr1:...")과
+  섞여 있어도 구분해서 읽습니다. (읽기는 항상 두 형식 모두, 쓰기는 CACHE_CODEC_WRITE_VERSION 으로 선택)
+- 직렬화/압축 라이브러리가 없으면 json / 무압축으로 대체 (읽을 수 없는 값은 CodecError -> 캐시 미스)
+"""
+
+import json
+import struct
+from collections import defaultdict
+from typing import Any, Callable, Dict, Tuple
+from fastapi.logger import logger
+
+from core.local_cache import namespace_of
+
+VERSION = 0x81
+SWR_FLAG = 0x80
+LEGACY_SWR_PREFIX = "swr1:"
+_SOFT = struct.Struct(">d")
+HEADER_BYTES = 2 + _SOFT.size  # swr 값에서 soft 만료 시각까지의 길이
+
+# 직렬화
+TEXT, JSON, ORJSON, MSGPACK = 0, 1, 2, 3
+SERIALIZERS = {"json": JSON, "orjson": ORJSON, "msgpack": MSGPACK}
+# 압축
+NONE, ZSTD, LZ4 = 0, 1, 2
+COMPRESSIONS = {"none": NONE, "zstd": ZSTD, "lz4": LZ4}
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+_AVAILABLE = {
+    ORJSON: orjson is not None,
+    MSGPACK: msgpack is not None,
+    ZSTD: zstandard is not None,
+    LZ4: lz4_frame is not None,
+}
+
+
+class CodecError(Exception):
+    """저장된 값을 이 워커에서 디코딩할 수 없음 (호출자는 캐시 미스로 취급)"""
+
+
+def _resolve(kind: str, name: str, table: Dict[str, int], fallback: str) -> int:
+    code = table.get(name)
+    if code is None:
+        raise ValueError(f"알 수 없는 캐시 {kind}: {name}")
+    if not _AVAILABLE.get(code, True):
+        logger.warning(f"[CODEC] {name} 라이브러리가 없어 {fallback} 사용")
+        return table[fallback]
+    return code
+
+
+class CacheCodec:
+    def __init__(
+        self,
+        serializer: str = "orjson",
+        compression: str = "zstd",
+        compress_min_bytes: int = 1024,
+        zstd_level: int = 3,
+        write_version: int = 1,
+    ):
+        self.serializer = _resolve("직렬화", serializer, SERIALIZERS, "json")
+        self.compression = _resolve("압축", compression, COMPRESSIONS, "none")
+        self.compress_min_bytes = compress_min_bytes
+        self.write_version = write_version
+        self._zstd_c = zstandard.ZstdCompressor(level=zstd_level) if zstandard else None
+        self._zstd_d = zstandard.ZstdDecompressor() if zstandard else None
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"writes": 0, "payload_bytes": 0, "stored_bytes": 0, "compressed": 0, "legacy_reads": 0, "errors": 0}
+        )
+
+    # --- 직렬화 / 압축 ---
+
+    def _serialize(self, value: Any) -> bytes:
+        if self.serializer == ORJSON:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        if self.serializer == MSGPACK:
+            return msgpack.packb(value, use_bin_type=True)
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+    @staticmethod
+    def _deserialize(serializer: int, payload: bytes, loads: Callable[[str], Any] | None) -> Any:
+        if serializer == MSGPACK:
+            if msgpack is None or loads is not None:
+                raise CodecError("msgpack 값을 읽을 수 없습니다.")
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        if loads is not None:
+            return loads(payload.decode())
+        if serializer == TEXT:
+            return payload.decode()
+        if serializer == ORJSON and orjson is not None:
+            return orjson.loads(payload)
+        return json.loads(payload)
+
+    def _compress(self, payload: bytes) -> Tuple[int, bytes]:
+        if self.compression == NONE or len(payload) < self.compress_min_bytes:
+            return NONE, payload
+        if self.compression == ZSTD:
+            compressed = self._zstd_c.compress(payload)
+        else:
+            compressed = lz4_frame.compress(payload)
+        return (self.compression, compressed) if len(compressed) < len(payload) else (NONE, payload)
+
+    def _decompress(self, compression: int, data: bytes) -> bytes:
+        if compression == NONE:
+            return data
+        if compression == ZSTD and self._zstd_d is not None:
+            return self._zstd_d.decompress(data)
+        if compression == LZ4 and lz4_frame is not None:
+            return lz4_frame.decompress(data)
+        raise CodecError(f"압축 형식 {compression} 을 풀 수 없습니다.")
+
+    # --- 인코딩 / 디코딩 ---
+
+    def encode(
+        self,
+        key: str,
+        value: Any,
+        dumps: Callable[[Any], str] | None = None,
+        soft_expires_at: float | None = None,
+    ) -> str | bytes:
+        """
+        dumps 를 주면 그 결과(문자열)를 text 로, 아니면 설정된 직렬화로 저장합니다.
+        soft_expires_at 은 swr 값의 soft 만료 시각입니다.
+        """
+        if self.write_version < 1:
+            text = dumps(value) if dumps else json.dumps(value)
+            return text if soft_expires_at is None else f"{LEGACY_SWR_PREFIX}{soft_expires_at:.3f}|{text}"
+
+        if dumps is not None:
+            serializer, payload = TEXT, dumps(value).encode()
+        else:
+            serializer, payload = self.serializer, self._serialize(value)
+        compression, data = self._compress(payload)
+
+        flags = serializer | (compression << 4)
+        header = bytes((VERSION, flags | (SWR_FLAG if soft_expires_at is not None else 0)))
+        if soft_expires_at is not None:
+            header += _SOFT.pack(soft_expires_at)
+        encoded = header + data
+
+        stats = self._stats[namespace_of(key)]
+        stats["writes"] += 1
+        stats["payload_bytes"] += len(payload)
+        stats["stored_bytes"] += len(encoded)
+        if compression != NONE:
+            stats["compressed"] += 1
+        return encoded
+
+    def decode(self, key: str, raw: bytes, loads: Callable[[str], Any] | None = None) -> Tuple[float | None, Any]:
+        """(soft 만료 시각 또는 None, 값). 읽을 수 없으면 CodecError"""
+        try:
+            if raw[:1] != bytes((VERSION,)):
+                return self._decode_legacy(key, raw.decode(), loads)
+            flags = raw[1]
+            offset = 2
+            soft_expires_at = None
+            if flags & SWR_FLAG:
+                soft_expires_at = _SOFT.unpack_from(raw, offset)[0]
+                offset += _SOFT.size
+            payload = self._decompress((flags >> 4) & 0x07, raw[offset:])
+            return soft_expires_at, self._deserialize(flags & 0x0F, payload, loads)
+        except CodecError:
+            self._stats[namespace_of(key)]["errors"] += 1
+            raise
+        except Exception as e:
+            self._stats[namespace_of(key)]["errors"] += 1
+            raise CodecError(f"{key} 디코딩 실패: {e!r}") from e
+
+    def _decode_legacy(self, key: str, text: str, loads: Callable[[str], Any] | None) -> Tuple[float | None, Any]:
+        self._stats[namespace_of(key)]["legacy_reads"] += 1
+        loads = loads or json.loads
+        if text.startswith(LEGACY_SWR_PREFIX):
+            soft_expires_at, _, payload = text[len(LEGACY_SWR_PREFIX):].partition("|")
+            return float(soft_expires_at), loads(payload)
+        return None, loads(text)
+
+    @staticmethod
+    def soft_expiry(header: bytes) -> float:
+        """값 앞부분(GETRANGE)만으로 soft 만료 시각을 읽습니다. 없으면 0.0 (= 이미 stale)"""
+        if header[:1] == bytes((VERSION,)):
+            if len(header) >= HEADER_BYTES and header[1] & SWR_FLAG:
+                return _SOFT.unpack_from(header, 2)[0]
+            return 0.0
+        if header.startswith(LEGACY_SWR_PREFIX.encode()) and b"|" in header:
+            return float(header[len(LEGACY_SWR_PREFIX):].partition(b"|")[0])
+        return 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        namespaces = {}
+        for namespace, counters in self._stats.items():
+            payload, stored = counters["payload_bytes"], counters["stored_bytes"]
+            namespaces[namespace] = {
+                **counters,
+                "saved_ratio": round(1 - stored / payload, 3) if payload else None,
+            }
+        return {
+            "write_version": self.write_version,
+            "serializer": {v: k for k, v in SERIALIZERS.items()}[self.serializer],
+            "compression": {v: k for k, v in COMPRESSIONS.items()}[self.compression],
+            "compress_min_bytes": self.compress_min_bytes,
+            "namespaces": namespaces,
+        }
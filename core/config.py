@@ -1,18 +1,54 @@
 import os
+from datetime import datetime
 from dotenv import load_dotenv
 
 # .env 파일이 있다면 로드
 load_dotenv() 
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# 비어 있으면 DATABASE_URL 의 드라이버를 비동기 드라이버로 바꿔서 사용
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_URL = os.getenv("GROQ_URL")
+# LLM 게이트웨이: 기본 모델 + 지연/오류 시 넘어갈 대체 모델(빠르거나 작은 모델, 우선순위 순)
+GROQ_MODEL = os.getenv("GROQ_MODEL", "openai/gpt-oss-120b")
+GROQ_FALLBACK_MODELS = [m.strip() for m in os.getenv("GROQ_FALLBACK_MODELS", "llama-3.1-8b-instant").split(",") if m.strip()]
+# 모델별 예산 (워커 공유). 일일 한도 0 = 제한 없음
+GROQ_RPM = int(os.getenv("GROQ_RPM", "30"))
+GROQ_TPM = int(os.getenv("GROQ_TPM", "8000"))
+GROQ_RPD = int(os.getenv("GROQ_RPD", "0"))
+GROQ_TPD = int(os.getenv("GROQ_TPD", "0"))
+GROQ_COMPLETION_RESERVE = int(os.getenv("GROQ_COMPLETION_RESERVE", "1024"))  # 응답(추론 포함) 토큰 예약분
+GROQ_BACKGROUND_RESERVE = float(os.getenv("GROQ_BACKGROUND_RESERVE", "0.3"))   # background(갱신/배치)가 남겨둘 예산 비율
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "4"))             # 워커별 동시 호출 수
+GROQ_QUEUE_TIMEOUT = float(os.getenv("GROQ_QUEUE_TIMEOUT", "10"))              # 대기열/예산 대기 최대(초)
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "20"))                          # 모델 호출 1회 타임아웃(초)
+# 모델 전환 임계치: 최근 호출의 p95 지연(ms) 또는 오류율이 넘으면 cooldown 동안 다음 모델 사용
+GROQ_FAILOVER_P95_MS = float(os.getenv("GROQ_FAILOVER_P95_MS", "8000"))
+GROQ_FAILOVER_ERROR_RATE = float(os.getenv("GROQ_FAILOVER_ERROR_RATE", "0.5"))
+GROQ_FAILOVER_COOLDOWN = float(os.getenv("GROQ_FAILOVER_COOLDOWN", "60"))
 
 NAVER_CLIENT_ID = os.getenv("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = os.getenv("NAVER_CLIENT_SECRET")
 
 DART_API = os.getenv("dart_api_key")
+# 로컬 stub 서버로 바꿔 끼울 수 있도록 (예: http://127.0.0.1:8081/api)
+DART_BASE_URL = os.getenv("DART_BASE_URL", "https://opendart.fss.or.kr/api").rstrip("/")
+# 재무제표 조회 기간: 최신 사업연도(기본: 작년)부터 DART_YEAR_WINDOW 개 연도
+# 비워 두면 호출 시점의 작년 (오래 떠 있는 워커도 해가 바뀌면 따라감) -> latest_bsns_year()
+DART_LATEST_BSNS_YEAR = int(os.getenv("DART_LATEST_BSNS_YEAR") or 0)
+DART_YEAR_WINDOW = int(os.getenv("DART_YEAR_WINDOW", "3"))
+# 보고서 코드: 11011 사업보고서, 11012 반기, 11013 1분기, 11014 3분기 (상세 화면은 사업보고서 기준)
+DART_REPORT_CODES = [code.strip() for code in os.getenv("DART_REPORT_CODES", "11011").split(",") if code.strip()]
+# 데이터가 없던 기간(아직 미공시)을 DART 에 다시 확인하기까지의 간격(초)
+FINANCIAL_RECHECK_INTERVAL = float(os.getenv("FINANCIAL_RECHECK_INTERVAL", "86400"))
+
+
+def latest_bsns_year() -> int:
+    """조회 기준 최신 사업연도 (DART_LATEST_BSNS_YEAR 고정값, 없으면 지금 기준 작년)"""
+    return DART_LATEST_BSNS_YEAR or datetime.now().year - 1
+
 
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
@@ -23,4 +59,81 @@ FRONTEND_URL = os.getenv("FRONTEND_URL")
 
 LOGO_PUBLISHABLE_KEY = os.getenv("LOGO_PUBLISHABLE_KEY") or ""
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0")
\ No newline at end of file
+REDIS_URL = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0")
+
+# (L0) 워커 로컬 캐시
+L0_CACHE_MAX_ENTRIES = int(os.getenv("L0_CACHE_MAX_ENTRIES", "2048"))
+L0_CACHE_TTL = float(os.getenv("L0_CACHE_TTL", "30"))
+
+# 회사명 검색 인덱스 갱신 주기(초). 주기마다 company_overview 전체를 다시 읽어 바뀐 회사만 반영
+SEARCH_INDEX_REFRESH_INTERVAL = float(os.getenv("SEARCH_INDEX_REFRESH_INTERVAL", "300"))
+
+# 뉴스: 카테고리별 기사 수 / L2(RDB) 에 보관하는 기간(일, 마지막으로 검색 결과에 보인 시점 기준)
+NEWS_PER_CATEGORY = int(os.getenv("NEWS_PER_CATEGORY", "5"))
+NEWS_RETENTION_DAYS = int(os.getenv("NEWS_RETENTION_DAYS", "30"))
+
+# Naver 검색 API 호출 스케줄러 (워커 공유 토큰 버킷 + 일일 한도)
+NAVER_RATE_PER_SEC = float(os.getenv("NAVER_RATE_PER_SEC", "10"))
+NAVER_BURST = int(os.getenv("NAVER_BURST", "10"))
+NAVER_DAILY_QUOTA = int(os.getenv("NAVER_DAILY_QUOTA", "25000"))
+# background(갱신) 호출이 남겨둬야 하는 interactive 몫 (버킷/일일 한도 비율)
+NAVER_BACKGROUND_RESERVE = float(os.getenv("NAVER_BACKGROUND_RESERVE", "0.3"))
+# 토큰을 기다리는 최대 시간(초): 넘으면 L2 로 degrade / 갱신 보류
+NAVER_INTERACTIVE_WAIT = float(os.getenv("NAVER_INTERACTIVE_WAIT", "2"))
+NAVER_BACKGROUND_WAIT = float(os.getenv("NAVER_BACKGROUND_WAIT", "30"))
+
+# '좋아요' 증감분을 Redis 에서 MySQL 로 반영하는 주기(초)
+FAVORITE_FLUSH_INTERVAL = float(os.getenv("FAVORITE_FLUSH_INTERVAL", "30"))
+
+# 앱 종료 시 남은 백그라운드 작업(L2 저장 등)을 기다리는 최대 시간(초)
+SHUTDOWN_DRAIN_TIMEOUT = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", "10"))
+
+# 인기 회사 refresh-ahead: 조회 빈도(반감기 감쇠) 상위 K 개 회사의 details 캐시를 만료 전에 미리 갱신
+POPULARITY_HALF_LIFE = float(os.getenv("POPULARITY_HALF_LIFE", "3600"))
+REFRESH_AHEAD_INTERVAL = float(os.getenv("REFRESH_AHEAD_INTERVAL", "60"))
+REFRESH_AHEAD_TOP_K = int(os.getenv("REFRESH_AHEAD_TOP_K", "50"))
+# soft TTL 만료까지 이 시간(초) 이내로 남은 섹션을 갱신 (주기보다 길어야 놓치지 않음)
+REFRESH_AHEAD_LEAD = float(os.getenv("REFRESH_AHEAD_LEAD", "180"))
+REFRESH_AHEAD_CONCURRENCY = int(os.getenv("REFRESH_AHEAD_CONCURRENCY", "4"))
+# 한 주기에 갱신하는 최대 섹션 수 (업스트림 호출 예산)
+REFRESH_AHEAD_BUDGET = int(os.getenv("REFRESH_AHEAD_BUDGET", "30"))
+
+# 업스트림(DART/Naver/Groq) 회로 차단기: 최근 BREAKER_WINDOW 번 중 실패율이 넘으면 OPEN_SECONDS 동안 호출하지 않고
+# L2 로 바로 degrade, 그 뒤 HALF_OPEN_PROBES 개의 시험 호출이 성공하면 다시 닫힘 (워커별)
+BREAKER_WINDOW = int(os.getenv("BREAKER_WINDOW", "20"))
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "5"))
+BREAKER_FAILURE_RATE = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+BREAKER_HALF_OPEN_PROBES = int(os.getenv("BREAKER_HALF_OPEN_PROBES", "1"))
+# 재시도(지터 지수 백오프) / 시도 1회 타임아웃(초) / hedging 지연(초, 0 이면 끔, 멱등 GET 만)
+UPSTREAM_RETRY_BASE_DELAY = float(os.getenv("UPSTREAM_RETRY_BASE_DELAY", "0.2"))
+UPSTREAM_RETRY_MAX_DELAY = float(os.getenv("UPSTREAM_RETRY_MAX_DELAY", "2"))
+DART_RETRY_ATTEMPTS = int(os.getenv("DART_RETRY_ATTEMPTS", "3"))
+DART_ATTEMPT_TIMEOUT = float(os.getenv("DART_ATTEMPT_TIMEOUT", "5"))
+DART_HEDGE_DELAY = float(os.getenv("DART_HEDGE_DELAY", "0"))
+NAVER_RETRY_ATTEMPTS = int(os.getenv("NAVER_RETRY_ATTEMPTS", "2"))
+NAVER_ATTEMPT_TIMEOUT = float(os.getenv("NAVER_ATTEMPT_TIMEOUT", "3"))
+NAVER_HEDGE_DELAY = float(os.getenv("NAVER_HEDGE_DELAY", "0"))
+
+# details 요청 전체 시간 예산(ms). X-Deadline-Ms 헤더로 요청마다 바꿀 수 있음 (MIN~MAX 로 제한)
+DETAILS_DEADLINE_MS = int(os.getenv("DETAILS_DEADLINE_MS", "4000"))
+DETAILS_DEADLINE_MIN_MS = int(os.getenv("DETAILS_DEADLINE_MIN_MS", "300"))
+DETAILS_DEADLINE_MAX_MS = int(os.getenv("DETAILS_DEADLINE_MAX_MS", "20000"))
+# 재무/뉴스 단계가 쓸 수 있는 예산 비율 (나머지는 AI 요약), 기한을 넘긴 섹션을 L2 로 채울 때 추가로 주는 시간(초)
+DETAILS_FETCH_SHARE = float(os.getenv("DETAILS_FETCH_SHARE", "0.6"))
+DETAILS_FALLBACK_GRACE = float(os.getenv("DETAILS_FALLBACK_GRACE", "0.2"))
+
+# details 캐시 키(전체 응답 / 개황 / 뉴스 / 요약 / 재무) 프리페치: 1 = 한 번의 왕복(MGET)으로 L0 에 채움, 0 = 끔
+DETAILS_PREFETCH = os.getenv("DETAILS_PREFETCH", "1") == "1"
+
+# details 전체 응답(직렬화된 본문) 캐시 보관 시간(초, 0 이면 끔). 모든 섹션이 fresh 인 응답만 저장
+DETAILS_RESPONSE_TTL = int(os.getenv("DETAILS_RESPONSE_TTL", "60"))
+
+# Redis 캐시 값 코덱 (core/codec.py)
+# 쓰기 형식: 1 = 바이너리 프레임, 0 = 도입 이전 JSON 텍스트 (읽기는 항상 두 형식 모두 -> 단계적 배포 / 되돌리기)
+# 기본은 0: 모든 워커가 두 형식을 읽을 수 있게 배포된 뒤에 1 로 올림 (이전 워커는 바이너리 값을 읽지 못함)
+CACHE_CODEC_WRITE_VERSION = int(os.getenv("CACHE_CODEC_WRITE_VERSION", "0"))
+CACHE_CODEC_SERIALIZER = os.getenv("CACHE_CODEC_SERIALIZER", "orjson")      # json | orjson | msgpack (msgpack 설치 필요)
+CACHE_CODEC_COMPRESSION = os.getenv("CACHE_CODEC_COMPRESSION", "zstd")      # none | zstd | lz4 (lz4 설치 필요)
+CACHE_CODEC_COMPRESS_MIN_BYTES = int(os.getenv("CACHE_CODEC_COMPRESS_MIN_BYTES", "1024"))
+CACHE_CODEC_ZSTD_LEVEL = int(os.getenv("CACHE_CODEC_ZSTD_LEVEL", "3"))
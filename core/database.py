@@ -1,19 +1,51 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 # 1. config.py에서 설정 값을 가져옴
-from core.config import DATABASE_URL 
+from core.config import DATABASE_URL, ASYNC_DATABASE_URL
+
+# 동기 드라이버 -> 비동기 드라이버 매핑
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    """동기 DB URL을 같은 DB를 가리키는 비동기 드라이버 URL로 변환합니다."""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
 
 # 2. engine 생성 시 설정 값 사용
 engine = create_engine(DATABASE_URL, echo=True, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-# 3. get_db 함수는 그대로 유지
+# 3. (비동기) details 파이프라인용 AsyncEngine / AsyncSession
+#    - 스레드 풀(asyncio.to_thread)을 거치지 않고 이벤트 루프에서 바로 쿼리
+#    - expire_on_commit=False: commit 후에도 ORM 속성 접근 시 추가 I/O가 없도록
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL or to_async_url(DATABASE_URL), echo=True, pool_pre_ping=True
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# 4. get_db 함수는 그대로 유지 (동기 def 라우터용)
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
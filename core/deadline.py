@@ -0,0 +1,55 @@
+# /core/deadline.py
+
+import time
+from typing import Dict
+
+from core.config import DETAILS_DEADLINE_MS, DETAILS_DEADLINE_MIN_MS, DETAILS_DEADLINE_MAX_MS
+
+
+class Deadline:
+    """
+    요청 1건의 전체 시간 예산. 단계마다 예산의 몫(share)까지 남은 시간을 받아 씁니다.
+    예) share 0.6 → 요청 시작 후 예산의 60% 시점까지
+    """
+
+    def __init__(self, budget_ms: int):
+        self.budget = budget_ms / 1000
+        self.started = time.monotonic()
+
+    @classmethod
+    def from_header(cls, header_ms: int | None) -> "Deadline":
+        """X-Deadline-Ms 헤더 값(없으면 기본값)을 허용 범위로 제한해 만듭니다."""
+        budget_ms = DETAILS_DEADLINE_MS if header_ms is None else header_ms
+        return cls(min(DETAILS_DEADLINE_MAX_MS, max(DETAILS_DEADLINE_MIN_MS, budget_ms)))
+
+    def until(self, share: float) -> float:
+        """예산의 share 시점까지 남은 시간(초, 0 이상)"""
+        return max(0.0, self.started + self.budget * share - time.monotonic())
+
+    def remaining(self) -> float:
+        return self.until(1.0)
+
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self.started) * 1000
+
+
+class DeadlineStats:
+    """단계별 기한 초과 / 대체(degraded: L2) / 미완(pending) 횟수 (워커별)"""
+
+    def __init__(self, stages):
+        self.requests = 0
+        self.partial_responses = 0
+        self.counters: Dict[str, Dict[str, int]] = {
+            stage: {"overruns": 0, "degraded": 0, "pending": 0} for stage in stages
+        }
+
+    def count(self, stage: str, kind: str):
+        self.counters[stage][kind] += 1
+
+    def stats(self) -> dict:
+        return {
+            "default_deadline_ms": DETAILS_DEADLINE_MS,
+            "requests": self.requests,
+            "partial_responses": self.partial_responses,
+            "stages": self.counters,
+        }
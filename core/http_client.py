@@ -0,0 +1,139 @@
+# /core/http_client.py
+
+import httpx
+from dataclasses import dataclass
+from typing import Dict
+from fastapi.logger import logger
+
+from core.config import GROQ_URL
+
+
+@dataclass(frozen=True)
+class UpstreamConfig:
+    """업스트림(외부 API)별 커넥션 풀 설정"""
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry: float
+    connect_timeout: float
+    read_timeout: float
+    pool_timeout: float
+    http2: bool = False
+
+
+# 업스트림별 풀 설정
+# - dart: opendart.fss.or.kr 는 HTTP/1.1 만 지원
+# - naver: 카테고리 5개 병렬 조회가 기본이므로 커넥션을 넉넉히 유지
+# - groq: LLM 응답이 느리므로 read 타임아웃을 길게
+UPSTREAMS: Dict[str, UpstreamConfig] = {
+    "dart": UpstreamConfig(
+        max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0,
+        connect_timeout=3.0, read_timeout=10.0, pool_timeout=5.0, http2=False,
+    ),
+    "naver": UpstreamConfig(
+        max_connections=50, max_keepalive_connections=20, keepalive_expiry=30.0,
+        connect_timeout=3.0, read_timeout=5.0, pool_timeout=5.0, http2=True,
+    ),
+    "groq": UpstreamConfig(
+        max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0,
+        connect_timeout=3.0, read_timeout=30.0, pool_timeout=10.0,
+        http2=bool(GROQ_URL and GROQ_URL.startswith("https://")),
+    ),
+}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HttpClientRegistry:
+    """
+    업스트림별로 keep-alive 커넥션 풀(httpx.AsyncClient)을 하나씩 유지합니다.
+    FastAPI lifespan 에서 startup/shutdown 되며, 요청마다 새 클라이언트를 만들지 않습니다.
+    """
+
+    def __init__(self, upstreams: Dict[str, UpstreamConfig]):
+        self.upstreams = upstreams
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def _build(self, name: str) -> httpx.AsyncClient:
+        cfg = self.upstreams[name]
+        http2 = cfg.http2 and _http2_available()
+        if cfg.http2 and not http2:
+            logger.warning(f"[HTTP] h2 패키지가 없어 {name} 업스트림은 HTTP/1.1 로 동작합니다.")
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=cfg.max_connections,
+                max_keepalive_connections=cfg.max_keepalive_connections,
+                keepalive_expiry=cfg.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                connect=cfg.connect_timeout,
+                read=cfg.read_timeout,
+                write=cfg.read_timeout,
+                pool=cfg.pool_timeout,
+            ),
+        )
+
+    async def startup(self):
+        for name in self.upstreams:
+            if name not in self._clients:
+                self._clients[name] = self._build(name)
+
+    async def shutdown(self):
+        clients, self._clients = self._clients, {}
+        for name, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"[HTTP] {name} 클라이언트 종료 실패: {e}")
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """
+        업스트림 클라이언트를 반환합니다.
+        (lifespan 밖에서 실행되는 스크립트를 위해 없으면 지연 생성)
+        """
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = self._build(name)
+        return client
+
+    def stats(self) -> Dict[str, Dict[str, int] | str]:
+        """
+        업스트림별 커넥션 풀 상태 (open / idle / active / waiting)
+        httpx 는 풀 상태를 공개하지 않아 httpcore 내부 필드를 읽습니다. (requirements.txt 에서 httpcore 버전 고정)
+        버전이 바뀌어 읽을 수 없으면 0 대신 "unavailable" 로 표시합니다.
+        """
+        result: Dict[str, Dict[str, int] | str] = {}
+        for name, cfg in self.upstreams.items():
+            try:
+                result[name] = self._pool_stats(self._clients.get(name), cfg)
+            except Exception as e:
+                logger.warning(f"[HTTP] {name} 커넥션 풀 상태를 읽을 수 없습니다: {e!r}")
+                result[name] = "unavailable"
+        return result
+
+    @staticmethod
+    def _pool_stats(client: httpx.AsyncClient | None, cfg: UpstreamConfig) -> Dict[str, int]:
+        entry = {
+            "open": 0,
+            "idle": 0,
+            "active": 0,
+            "waiting": 0,
+            "max_connections": cfg.max_connections,
+        }
+        if client is None:
+            return entry  # 아직 만들지 않음
+        pool = client._transport._pool
+        connections = list(pool.connections)
+        entry["open"] = sum(1 for c in connections if not c.is_closed())
+        entry["idle"] = sum(1 for c in connections if c.is_idle())
+        entry["active"] = entry["open"] - entry["idle"]
+        entry["waiting"] = sum(1 for r in pool._requests if r.connection is None)
+        return entry
+
+http_clients = HttpClientRegistry(UPSTREAMS)
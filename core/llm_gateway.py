@@ -0,0 +1,374 @@
+# /core/llm_gateway.py
+
+"""
+LLM(OpenAI 호환 Chat Completions, Groq) 호출 게이트웨이.
+
+- 워커별 동시 호출 상한 + 대기열 (max_concurrency, queue_timeout: 슬롯 + 예산 대기를 합친 최대 시간)
+- 모델별 RPM / TPM 예산: 워커 공유 Redis 토큰 버킷 (core.rate_limit), 두 버킷을 함께 차감(전부 또는 전무)
+  background(갱신/배치) 호출은 background_reserve 비율을 interactive 몫으로 남겨둠
+  TPM 은 호출 전에 프롬프트 토큰을 추정(estimate_tokens)하고 응답 예약분을 더해 차감
+- 모델별 최근 지연(p50/p95/p99)과 오류율 추적
+- 기본 모델의 p95 지연이나 오류율이 임계치를 넘으면 cooldown 동안 대체 모델을 먼저 사용하고,
+  호출 실패(429/5xx/타임아웃)나 예산 부족도 다음 모델로 넘깁니다.
+- 응답에는 실제로 응답한 모델을 함께 돌려줍니다. (대체 모델 결과를 호출자가 구분할 수 있도록)
+"""
+
+import asyncio
+import json
+import math
+import time
+import httpx
+import redis.asyncio as redis
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Tuple
+from fastapi import HTTPException
+from fastapi.logger import logger
+
+from core.http_client import http_clients
+from core.rate_limit import TokenBucketScheduler, RateLimitExceeded, INTERACTIVE, acquire_all
+from core.resilience import CircuitBreaker
+
+HEALTH_WINDOW = 50        # 지연/오류율을 계산할 최근 호출 수
+HEALTH_MIN_SAMPLES = 5    # 이보다 적으면 전환 판단을 하지 않음
+UNLIMITED = 10 ** 12      # 일일 한도 0(제한 없음) 대신 쓰는 값
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class LLMUnavailable(Exception):
+    """모든 모델이 실패했거나 대기 시간 안에 예산을 얻지 못함 (호출자는 L2 등으로 degrade)"""
+
+
+def estimate_tokens(messages: List[dict]) -> int:
+    """
+    호출 전 프롬프트 토큰 추정 (토크나이저 없이 보수적으로)
+    - ASCII 는 4글자당 1토큰, 한글 등 그 외 문자는 1글자당 1토큰
+    """
+    total = 3
+    for message in messages:
+        content = message.get("content") or ""
+        ascii_chars = sum(1 for ch in content if ord(ch) < 128)
+        total += MESSAGE_OVERHEAD_TOKENS + math.ceil(ascii_chars / 4) + (len(content) - ascii_chars)
+    return total
+
+
+def _is_retryable(error: Exception) -> bool:
+    """다른 모델로 넘겨볼 만한 오류 (요청 자체가 잘못된 4xx 는 제외)"""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, (httpx.TransportError, json.JSONDecodeError, KeyError))
+
+
+class ModelHealth:
+    """모델별 최근 지연/오류 창과 누적 카운터"""
+
+    def __init__(self):
+        self.latencies: Deque[float] = deque(maxlen=HEALTH_WINDOW)  # 성공 호출 지연(ms)
+        self.outcomes: Deque[bool] = deque(maxlen=HEALTH_WINDOW)
+        self.tripped_until = 0.0
+        self.counters: Dict[str, int] = {
+            "calls": 0, "errors": 0, "rate_limited": 0, "trips": 0,
+            "estimated_tokens": 0, "used_tokens": 0,
+        }
+
+    def percentile(self, p: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 1)
+
+    def error_rate(self) -> float | None:
+        if not self.outcomes:
+            return None
+        return round(1 - sum(self.outcomes) / len(self.outcomes), 3)
+
+    def tripped(self, now: float) -> bool:
+        return self.tripped_until > now
+
+    def record(self, ok: bool, latency_ms: float, p95_threshold_ms: float, error_threshold: float, cooldown: float):
+        self.counters["calls"] += 1
+        self.outcomes.append(ok)
+        if ok:
+            self.latencies.append(latency_ms)
+        else:
+            self.counters["errors"] += 1
+
+        if len(self.outcomes) < HEALTH_MIN_SAMPLES:
+            return
+        p95 = self.percentile(0.95)
+        if (p95 is not None and p95 > p95_threshold_ms) or self.error_rate() > error_threshold:
+            # cooldown 뒤에는 새 표본으로 다시 판단
+            self.tripped_until = time.time() + cooldown
+            self.counters["trips"] += 1
+            self.latencies.clear()
+            self.outcomes.clear()
+
+    def stats(self, now: float) -> dict:
+        return {
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "error_rate": self.error_rate(),
+            "samples": len(self.outcomes),
+            "tripped": self.tripped(now),
+            "tripped_for": round(max(0.0, self.tripped_until - now), 1),
+            **self.counters,
+        }
+
+
+class LLMGateway:
+    def __init__(
+        self,
+        name: str,
+        url: str | None,
+        api_key: str | None,
+        models: List[str],
+        rpm: int,
+        tpm: int,
+        rpd: int,
+        tpd: int,
+        completion_reserve: int,
+        background_reserve: float,
+        max_concurrency: int,
+        queue_timeout: float,
+        timeout: float,
+        failover_p95_ms: float,
+        failover_error_rate: float,
+        failover_cooldown: float,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.name = name
+        self.url = url
+        self.api_key = api_key
+        self.models = list(dict.fromkeys(models))  # 순서 유지 중복 제거
+        self.completion_reserve = completion_reserve
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.timeout = timeout
+        self.failover_p95_ms = failover_p95_ms
+        self.failover_error_rate = failover_error_rate
+        self.failover_cooldown = failover_cooldown
+        self.breaker = breaker  # 업스트림 전체 회로 차단기 (열려 있으면 대기열에도 들어가지 않음)
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queued = 0
+        self._active = 0
+        self._counters: Dict[str, int] = {"requests": 0, "failovers": 0, "queue_timeouts": 0, "unavailable": 0}
+        self.health: Dict[str, ModelHealth] = {model: ModelHealth() for model in self.models}
+        # (RPM, TPM) 버킷: Groq 한도는 모델별
+        self._budgets = {
+            model: (
+                TokenBucketScheduler(f"llm:{model}:rpm", rate=rpm / 60, burst=rpm,
+                                     daily_limit=rpd or UNLIMITED, reserve=background_reserve),
+                TokenBucketScheduler(f"llm:{model}:tpm", rate=tpm / 60, burst=tpm,
+                                     daily_limit=tpd or UNLIMITED, reserve=background_reserve),
+            )
+            for model in self.models
+        }
+
+    # --- 모델 선택 / 예산 ---
+
+    def _candidates(self) -> List[str]:
+        """건강한 모델(설정 순서) 먼저, 전환 중인 모델은 마지막 수단으로"""
+        now = time.time()
+        healthy = [m for m in self.models if not self.health[m].tripped(now)]
+        return healthy + [m for m in self.models if m not in healthy]
+
+    async def _admit(self, redis_client: redis.Redis, model: str, tokens: int, priority: str, timeout: float):
+        rpm, tpm = self._budgets[model]
+        # RPM / TPM 을 한 스크립트로: 한쪽이 모자라면 다른 쪽도 차감하지 않고, 대기도 timeout 한 번
+        await acquire_all(redis_client, [(rpm, 1), (tpm, tokens)], priority=priority, timeout=timeout)
+
+    async def _next_model(
+        self, redis_client: redis.Redis, candidates: List[str], tokens: int, priority: str
+    ) -> str | None:
+        """남은 후보 중 지금 예산을 얻은 첫 모델을 꺼냅니다. (없으면 None)"""
+        while candidates:
+            model = candidates.pop(0)
+            try:
+                await self._admit(redis_client, model, tokens, priority, timeout=0)
+            except RateLimitExceeded:
+                self.health[model].counters["rate_limited"] += 1
+                continue
+            return model
+        return None
+
+    async def _first_model(
+        self, redis_client: redis.Redis, candidates: List[str], tokens: int, priority: str, deadline: float
+    ) -> str:
+        """
+        첫 호출 모델: 예산이 있는 후보 중 첫 번째.
+        어느 모델도 당장 예산이 없으면 첫 후보의 예산을 대기열 기한(deadline)까지 기다립니다.
+        """
+        first = candidates[0]
+        model = await self._next_model(redis_client, candidates, tokens, priority)
+        if model is not None:
+            return model
+        try:
+            remaining = max(0.0, deadline - asyncio.get_running_loop().time())
+            await self._admit(redis_client, first, tokens, priority, timeout=remaining)
+        except RateLimitExceeded as e:
+            raise LLMUnavailable(f"{self.name} 예산 대기 초과: {e}") from e
+        return first
+
+    def _attempt(self, model: str, tokens: int):
+        if model != self.models[0]:
+            self._counters["failovers"] += 1
+        self.health[model].counters["estimated_tokens"] += tokens
+
+    def _record(self, model: str, ok: bool, started: float, upstream_ok: bool, probe: bool):
+        """모델 건강 상태 + 업스트림 회로 차단기 (요청 자체 오류(4xx)는 업스트림 실패로 보지 않음)"""
+        self.health[model].record(
+            ok, (time.monotonic() - started) * 1000,
+            self.failover_p95_ms, self.failover_error_rate, self.failover_cooldown,
+        )
+        if self.breaker:
+            self.breaker.after_call(upstream_ok, probe)
+
+    def _check_breaker(self):
+        if self.breaker:
+            self.breaker.check()
+
+    def _before_call(self) -> bool:
+        return self.breaker.before_call() if self.breaker else False
+
+    def _cancel_call(self, probe: bool):
+        if self.breaker:
+            self.breaker.cancel_call(probe)
+
+    async def _slot(self) -> float:
+        """동시 호출 슬롯을 queue_timeout 까지 기다리고, 예산 대기에 남은 기한(loop 시각)을 반환합니다."""
+        deadline = asyncio.get_running_loop().time() + self.queue_timeout
+        self._queued += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._counters["queue_timeouts"] += 1
+            raise LLMUnavailable(f"{self.name} 대기열 시간 초과")
+        finally:
+            self._queued -= 1
+        self._active += 1
+        return deadline
+
+    def _release(self):
+        self._active -= 1
+        self._semaphore.release()
+
+    # --- 호출 ---
+
+    def _headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+
+    async def complete(
+        self, redis_client: redis.Redis, messages: List[dict], priority: str = INTERACTIVE
+    ) -> Tuple[str, str]:
+        """(응답 전체 텍스트, 응답한 모델)을 반환합니다."""
+        self._check_breaker()
+        self._counters["requests"] += 1
+        tokens = estimate_tokens(messages) + self.completion_reserve
+        client = http_clients.get("groq")
+        deadline = await self._slot()
+        try:
+            last_error: Exception | None = None
+            candidates = self._candidates()
+            model = await self._first_model(redis_client, candidates, tokens, priority, deadline)
+            while model is not None:
+                self._attempt(model, tokens)
+                probe = self._before_call()
+                started = time.monotonic()
+                try:
+                    resp = await client.post(
+                        self.url, headers=self._headers(),
+                        json={"model": model, "messages": messages}, timeout=self.timeout,
+                    )
+                    resp.raise_for_status()
+                    data = resp.json()
+                    text = data["choices"][0]["message"]["content"]
+                except asyncio.CancelledError:
+                    self._cancel_call(probe)
+                    raise
+                except Exception as e:
+                    self._record(model, False, started, not _is_retryable(e), probe)
+                    if not _is_retryable(e):
+                        raise HTTPException(status_code=502, detail=f"LLM API error({model}): {e}")
+                    logger.warning(f"[LLM] {model} 호출 실패, 다음 모델 시도: {e!r}")
+                    last_error = e
+                    model = await self._next_model(redis_client, candidates, tokens, priority)
+                    continue
+                self._record(model, True, started, True, probe)
+                self.health[model].counters["used_tokens"] += (data.get("usage") or {}).get("total_tokens", 0)
+                return text, model
+            raise LLMUnavailable(f"{self.name} 모든 모델 호출 실패: {last_error!r}")
+        except LLMUnavailable:
+            self._counters["unavailable"] += 1
+            raise
+        finally:
+            self._release()
+
+    async def stream(
+        self, redis_client: redis.Redis, messages: List[dict], priority: str = INTERACTIVE
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """
+        complete 의 스트리밍 버전: SSE 응답의 토큰 조각을 도착하는 대로 (응답한 모델, 조각) 으로 냅니다.
+        첫 조각을 받기 전의 실패만 다음 모델로 넘기고, 그 뒤의 실패는 그대로 전파합니다.
+        """
+        self._check_breaker()
+        self._counters["requests"] += 1
+        tokens = estimate_tokens(messages) + self.completion_reserve
+        client = http_clients.get("groq")
+        deadline = await self._slot()
+        try:
+            last_error: Exception | None = None
+            candidates = self._candidates()
+            model = await self._first_model(redis_client, candidates, tokens, priority, deadline)
+            while model is not None:
+                self._attempt(model, tokens)
+                probe = self._before_call()
+                started = time.monotonic()
+                yielded = False
+                try:
+                    async with client.stream(
+                        "POST", self.url, headers=self._headers(),
+                        json={"model": model, "messages": messages, "stream": True}, timeout=self.timeout,
+                    ) as resp:
+                        resp.raise_for_status()
+                        async for line in resp.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[len("data:"):].strip()
+                            if data == "[DONE]":
+                                break
+                            choices = json.loads(data).get("choices") or [{}]
+                            content = (choices[0].get("delta") or {}).get("content")
+                            if content:
+                                yielded = True
+                                yield model, content
+                except (asyncio.CancelledError, GeneratorExit):
+                    self._cancel_call(probe)  # 클라이언트 연결 종료
+                    raise
+                except Exception as e:
+                    self._record(model, False, started, not _is_retryable(e), probe)
+                    if yielded or not _is_retryable(e):
+                        raise
+                    logger.warning(f"[LLM] {model} 스트리밍 실패, 다음 모델 시도: {e!r}")
+                    last_error = e
+                    model = await self._next_model(redis_client, candidates, tokens, priority)
+                    continue
+                self._record(model, True, started, True, probe)
+                return
+            raise LLMUnavailable(f"{self.name} 모든 모델 호출 실패: {last_error!r}")
+        except LLMUnavailable:
+            self._counters["unavailable"] += 1
+            raise
+        finally:
+            self._release()
+
+    def stats(self) -> dict:
+        now = time.time()
+        return {
+            "models": self.models,
+            "active": self._active,
+            "queued": self._queued,
+            **self._counters,
+            "per_model": {model: health.stats(now) for model, health in self.health.items()},
+        }
@@ -0,0 +1,106 @@
+# /core/local_cache.py
+
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Tuple
+
+
+def namespace_of(key: str) -> str:
+    """'details:info:삼성전자' -> 'details:info'"""
+    return key.rsplit(":", 1)[0] if ":" in key else key
+
+
+GENERATIONS_PER_ENTRY = 4  # 기억하는 세대 수 = max_entries x 이 값
+
+
+class LocalCache:
+    """
+    (L0) 워커 프로세스 내부의 TTL + LRU 캐시.
+    Redis 에서 가져와 디코딩까지 끝난 객체를 보관합니다.
+    (반환된 객체는 여러 요청이 공유하므로 읽기 전용으로 취급해야 합니다.)
+
+    키별 세대(generation): 무효화 / 직접 저장마다 올라갑니다. Redis 에서 읽어 채우는 쪽은 읽기 전에
+    세대를 받아 set(generation=...) 으로 넘기고, 그 사이 세대가 바뀌었으면(무효화가 먼저 도착) 채우지 않습니다.
+    """
+
+    def __init__(self, max_entries: int, default_ttl: float):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # 최근에 무효화 / 저장된 키의 세대 (없으면 0). 키 수 제한을 넘으면 오래된 것부터 잊음
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._max_generations = max_entries * GENERATIONS_PER_ENTRY
+        self._clock = 0
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "stale_fills": 0}
+        )
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        stats = self._stats[namespace_of(key)]
+        entry = self._data.get(key)
+        if entry is None:
+            stats["misses"] += 1
+            return False, None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            stats["evictions"] += 1
+            stats["misses"] += 1
+            return False, None
+
+        self._data.move_to_end(key)
+        stats["hits"] += 1
+        return True, value
+
+    def contains(self, key: str) -> bool:
+        """만료되지 않은 값이 있는지 (통계 / LRU 순서에 반영하지 않음)"""
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def generation(self, key: str) -> int:
+        return self._generations.get(key, 0)
+
+    def _bump(self, key: str):
+        self._clock += 1
+        self._generations[key] = self._clock
+        self._generations.move_to_end(key)
+        while len(self._generations) > self._max_generations:
+            # 잊힌 키는 세대 0 -> 그 전에 받은 세대(> 0)로 채우려는 읽기는 건너뜀
+            self._generations.popitem(last=False)
+
+    def set(self, key: str, value: Any, ttl: float | None = None, generation: int | None = None):
+        """
+        generation 없이 부르면 직접 저장(진행 중인 읽기보다 새 값)으로 보고 세대를 올립니다.
+        generation 을 주면 읽기 전에 받은 세대와 같을 때만 채웁니다.
+        """
+        if generation is None:
+            self._bump(key)
+        elif generation != self.generation(key):
+            self._stats[namespace_of(key)]["stale_fills"] += 1
+            return
+        ttl = self.default_ttl if ttl is None else min(ttl, self.default_ttl)
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_entries:
+            old_key, _ = self._data.popitem(last=False)
+            self._stats[namespace_of(old_key)]["evictions"] += 1
+
+    def invalidate(self, key: str):
+        self._bump(key)
+        if self._data.pop(key, None) is not None:
+            self._stats[namespace_of(key)]["invalidations"] += 1
+
+    def clear(self):
+        self._data.clear()
+        self._generations.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "namespaces": {ns: dict(counters) for ns, counters in self._stats.items()},
+        }
@@ -0,0 +1,141 @@
+# /core/lock.py
+
+import asyncio
+import uuid
+import redis.asyncio as redis
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Set
+from fastapi.logger import logger
+
+from core.cache import pubsub
+
+LOCK_RELEASED_CHANNEL = "lock:released"
+SAFETY_POLL_INTERVAL = 1.0     # Pub/Sub 메시지 유실 대비 재조회 간격(초)
+FALLBACK_POLL_INTERVAL = 0.3   # Pub/Sub 구독이 없을 때(스크립트 등) 폴링 간격(초)
+
+# 토큰이 일치할 때만 해제하고, 대기자에게 해제 알림을 발행
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    redis.call('del', KEYS[1])
+    redis.call('publish', ARGV[2], KEYS[1])
+    return 1
+end
+return 0
+"""
+
+# 토큰이 일치할 때만 리스 연장
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# 락 키 -> 이 워커에서 해제를 기다리는 이벤트들
+_waiters: Dict[str, Set[asyncio.Event]] = defaultdict(set)
+
+
+def _on_released(lock_key: str):
+    for event in _waiters.get(lock_key, ()):
+        event.set()
+
+pubsub.subscribe(LOCK_RELEASED_CHANNEL, _on_released)
+
+
+class RedisLock:
+    """
+    토큰 펜싱(fencing) 기반 분산 락.
+    - 획득 시 발급한 토큰을 가진 쪽만 해제/연장할 수 있습니다.
+    - 잡고 있는 동안 ttl/3 주기로 리스를 연장합니다. (느린 Groq 호출 대비)
+    - 해제 시 LOCK_RELEASED_CHANNEL 로 알림을 보내 대기자를 즉시 깨웁니다.
+    """
+
+    def __init__(self, redis_client: redis.Redis, key: str, ttl: float, renew: bool = True):
+        self.redis = redis_client
+        self.key = key
+        self.ttl = ttl
+        self.renew = renew
+        self.token = uuid.uuid4().hex
+        self.acquired = False
+        self._renew_task: asyncio.Task | None = None
+
+    async def acquire(self) -> bool:
+        self.acquired = bool(
+            await self.redis.set(self.key, self.token, px=int(self.ttl * 1000), nx=True)
+        )
+        if self.acquired and self.renew:
+            self._renew_task = asyncio.create_task(self._renew_loop())
+        return self.acquired
+
+    async def _renew_loop(self):
+        interval = self.ttl / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                renewed = await self.redis.eval(
+                    _RENEW_SCRIPT, 1, self.key, self.token, int(self.ttl * 1000)
+                )
+            except Exception as e:
+                logger.error(f"[LOCK] {self.key} 리스 연장 실패: {e}")
+                continue
+            if not renewed:
+                logger.warning(f"[LOCK] {self.key} 락을 잃었습니다. (만료 또는 다른 소유자)")
+                return
+
+    async def release(self) -> bool:
+        """내가 잡은 락일 때만 해제합니다."""
+        if self._renew_task is not None:
+            self._renew_task.cancel()
+            self._renew_task = None
+        if not self.acquired:
+            return False
+        self.acquired = False
+        try:
+            return bool(await self.redis.eval(
+                _RELEASE_SCRIPT, 1, self.key, self.token, LOCK_RELEASED_CHANNEL
+            ))
+        except Exception as e:
+            logger.error(f"[LOCK] {self.key} 해제 실패: {e}")
+            return False
+
+
+async def wait_for_release(
+    redis_client: redis.Redis,
+    lock_key: str,
+    check: Callable[[], Awaitable[Any]],
+    timeout: float,
+) -> Any | None:
+    """
+    다른 워커/요청이 잡은 락이 풀리기를 기다리며 check() 결과를 반환합니다.
+    - check() 가 값을 반환하면 즉시 반환
+    - 락이 해제됐으면(알림 수신 또는 EXISTS 로 확인) check() 를 한 번 더 보고 반환
+      (값이 없으면(생성 실패) None 을 반환해 호출자가 L2 fallback 하도록)
+    - timeout 까지 아무 일도 없으면 None
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    poll_interval = SAFETY_POLL_INTERVAL if pubsub.running else FALLBACK_POLL_INTERVAL
+
+    # check 이전에 등록해야 그 사이의 해제 알림을 놓치지 않음
+    event = asyncio.Event()
+    _waiters[lock_key].add(event)
+    try:
+        while True:
+            value = await check()
+            if value is not None:
+                return value
+            # 등록 이전에 이미 풀린 락은 알림이 오지 않으므로, 기다리기 전에 키가 남아 있는지 확인
+            if event.is_set() or not await redis_client.exists(lock_key):
+                return await check()
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(event.wait(), timeout=min(remaining, poll_interval))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        _waiters[lock_key].discard(event)
+        if not _waiters[lock_key]:
+            _waiters.pop(lock_key, None)
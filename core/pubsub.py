@@ -0,0 +1,72 @@
+# /core/pubsub.py
+
+import asyncio
+import redis.asyncio as redis
+from typing import Callable, Dict
+from fastapi.logger import logger
+
+RECONNECT_DELAY = 1.0
+
+
+class PubSubDispatcher:
+    """
+    워커당 Redis Pub/Sub 연결 1개로 여러 채널을 구독하고,
+    수신한 메시지를 채널별 핸들러(동기 함수)로 전달합니다.
+    lifespan 에서 start/stop 됩니다.
+    """
+
+    def __init__(self, connection_pool: redis.ConnectionPool):
+        self.connection_pool = connection_pool
+        self._handlers: Dict[str, Callable[[str], None]] = {}
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, channel: str, handler: Callable[[str], None]):
+        """핸들러 등록 (start 이전에 등록해야 합니다)"""
+        self._handlers[channel] = handler
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        if not self.running and self._handlers:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                async with redis.Redis(connection_pool=self.connection_pool) as client:
+                    async with client.pubsub(ignore_subscribe_messages=True) as pubsub:
+                        await pubsub.subscribe(*self._handlers)
+                        async for message in pubsub.listen():
+                            self._dispatch(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[PUBSUB] 구독 연결 오류, 재연결합니다: {e}")
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    def _dispatch(self, message: dict):
+        channel = message.get("channel")
+        data = message.get("data")
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        if isinstance(data, bytes):
+            data = data.decode()
+        handler = self._handlers.get(channel)
+        if handler is None:
+            return
+        try:
+            handler(data)
+        except Exception as e:
+            logger.error(f"[PUBSUB] {channel} 핸들러 오류: {e}")
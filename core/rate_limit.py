@@ -0,0 +1,211 @@
+# /core/rate_limit.py
+
+import asyncio
+import redis.asyncio as redis
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+from fastapi.logger import logger
+import pytz
+
+SEOUL_TZ = pytz.timezone("Asia/Seoul")  # 외부 API 일일 한도는 KST 자정에 초기화
+
+INTERACTIVE = "interactive"  # 사용자 요청 (먼저 처리)
+BACKGROUND = "background"    # stale 갱신 / 배치 (예약분을 남겨두고 사용)
+PRIORITIES = (INTERACTIVE, BACKGROUND)
+
+# 워커 전체가 공유하는 토큰 버킷 + 일일 사용량 원장
+# KEYS = 버킷마다 (버킷, 원장), ARGV = 버킷마다 (rate, burst, cost, daily_limit, reserve, ledger_ttl)
+# 모든 버킷을 먼저 확인하고, 전부 허가될 때만 한꺼번에 차감합니다. (하나라도 모자라면 아무것도 쓰지 않음)
+# 반환: 0 = 허가 / 양수 = 다시 시도할 때까지 기다릴 ms / -i = i 번째 버킷의 일일 한도 소진
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local n = #KEYS / 2
+local tokens = {}
+local wait = 0
+
+for i = 1, n do
+    local base = (i - 1) * 6
+    local rate = tonumber(ARGV[base + 1])
+    local burst = tonumber(ARGV[base + 2])
+    local cost = tonumber(ARGV[base + 3])
+    local daily_limit = tonumber(ARGV[base + 4])
+    local reserve = tonumber(ARGV[base + 5])
+
+    local used = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+    if used + cost > daily_limit * (1 - reserve) then
+        return -i
+    end
+
+    local state = redis.call('HMGET', KEYS[2 * i - 1], 'tokens', 'ts')
+    local ts = tonumber(state[2]) or now
+    tokens[i] = math.min(burst, (tonumber(state[1]) or burst) + math.max(0, now - ts) * rate / 1000)
+
+    local floor = burst * reserve
+    if tokens[i] - cost < floor then
+        wait = math.max(wait, math.ceil((cost + floor - tokens[i]) * 1000 / rate))
+    end
+end
+
+for i = 1, n do
+    local base = (i - 1) * 6
+    local rate = tonumber(ARGV[base + 1])
+    local burst = tonumber(ARGV[base + 2])
+    local cost = tonumber(ARGV[base + 3])
+    if wait > 0 then
+        redis.call('HSET', KEYS[2 * i - 1], 'tokens', tostring(tokens[i]), 'ts', now)
+    else
+        redis.call('HSET', KEYS[2 * i - 1], 'tokens', tostring(tokens[i] - cost), 'ts', now)
+        redis.call('PEXPIRE', KEYS[2 * i - 1], math.ceil(burst * 1000 / rate) + 1000)
+        redis.call('INCRBY', KEYS[2 * i], cost)
+        redis.call('EXPIRE', KEYS[2 * i], tonumber(ARGV[base + 6]))
+    end
+end
+return wait
+"""
+
+LEDGER_TTL = 2 * 86400
+MIN_RETRY_INTERVAL = 0.02   # Redis 재시도 최소 간격(초)
+LOCAL_YIELD_INTERVAL = 0.05 # 같은 워커에 interactive 대기자가 있을 때 background 양보 간격(초)
+
+
+class RateLimitExceeded(Exception):
+    """대기 시간 안에 토큰을 얻지 못했거나 일일 한도가 소진됨 (호출자는 L2 등으로 degrade)"""
+
+    def __init__(self, name: str, reason: str):
+        super().__init__(f"{name} 호출 한도 초과: {reason}")
+        self.name = name
+        self.reason = reason  # "quota" | "timeout" | "oversize"
+
+
+class TokenBucketScheduler:
+    """
+    Redis 기반 분산 토큰 버킷 스케줄러 (워커 간 공유).
+    - rate / burst: 초당 허용 호출 수 / 순간 최대 호출 수
+    - daily_limit: 일일 한도 (KST 날짜별 원장 키에 누적)
+    - background 는 버킷과 일일 한도의 reserve 비율을 interactive 몫으로 남겨두고,
+      같은 워커에 interactive 대기자가 있으면 양보합니다.
+    - 토큰이 없으면 timeout 까지 대기(queue)하고, 그래도 없으면 RateLimitExceeded
+    - 버킷이 가득 차도 허가될 수 없는 묶음(cost > 우선순위별 사용 가능 burst)은 기다리지 않고 거절
+    - Redis 장애 시에는 호출을 막지 않습니다. (fail-open)
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, daily_limit: int, reserve: float):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.daily_limit = daily_limit
+        self.reserve = {INTERACTIVE: 0.0, BACKGROUND: reserve}
+        self.bucket_key = f"ratelimit:{name}:bucket"
+        self._waiting: Dict[str, int] = {p: 0 for p in PRIORITIES}
+        self._counters: Dict[str, Dict[str, float]] = {
+            p: {"granted": 0, "queued": 0, "rejected_quota": 0, "rejected_timeout": 0,
+                "rejected_oversize": 0, "wait_seconds": 0.0, "max_depth": 0}
+            for p in PRIORITIES
+        }
+
+    def _ledger_key(self) -> str:
+        return f"ratelimit:{self.name}:quota:{datetime.now(SEOUL_TZ):%Y%m%d}"
+
+    def _args(self, cost: int, priority: str) -> list:
+        return [self.rate, self.burst, cost, self.daily_limit, self.reserve[priority], LEDGER_TTL]
+
+    async def acquire(
+        self, redis_client: redis.Redis, cost: int = 1, priority: str = INTERACTIVE, timeout: float = 0.0
+    ):
+        """cost 개의 토큰을 한 번에 얻을 때까지 최대 timeout 초 대기합니다."""
+        await acquire_all(redis_client, [(self, cost)], priority, timeout)
+
+    async def stats(self, redis_client: redis.Redis) -> dict:
+        """대기열 깊이(이 워커) / 우선순위별 카운터 / 오늘 일일 한도 사용량(전체 워커)"""
+        try:
+            used = int(await redis_client.get(self._ledger_key()) or 0)
+        except Exception:
+            used = None
+        return {
+            "rate_per_sec": self.rate,
+            "burst": self.burst,
+            "daily_limit": self.daily_limit,
+            "daily_used": used,
+            "daily_remaining": None if used is None else max(0, self.daily_limit - used),
+            "queue_depth": dict(self._waiting),
+            "priorities": {
+                p: {**c, "wait_seconds": round(c["wait_seconds"], 3)}
+                for p, c in self._counters.items()
+            },
+        }
+
+
+async def _try_acquire_all(
+    redis_client: redis.Redis, costs: Sequence[Tuple[TokenBucketScheduler, int]], priority: str
+) -> int:
+    keys: List[str] = []
+    args: list = []
+    for scheduler, cost in costs:
+        keys += [scheduler.bucket_key, scheduler._ledger_key()]
+        args += scheduler._args(cost, priority)
+    try:
+        return int(await redis_client.eval(_ACQUIRE_SCRIPT, len(keys), *keys, *args))
+    except Exception as e:
+        names = ",".join(scheduler.name for scheduler, _ in costs)
+        logger.error(f"[RATE] {names} 토큰 확인 실패, 제한 없이 진행: {e}")
+        return 0
+
+
+async def acquire_all(
+    redis_client: redis.Redis,
+    costs: Sequence[Tuple[TokenBucketScheduler, int]],
+    priority: str = INTERACTIVE,
+    timeout: float = 0.0,
+):
+    """
+    여러 버킷(예: LLM 의 RPM + TPM)의 토큰을 전부 얻거나 하나도 쓰지 않습니다. (최대 timeout 초 대기)
+    한 버킷만 모자라도 다른 버킷의 토큰은 차감되지 않으며, 대기는 버킷 수와 무관하게 timeout 한 번입니다.
+    """
+    for scheduler, cost in costs:
+        if cost > scheduler.burst * (1 - scheduler.reserve[priority]):
+            # 줄여서 허가하면 실제 사용량보다 덜 차감되므로, 호출자가 나누거나 다른 경로로 가도록 거절
+            scheduler._counters[priority]["rejected_oversize"] += 1
+            raise RateLimitExceeded(scheduler.name, "oversize")
+
+    schedulers = [scheduler for scheduler, _ in costs]
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline = start + timeout
+    queued = False
+
+    try:
+        while True:
+            # 같은 워커의 interactive 대기자에게 먼저 양보
+            if priority == BACKGROUND and any(scheduler._waiting[INTERACTIVE] for scheduler in schedulers):
+                wait_ms = int(LOCAL_YIELD_INTERVAL * 1000)
+            else:
+                wait_ms = await _try_acquire_all(redis_client, costs, priority)
+                if wait_ms == 0:
+                    for scheduler in schedulers:
+                        scheduler._counters[priority]["granted"] += 1
+                        scheduler._counters[priority]["wait_seconds"] += loop.time() - start
+                    return
+                if wait_ms < 0:
+                    exhausted = schedulers[-wait_ms - 1]
+                    exhausted._counters[priority]["rejected_quota"] += 1
+                    raise RateLimitExceeded(exhausted.name, "quota")
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                for scheduler in schedulers:
+                    scheduler._counters[priority]["rejected_timeout"] += 1
+                raise RateLimitExceeded(",".join(scheduler.name for scheduler in schedulers), "timeout")
+
+            if not queued:
+                queued = True
+                for scheduler in schedulers:
+                    counters = scheduler._counters[priority]
+                    counters["queued"] += 1
+                    scheduler._waiting[priority] += 1
+                    counters["max_depth"] = max(counters["max_depth"], scheduler._waiting[priority])
+            await asyncio.sleep(min(remaining, max(wait_ms / 1000, MIN_RETRY_INTERVAL)))
+    finally:
+        if queued:
+            for scheduler in schedulers:
+                scheduler._waiting[priority] -= 1
@@ -0,0 +1,262 @@
+# /core/resilience.py
+
+"""
+업스트림(DART / Naver / Groq) 호출 보호.
+
+- CircuitBreaker: 최근 호출의 실패율이 임계치를 넘으면 open_seconds 동안 호출 없이 CircuitOpenError
+  (호출자는 L2 fallback 으로 바로 degrade). 그 뒤 half-open 에서 시험 호출 몇 개만 통과시켜
+  성공하면 닫고, 실패하면 다시 엽니다. (워커별 상태)
+- Upstream.call: 시도 1회 타임아웃 + 지터를 준 지수 백오프 재시도(횟수 제한) +
+  (선택) 멱등 GET hedging: hedge_delay 안에 응답이 없으면 같은 요청을 하나 더 보내 먼저 온 응답 사용
+"""
+
+import asyncio
+import random
+import time
+import httpx
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict
+from fastapi.logger import logger
+
+from core.config import (
+    BREAKER_WINDOW, BREAKER_MIN_CALLS, BREAKER_FAILURE_RATE, BREAKER_OPEN_SECONDS, BREAKER_HALF_OPEN_PROBES,
+    UPSTREAM_RETRY_BASE_DELAY, UPSTREAM_RETRY_MAX_DELAY,
+    DART_RETRY_ATTEMPTS, DART_ATTEMPT_TIMEOUT, DART_HEDGE_DELAY,
+    NAVER_RETRY_ATTEMPTS, NAVER_ATTEMPT_TIMEOUT, NAVER_HEDGE_DELAY,
+)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+MAX_RETRY_AFTER = 10.0  # Retry-After 헤더를 따를 최대 시간(초)
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 호출하지 않음 (호출자는 L2 등으로 degrade)"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} 회로 차단 중 ({retry_after:.0f}초 후 재시도)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def is_transient(error: Exception) -> bool:
+    """재시도할 만한 오류: 네트워크 / 타임아웃 / 429 / 5xx (그 외 4xx 는 요청 자체 문제)"""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, (httpx.TransportError, TimeoutError))
+
+
+def _retry_after(error: Exception) -> float:
+    """서버가 알려준 최소 대기 시간 (429 Retry-After 헤더 / 예외의 retry_after 속성)"""
+    if isinstance(error, httpx.HTTPStatusError):
+        try:
+            return min(MAX_RETRY_AFTER, float(error.response.headers.get("Retry-After", 0)))
+        except ValueError:
+            return 0.0
+    return min(MAX_RETRY_AFTER, float(getattr(error, "retry_after", 0) or 0))
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        window: int = BREAKER_WINDOW,
+        min_calls: int = BREAKER_MIN_CALLS,
+        failure_rate: float = BREAKER_FAILURE_RATE,
+        open_seconds: float = BREAKER_OPEN_SECONDS,
+        half_open_probes: int = BREAKER_HALF_OPEN_PROBES,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._probes = 0  # half-open 에서 진행 중인 시험 호출 수
+        self._counters: Dict[str, int] = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._counters["opened"] += 1
+        self._outcomes.clear()
+        logger.warning(f"[BREAKER] {self.name} 회로 열림 ({self.open_seconds:.0f}초)")
+
+    def check(self):
+        """호출 가능 여부만 확인합니다. (OPEN 이면 CircuitOpenError, 상태를 바꾸지 않음)"""
+        if self.state == OPEN:
+            remaining = self.opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                self._counters["rejected"] += 1
+                raise CircuitOpenError(self.name, remaining)
+
+    def before_call(self) -> bool:
+        """호출 직전: 허용되면 시험 호출(half-open)인지 반환, 아니면 CircuitOpenError"""
+        self.check()
+        if self.state == OPEN:
+            self.state = HALF_OPEN  # open_seconds 경과: 시험 호출 허용
+            self._probes = 0
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_probes:
+                self._counters["rejected"] += 1
+                raise CircuitOpenError(self.name, 0)
+            self._probes += 1
+        self._counters["calls"] += 1
+        return self.state == HALF_OPEN
+
+    def cancel_call(self, probe: bool):
+        """결과 없이 끝난 호출 (hedging 에서 진 요청 / 클라이언트 연결 종료)"""
+        if probe:
+            self._probes -= 1
+
+    def after_call(self, ok: bool, probe: bool):
+        if not ok:
+            self._counters["failures"] += 1
+        if probe:
+            self._probes -= 1
+            if self.state != HALF_OPEN:
+                return
+            if ok:
+                self.state = CLOSED
+                logger.info(f"[BREAKER] {self.name} 회로 닫힘")
+            else:
+                self._open()
+            return
+        if self.state != CLOSED:
+            return
+        self._outcomes.append(ok)
+        if len(self._outcomes) >= self.min_calls:
+            failures = self._outcomes.count(False)
+            if failures / len(self._outcomes) >= self.failure_rate:
+                self._open()
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], is_failure: Callable[[Exception], bool] = is_transient):
+        """fn 을 회로 차단기 아래에서 실행합니다. (is_failure 가 False 인 예외는 성공으로 집계)"""
+        probe = self.before_call()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self.cancel_call(probe)
+            raise
+        except Exception as e:
+            self.after_call(not is_failure(e), probe)
+            raise
+        self.after_call(True, probe)
+        return result
+
+    def stats(self) -> dict:
+        outcomes = list(self._outcomes)
+        return {
+            "state": self.state,
+            "window_failure_rate": round(outcomes.count(False) / len(outcomes), 3) if outcomes else None,
+            "open_for": round(max(0.0, self.opened_at + self.open_seconds - time.monotonic()), 1)
+            if self.state == OPEN else 0.0,
+            **self._counters,
+        }
+
+
+class Upstream:
+    """업스트림 하나의 회로 차단기 + 재시도 + hedging 정책"""
+
+    def __init__(
+        self,
+        name: str,
+        attempts: int,
+        attempt_timeout: float,
+        hedge_delay: float = 0.0,
+        base_delay: float = UPSTREAM_RETRY_BASE_DELAY,
+        max_delay: float = UPSTREAM_RETRY_MAX_DELAY,
+    ):
+        self.name = name
+        self.breaker = CircuitBreaker(name)
+        self.attempts = max(1, attempts)
+        self.attempt_timeout = attempt_timeout
+        self.hedge_delay = hedge_delay
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._counters: Dict[str, int] = {"retries": 0, "hedges": 0, "hedge_wins": 0}
+
+    async def _attempt(self, fn, is_failure):
+        return await self.breaker.call(lambda: asyncio.wait_for(fn(), self.attempt_timeout), is_failure)
+
+    async def _hedged(self, fn, is_failure):
+        first = asyncio.create_task(self._attempt(fn, is_failure))
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay)
+            if done:
+                return first.result()
+
+            self._counters["hedges"] += 1
+            second = asyncio.create_task(self._attempt(fn, is_failure))
+            tasks.append(second)
+            pending = set(tasks)
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self._counters["hedge_wins"] += 1
+                        return task.result()
+                    # 원래 요청의 오류를 우선 (hedge 는 회로가 열려 바로 거절됐을 수 있음)
+                    if error is None or task is first:
+                        error = task.exception()
+            raise error
+        finally:
+            # 진 요청 / 호출자 취소 시 남은 요청 정리
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        retryable: Callable[[Exception], bool] = is_transient,
+        is_failure: Callable[[Exception], bool] = is_transient,
+        hedge: bool = False,
+    ):
+        """
+        fn(요청 1회를 만드는 함수)을 재시도/hedging 하며 실행합니다.
+        회로가 열려 있으면 재시도 없이 CircuitOpenError.
+        """
+        for attempt in range(self.attempts):
+            try:
+                if hedge and self.hedge_delay > 0:
+                    return await self._hedged(fn, is_failure)
+                return await self._attempt(fn, is_failure)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                if attempt + 1 >= self.attempts or not retryable(e):
+                    raise
+                # full jitter (동시에 실패한 요청들이 같은 순간에 다시 몰리지 않도록)
+                delay = max(_retry_after(e), random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+                self._counters["retries"] += 1
+                logger.info(f"[UPSTREAM] {self.name} 재시도 {attempt + 1}/{self.attempts - 1} ({delay:.2f}s): {e!r}")
+                await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "attempts": self.attempts,
+            "attempt_timeout": self.attempt_timeout,
+            "hedge_delay": self.hedge_delay,
+            **self._counters,
+            "breaker": self.breaker.stats(),
+        }
+
+
+dart_upstream = Upstream("dart", DART_RETRY_ATTEMPTS, DART_ATTEMPT_TIMEOUT, DART_HEDGE_DELAY)
+naver_upstream = Upstream("naver", NAVER_RETRY_ATTEMPTS, NAVER_ATTEMPT_TIMEOUT, NAVER_HEDGE_DELAY)
+# Groq 는 모델 전환/재시도를 LLM 게이트웨이가 하므로 회로 차단기만 사용
+groq_breaker = CircuitBreaker("groq")
+
+
+def upstream_stats() -> dict:
+    return {
+        "dart": dart_upstream.stats(),
+        "naver": naver_upstream.stats(),
+        "groq": {"breaker": groq_breaker.stats()},
+    }
@@ -0,0 +1,33 @@
+# /core/tasks.py
+
+import asyncio
+from typing import Coroutine, Set
+from fastapi.logger import logger
+
+# 이벤트 루프는 태스크를 약한 참조로만 들고 있으므로, 완료 전까지 강한 참조를 유지
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def spawn_background(coro: Coroutine, name: str | None = None) -> asyncio.Task:
+    """'Fire and Forget' 태스크를 실행하고, 실패 시 로그만 남깁니다."""
+    task = asyncio.create_task(coro, name=name)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_done)
+    return task
+
+
+def _on_done(task: asyncio.Task):
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"[TASK] 백그라운드 작업 실패({task.get_name()}): {task.exception()}")
+
+
+async def drain_background(timeout: float):
+    """
+    남은 백그라운드 작업(L2 저장 등)이 끝나기를 최대 timeout 초 기다립니다. (배치 작업 종료 전)
+    작업이 다시 띄운 작업(갱신 -> L2 저장)까지 기다립니다.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while _background_tasks and loop.time() < deadline:
+        await asyncio.wait(set(_background_tasks), timeout=deadline - loop.time())
@@ -0,0 +1,326 @@
+"""
+DART 다중회사 주요계정(fnlttMultiAcnt) 일괄 적재
+
+조회 기간(사업연도 × 보고서 코드)마다 company_overview 를 corp_code 순으로 훑으며
+최대 100개씩 묶어 호출하고, 결과를 financial_statements 에 일괄 Upsert 합니다.
+- 이미 적재된 기간이나 최근에 확인한(아직 미공시) 기간의 회사는 DART 에 묻지 않음 (증분 갱신)
+- 동시 요청 수(--concurrency)와 초당 요청 수(--rps)를 제한
+- DART status 020(요청 제한 초과)/네트워크 오류는 지터를 준 지수 백오프로 재시도
+- 체크포인트 파일에 완료 지점(watermark)과 실패한 회사 코드를 기록해, 중단돼도 이어서 실행
+
+    python -m jobs.ingest_financials                                   # 설정된 기간 전체
+    python -m jobs.ingest_financials --latest-year 2024 --years 1 --reprt-codes 11011,11012
+    DART_BASE_URL=http://127.0.0.1:8081/api python -m jobs.ingest_financials   # 로컬 stub 서버
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, Dict, List, Tuple
+
+import httpx
+from fastapi.logger import logger
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from clients import dart_api_client
+from core.config import latest_bsns_year, DART_YEAR_WINDOW, DART_REPORT_CODES, FINANCIAL_RECHECK_INTERVAL
+from core.database import AsyncSessionLocal, async_engine
+from core.http_client import http_clients
+from repository import company_repository, financials_repository
+from utils.financial_parser import parse_financials_batch
+import pytz
+
+SEOUL_TZ = pytz.timezone("Asia/Seoul")
+
+MAX_BATCH_SIZE = 100          # fnlttMultiAcnt 한 번에 조회 가능한 회사 수
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RPS = 5.0             # 초당 요청 수
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0            # 초
+DEFAULT_CHECKPOINT_PREFIX = "ingest_financials"   # {prefix}.{사업연도}.{보고서}.checkpoint.json
+
+DART_STATUS_OK = "000"
+DART_STATUS_NO_DATA = "013"
+DART_STATUS_RATE_LIMITED = "020"
+
+
+class DartIngestError(Exception):
+    pass
+
+
+class RateLimiter:
+    """요청 시작 간격을 1/rate 초 이상으로 맞춥니다. (여러 코루틴이 공유)"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next = max(loop.time(), self._next) + self.interval
+
+    def pause(self, seconds: float):
+        """요청 제한 응답을 받으면 모든 요청을 잠시 멈춥니다."""
+        self._next = max(self._next, asyncio.get_running_loop().time() + seconds)
+
+
+@dataclass
+class Checkpoint:
+    bsns_year: int
+    reprt_code: str
+    watermark: str | None = None                      # 이 corp_code 까지(포함) 처리 완료
+    failed: List[str] = field(default_factory=list)   # 실패한 회사 (다음 실행에서 먼저 재시도, 성공 시 제거)
+    companies: int = 0
+    statements: int = 0
+    skipped: int = 0                                   # 이미 적재/최근 확인돼 건너뛴 회사
+
+    @classmethod
+    def load(cls, path: str, bsns_year: int, reprt_code: str) -> "Checkpoint":
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("bsns_year") == bsns_year and data.get("reprt_code") == reprt_code:
+                return cls(**data)
+            logger.warning(f"[INGEST] 체크포인트의 사업연도/보고서가 달라 처음부터 시작합니다: {path}")
+        return cls(bsns_year=bsns_year, reprt_code=reprt_code)
+
+    def save(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class FinancialsIngestor:
+    def __init__(
+        self,
+        SessionLocal: async_sessionmaker,
+        bsns_year: int,
+        reprt_code: str,
+        checkpoint_path: str,
+        batch_size: int = MAX_BATCH_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rps: float = DEFAULT_RPS,
+        limit: int | None = None,
+        recheck_interval: float = FINANCIAL_RECHECK_INTERVAL,
+    ):
+        self.SessionLocal = SessionLocal
+        self.bsns_year = bsns_year
+        self.reprt_code = reprt_code
+        self.checkpoint_path = checkpoint_path
+        self.batch_size = min(batch_size, MAX_BATCH_SIZE)
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rps)
+        self.limit = limit
+        self.recheck_interval = recheck_interval
+        self.exhausted = False  # 회사 목록 끝까지 돌았는지
+        self.checkpoint = Checkpoint.load(checkpoint_path, bsns_year, reprt_code)
+
+    async def _fetch(self, corp_codes: List[str]) -> List[dict]:
+        error: Exception | str | None = None
+        for attempt in range(MAX_RETRIES):
+            await self.limiter.wait()
+            rate_limited = False
+            try:
+                data = await dart_api_client.fetch_multi_financial_raw(
+                    corp_codes, self.bsns_year, self.reprt_code
+                )
+            except httpx.HTTPError as e:
+                error = e
+            else:
+                status = data.get("status", DART_STATUS_OK)
+                if status == DART_STATUS_OK:
+                    return data.get("list", [])
+                if status == DART_STATUS_NO_DATA:
+                    return []
+                if status != DART_STATUS_RATE_LIMITED:
+                    raise DartIngestError(f"DART status {status}: {data.get('message')}")
+                error, rate_limited = f"DART status {status}: {data.get('message')}", True
+
+            delay = BACKOFF_BASE * (2 ** attempt) * (0.5 + random.random())
+            if rate_limited:
+                self.limiter.pause(delay)
+            logger.warning(f"[INGEST] {corp_codes[0]}~ 재시도 {attempt + 1}/{MAX_RETRIES} ({delay:.1f}s): {error}")
+            await asyncio.sleep(delay)
+        raise DartIngestError(f"재시도 초과: {error}")
+
+    async def _pending(self, corp_codes: List[str]) -> List[str]:
+        """이미 적재됐거나 최근에 확인한 회사를 빼고 DART 에 물어볼 회사만 남깁니다."""
+        since = datetime.now(SEOUL_TZ) - timedelta(seconds=self.recheck_interval)
+        async with self.SessionLocal() as db:
+            stored = await financials_repository.get_stored_periods_async(
+                db, corp_codes, self.reprt_code, [self.bsns_year]
+            )
+            checked = await financials_repository.get_recent_checks_async(
+                db, corp_codes, self.reprt_code, [self.bsns_year], since
+            )
+        skip = {corp_code for corp_code, _ in stored | checked}
+        return [corp_code for corp_code in corp_codes if corp_code not in skip]
+
+    async def _ingest_batch(self, corp_codes: List[str]) -> Tuple[int, int, int]:
+        pending = await self._pending(corp_codes)
+        if not pending:
+            return 0, 0, len(corp_codes)
+
+        rows = await self._fetch(pending)
+        requested = set(pending)
+        parsed = {
+            corp_code: data
+            for corp_code, data in parse_financials_batch(rows, self.bsns_year, self.reprt_code).items()
+            if corp_code in requested
+        }
+        # 확인한 회사 전부 기록 (공시가 없던 회사는 rcept_no 없이)
+        rcept_nos: Dict[str, str | None] = dict.fromkeys(pending)
+        for row in rows:
+            if row.get("corp_code") in requested and row.get("rcept_no"):
+                rcept_nos[row["corp_code"]] = row["rcept_no"]
+
+        async with self.SessionLocal() as db:
+            try:
+                statements = await financials_repository.bulk_upsert_financials_async(
+                    db, parsed, self.reprt_code
+                )
+                await financials_repository.record_report_checks_async(
+                    db, rcept_nos, self.bsns_year, self.reprt_code
+                )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        return len(parsed), statements, len(corp_codes) - len(pending)
+
+    async def _batches(self) -> AsyncIterator[Tuple[List[str], bool]]:
+        """(회사 코드 묶음, watermark 를 전진시키는지) — 지난 실패분 먼저, 그다음 keyset 순회"""
+        cp = self.checkpoint
+        retry = list(cp.failed)
+        for i in range(0, len(retry), self.batch_size):
+            yield retry[i:i + self.batch_size], False
+
+        remaining = self.limit
+        after = cp.watermark
+        while remaining is None or remaining > 0:
+            size = self.batch_size if remaining is None else min(self.batch_size, remaining)
+            async with self.SessionLocal() as db:
+                corp_codes = await company_repository.get_corp_codes_after_async(db, after, size)
+            if not corp_codes:
+                self.exhausted = True
+                return
+            after = corp_codes[-1]
+            if remaining is not None:
+                remaining -= len(corp_codes)
+            yield corp_codes, True
+
+    async def run(self) -> Checkpoint:
+        cp = self.checkpoint
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        # 순서대로 끝난 배치까지만 watermark 를 전진 (동시 실행이라 완료 순서가 뒤섞임)
+        order: List[str] = []
+        done: Dict[int, bool] = {}
+        committed = 0
+
+        async def worker(seq: int | None, corp_codes: List[str]):
+            nonlocal committed
+            try:
+                companies, statements, skipped = await self._ingest_batch(corp_codes)
+                cp.companies += companies
+                cp.statements += statements
+                cp.skipped += skipped
+                if seq is None:
+                    succeeded = set(corp_codes)
+                    cp.failed = [code for code in cp.failed if code not in succeeded]
+            except Exception as e:
+                logger.error(f"[INGEST] {corp_codes[0]}~{corp_codes[-1]} 실패: {e}")
+                if seq is not None:
+                    cp.failed.extend(corp_codes)
+            finally:
+                semaphore.release()
+            if seq is not None:
+                done[seq] = True
+                while done.pop(committed, False):
+                    cp.watermark = order[committed]
+                    committed += 1
+            cp.save(self.checkpoint_path)
+
+        async for corp_codes, advances in self._batches():
+            await semaphore.acquire()
+            seq = None
+            if advances:
+                seq = len(order)
+                order.append(corp_codes[-1])
+            task = asyncio.create_task(worker(seq, corp_codes))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        if self.exhausted and not cp.failed:
+            # 한 바퀴 완료: 다음 실행은 처음부터 (이미 적재/확인된 회사는 싸게 건너뜀)
+            if os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
+        else:
+            cp.save(self.checkpoint_path)
+        return cp
+
+
+async def _main(args: argparse.Namespace):
+    years = [args.latest_year - i for i in range(args.years)]
+    reprt_codes = [code.strip() for code in args.reprt_codes.split(",") if code.strip()]
+    try:
+        # 사업보고서 하나가 3개 연도를 채우므로 최신 연도부터 (이후 연도는 대부분 건너뜀)
+        for reprt_code in reprt_codes:
+            for bsns_year in years:
+                checkpoint_path = f"{args.checkpoint_prefix}.{bsns_year}.{reprt_code}.checkpoint.json"
+                if args.reset and os.path.exists(checkpoint_path):
+                    os.remove(checkpoint_path)
+                ingestor = FinancialsIngestor(
+                    AsyncSessionLocal,
+                    bsns_year=bsns_year,
+                    reprt_code=reprt_code,
+                    checkpoint_path=checkpoint_path,
+                    batch_size=args.batch_size,
+                    concurrency=args.concurrency,
+                    rps=args.rps,
+                    limit=args.limit,
+                    recheck_interval=args.recheck_interval,
+                )
+                cp = await ingestor.run()
+                logger.info(
+                    f"[INGEST] {bsns_year}/{reprt_code} 완료: 회사 {cp.companies}개, 재무제표 {cp.statements}행, "
+                    f"건너뜀 {cp.skipped}개, watermark={cp.watermark}, 실패 {len(cp.failed)}개"
+                )
+    finally:
+        await http_clients.shutdown()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DART 재무제표 일괄 적재 (fnlttMultiAcnt)")
+    parser.add_argument("--latest-year", type=int, default=latest_bsns_year(), help="최신 사업연도")
+    parser.add_argument("--years", type=int, default=DART_YEAR_WINDOW, help="최신 사업연도부터 몇 개 연도")
+    parser.add_argument(
+        "--reprt-codes", default=",".join(DART_REPORT_CODES),
+        help="보고서 코드 (11011 사업보고서, 11012 반기, 11013 1분기, 11014 3분기)",
+    )
+    parser.add_argument("--batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--rps", type=float, default=DEFAULT_RPS, help="초당 최대 요청 수")
+    parser.add_argument("--limit", type=int, default=None, help="기간별로 이번 실행에서 처리할 최대 회사 수")
+    parser.add_argument(
+        "--recheck-interval", type=float, default=FINANCIAL_RECHECK_INTERVAL,
+        help="최근 이 시간(초) 안에 확인한 기간은 건너뜀 (0 이면 미적재 기간 전부 재확인)",
+    )
+    parser.add_argument("--checkpoint-prefix", default=DEFAULT_CHECKPOINT_PREFIX)
+    parser.add_argument("--reset", action="store_true", help="체크포인트를 지우고 처음부터")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,251 @@
+"""
+AI 요약 일괄 사전 생성 (요청 경로 밖에서)
+
+financial_statements(사업보고서) 행이 있는 회사를 '좋아요' 수와 최근 조회수(refresh-ahead 인기도 ZSET)
+순으로 훑으며, 저장된 요약의 입력 지문이 현재 입력(재무/채용 뉴스)과 다른 회사만 Groq 로 다시 생성해
+summary_repository upsert 경로로 DB 에 저장하고 Redis 에도 채웁니다.
+- 재무/뉴스도 details 와 같은 서비스 경로로 읽어 Redis 를 미리 채우고, 요청과 같은 지문이 나오게 함
+- Naver / Groq 호출은 background 우선순위 (interactive 몫의 예산을 남겨둠)
+- 동시 처리 수(--concurrency)와 실행 1회의 비용 예산(--max-calls, --max-tokens, --max-naver-calls)을 넘지 않음
+  (예산은 업스트림을 부르기 전에 확인. 생성 전에 예상 토큰을 예약하고, 생성하지 않았으면 돌려받음)
+- 뉴스 캐시가 없거나 stale 인 회사만 Naver 를 부르므로 그 검색 호출 수를 예산에서 차감
+
+    python -m jobs.precompute_summaries                                   # 1회 실행
+    python -m jobs.precompute_summaries --limit 500 --max-calls 100 --max-tokens 300000 --max-naver-calls 500
+    python -m jobs.precompute_summaries --interval 3600                   # 워커: 주기마다 반복
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Tuple
+
+import redis.asyncio as redis
+from fastapi.logger import logger
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from core.cache import redis_pool, swr_soft_expiries
+from core.database import AsyncSessionLocal, async_engine
+from core.http_client import http_clients
+from core.rate_limit import BACKGROUND
+from core.tasks import drain_background
+from repository import company_repository
+from services.financial_service import FinancialService
+from services.news_service import NewsService, CATEGORIES
+from services.refresh_ahead import POPULARITY_KEY
+from services.summary_service import SummaryService, REFRESH_FRESH, REFRESH_GENERATED
+from utils.financial_parser import ANNUAL_REPORT_CODE
+
+DEFAULT_CONCURRENCY = 2
+DEFAULT_MAX_CALLS = 200          # 실행 1회당 요약 생성(LLM 호출) 상한
+DEFAULT_MAX_TOKENS = 400_000     # 실행 1회당 예상 토큰 상한
+DEFAULT_MAX_NAVER_CALLS = 1000   # 실행 1회당 Naver 검색 호출 상한 (뉴스 1회 = 카테고리 수만큼)
+FAVORITE_WEIGHT = 10.0           # '좋아요' 1개 = 감쇠 조회수 10회
+DRAIN_TIMEOUT = 30               # 종료 전 L2 저장 등 백그라운드 작업 대기(초)
+
+
+@dataclass
+class PrecomputeReport:
+    candidates: int = 0
+    fresh: int = 0          # 지문이 같아 호출하지 않음
+    generated: int = 0
+    skipped: int = 0        # 다른 요청이 생성 중이거나 생성 실패
+    no_input: int = 0       # 유효한 재무 데이터 없음
+    over_budget: int = 0    # 예산 부족으로 이번 실행에서 건너뜀
+    failed: int = 0
+    estimated_tokens: int = 0
+    naver_calls: int = 0    # 뉴스를 새로 받느라 쓴 Naver 검색 호출 수
+    seconds: float = 0.0
+
+
+class CostBudget:
+    """실행 1회의 비용 예산 (LLM 생성 호출 수 + 예상 토큰, Naver 검색 호출 수)"""
+
+    def __init__(self, max_calls: int, max_tokens: int, max_naver_calls: int = DEFAULT_MAX_NAVER_CALLS):
+        self.max_calls = max_calls
+        self.max_tokens = max_tokens
+        self.max_naver_calls = max_naver_calls
+        self.calls = 0
+        self.tokens = 0
+        self.naver_calls = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.calls >= self.max_calls
+
+    def reserve(self, tokens: int) -> bool:
+        if self.calls + 1 > self.max_calls or self.tokens + tokens > self.max_tokens:
+            return False
+        self.calls += 1
+        self.tokens += tokens
+        return True
+
+    def release(self, tokens: int):
+        """예약했지만 생성하지 않은 몫을 돌려받습니다."""
+        self.calls -= 1
+        self.tokens -= tokens
+
+    def charge_naver(self, calls: int) -> bool:
+        """Naver 검색 calls 회를 차감합니다. (상한을 넘으면 차감하지 않고 False)"""
+        if self.naver_calls + calls > self.max_naver_calls:
+            return False
+        self.naver_calls += calls
+        return True
+
+
+def _has_financials(financial_data: dict) -> bool:
+    return any(isinstance(v, dict) and "매출액" in v for v in financial_data.values())
+
+
+class SummaryPrecomputer:
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        SessionLocal: async_sessionmaker,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_calls: int = DEFAULT_MAX_CALLS,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        limit: int | None = None,
+        max_naver_calls: int = DEFAULT_MAX_NAVER_CALLS,
+    ):
+        self.redis = redis_client
+        self.SessionLocal = SessionLocal
+        self.concurrency = concurrency
+        self.budget = CostBudget(max_calls, max_tokens, max_naver_calls)
+        self.limit = limit
+        self.report = PrecomputeReport()
+
+    async def _candidates(self) -> List[Tuple[str, str, float]]:
+        """(corp_code, 회사명, 우선순위) — '좋아요' × FAVORITE_WEIGHT + 감쇠 조회수 내림차순"""
+        async with self.SessionLocal() as db:
+            companies = await company_repository.get_companies_with_financials_async(db, ANNUAL_REPORT_CODE)
+
+        traffic: Dict[str, float] = {}
+        for member, score in await self.redis.zrange(POPULARITY_KEY, 0, -1, withscores=True):
+            corp_code, _, _ = member.partition("|")
+            traffic[corp_code] = traffic.get(corp_code, 0.0) + score
+
+        # details 와 같은 키를 쓰도록 CompanyInfo.corp_code(int) 표기로 맞춤 ("00126380" -> "126380")
+        companies = [(str(int(corp_code)), name, favorite_count) for corp_code, name, favorite_count in companies]
+        ranked = sorted(
+            (
+                (corp_code, name, FAVORITE_WEIGHT * favorite_count + traffic.get(corp_code, 0.0))
+                for corp_code, name, favorite_count in companies
+            ),
+            key=lambda company: company[2],
+            reverse=True,
+        )
+        return ranked[:self.limit] if self.limit else ranked
+
+    async def _news_needs_fetch(self, name: str) -> bool:
+        """뉴스 캐시가 없거나(조회 시 Naver 호출) stale(백그라운드 갱신 시 Naver 호출)인지"""
+        [soft_expires_at] = await swr_soft_expiries(self.redis, [f"details:news:{name}"])
+        return soft_expires_at is None or soft_expires_at <= time.time()
+
+    async def _precompute(self, corp_code: str, name: str):
+        report = self.report
+        # 업스트림(DART / Naver)을 부르기 전에 예산 확인 (동시 처리 중 다른 회사가 소진했을 수 있음)
+        if self.budget.exhausted:
+            report.over_budget += 1
+            return
+        financial_data = await FinancialService(self.redis, self.SessionLocal).get_financials(corp_code)
+        if not _has_financials(financial_data):
+            report.no_input += 1
+            return
+        if await self._news_needs_fetch(name) and not self.budget.charge_naver(len(CATEGORIES)):
+            report.over_budget += 1
+            return
+        news_data = await NewsService(self.redis, self.SessionLocal).get_news(name, corp_code, priority=BACKGROUND)
+
+        summary_service = SummaryService(self.redis, self.SessionLocal)
+        tokens = summary_service.estimate_tokens(name, financial_data, news_data)
+        if not self.budget.reserve(tokens):
+            report.over_budget += 1
+            return
+
+        outcome = await summary_service.refresh(name, financial_data, news_data)
+        if outcome == REFRESH_GENERATED:
+            report.generated += 1
+            report.estimated_tokens += tokens
+            return
+        self.budget.release(tokens)
+        if outcome == REFRESH_FRESH:
+            report.fresh += 1
+        else:
+            report.skipped += 1
+
+    async def run(self) -> PrecomputeReport:
+        start = time.monotonic()
+        report = self.report
+        candidates = await self._candidates()
+        report.candidates = len(candidates)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+
+        async def worker(corp_code: str, name: str):
+            try:
+                await self._precompute(corp_code, name)
+            except Exception as e:
+                report.failed += 1
+                logger.error(f"[PRECOMPUTE] {name}({corp_code}) 실패: {e}")
+            finally:
+                semaphore.release()
+
+        for i, (corp_code, name, _) in enumerate(candidates):
+            await semaphore.acquire()
+            if self.budget.exhausted:
+                # 호출 수 예산 소진: 남은 회사는 재무/뉴스도 읽지 않고 다음 실행으로
+                semaphore.release()
+                report.over_budget += len(candidates) - i
+                break
+            task = asyncio.create_task(worker(corp_code, name))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        report.naver_calls = self.budget.naver_calls
+        report.seconds = round(time.monotonic() - start, 3)
+        return report
+
+
+async def _main(args: argparse.Namespace):
+    try:
+        async with redis.Redis(connection_pool=redis_pool) as redis_client:
+            while True:
+                precomputer = SummaryPrecomputer(
+                    redis_client,
+                    AsyncSessionLocal,
+                    concurrency=args.concurrency,
+                    max_calls=args.max_calls,
+                    max_tokens=args.max_tokens,
+                    limit=args.limit,
+                    max_naver_calls=args.max_naver_calls,
+                )
+                report = await precomputer.run()
+                logger.info(f"[PRECOMPUTE] 완료: {asdict(report)}")
+                if not args.interval:
+                    break
+                await asyncio.sleep(args.interval)
+    finally:
+        await drain_background(DRAIN_TIMEOUT)
+        await http_clients.shutdown()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI 요약 일괄 사전 생성")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시에 처리할 회사 수")
+    parser.add_argument("--max-calls", type=int, default=DEFAULT_MAX_CALLS, help="실행 1회당 최대 요약 생성 수")
+    parser.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS, help="실행 1회당 최대 예상 토큰")
+    parser.add_argument(
+        "--max-naver-calls", type=int, default=DEFAULT_MAX_NAVER_CALLS,
+        help="실행 1회당 최대 Naver 검색 호출 수 (뉴스 캐시가 없거나 stale 인 회사만 차감)",
+    )
+    parser.add_argument("--limit", type=int, default=None, help="우선순위 상위 N개 회사만")
+    parser.add_argument("--interval", type=float, default=0, help="0 보다 크면 이 간격(초)으로 계속 반복 (워커 모드)")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))
@@ -1,12 +1,49 @@
-from core.config import SECRET_KEY
+from core.config import (
+    SECRET_KEY, SEARCH_INDEX_REFRESH_INTERVAL, FAVORITE_FLUSH_INTERVAL, REFRESH_AHEAD_INTERVAL, SHUTDOWN_DRAIN_TIMEOUT,
+)
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
-from routers import auth, details_all, users, companies, industries
-from core.database import Base, engine
+from routers import auth, details_all, users, companies, industries, metrics
+from core.database import Base, engine, async_engine, AsyncSessionLocal
+from core.http_client import http_clients
+from core.cache import pubsub
+from core.tasks import spawn_background, drain_background
+from services.company_search_index import company_search_index
+from services.company_service import flush_favorites_forever
+from services.refresh_ahead import refresh_ahead
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 import models
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 업스트림(DART/Naver/Groq) keep-alive 커넥션 풀 생성
+    await http_clients.startup()
+    # L0 캐시 무효화 메시지 구독 (워커당 Pub/Sub 연결 1개)
+    await pubsub.start()
+    # 회사명 검색 인덱스 구축 + 주기적 전체 재적재 / 차이 반영 (준비 전엔 DB 검색으로 fallback)
+    # '좋아요' 증감분 주기적 MySQL 반영 (write-behind)
+    # 인기 회사 details 캐시 만료 전 미리 갱신 (refresh-ahead, 주기마다 리더 워커 1개)
+    background = [
+        spawn_background(company_search_index.refresh_forever(SEARCH_INDEX_REFRESH_INTERVAL)),
+        spawn_background(flush_favorites_forever(AsyncSessionLocal, FAVORITE_FLUSH_INTERVAL)),
+        spawn_background(refresh_ahead.run_forever(AsyncSessionLocal, REFRESH_AHEAD_INTERVAL)),
+    ]
+    try:
+        yield
+    finally:
+        # 주기 루프를 멈추고 끝날 때까지 기다린 뒤, 요청이 띄운 L2 저장 등을 마저 끝내고 커넥션 정리
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        await drain_background(SHUTDOWN_DRAIN_TIMEOUT)
+        await pubsub.stop()
+        await http_clients.shutdown()
+        await async_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",
@@ -41,4 +78,5 @@ app.include_router(auth.router, prefix="/auth", tags=["Auth"])
 app.include_router(users.router, prefix="/users", tags=["Users"])
 app.include_router(companies.router, prefix="/companies", tags=["Companies"])
 app.include_router(industries.router, prefix="/industries", tags=["Industries"])
-app.include_router(details_all.router, prefix="/details-final", tags=["Company Details (Final)"])
\ No newline at end of file
+app.include_router(details_all.router, prefix="/details-final", tags=["Company Details (Final)"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
\ No newline at end of file
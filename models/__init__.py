@@ -5,7 +5,9 @@ from core.database import Base
 from .user import User
 from .company_overview import CompanyOverviews
 from .financial_statement import FinancialStatement
+from .financial_report_check import FinancialReportCheck
 from .cached_news_article import CachedNewsArticle
 from .industry_classification import IndustryClassification
 from .summary import Summary
-from .user_industry_favorite import UserIndustryFavorite
\ No newline at end of file
+from .user_industry_favorite import UserIndustryFavorite
+from .favorite_flush_batch import FavoriteFlushBatch
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, VARCHAR, DateTime
+from datetime import datetime
+import pytz
+from core.database import Base
+
+SEOUL_TZ = pytz.timezone("Asia/Seoul")
+
+class FavoriteFlushBatch(Base):
+    """MySQL 에 반영을 마친 '좋아요' 증감분 묶음 (write-behind flush 를 한 번만 적용하기 위한 표시)"""
+    __tablename__ = "favorite_flush_batches"
+    __table_args__ = (
+        {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+
+    batch_id = Column(VARCHAR(32), primary_key=True)
+    applied_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(SEOUL_TZ),
+        nullable=False
+    )
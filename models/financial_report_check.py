@@ -0,0 +1,26 @@
+from sqlalchemy import Column, VARCHAR, Integer, DateTime, ForeignKey
+from datetime import datetime
+import pytz
+from core.database import Base
+
+SEOUL_TZ = pytz.timezone("Asia/Seoul")
+
+class FinancialReportCheck(Base):
+    """(회사, 사업연도, 보고서) 별로 DART 에 마지막으로 확인한 시점 (증분 갱신용)"""
+    __tablename__ = "financial_report_checks"
+    __table_args__ = (
+        {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+
+    corp_code = Column(VARCHAR(8), ForeignKey("company_overview.corp_code"), primary_key=True)
+    bsns_year = Column(Integer, primary_key=True)
+    reprt_code = Column(VARCHAR(5), primary_key=True)
+
+    # 공시가 있었으면 접수번호, 아직 없으면 NULL
+    rcept_no = Column(VARCHAR(14), nullable=True)
+    checked_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(SEOUL_TZ),
+        onupdate=lambda: datetime.now(SEOUL_TZ),
+        nullable=False
+    )
@@ -8,7 +8,7 @@ from core.database import Base
 class FinancialStatement(Base):
     __tablename__ = "financial_statements"
     __table_args__ = (
-        UniqueConstraint("corp_code", "year", name="uq_company_year"),
+        UniqueConstraint("corp_code", "year", "reprt_code", name="uq_company_year_report"),
         {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"}
     )
     
@@ -17,6 +17,8 @@ class FinancialStatement(Base):
     
     # 2022, 2023, 2024...
     year = Column(Integer, nullable=False, index=True) 
+    # 11011 사업보고서, 11012 반기, 11013 1분기, 11014 3분기
+    reprt_code = Column(VARCHAR(5), nullable=False, server_default="11011", default="11011")
     
     revenue = Column(BigInteger, nullable=True)          # 매출액
     operating_profit = Column(BigInteger, nullable=True) # 영업이익
@@ -20,6 +20,8 @@ class Summary(Base):
     # 2) unique=True 옵션 추가 (ORM 차원에서도 명시)
     company_name = Column(String(255), index=True, nullable=False, unique=True)
     summary_text = Column(Text, nullable=False)
+    # 요약 입력 지문 (모델 + 프롬프트 버전 + 재무/채용뉴스 sha256). 같으면 다시 생성하지 않음
+    input_hash = Column(String(64), nullable=True)
     created_at = Column(
         DateTime(timezone=True),
         default=lambda: datetime.now(SEOUL_TZ),
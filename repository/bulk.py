@@ -0,0 +1,105 @@
+# /repository/bulk.py
+
+"""
+집합 기반 bulk upsert.
+
+여러 회사의 여러 행을 upsert 문 하나 + 파라미터 목록(executemany)으로 보내고,
+유니크 제약에 걸리는 행은 갱신합니다. 문장 모양이 행 수와 무관해 컴파일 캐시를 타고,
+드라이버가 다중 VALUES 로 묶어 청크당 왕복 1번으로 실행합니다.
+- MySQL: INSERT ... ON DUPLICATE KEY UPDATE
+- SQLite / PostgreSQL: INSERT ... ON CONFLICT (...) DO UPDATE  (로컬/테스트용)
+update_cols 가 비어 있으면 이미 있는 행은 그대로 둡니다. (insert-only)
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+BULK_CHUNK_SIZE = 500  # execute 한 번에 넘기는 최대 행 수 (max_allowed_packet 대비)
+
+
+def _table_of(model) -> Table:
+    return model.__table__ if hasattr(model, "__table__") else model
+
+
+def _dedupe(rows: Iterable[Dict[str, Any]], conflict_cols: Sequence[str]) -> List[Dict[str, Any]]:
+    """같은 키가 한 문장에 두 번 들어가지 않도록 (뒤의 행 우선)"""
+    unique: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        unique[tuple(row[col] for col in conflict_cols)] = row
+    return list(unique.values())
+
+
+def build_upsert(
+    dialect_name: str,
+    model,
+    conflict_cols: Sequence[str],
+    update_cols: Sequence[str],
+):
+    """방언별 upsert 문 하나를 만듭니다. (값은 execute 의 파라미터 목록으로 전달)"""
+    table = _table_of(model)
+
+    if dialect_name in ("mysql", "mariadb"):
+        stmt = mysql.insert(table)
+        # ON DUPLICATE KEY UPDATE 는 최소 1개 컬럼이 필요 → insert-only 는 키를 자기 자신으로 갱신
+        targets = update_cols or conflict_cols[:1]
+        return stmt.on_duplicate_key_update({col: stmt.inserted[col] for col in targets})
+
+    if dialect_name in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect_name == "sqlite" else postgresql.insert
+        stmt = insert(table)
+        if not update_cols:
+            return stmt.on_conflict_do_nothing(index_elements=list(conflict_cols))
+        return stmt.on_conflict_do_update(
+            index_elements=list(conflict_cols),
+            set_={col: stmt.excluded[col] for col in update_cols},
+        )
+
+    raise NotImplementedError(f"bulk upsert 를 지원하지 않는 DB 입니다: {dialect_name}")
+
+
+def _prepare(model, rows, conflict_cols, update_cols):
+    rows = _dedupe(rows, conflict_cols)
+    if update_cols is None and rows:
+        # 기본: 키/PK 를 제외하고 넘겨준 모든 컬럼 갱신
+        primary_keys = {col.name for col in _table_of(model).primary_key}
+        update_cols = [col for col in rows[0] if col not in conflict_cols and col not in primary_keys]
+    return rows, list(update_cols or ())
+
+
+def bulk_upsert(
+    db: Session,
+    model,
+    rows: Iterable[Dict[str, Any]],
+    conflict_cols: Sequence[str],
+    update_cols: Sequence[str] | None = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> int:
+    """rows 를 chunk_size 개씩 upsert 하고 보낸 행 수를 반환합니다. (commit은 호출자)"""
+    rows, update_cols = _prepare(model, rows, conflict_cols, update_cols)
+    if not rows:
+        return 0
+    stmt = build_upsert(db.get_bind().dialect.name, model, conflict_cols, update_cols)
+    for i in range(0, len(rows), chunk_size):
+        db.execute(stmt, rows[i:i + chunk_size])
+    return len(rows)
+
+
+async def bulk_upsert_async(
+    db: AsyncSession,
+    model,
+    rows: Iterable[Dict[str, Any]],
+    conflict_cols: Sequence[str],
+    update_cols: Sequence[str] | None = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> int:
+    """bulk_upsert 의 AsyncSession 버전"""
+    rows, update_cols = _prepare(model, rows, conflict_cols, update_cols)
+    if not rows:
+        return 0
+    stmt = build_upsert(db.get_bind().dialect.name, model, conflict_cols, update_cols)
+    for i in range(0, len(rows), chunk_size):
+        await db.execute(stmt, rows[i:i + chunk_size])
+    return len(rows)
@@ -1,6 +1,17 @@
+from sqlalchemy import select, update, delete, and_, or_
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import func
 from models.company_overview import CompanyOverviews
+from models.financial_statement import FinancialStatement
+from models.favorite_flush_batch import FavoriteFlushBatch
+from datetime import datetime, timedelta
+from typing import Iterator, Tuple
+import pytz
+
+SEOUL_TZ = pytz.timezone("Asia/Seoul")
+
+KEYSET_STREAM_BATCH = 500
 
 def get_company_by_name_exact(db: Session, name: str) -> CompanyOverviews | None:
     """이름으로 정확히 1개의 회사 정보를 조회합니다."""
@@ -44,14 +55,27 @@ def atomic_subtract_favorite_count(db: Session, corp_code: int) -> int:
     return result
 
 
-def search_companies_by_keyword(db: Session, keyword: str) -> list[CompanyOverviews]:
-    """키워드(ilike)로 여러 회사를 검색합니다."""
-    return (
+def search_companies_by_keyword(db: Session, keyword: str, limit: int | None = None) -> list[CompanyOverviews]:
+    """키워드(ilike)로 여러 회사를 검색합니다. (검색 인덱스 준비 전 fallback)"""
+    query = (
         db.query(CompanyOverviews)
         .filter(CompanyOverviews.corp_name.ilike(f"%{keyword}%"))
         .order_by(CompanyOverviews.corp_name.asc())
-        .all()
     )
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+def get_search_index_rows(db: Session):
+    """검색 인덱스 구축에 필요한 컬럼만 조회합니다."""
+    return db.query(
+        CompanyOverviews.corp_code,
+        CompanyOverviews.corp_name,
+        CompanyOverviews.favorite_count,
+        CompanyOverviews.hm_url,
+        CompanyOverviews.induty_name,
+        CompanyOverviews.logo,
+    ).all()
 
 def get_best_companies(db: Session, limit: int = 3) -> list[CompanyOverviews]:
     """좋아요(favorite_count) 순으로 상위 N개 회사를 조회합니다."""
@@ -67,4 +91,145 @@ def get_companies_by_industry_code(db: Session, industry_code: int) -> list[Comp
         db.query(CompanyOverviews)
         .filter(CompanyOverviews.induty_code.like(f"{industry_code}%"))
         .all()
-    )
\ No newline at end of file
+    )
+
+
+
+# --- Keyset 페이지네이션 / 스트리밍 (corp_name, corp_code 순) ---
+
+def _keyset_query(db: Session, condition, after: Tuple[str, str] | None):
+    """정렬 키 (corp_name, corp_code) 기준으로 after 다음 행부터 조회하는 쿼리"""
+    query = db.query(CompanyOverviews).filter(condition, CompanyOverviews.corp_name.isnot(None))
+    if after is not None:
+        last_name, last_code = after
+        query = query.filter(
+            or_(
+                CompanyOverviews.corp_name > last_name,
+                and_(CompanyOverviews.corp_name == last_name, CompanyOverviews.corp_code > last_code),
+            )
+        )
+    return query.order_by(CompanyOverviews.corp_name.asc(), CompanyOverviews.corp_code.asc())
+
+def _keyword_condition(keyword: str):
+    return CompanyOverviews.corp_name.ilike(f"%{keyword}%")
+
+def _industry_condition(industry_code: int):
+    return CompanyOverviews.induty_code.like(f"{industry_code}%")
+
+def search_companies_page(
+    db: Session, keyword: str, limit: int, after: Tuple[str, str] | None = None
+) -> list[CompanyOverviews]:
+    """키워드 검색 결과의 한 페이지 (OFFSET 없이 마지막 키 다음부터)"""
+    return _keyset_query(db, _keyword_condition(keyword), after).limit(limit).all()
+
+def get_companies_by_industry_page(
+    db: Session, industry_code: int, limit: int, after: Tuple[str, str] | None = None
+) -> list[CompanyOverviews]:
+    """산업 코드별 회사 목록의 한 페이지"""
+    return _keyset_query(db, _industry_condition(industry_code), after).limit(limit).all()
+
+def iter_companies_by_keyword(
+    db: Session, keyword: str, after: Tuple[str, str] | None = None
+) -> Iterator[CompanyOverviews]:
+    """서버 사이드 커서로 검색 결과를 배치 단위로 흘려보냅니다."""
+    return _keyset_query(db, _keyword_condition(keyword), after).yield_per(KEYSET_STREAM_BATCH)
+
+def iter_companies_by_industry(
+    db: Session, industry_code: int, after: Tuple[str, str] | None = None
+) -> Iterator[CompanyOverviews]:
+    """서버 사이드 커서로 산업 코드별 회사를 배치 단위로 흘려보냅니다."""
+    return _keyset_query(db, _industry_condition(industry_code), after).yield_per(KEYSET_STREAM_BATCH)
+
+
+# --- AsyncSession 버전 (비동기 details 파이프라인용) ---
+
+async def get_company_by_name_exact_async(db: AsyncSession, name: str) -> CompanyOverviews | None:
+    """이름으로 정확히 1개의 회사 정보를 조회합니다. (비동기)"""
+    result = await db.execute(
+        select(CompanyOverviews).where(CompanyOverviews.corp_name == name).limit(1)
+    )
+    return result.scalars().first()
+
+async def get_company_by_code_async(db: AsyncSession, corp_code: int) -> CompanyOverviews | None:
+    """회사 코드로 1개의 회사 정보를 조회합니다. (비동기)"""
+    return await db.get(CompanyOverviews, corp_code)
+
+async def get_companies_by_codes_async(db: AsyncSession, corp_codes: list[str]) -> list[CompanyOverviews]:
+    """여러 회사 코드로 회사 정보를 한 번에 조회합니다. (순서 보장 안 함)"""
+    if not corp_codes:
+        return []
+    result = await db.execute(
+        select(CompanyOverviews).where(CompanyOverviews.corp_code.in_(corp_codes))
+    )
+    return list(result.scalars().all())
+
+async def get_best_companies_async(db: AsyncSession, limit: int = 3) -> list[CompanyOverviews]:
+    """좋아요(favorite_count) 순으로 상위 N개 회사를 조회합니다. (비동기)"""
+    result = await db.execute(
+        select(CompanyOverviews).order_by(CompanyOverviews.favorite_count.desc()).limit(limit)
+    )
+    return list(result.scalars().all())
+
+async def get_all_favorite_counts_async(db: AsyncSession) -> list[tuple[str, int]]:
+    """모든 회사의 (corp_code, favorite_count) 를 조회합니다. (Redis 랭킹 재구축용)"""
+    result = await db.execute(
+        select(CompanyOverviews.corp_code, CompanyOverviews.favorite_count)
+    )
+    return [(code, count or 0) for code, count in result.all()]
+
+async def apply_favorite_deltas_async(db: AsyncSession, deltas: dict[str, int]) -> int:
+    """
+    회사별 '좋아요' 증감분을 일괄 반영합니다. (write-behind flush)
+    같은 증감값끼리 묶어 UPDATE ... WHERE corp_code IN (...) 한 번으로 처리합니다.
+    """
+    by_delta: dict[int, list[str]] = {}
+    for corp_code, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(corp_code)
+
+    rows_affected = 0
+    for delta, corp_codes in by_delta.items():
+        result = await db.execute(
+            update(CompanyOverviews)
+            .where(CompanyOverviews.corp_code.in_(corp_codes))
+            .values(favorite_count=func.coalesce(CompanyOverviews.favorite_count, 0) + delta)
+            .execution_options(synchronize_session=False)
+        )
+        rows_affected += result.rowcount
+    return rows_affected
+
+async def is_favorite_batch_applied_async(db: AsyncSession, batch_id: str) -> bool:
+    """증감분 묶음(batch_id)이 이미 반영됐는지 조회합니다."""
+    return await db.get(FavoriteFlushBatch, batch_id) is not None
+
+async def record_favorite_batch_async(db: AsyncSession, batch_id: str, keep: timedelta = timedelta(days=1)):
+    """
+    증감분 묶음을 반영했다고 기록합니다. (apply_favorite_deltas_async 와 같은 트랜잭션, commit은 호출자)
+    keep 보다 오래된 기록은 함께 정리합니다.
+    """
+    now = datetime.now(SEOUL_TZ)
+    await db.execute(delete(FavoriteFlushBatch).where(FavoriteFlushBatch.applied_at < now - keep))
+    db.add(FavoriteFlushBatch(batch_id=batch_id, applied_at=now))
+
+async def get_companies_with_financials_async(
+    db: AsyncSession, reprt_code: str
+) -> list[tuple[str, str, int]]:
+    """재무제표(reprt_code) 행이 있는 회사의 (corp_code, corp_name, favorite_count) 를 조회합니다. (요약 배치용)"""
+    has_financials = (
+        select(FinancialStatement.id)
+        .where(FinancialStatement.corp_code == CompanyOverviews.corp_code, FinancialStatement.reprt_code == reprt_code)
+        .exists()
+    )
+    result = await db.execute(
+        select(CompanyOverviews.corp_code, CompanyOverviews.corp_name, CompanyOverviews.favorite_count)
+        .where(has_financials, CompanyOverviews.corp_name.is_not(None))
+    )
+    return [(code, name, count or 0) for code, name, count in result.all()]
+
+async def get_corp_codes_after_async(db: AsyncSession, after: str | None, limit: int) -> list[str]:
+    """corp_code 순으로 after 다음의 회사 코드 limit 개를 조회합니다. (배치 적재용 keyset)"""
+    query = select(CompanyOverviews.corp_code).order_by(CompanyOverviews.corp_code.asc()).limit(limit)
+    if after is not None:
+        query = query.where(CompanyOverviews.corp_code > after)
+    result = await db.execute(query)
+    return list(result.scalars().all())
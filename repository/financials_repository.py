@@ -1,57 +1,142 @@
 # /repository/financials_repository.py
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.financial_statement import FinancialStatement
-from typing import Dict, Any, List
+from models.financial_report_check import FinancialReportCheck
+from repository.bulk import bulk_upsert, bulk_upsert_async
+from utils.financial_parser import ANNUAL_REPORT_CODE
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Set, Tuple
+import pytz
 
-def get_financials_by_code(db: Session, corp_code: str) -> List[FinancialStatement]:
+SEOUL_TZ = pytz.timezone("Asia/Seoul")
+
+FINANCIALS_CONFLICT_COLS = ("corp_code", "year", "reprt_code")        # uq_company_year_report
+REPORT_CHECKS_CONFLICT_COLS = ("corp_code", "bsns_year", "reprt_code")  # PK
+
+def _is_valid_entry(data: Any) -> bool:
+    return isinstance(data, dict) and "매출액" in data
+
+def _to_row(corp_code: str, year: int, reprt_code: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "corp_code": corp_code,
+        "year": year,
+        "reprt_code": reprt_code,
+        "revenue": data.get("매출액"),
+        "operating_profit": data.get("영업이익"),
+        "net_income": data.get("당기순이익"),
+        "total_assets": data.get("자산총계"),
+        "total_equity": data.get("자본총계"), # 스키마에 따라 추가
+        "ratios": data.get("ratio"),
+    }
+
+def _to_rows(corp_code: str, financial_data: Dict[str, Any], reprt_code: str) -> List[Dict[str, Any]]:
+    """유효하지 않은 데이터(예: "message: ...")는 건너뜀"""
+    return [
+        _to_row(corp_code, int(year), reprt_code, data)
+        for year, data in financial_data.items()
+        if _is_valid_entry(data)
+    ]
+
+def get_financials_by_code(db: Session, corp_code: str, reprt_code: str = ANNUAL_REPORT_CODE) -> List[FinancialStatement]:
     """L2(RDB)에서 특정 회사의 모든 재무제표를 조회합니다."""
     corp_code = "00" + corp_code if len(corp_code) == 6 else corp_code
     
     return (
         db.query(FinancialStatement)
-        .filter(FinancialStatement.corp_code == corp_code)
+        .filter(FinancialStatement.corp_code == corp_code, FinancialStatement.reprt_code == reprt_code)
         .order_by(FinancialStatement.year.asc())
         .all()
     )
 
-def upsert_financials(db: Session, corp_code: str, financial_data: Dict[str, Any]):
+def upsert_financials(db: Session, corp_code: str, financial_data: Dict[str, Any], reprt_code: str = ANNUAL_REPORT_CODE):
     """
     L3(DART)에서 가져온 데이터를 L2(RDB)에 Upsert(Update or Insert)합니다.
+    (연도별 SELECT 없이 INSERT ... ON DUPLICATE KEY UPDATE 한 번)
     """
     corp_code = "00" + corp_code if len(corp_code) == 6 else corp_code
-    
-    for year, data in financial_data.items():
-        if not (isinstance(data, dict) and "매출액" in data):
-            continue # 유효하지 않은 데이터(예: "message: ...") 스킵
-        
-        # 1. (Upsert) 기존 데이터가 있는지 확인
-        existing = (
-            db.query(FinancialStatement)
-            .filter_by(corp_code=corp_code, year=int(year))
-            .first()
+    bulk_upsert(db, FinancialStatement, _to_rows(corp_code, financial_data, reprt_code), FINANCIALS_CONFLICT_COLS)
+    # 트랜잭션은 Service 계층에서 commit/rollback 관리 (여기서는 안 함)
+
+
+# --- AsyncSession 버전 (비동기 details 파이프라인용) ---
+
+async def get_financials_by_code_async(
+    db: AsyncSession, corp_code: str, reprt_code: str = ANNUAL_REPORT_CODE, years: Iterable[int] | None = None
+) -> List[FinancialStatement]:
+    """L2(RDB)에서 특정 회사의 재무제표를 조회합니다. (비동기, years 를 주면 해당 연도만)"""
+    corp_code = "00" + corp_code if len(corp_code) == 6 else corp_code
+
+    query = (
+        select(FinancialStatement)
+        .where(FinancialStatement.corp_code == corp_code, FinancialStatement.reprt_code == reprt_code)
+        .order_by(FinancialStatement.year.asc())
+    )
+    if years is not None:
+        query = query.where(FinancialStatement.year.in_(list(years)))
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+async def upsert_financials_async(
+    db: AsyncSession, corp_code: str, financial_data: Dict[str, Any], reprt_code: str = ANNUAL_REPORT_CODE
+):
+    """L3(DART) 데이터를 L2(RDB)에 Upsert 합니다. (비동기, commit은 서비스 계층)"""
+    corp_code = "00" + corp_code if len(corp_code) == 6 else corp_code
+    await bulk_upsert_async(db, FinancialStatement, _to_rows(corp_code, financial_data, reprt_code), FINANCIALS_CONFLICT_COLS)
+
+async def bulk_upsert_financials_async(
+    db: AsyncSession, financials_by_code: Dict[str, Dict[str, Any]], reprt_code: str = ANNUAL_REPORT_CODE
+) -> int:
+    """여러 회사의 재무 데이터를 한 번에 Upsert 합니다. (배치 적재용, commit은 호출자)"""
+    rows = [
+        row
+        for corp_code, financial_data in financials_by_code.items()
+        for row in _to_rows(corp_code, financial_data, reprt_code)
+    ]
+    return await bulk_upsert_async(db, FinancialStatement, rows, FINANCIALS_CONFLICT_COLS)
+
+
+# --- 증분 갱신: 이미 있는 기간 / 마지막 확인 시점 ---
+
+async def get_stored_periods_async(
+    db: AsyncSession, corp_codes: Iterable[str], reprt_code: str, years: Iterable[int]
+) -> Set[Tuple[str, int]]:
+    """financial_statements 에 이미 있는 (corp_code, year) 를 조회합니다."""
+    result = await db.execute(
+        select(FinancialStatement.corp_code, FinancialStatement.year).where(
+            FinancialStatement.corp_code.in_(list(corp_codes)),
+            FinancialStatement.reprt_code == reprt_code,
+            FinancialStatement.year.in_(list(years)),
         )
-        
-        if existing:
-            # 2. (Update)
-            existing.revenue = data.get("매출액")
-            existing.operating_profit = data.get("영업이익")
-            existing.net_income = data.get("당기순이익")
-            existing.total_assets = data.get("자산총계")
-            existing.total_equity = data.get("자본총계") # 스키마에 따라 추가
-            existing.ratios = data.get("ratio")
-        else:
-            # 3. (Insert)
-            new_statement = FinancialStatement(
-                corp_code=corp_code,
-                year=int(year),
-                revenue=data.get("매출액"),
-                operating_profit=data.get("영업이익"),
-                net_income=data.get("당기순이익"),
-                total_assets=data.get("자산총계"),
-                total_equity=data.get("자본총계"),
-                ratios=data.get("ratio"),
-            )
-            db.add(new_statement)
-    
-    # 4. 트랜잭션은 Service 계층에서 commit/rollback 관리 (여기서는 안 함)
\ No newline at end of file
+    )
+    return {(corp_code, year) for corp_code, year in result.all()}
+
+async def get_recent_checks_async(
+    db: AsyncSession, corp_codes: Iterable[str], reprt_code: str, bsns_years: Iterable[int], since: datetime
+) -> Set[Tuple[str, int]]:
+    """since 이후에 DART 에 확인한 적 있는 (corp_code, bsns_year) 를 조회합니다. (corp_code 는 8자리)"""
+    result = await db.execute(
+        select(FinancialReportCheck.corp_code, FinancialReportCheck.bsns_year).where(
+            FinancialReportCheck.corp_code.in_(["00" + c if len(c) == 6 else c for c in corp_codes]),
+            FinancialReportCheck.reprt_code == reprt_code,
+            FinancialReportCheck.bsns_year.in_(list(bsns_years)),
+            FinancialReportCheck.checked_at >= since,
+        )
+    )
+    return {(corp_code, bsns_year) for corp_code, bsns_year in result.all()}
+
+async def record_report_checks_async(
+    db: AsyncSession, rcept_nos: Dict[str, str | None], bsns_year: int, reprt_code: str
+):
+    """회사별 확인 시점(과 공시 접수번호)을 기록합니다. (commit은 호출자)"""
+    now = datetime.now(SEOUL_TZ)
+    rows = [
+        {
+            "corp_code": "00" + corp_code if len(corp_code) == 6 else corp_code,
+            "bsns_year": bsns_year, "reprt_code": reprt_code, "rcept_no": rcept_no, "checked_at": now,
+        }
+        for corp_code, rcept_no in rcept_nos.items()
+    ]
+    await bulk_upsert_async(db, FinancialReportCheck, rows, REPORT_CHECKS_CONFLICT_COLS)
@@ -1,39 +1,25 @@
 # /repository/news_repository.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, func, tuple_
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.cached_news_article import CachedNewsArticle
 from schemas.news import NewsArticle # Pydantic 스키마
-from typing import Dict, Any, List
-from datetime import datetime
+from repository.bulk import bulk_upsert, bulk_upsert_async
+from typing import Dict, Any, List, Tuple
+from datetime import datetime, timedelta
+from core.config import NEWS_PER_CATEGORY, NEWS_RETENTION_DAYS
 import pytz
 from email.utils import parsedate_to_datetime # 1. 날짜 파서 임포트
 
 SEOUL_TZ = pytz.timezone("Asia/Seoul")
 
-def get_cached_news_by_code(db: Session, corp_code: str) -> List[CachedNewsArticle]:
-    """L2(RDB)에서 특정 회사의 모든 캐시된 뉴스를 조회합니다. (Fallback 용)"""
-    return (
-        db.query(CachedNewsArticle)
-        .filter(CachedNewsArticle.corp_code == corp_code)
-        .all()
-    )
+NEWS_CONFLICT_COLS = ("corp_code", "category", "link")  # uq_company_category_link
+NEWS_RETENTION = timedelta(days=NEWS_RETENTION_DAYS)
 
-def upsert_news_articles(db: Session, corp_code: str, news_data: Dict[str, List[Dict]]):
-    """
-    L3(Naver)에서 가져온 새 데이터를 L2(RDB)에 덮어씁니다.
-    (이전 캐시를 삭제하고 새로 삽입)
-    """
-    corp_code = "00" + corp_code if len(corp_code) == 6 else corp_code
-    
-    # 1. (Delete) L2의 기존 뉴스 캐시를 모두 삭제
-    db.query(CachedNewsArticle).filter(CachedNewsArticle.corp_code == corp_code).delete(
-        synchronize_session=False
-    )
-    
-    now = datetime.now(SEOUL_TZ)
-    
-    # 2. (Insert) L3의 새 데이터를 L2에 삽입
-    new_articles = []
+def _build_rows(corp_code: str, news_data: Dict[str, List[Dict]], now: datetime) -> List[Dict[str, Any]]:
+    """L3(Naver) 응답을 cached_news_articles 행(dict) 목록으로 변환합니다."""
+    rows = []
     for category, articles in news_data.items():
         for article_dict in articles:
             # Pydantic 모델로 파싱/검증 (dict -> NewsArticle)
@@ -44,17 +30,131 @@ def upsert_news_articles(db: Session, corp_code: str, news_data: Dict[str, List[
             except Exception:
                 dt_object = now # 파싱 실패 시 현재 시간으로 대체
 
-            new_articles.append(
-                CachedNewsArticle(
-                    corp_code=corp_code,
-                    category=category,
-                    title=article_model.title,
-                    link=str(article_model.link), # Pydantic HttpUrl을 str로 변환
-                    pub_date=dt_object,
-                    cached_at=now,
-                )
-            )
-    
-    db.add_all(new_articles)
-    
-    # 3. 트랜잭션은 Service 계층에서 commit/rollback 관리 (여기서는 안 함)
\ No newline at end of file
+            rows.append({
+                "corp_code": corp_code,
+                "category": category,
+                "title": article_model.title,
+                "link": str(article_model.link), # Pydantic HttpUrl을 str로 변환
+                "pub_date": dt_object,
+                "cached_at": now,
+            })
+    return rows
+
+def _normalize_code(corp_code: str) -> str:
+    return "00" + corp_code if len(corp_code) == 6 else corp_code
+
+def _stored_keys_stmt(corp_code: str):
+    return select(CachedNewsArticle.category, CachedNewsArticle.link).where(
+        CachedNewsArticle.corp_code == corp_code
+    )
+
+def _diff(rows: List[Dict[str, Any]], stored_keys) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]:
+    """
+    이번 검색 결과를 저장된 (category, link) 키와 비교합니다.
+    반환: (새로 INSERT 할 행, cached_at 만 갱신할 기존 기사 키)
+    """
+    stored = set(map(tuple, stored_keys))
+    new_rows, current_keys = [], set()
+    for row in rows:
+        key = (row["category"], row["link"])
+        if key in stored:
+            current_keys.add(key)
+        else:
+            new_rows.append(row)
+    return new_rows, list(current_keys)
+
+def _touch_stmt(corp_code: str, keys: List[Tuple[str, str]], now: datetime):
+    """아직 검색 결과에 남아 있는 기사의 cached_at 갱신 (UPDATE 1번)"""
+    return (
+        update(CachedNewsArticle)
+        .where(
+            CachedNewsArticle.corp_code == corp_code,
+            tuple_(CachedNewsArticle.category, CachedNewsArticle.link).in_(keys),
+        )
+        .values(cached_at=now)
+        .execution_options(synchronize_session=False)
+    )
+
+def _now() -> datetime:
+    """
+    저장/정리 기준 시각 (초 단위)
+    MySQL DATETIME(0) 은 소수 초를 반올림해 저장하므로, 그대로 쓰면 방금 저장한 cached_at 이
+    정리 기준(now - 보관 기간)과 어긋날 수 있어 초 단위로 맞춥니다.
+    """
+    return datetime.now(SEOUL_TZ).replace(microsecond=0)
+
+def _expire_stmt(corp_code: str, now: datetime):
+    """보관 기간(NEWS_RETENTION_DAYS) 동안 검색 결과에 다시 보이지 않은 기사 정리"""
+    return delete(CachedNewsArticle).where(
+        CachedNewsArticle.corp_code == corp_code,
+        CachedNewsArticle.cached_at < now - NEWS_RETENTION,
+    )
+
+def _latest_stmt(corp_code: str):
+    """
+    카테고리별 최신 NEWS_PER_CATEGORY 건 (Fallback 용)
+    - 마지막 갱신 때 검색 결과에 있던 기사(cached_at 최신)가 먼저, 그다음 발행일 순
+    """
+    ranked = (
+        select(
+            CachedNewsArticle,
+            func.row_number().over(
+                partition_by=CachedNewsArticle.category,
+                order_by=(
+                    CachedNewsArticle.cached_at.desc(),
+                    CachedNewsArticle.pub_date.desc(),
+                    CachedNewsArticle.id.desc(),
+                ),
+            ).label("rn"),
+        )
+        .where(CachedNewsArticle.corp_code == corp_code)
+        .subquery()
+    )
+    article = aliased(CachedNewsArticle, ranked)
+    return (
+        select(article)
+        .where(ranked.c.rn <= NEWS_PER_CATEGORY)
+        .order_by(ranked.c.category, ranked.c.rn)
+    )
+
+def get_cached_news_by_code(db: Session, corp_code: str) -> List[CachedNewsArticle]:
+    """L2(RDB)에서 특정 회사의 카테고리별 최신 뉴스를 조회합니다. (Fallback 용)"""
+    return list(db.scalars(_latest_stmt(_normalize_code(corp_code))).all())
+
+def upsert_news_articles(db: Session, corp_code: str, news_data: Dict[str, List[Dict]]):
+    """
+    L3(Naver)에서 가져온 새 데이터를 L2(RDB)에 반영합니다. (저장된 키와의 차집합만 기록)
+    - 새 기사만 INSERT, 아직 검색 결과에 있는 기사는 cached_at 만 갱신
+    - 검색 결과에서 빠진 기사는 보관 기간이 지나면 DELETE (그 전까지는 뉴스 이력으로 남음)
+    """
+    corp_code = _normalize_code(corp_code)
+    now = _now()
+
+    stored_keys = db.execute(_stored_keys_stmt(corp_code)).all()
+    new_rows, current_keys = _diff(_build_rows(corp_code, news_data, now), stored_keys)
+    # 동시 갱신으로 이미 들어간 키는 건너뜀 (insert-only)
+    bulk_upsert(db, CachedNewsArticle, new_rows, NEWS_CONFLICT_COLS, update_cols=())
+    if current_keys:
+        db.execute(_touch_stmt(corp_code, current_keys, now))
+    db.execute(_expire_stmt(corp_code, now))
+    # 트랜잭션은 Service 계층에서 commit/rollback 관리 (여기서는 안 함)
+
+
+# --- AsyncSession 버전 (비동기 details 파이프라인용) ---
+
+async def get_cached_news_by_code_async(db: AsyncSession, corp_code: str) -> List[CachedNewsArticle]:
+    """L2(RDB)에서 특정 회사의 카테고리별 최신 뉴스를 조회합니다. (비동기, Fallback 용)"""
+    result = await db.scalars(_latest_stmt(_normalize_code(corp_code)))
+    return list(result.all())
+
+async def upsert_news_articles_async(db: AsyncSession, corp_code: str, news_data: Dict[str, List[Dict]]):
+    """L3(Naver) 데이터를 L2(RDB)에 차집합만 반영합니다. (비동기, commit은 서비스 계층)"""
+    corp_code = _normalize_code(corp_code)
+    now = _now()
+
+    stored_keys = (await db.execute(_stored_keys_stmt(corp_code))).all()
+    new_rows, current_keys = _diff(_build_rows(corp_code, news_data, now), stored_keys)
+    await bulk_upsert_async(db, CachedNewsArticle, new_rows, NEWS_CONFLICT_COLS, update_cols=())
+    if current_keys:
+        await db.execute(_touch_stmt(corp_code, current_keys, now))
+    await db.execute(_expire_stmt(corp_code, now))
@@ -1,8 +1,11 @@
 # services/summary_crud.py
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.summary import Summary
 from schemas.summary import SummaryCreate
+from repository.bulk import bulk_upsert, bulk_upsert_async
 from datetime import datetime
 import pytz
 
@@ -35,21 +38,34 @@ def update_summary(db: Session, data: SummaryCreate) -> Summary:
     return db_obj
 
 
+SUMMARY_CONFLICT_COLS = ("company_name",)  # uq_summaries_company_name
+SUMMARY_UPDATE_COLS = ("summary_text", "input_hash", "updated_at")
+
+def _summary_row(data: SummaryCreate) -> dict:
+    now = datetime.now(SEOUL_TZ)
+    return {**data.dict(), "created_at": now, "updated_at": now}
+
+
 def upsert_summary(db: Session, data: SummaryCreate):
     """
     (수정) 요약 데이터를 Upsert(Update or Insert)합니다.
+    INSERT ... ON DUPLICATE KEY UPDATE 한 문장이라 동시 요청에도 경합(중복 INSERT)이 없습니다.
     (COMMIT은 서비스 계층이 담당합니다.)
     """
-    db_obj = get_recent_summary(db, data.company_name)
-    
-    if db_obj:
-        # (Update)
-        db_obj.summary_text = data.summary_text
-        db_obj.updated_at = datetime.now(SEOUL_TZ)
-    else:
-        # (Insert)
-        db_obj = Summary(**data.dict())
-        db.add(db_obj)
-    
-    # [!] db.commit()을 여기서 호출하지 않습니다.
-    # [!] db.refresh()도 서비스 계층에서 필요시 호출합니다.
+    bulk_upsert(db, Summary, [_summary_row(data)], SUMMARY_CONFLICT_COLS, update_cols=SUMMARY_UPDATE_COLS)
+
+
+# --- AsyncSession 버전 (비동기 details 파이프라인용) ---
+
+async def get_recent_summary_async(db: AsyncSession, company: str) -> Summary | None:
+    result = await db.execute(
+        select(Summary).where(Summary.company_name == company).limit(1)
+    )
+    return result.scalars().first()
+
+
+async def upsert_summary_async(db: AsyncSession, data: SummaryCreate):
+    """요약 데이터를 Upsert 합니다. (비동기, COMMIT은 서비스 계층)"""
+    await bulk_upsert_async(
+        db, Summary, [_summary_row(data)], SUMMARY_CONFLICT_COLS, update_cols=SUMMARY_UPDATE_COLS
+    )
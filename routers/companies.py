@@ -1,11 +1,19 @@
-from fastapi import Depends, APIRouter, HTTPException
+from fastapi import Depends, APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+import redis.asyncio as redis
 from sqlalchemy.orm import Session
-from core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import get_db, get_async_db, SessionLocal, AsyncSessionLocal
+from core.cache import get_redis
 from repository import company_repository
 from services import company_service
-from typing import List
+from services.company_search_index import company_search_index
+from typing import Callable, Iterator, List, Literal, Optional, Tuple
+from pydantic import BaseModel
+from utils.utils import encode_cursor, decode_cursor
 from schemas.company import (
     CompanySearchResult,
+    CompanyAutocompleteResult,
     BestCompanyResult,
     CompanyByIndustry,
     FavoriteCountResult,
@@ -13,43 +21,161 @@ from schemas.company import (
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+INDUSTRY_PAGE_SIZE = 100  # /by-industry 에 cursor 만 준 경우의 페이지 크기
+SEARCH_RELEVANCE_MAX_LIMIT = 100  # /search 관련도 순(페이지 없음)의 최대 limit
 
-"""(DB) 키워드로 회사를 검색합니다."""
+
+def _parse_cursor(cursor: Optional[str]) -> Tuple[str, str] | None:
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _paginate(response: Response, rows: list, limit: int) -> list:
+    """limit+1 개를 조회해 다음 페이지가 있으면 X-Next-Cursor 헤더를 채웁니다."""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.corp_name, last.corp_code)
+    return rows
+
+
+def _stream_ndjson(
+    iter_rows: Callable[[Session], Iterator], schema: type[BaseModel]
+) -> StreamingResponse:
+    """
+    서버 사이드 커서에서 한 행씩 읽어 NDJSON 으로 흘려보냅니다.
+    (응답이 끝날 때까지 세션이 필요하므로 의존성 세션이 아닌 자체 세션 사용)
+    """
+    def generate():
+        db = SessionLocal()
+        try:
+            for row in iter_rows(db):
+                yield schema.from_orm(row).json() + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+"""
+키워드로 회사를 검색합니다.
+- sort=relevance: (Index) prefix / infix / 초성 매치 품질 순 상위 limit 개
+  (limit 최대 SEARCH_RELEVANCE_MAX_LIMIT, 넘으면 422. 더 많이 받으려면 sort=name 페이지 / stream)
+- sort=name: (DB) 회사명 순 keyset 페이지 (cursor, X-Next-Cursor)
+- stream=true: (DB) 회사명 순 전체 결과를 NDJSON 으로 스트리밍
+"""
 @router.get("/search", response_model=List[CompanySearchResult])
-def search_companies(keyword: str, db: Session = Depends(get_db)):
-    companies = company_repository.search_companies_by_keyword(db, keyword)
+def search_companies(
+    response: Response,
+    keyword: str,
+    limit: int = Query(20, ge=1, le=1000),
+    sort: Literal["relevance", "name"] = "relevance",
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    db: Session = Depends(get_db),
+):
+    after = _parse_cursor(cursor)
+    if stream:
+        return _stream_ndjson(
+            lambda s: company_repository.iter_companies_by_keyword(s, keyword, after),
+            CompanySearchResult,
+        )
+
+    if sort == "name" or after is not None:
+        companies = _paginate(
+            response, company_repository.search_companies_page(db, keyword, limit + 1, after), limit
+        )
+        if not companies and after is not None:
+            return []
+    elif limit > SEARCH_RELEVANCE_MAX_LIMIT:
+        # 잘린 목록을 조용히 돌려주지 않도록 (관련도 순은 다음 페이지 cursor 가 없음)
+        raise HTTPException(
+            status_code=422,
+            detail=f"sort=relevance 의 limit 은 {SEARCH_RELEVANCE_MAX_LIMIT} 이하입니다. 더 많은 결과는 sort=name 을 사용하세요.",
+        )
+    elif company_search_index.ready:
+        companies = company_search_index.search(keyword, limit)
+    else:
+        companies = company_repository.search_companies_by_keyword(db, keyword, limit)
     if not companies:
         raise HTTPException(status_code=404, detail="회사를 찾을 수 없습니다.")
     return companies
 
 
-"""(DB) 인기 기업 Top 3를 조회합니다."""
+"""(Index) 검색창 자동완성용 회사명 후보를 조회합니다."""
+@router.get("/autocomplete", response_model=List[CompanyAutocompleteResult])
+def autocomplete_companies(
+    q: str,
+    limit: int = Query(10, ge=1, le=30),
+    db: Session = Depends(get_db),
+):
+    if company_search_index.ready:
+        return company_search_index.search(q, limit)
+    return company_repository.search_companies_by_keyword(db, q, limit)
+
+
+"""(Redis ZSET) 인기 기업 Top N 을 순위와 함께 조회합니다."""
 @router.get("/best", response_model=List[BestCompanyResult])
-def get_best_companies(db: Session = Depends(get_db)):
-    best_results = company_repository.get_best_companies(db, limit=3)
-    if not best_results:
-        return [] 
-    return best_results
+async def get_best_companies(
+    limit: int = Query(3, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    redis_client: redis.Redis = Depends(get_redis),
+):
+    return await company_service.get_best_companies(redis_client, db, AsyncSessionLocal, limit)
 
 
-"""(DB) 산업 코드로 회사 목록을 조회합니다."""
+"""
+(DB) 산업 코드로 회사 목록을 조회합니다.
+- 기본: 전체 목록 (기존 응답 그대로)
+- limit 또는 cursor 를 주면 회사명 순 keyset 페이지 (cursor, X-Next-Cursor)
+- stream=true: 전체 결과를 NDJSON 으로 스트리밍
+"""
 @router.get("/by-industry", response_model=List[CompanyByIndustry])
-def get_companies_by_industry(industry_code: int, db: Session = Depends(get_db)):
-    result = company_repository.get_companies_by_industry_code(db, industry_code)
-    if not result:
-        return [] 
-    return result
+def get_companies_by_industry(
+    response: Response,
+    industry_code: int,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    db: Session = Depends(get_db),
+):
+    after = _parse_cursor(cursor)
+    if stream:
+        return _stream_ndjson(
+            lambda s: company_repository.iter_companies_by_industry(s, industry_code, after),
+            CompanyByIndustry,
+        )
+
+    if limit is None and after is None:
+        return company_repository.get_companies_by_industry_code(db, industry_code)
+
+    limit = limit or INDUSTRY_PAGE_SIZE
+    result = company_repository.get_companies_by_industry_page(db, industry_code, limit + 1, after)
+    return _paginate(response, result, limit)
 
 
 """'좋아요'를 1 증가시킵니다. (Service 호출)"""
 @router.post("/{corp_code}/favorite/add", response_model=FavoriteCountResult)
-def add_favorites(corp_code: int, db: Session = Depends(get_db)):
-    count = company_service.add_favorite_count(db, corp_code)
+async def add_favorites(
+    corp_code: int,
+    db: AsyncSession = Depends(get_async_db),
+    redis_client: redis.Redis = Depends(get_redis),
+):
+    count = await company_service.add_favorite_count(redis_client, db, AsyncSessionLocal, corp_code)
     return {"favorite_count": count}
 
 
 """'좋아요'를 1 감소시킵니다. (Service 호출)"""
 @router.post("/{corp_code}/favorite/subtract", response_model=FavoriteCountResult)
-def sub_favorites(corp_code: int, db: Session = Depends(get_db)):
-    count = company_service.subtract_favorite_count(db, corp_code)
+async def sub_favorites(
+    corp_code: int,
+    db: AsyncSession = Depends(get_async_db),
+    redis_client: redis.Redis = Depends(get_redis),
+):
+    count = await company_service.subtract_favorite_count(redis_client, db, AsyncSessionLocal, corp_code)
     return {"favorite_count": count}
\ No newline at end of file
@@ -1,21 +1,62 @@
 # /routers/details_final.py
 
-from fastapi import APIRouter, Query, Depends
-from sqlalchemy.orm import Session
+import json
+from typing import Literal, Optional
+from fastapi import APIRouter, Query, Depends, Header
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
-from core.database import get_db
+from core.database import get_async_db
 from core.cache import get_redis
+from core.deadline import Deadline
 
 from schemas.details import CompanyDetailResponse 
 from services import details_service # 1단계에서 만든 서비스
 
 router = APIRouter()
 
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def _encode_event(fmt: str, event: str, data) -> str:
+    if fmt == "sse":
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+    return json.dumps({"event": event, "data": data}, ensure_ascii=False, default=str) + "\n"
+
+
+"""
+회사 상세 정보 (개황 + 재무 + 뉴스 + AI 요약)
+- stream 생략: 모든 섹션이 준비된 뒤 한 번에 응답
+- stream=ndjson|sse: 섹션이 준비되는 대로 이벤트로 전송
+  company_info -> financial_data / news_data -> ai_summary_delta(Groq 토큰, 새로 생성할 때만)
+  -> ai_summary(최종 전체 요약) -> meta / 오류 시 error
+- X-Deadline-Ms: (stream 생략 시) 요청 기한. 넘기면 준비된 섹션만 채우고 나머지는 meta 에 degraded/pending
+- (stream 생략 시) 직렬화된 본문을 그대로 응답 (전체 응답 캐시 적중 여부는 X-Cache: HIT/MISS)
+"""
 @router.get("/company-details", response_model=CompanyDetailResponse)
 async def get_integrated_company_details_final(
     name: str = Query(...), 
-    db: Session = Depends(get_db),
+    stream: Optional[Literal["ndjson", "sse"]] = None,
+    x_deadline_ms: Optional[int] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     redis_client: redis.Redis = Depends(get_redis)
 ):
-    
-    return await details_service.get_company_details(name, db, redis_client)
\ No newline at end of file
+    if stream is None:
+        body, hit = await details_service.get_company_details_body(
+            name, db, redis_client, Deadline.from_header(x_deadline_ms)
+        )
+        return Response(content=body, media_type="application/json", headers={"X-Cache": "HIT" if hit else "MISS"})
+
+    # 회사가 없으면 스트림을 열기 전에 404 (DB 세션은 여기까지만 사용)
+    await details_service.prefetch_sections(name, redis_client)
+    company_info = await details_service.get_company_info(name, db, redis_client)
+
+    async def generate():
+        async for event, data in details_service.stream_company_details(name, company_info, redis_client):
+            yield _encode_event(stream, event, data)
+
+    return StreamingResponse(
+        generate(),
+        media_type=STREAM_MEDIA_TYPES[stream],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},  # 프록시 버퍼링 방지
+    )
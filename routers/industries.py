@@ -1,23 +1,34 @@
-from fastapi import Depends, APIRouter, HTTPException
+from fastapi import Depends, APIRouter, HTTPException, Request
 from sqlalchemy.orm import Session
+import redis.asyncio as redis
 from core.database import get_db
-from repository import industry_repository, user_repository
+from core.cache import get_redis
+from repository import user_repository
+from services import industry_service
 from schemas.user import IndustryCategoryNode # 스키마를 사용하셨네요. 좋습니다.
 from typing import List
 
 router = APIRouter()
 
 @router.get("", response_model=List[IndustryCategoryNode])
-def get_all_industries(db: Session = Depends(get_db)):
-    """(DB) 전체 산업 분류 목록을 조회합니다."""
-    industries = industry_repository.get_all_industries(db)
-    # Pydantic 모델(스키마)로 자동 변환
-    return [IndustryCategoryNode.from_orm(ind) for ind in industries]
+async def get_all_industries(request: Request, redis_client: redis.Redis = Depends(get_redis)):
+    """(Cache) 전체 산업 분류 목록을 조회합니다. (사전 직렬화 + ETag)"""
+    snapshot = await industry_service.get_snapshot(redis_client)
+    return industry_service.etag_response(request, snapshot.flat_json, snapshot.flat_etag)
+
+@router.get("/tree")
+async def get_industry_tree(request: Request, redis_client: redis.Redis = Depends(get_redis)):
+    """(Cache) 5단계 산업 분류 트리(child_count 포함)를 조회합니다. (사전 직렬화 + ETag)"""
+    snapshot = await industry_service.get_snapshot(redis_client)
+    return industry_service.etag_response(request, snapshot.tree_json, snapshot.tree_etag)
 
 @router.get("/code")
-def get_industry_code_from_name(name: str, level: int, db: Session = Depends(get_db)):
-    """(DB) 산업 이름과 레벨로 산업 코드를 조회합니다."""
-    code = industry_repository.get_industry_code_by_name_and_level(db, name, level)
+async def get_industry_code_from_name(
+    name: str, level: int, redis_client: redis.Redis = Depends(get_redis)
+):
+    """(Cache) 산업 이름과 레벨로 산업 코드를 조회합니다."""
+    snapshot = await industry_service.get_snapshot(redis_client)
+    code = snapshot.lookup.get((name, level + 1))
     if not code:
         raise HTTPException(status_code=404, detail="산업 코드를 찾을 수 없습니다.")
     return {"code": code}
@@ -28,4 +39,4 @@ def get_user_industry_preferences(user_id: int, db: Session = Depends(get_db)):
     preferences = user_repository.get_user_preferences_by_id(db, user_id)
     if not preferences:
         raise HTTPException(status_code=404, detail="사용자의 관심 산업 정보를 찾을 수 없습니다.")
-    return preferences
\ No newline at end of file
+    return preferences
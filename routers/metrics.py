@@ -0,0 +1,81 @@
+# /routers/metrics.py
+
+from fastapi import APIRouter, Depends
+import redis.asyncio as redis
+from core.http_client import http_clients
+from core.cache import codec, local_cache, get_redis
+from core.resilience import upstream_stats
+from clients.naver_news_client import naver_scheduler
+from services.company_search_index import company_search_index
+from services.refresh_ahead import refresh_ahead
+from services.summary_service import summary_cache_stats
+from services.groq_service import groq_gateway
+from services.details_service import deadline_stats, details_redis_stats
+
+router = APIRouter()
+
+
+@router.get("/http-pools")
+async def get_http_pool_stats():
+    """업스트림별 HTTP 커넥션 풀 상태 (limits 튜닝용)"""
+    return http_clients.stats()
+
+
+@router.get("/cache")
+async def get_local_cache_stats():
+    """(L0) 워커 로컬 캐시의 네임스페이스별 hit / miss / eviction 카운터"""
+    return local_cache.stats()
+
+
+@router.get("/cache-codec")
+async def get_cache_codec_stats():
+    """Redis 캐시 값 코덱: 설정 + 네임스페이스별 쓰기 수 / 직렬화·저장 바이트 / 압축 절감률 / 이전 형식 읽기 (이 워커 기준)"""
+    return codec.stats()
+
+
+@router.get("/search-index")
+async def get_search_index_stats():
+    """회사명 검색 인덱스 상태"""
+    return company_search_index.stats()
+
+
+@router.get("/naver-quota")
+async def get_naver_quota_stats(redis_client: redis.Redis = Depends(get_redis)):
+    """Naver 검색 API 스케줄러: 대기열 깊이 / 우선순위별 허가·대기·거절 / 오늘 일일 한도 사용량"""
+    return await naver_scheduler.stats(redis_client)
+
+
+@router.get("/refresh-ahead")
+async def get_refresh_ahead_stats():
+    """인기 회사 refresh-ahead 스케줄러 (이 워커가 리더였던 주기 기준)"""
+    return refresh_ahead.stats()
+
+
+@router.get("/summary-cache")
+async def get_summary_cache_stats():
+    """AI 요약 입력 지문 캐시: 조회 / 적중(Redis·DB) / 생성 / 절약한 LLM 호출 (이 워커 기준)"""
+    return summary_cache_stats()
+
+
+@router.get("/llm")
+async def get_llm_gateway_stats():
+    """LLM 게이트웨이: 동시 호출 / 대기열 / 모델 전환 횟수 / 모델별 지연(p50·p95·p99)·오류율·토큰 사용 (이 워커 기준)"""
+    return groq_gateway.stats()
+
+
+@router.get("/upstreams")
+async def get_upstream_stats():
+    """업스트림별 회로 차단기 상태 / 재시도 / hedging 횟수 (이 워커 기준)"""
+    return upstream_stats()
+
+
+@router.get("/deadlines")
+async def get_deadline_stats():
+    """details 요청 기한: 단계별 초과 / L2 대체(degraded) / 미완(pending) 횟수 (이 워커 기준)"""
+    return deadline_stats.stats()
+
+
+@router.get("/details-redis")
+async def get_details_redis_stats():
+    """details(stream 생략) 요청당 Redis 명령 / 왕복 수와 프리페치로 L0 에 채운 키 수 (이 워커 기준)"""
+    return details_redis_stats()
@@ -27,6 +27,7 @@ class CompanySearchResult(CompanyBase):
 class BestCompanyResult(CompanyBase):
     favorite_count: Optional[int] = 0
     category: Optional[str] = None
+    rank: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -39,5 +40,9 @@ class CompanyByIndustry(CompanyBase):
     class Config:
         from_attributes = True
 
+class CompanyAutocompleteResult(CompanyBase):
+    class Config:
+        from_attributes = True
+
 class FavoriteCountResult(BaseModel):
     favorite_count: int
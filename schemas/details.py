@@ -1,11 +1,20 @@
 # /schemas/details.py
 
-from pydantic import BaseModel
-from typing import Dict
+from pydantic import BaseModel, Field
+from typing import Dict, Literal
 from schemas.company import CompanyInfo
 from schemas.news import AllNewsResponse
 from schemas.summary import RawFinancialEntry
 
+# fresh: soft TTL 이내 / stale: soft~hard TTL 사이 값 (백그라운드 갱신 중)
+# degraded: 요청 기한 안에 준비되지 않아 L2(DB) 의 마지막 값으로 대체
+# pending: 기한 안에 준비되지 않았고 대체할 값도 없음 (빈 값, 백그라운드에서 계속 준비 중)
+SectionFreshness = Literal["fresh", "stale", "degraded", "pending"]
+
+class DetailMeta(BaseModel):
+    """섹션별 데이터 신선도 메타데이터"""
+    sections: Dict[str, SectionFreshness] = Field(default_factory=dict)
+
 class CompanyDetailResponse(BaseModel):
     """
     /details/company-details 엔드포인트의 
@@ -14,4 +23,5 @@ class CompanyDetailResponse(BaseModel):
     company_info: CompanyInfo
     financial_data: Dict[str, RawFinancialEntry]
     news_data: AllNewsResponse
-    ai_summary: str
\ No newline at end of file
+    ai_summary: str
+    meta: DetailMeta = Field(default_factory=DetailMeta)
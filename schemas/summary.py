@@ -9,6 +9,7 @@ class SummaryBase(BaseModel):
 
 class SummaryCreate(SummaryBase):
     summary_text: str
+    input_hash: Optional[str] = None
 
 
 class NewsArticle(BaseModel):
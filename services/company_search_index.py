@@ -0,0 +1,286 @@
+# /services/company_search_index.py
+
+import asyncio
+import bisect
+import heapq
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+from fastapi.logger import logger
+
+from core.database import SessionLocal
+from repository import company_repository
+
+# 한글 음절의 초성 (유니코드 '가'(0xAC00) 부터 588 자 단위)
+CHOSUNG = [
+    "ㄱ", "ㄲ", "ㄴ", "ㄷ", "ㄸ", "ㄹ", "ㅁ", "ㅂ", "ㅃ",
+    "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅉ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+]
+_CHOSUNG_SET = set(CHOSUNG)
+
+# 매치 품질 (작을수록 우선)
+EXACT, PREFIX, INFIX, CHOSUNG_PREFIX, CHOSUNG_INFIX = range(5)
+
+
+def normalize_name(text: str) -> str:
+    """대소문자/공백 차이를 무시하기 위한 정규화"""
+    return "".join(text.lower().split())
+
+
+def to_chosung(text: str) -> str:
+    """'삼성전자' -> 'ㅅㅅㅈㅈ' (한글 음절이 아닌 문자는 그대로)"""
+    result = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        result.append(CHOSUNG[code // 588] if 0 <= code < 11172 else ch)
+    return "".join(result)
+
+
+def is_chosung_query(text: str) -> bool:
+    return bool(text) and all(ch in _CHOSUNG_SET for ch in text)
+
+
+def _grams(text: str) -> Set[str]:
+    """1-gram + 2-gram (한 글자 검색어도 후보를 좁힐 수 있도록)"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+@dataclass
+class IndexedCompany:
+    corp_code: str
+    corp_name: str
+    favorite_count: int
+    hm_url: str | None
+    category: str | None
+    logo: str | None
+    key: str = ""
+    chosung: str = ""
+
+
+class _IndexState(NamedTuple):
+    entries: Dict[str, IndexedCompany]
+    prefix: List[Tuple[str, str]]             # (정규화 이름, corp_code) 정렬 목록
+    chosung_prefix: List[Tuple[str, str]]     # (초성 문자열, corp_code) 정렬 목록
+    grams: Dict[str, Set[str]]                # n-gram -> corp_code
+    chosung_grams: Dict[str, Set[str]]
+
+
+def _empty_state() -> _IndexState:
+    return _IndexState({}, [], [], defaultdict(set), defaultdict(set))
+
+
+class CompanySearchIndex:
+    """
+    company_overview 회사명 인메모리 검색 인덱스.
+    - prefix: 정렬 목록 + 이진 탐색
+    - infix: 1/2-gram 역색인 교집합 후 부분 문자열 검증
+    - 초성: 'ㅅㅅㅈㅈ' 같은 초성 검색어를 초성 문자열에 대해 prefix/infix 매칭
+    매치 품질 → favorite_count → 이름 길이 순으로 정렬해 limit 개만 반환합니다.
+    (동기 라우터는 스레드 풀에서 실행되므로 모든 접근은 락으로 보호)
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._state = _empty_state()
+        self.ready = False
+
+    # --- 구축 / 갱신 ---
+
+    @staticmethod
+    def _prepare(company: IndexedCompany) -> IndexedCompany:
+        company.key = normalize_name(company.corp_name or "")
+        company.chosung = to_chosung(company.key)
+        return company
+
+    @staticmethod
+    def _add(state: _IndexState, company: IndexedCompany, sorted_insert: bool = True):
+        state.entries[company.corp_code] = company
+        if sorted_insert:
+            bisect.insort(state.prefix, (company.key, company.corp_code))
+            bisect.insort(state.chosung_prefix, (company.chosung, company.corp_code))
+        else:
+            state.prefix.append((company.key, company.corp_code))
+            state.chosung_prefix.append((company.chosung, company.corp_code))
+        for gram in _grams(company.key):
+            state.grams[gram].add(company.corp_code)
+        for gram in _grams(company.chosung):
+            state.chosung_grams[gram].add(company.corp_code)
+
+    @staticmethod
+    def _remove(state: _IndexState, corp_code: str):
+        company = state.entries.pop(corp_code, None)
+        if company is None:
+            return
+        for sorted_list, value in (
+            (state.prefix, company.key), (state.chosung_prefix, company.chosung)
+        ):
+            i = bisect.bisect_left(sorted_list, (value, corp_code))
+            if i < len(sorted_list) and sorted_list[i] == (value, corp_code):
+                sorted_list.pop(i)
+        for postings, text in ((state.grams, company.key), (state.chosung_grams, company.chosung)):
+            for gram in _grams(text):
+                codes = postings.get(gram)
+                if codes is not None:
+                    codes.discard(corp_code)
+                    if not codes:
+                        del postings[gram]
+
+    def build(self, companies: Iterable[IndexedCompany]):
+        """전체 재구축 (새 상태를 만든 뒤 한 번에 교체)"""
+        state = _empty_state()
+        for company in companies:
+            self._add(state, self._prepare(company), sorted_insert=False)
+        state.prefix.sort()
+        state.chosung_prefix.sort()
+        with self._lock:
+            self._state = state
+            self.ready = True
+
+    def upsert(self, company: IndexedCompany):
+        """한 회사 추가/갱신. 이름이 그대로면 색인은 두고 필드만 교체합니다."""
+        company = self._prepare(company)
+        with self._lock:
+            state = self._state
+            current = state.entries.get(company.corp_code)
+            if current is not None and current.key == company.key:
+                state.entries[company.corp_code] = company
+                return
+            self._remove(state, company.corp_code)
+            self._add(state, company)
+
+    def remove(self, corp_code: str):
+        with self._lock:
+            self._remove(self._state, corp_code)
+
+    def apply_rows(self, companies: Iterable[IndexedCompany]) -> Dict[str, int]:
+        """
+        DB 에서 다시 읽은 전체 행과 비교해 바뀐 회사만 색인에 반영합니다. (전체 재적재 + 차이 반영)
+        DB 읽기는 매번 전체이고, 색인 재구성(gram / 정렬 목록)만 바뀐 회사로 한정됩니다.
+        """
+        with self._lock:
+            current = dict(self._state.entries)
+        changed = removed = 0
+        seen = set()
+        for company in companies:
+            seen.add(company.corp_code)
+            old = current.get(company.corp_code)
+            if old is None or (
+                old.corp_name, old.favorite_count, old.hm_url, old.category, old.logo
+            ) != (
+                company.corp_name, company.favorite_count, company.hm_url, company.category, company.logo
+            ):
+                self.upsert(company)
+                changed += 1
+        for corp_code in current.keys() - seen:
+            self.remove(corp_code)
+            removed += 1
+        return {"changed": changed, "removed": removed}
+
+    # --- 조회 ---
+
+    @staticmethod
+    def _prefix_codes(sorted_list: List[Tuple[str, str]], query: str) -> Iterable[str]:
+        i = bisect.bisect_left(sorted_list, (query, ""))
+        while i < len(sorted_list) and sorted_list[i][0].startswith(query):
+            yield sorted_list[i][1]
+            i += 1
+
+    @staticmethod
+    def _infix_codes(postings: Dict[str, Set[str]], query: str) -> Set[str]:
+        grams = sorted(_grams(query), key=lambda g: len(postings.get(g, ())))
+        if not grams:
+            return set()
+        codes = set(postings.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not codes:
+                break
+            codes &= postings.get(gram, set())
+        return codes
+
+    def search(self, keyword: str, limit: int = 20) -> List[IndexedCompany]:
+        query = normalize_name(keyword)
+        if not query:
+            return []
+
+        with self._lock:
+            state = self._state
+            ranks: Dict[str, int] = {}
+
+            if is_chosung_query(query):
+                for code in self._prefix_codes(state.chosung_prefix, query):
+                    ranks[code] = CHOSUNG_PREFIX
+                for code in self._infix_codes(state.chosung_grams, query):
+                    if code not in ranks and query in state.entries[code].chosung:
+                        ranks[code] = CHOSUNG_INFIX
+            else:
+                for code in self._prefix_codes(state.prefix, query):
+                    ranks[code] = EXACT if state.entries[code].key == query else PREFIX
+                for code in self._infix_codes(state.grams, query):
+                    if code not in ranks and query in state.entries[code].key:
+                        ranks[code] = INFIX
+
+            entries = state.entries
+            return heapq.nsmallest(
+                limit,
+                (entries[code] for code in ranks),
+                key=lambda c: (ranks[c.corp_code], -(c.favorite_count or 0), len(c.key), c.key),
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "companies": len(self._state.entries),
+                "grams": len(self._state.grams),
+                "chosung_grams": len(self._state.chosung_grams),
+            }
+
+    # --- DB 연동 ---
+
+    @staticmethod
+    def load_rows() -> List[IndexedCompany]:
+        db = SessionLocal()
+        try:
+            return [
+                IndexedCompany(
+                    corp_code=row.corp_code,
+                    corp_name=row.corp_name or "",
+                    favorite_count=row.favorite_count or 0,
+                    hm_url=row.hm_url,
+                    category=row.induty_name,
+                    logo=row.logo,
+                )
+                for row in company_repository.get_search_index_rows(db)
+            ]
+        finally:
+            db.close()
+
+    def refresh_from_db(self):
+        """
+        (스레드에서 실행) 최초엔 전체 구축, 이후엔 전체 행을 다시 읽어 차이만 반영
+        company_overview 에 변경 표시 컬럼이 없어 주기마다 전체 테이블을 읽습니다.
+        (~100k 행 기준 주기당 비용은 benchmarks/bench_company_search.py 의 refresh 항목)
+        """
+        rows = self.load_rows()
+        if not self.ready:
+            self.build(rows)
+            logger.info(f"[SEARCH] 회사 검색 인덱스 구축 완료: {len(rows)}개")
+        else:
+            result = self.apply_rows(rows)
+            if result["changed"] or result["removed"]:
+                logger.info(f"[SEARCH] 회사 검색 인덱스 갱신: {result}")
+
+    async def refresh_forever(self, interval: float):
+        """lifespan 에서 실행되는 주기적 갱신 루프"""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh_from_db)
+            except Exception as e:
+                logger.error(f"[SEARCH] 회사 검색 인덱스 갱신 실패: {e}")
+            await asyncio.sleep(interval)
+
+
+company_search_index = CompanySearchIndex()
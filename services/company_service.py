@@ -1,25 +1,280 @@
+import asyncio
+import uuid
+import redis.asyncio as redis
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from fastapi.logger import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from typing import Dict, List, Set
+
+from core.cache import redis_pool
+from core.lock import RedisLock, wait_for_release
 from repository import company_repository
 
-def add_favorite_count(db: Session, corp_code: int) -> int:
-    """회사의 '좋아요' 수를 1 원자적으로 증가시킵니다."""
-    rows_affected = company_repository.atomic_add_favorite_count(db, corp_code)
-    if rows_affected == 0:
-        raise HTTPException(status_code=404, detail="해당 기업을 찾을 수 없습니다.")
-    
-    db.commit()
-
-    data = company_repository.get_company_by_code(db, corp_code)
-    return data.favorite_count
-
-def subtract_favorite_count(db: Session, corp_code: int) -> int:
-    """회사의 '좋아요' 수를 1 원자적으로 감소시킵니다."""
-    rows_affected = company_repository.atomic_subtract_favorite_count(db, corp_code)
-    if rows_affected == 0:
-        raise HTTPException(status_code=404, detail="기업을 찾을 수 없거나 '좋아요'가 0입니다.")
-        
-    db.commit()
-    
-    data = company_repository.get_company_by_code(db, corp_code)
-    return data.favorite_count
\ No newline at end of file
+# '좋아요' 카운터는 Redis Sorted Set 이 원본이고, MySQL 에는 주기적으로 증감분만 반영 (write-behind)
+FAVORITES_KEY = "companies:favorites"                    # ZSET corp_code -> count
+FAVORITES_DELTA_KEY = "companies:favorites:delta"        # HASH corp_code -> 미반영 증감분
+FAVORITES_FLUSHING_KEY = "companies:favorites:delta:flushing"
+FLUSH_BATCH_FIELD = "__batch__"                          # flushing 해시 안의 묶음 식별자 (MySQL 반영 여부 확인용)
+FAVORITES_READY_KEY = "companies:favorites:ready"        # MySQL 로부터 재구축 완료 표시
+REBUILD_LOCK_KEY = "companies:favorites:rebuild_lock"
+FLUSH_LOCK_KEY = "companies:favorites:flush_lock"
+REBUILD_LOCK_TTL = 60
+REBUILD_WAIT_TIMEOUT = 10
+FLUSH_LOCK_TTL = 30
+REBUILD_BATCH = 5000
+
+# 회사가 없으면 -1, 0 에서 감소 시도면 -2, 아니면 변경 후 count
+_INCR_SCRIPT = """
+local current = redis.call('zscore', KEYS[1], ARGV[1])
+if not current then return -1 end
+local delta = tonumber(ARGV[2])
+if delta < 0 and tonumber(current) + delta < 0 then return -2 end
+redis.call('hincrby', KEYS[2], ARGV[1], delta)
+return tonumber(redis.call('zincrby', KEYS[1], delta, ARGV[1]))
+"""
+
+
+# Redis 장애로 MySQL 에 바로 반영한 회사 (Redis 가 돌아오면 ZSET 점수를 다시 맞춤, 워커별)
+_diverged: Set[str] = set()
+
+
+def _member(corp_code: int | str) -> str:
+    """company_overview.corp_code 는 8자리 문자열 ('00126380')"""
+    return f"{int(corp_code):08d}"
+
+
+def _pending_deltas(pending: Dict[str, str]) -> Dict[str, int]:
+    return {code: int(delta) for code, delta in pending.items() if code != FLUSH_BATCH_FIELD and int(delta)}
+
+
+async def _rebuild_from_db(redis_client: redis.Redis, SessionLocal: async_sessionmaker):
+    async with SessionLocal() as db:
+        counts = await company_repository.get_all_favorite_counts_async(db)
+
+    tmp_key = f"{FAVORITES_KEY}:rebuilding"
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.delete(tmp_key)
+        for i in range(0, len(counts), REBUILD_BATCH):
+            pipe.zadd(tmp_key, {code: count for code, count in counts[i:i + REBUILD_BATCH]})
+        await pipe.execute()
+
+    async with redis_client.pipeline(transaction=True) as pipe:
+        if counts:
+            pipe.rename(tmp_key, FAVORITES_KEY)
+        pipe.set(FAVORITES_READY_KEY, "1")
+        await pipe.execute()
+    logger.info(f"[FAVORITES] MySQL 에서 랭킹 재구축: {len(counts)}개")
+
+
+async def _reconcile(redis_client: redis.Redis, SessionLocal: async_sessionmaker):
+    """
+    Redis 장애 중 MySQL 에 바로 반영한 회사의 ZSET 점수를 다시 맞춥니다.
+    점수 = MySQL 값 + 아직 반영 전인 증감분(delta 해시, 반영 전인 flushing 해시)
+    """
+    codes = list(_diverged)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.hmget(FAVORITES_DELTA_KEY, codes)
+        pipe.hmget(FAVORITES_FLUSHING_KEY, codes)
+        pipe.hget(FAVORITES_FLUSHING_KEY, FLUSH_BATCH_FIELD)
+        pending, flushing, batch_id = await pipe.execute()
+
+    async with SessionLocal() as db:
+        counts = {c.corp_code: c.favorite_count or 0 for c in await company_repository.get_companies_by_codes_async(db, codes)}
+        flushing_applied = batch_id is None or await company_repository.is_favorite_batch_applied_async(db, batch_id)
+
+    scores = {}
+    for code, delta, flushing_delta in zip(codes, pending, flushing):
+        if code in counts:
+            scores[code] = counts[code] + int(delta or 0) + (0 if flushing_applied else int(flushing_delta or 0))
+    if scores:
+        await redis_client.zadd(FAVORITES_KEY, scores)
+    _diverged.difference_update(codes)
+    logger.info(f"[FAVORITES] MySQL 직접 반영분 랭킹 재조정: {len(scores)}개")
+
+
+async def ensure_leaderboard(redis_client: redis.Redis, SessionLocal: async_sessionmaker) -> bool:
+    """
+    Redis 랭킹이 없으면(최초 기동/Redis 유실) MySQL 에서 재구축합니다.
+    Redis 장애 중 MySQL 에 바로 반영한 회사가 있으면 점수를 다시 맞춥니다.
+    (Redis 오류는 호출자에게 그대로 전달 → MySQL 경로)
+    """
+    if await redis_client.exists(FAVORITES_READY_KEY):
+        if _diverged:
+            await _reconcile(redis_client, SessionLocal)
+        return True
+
+    lock = RedisLock(redis_client, REBUILD_LOCK_KEY, ttl=REBUILD_LOCK_TTL)
+    if not await lock.acquire():
+        ready = await wait_for_release(
+            redis_client,
+            REBUILD_LOCK_KEY,
+            lambda: _ready_or_none(redis_client),
+            REBUILD_WAIT_TIMEOUT,
+        )
+        return ready is not None
+    try:
+        if not await redis_client.exists(FAVORITES_READY_KEY):
+            await _rebuild_from_db(redis_client, SessionLocal)
+            _diverged.clear()  # 재구축한 랭킹은 MySQL 값 그대로
+        return True
+    except redis.RedisError:
+        raise
+    except Exception as e:
+        logger.error(f"[FAVORITES] 랭킹 재구축 실패: {e}")
+        return False
+    finally:
+        await lock.release()
+
+
+async def _ready_or_none(redis_client: redis.Redis):
+    return True if await redis_client.exists(FAVORITES_READY_KEY) else None
+
+
+async def _incr(redis_client: redis.Redis, member: str, delta: int) -> int:
+    return int(await redis_client.eval(_INCR_SCRIPT, 2, FAVORITES_KEY, FAVORITES_DELTA_KEY, member, delta))
+
+
+async def _seed_and_incr(redis_client: redis.Redis, db: AsyncSession, member: str, delta: int) -> int:
+    """랭킹 구축 이후 추가된 회사: MySQL 값으로 ZSET 에 넣은 뒤 다시 증감합니다. (없는 회사면 -1)"""
+    company = await company_repository.get_company_by_code_async(db, member)
+    if company is None:
+        return -1
+    await redis_client.zadd(FAVORITES_KEY, {member: company.favorite_count or 0}, nx=True)
+    return await _incr(redis_client, member, delta)
+
+
+async def _change_favorite_count(
+    redis_client: redis.Redis, db: AsyncSession, SessionLocal: async_sessionmaker,
+    corp_code: int, delta: int, not_found_detail: str,
+) -> int:
+    member = _member(corp_code)
+    try:
+        if await ensure_leaderboard(redis_client, SessionLocal):
+            result = await _incr(redis_client, member, delta)
+            if result == -1:
+                result = await _seed_and_incr(redis_client, db, member, delta)
+            if result < 0:
+                raise HTTPException(status_code=404, detail=not_found_detail)
+            return result
+    except redis.RedisError as e:
+        logger.warning(f"[FAVORITES] Redis 사용 불가, MySQL 에 바로 반영: {e}")
+
+    # Redis 랭킹을 쓸 수 없으면 MySQL 에 바로 반영 (Redis 가 돌아오면 랭킹 점수를 다시 맞춤)
+    rows_affected = await company_repository.apply_favorite_deltas_async(db, {member: delta})
+    company = await company_repository.get_company_by_code_async(db, member)
+    if rows_affected == 0 or company is None or (company.favorite_count or 0) < 0:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    await db.commit()
+    _diverged.add(member)
+    return company.favorite_count
+
+
+async def add_favorite_count(
+    redis_client: redis.Redis, db: AsyncSession, SessionLocal: async_sessionmaker, corp_code: int
+) -> int:
+    """회사의 '좋아요' 수를 1 원자적으로 증가시킵니다. (Redis ZINCRBY, MySQL 은 주기적 반영)"""
+    return await _change_favorite_count(
+        redis_client, db, SessionLocal, corp_code, 1, "해당 기업을 찾을 수 없습니다."
+    )
+
+
+async def subtract_favorite_count(
+    redis_client: redis.Redis, db: AsyncSession, SessionLocal: async_sessionmaker, corp_code: int
+) -> int:
+    """회사의 '좋아요' 수를 1 원자적으로 감소시킵니다. (0 미만으로는 내려가지 않음)"""
+    return await _change_favorite_count(
+        redis_client, db, SessionLocal, corp_code, -1, "기업을 찾을 수 없거나 '좋아요'가 0입니다."
+    )
+
+
+async def get_best_companies(
+    redis_client: redis.Redis, db: AsyncSession, SessionLocal: async_sessionmaker, limit: int
+) -> List[Dict]:
+    """'좋아요' 상위 N개 회사를 순위(rank)와 함께 반환합니다. (Redis 를 쓸 수 없으면 MySQL)"""
+    top = None
+    try:
+        if await ensure_leaderboard(redis_client, SessionLocal):
+            top = await redis_client.zrevrange(FAVORITES_KEY, 0, limit - 1, withscores=True)
+    except redis.RedisError as e:
+        logger.warning(f"[FAVORITES] Redis 사용 불가, MySQL 에서 조회: {e}")
+
+    if top is not None:
+        companies = {
+            c.corp_code: c
+            for c in await company_repository.get_companies_by_codes_async(db, [code for code, _ in top])
+        }
+        ranked = [(companies[code], int(score)) for code, score in top if code in companies]
+    else:
+        ranked = [
+            (c, c.favorite_count or 0)
+            for c in await company_repository.get_best_companies_async(db, limit)
+        ]
+
+    return [
+        {
+            "corp_code": company.corp_code,
+            "corp_name": company.corp_name,
+            "logo": company.logo,
+            "category": company.category,
+            "favorite_count": count,
+            "rank": rank,
+        }
+        for rank, (company, count) in enumerate(ranked, start=1)
+    ]
+
+
+async def flush_favorite_deltas(redis_client: redis.Redis, SessionLocal: async_sessionmaker) -> int:
+    """
+    Redis 에 쌓인 증감분을 MySQL 에 일괄 반영합니다.
+    - 증감 해시를 flushing 키로 RENAME 해서 이후 증감과 분리하고, 묶음 식별자(FLUSH_BATCH_FIELD)를 붙임
+    - 증감 반영과 묶음 기록을 같은 트랜잭션에서 commit → commit 뒤 flushing 키 삭제 전에 죽어도
+      다음 주기에 같은 묶음을 다시 적용하지 않음
+    - DB 반영 실패 시 flushing 분을 남겨 두고 다음 주기에 같은 묶음으로 재시도
+    """
+    lock = RedisLock(redis_client, FLUSH_LOCK_KEY, ttl=FLUSH_LOCK_TTL)
+    if not await lock.acquire():
+        return 0  # 다른 워커가 반영 중
+    try:
+        # 이전 주기에 남은 flushing 분이 없을 때만 새로 분리
+        if not await redis_client.exists(FAVORITES_FLUSHING_KEY):
+            if not await redis_client.exists(FAVORITES_DELTA_KEY):
+                return 0
+            await redis_client.renamenx(FAVORITES_DELTA_KEY, FAVORITES_FLUSHING_KEY)
+        await redis_client.hsetnx(FAVORITES_FLUSHING_KEY, FLUSH_BATCH_FIELD, uuid.uuid4().hex)
+
+        pending = await redis_client.hgetall(FAVORITES_FLUSHING_KEY)
+        batch_id = pending[FLUSH_BATCH_FIELD]
+        deltas = _pending_deltas(pending)
+
+        try:
+            async with SessionLocal() as db:
+                if await company_repository.is_favorite_batch_applied_async(db, batch_id):
+                    logger.info(f"[FAVORITES] 이미 반영된 묶음({batch_id}), 정리만 합니다.")
+                    deltas = {}
+                else:
+                    await company_repository.apply_favorite_deltas_async(db, deltas)
+                    await company_repository.record_favorite_batch_async(db, batch_id)
+                    await db.commit()
+        except Exception as e:
+            # flushing 분은 그대로 두고 다음 주기에 같은 묶음으로 재시도 (이미 commit 됐다면 건너뜀)
+            logger.error(f"[FAVORITES] MySQL 반영 실패, 다음 주기에 재시도: {e}")
+            return 0
+
+        await redis_client.delete(FAVORITES_FLUSHING_KEY)
+        return len(deltas)
+    finally:
+        await lock.release()
+
+
+async def flush_favorites_forever(SessionLocal: async_sessionmaker, interval: float):
+    """lifespan 에서 실행되는 주기적 write-behind 반영 루프"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with redis.Redis(connection_pool=redis_pool) as redis_client:
+                flushed = await flush_favorite_deltas(redis_client, SessionLocal)
+            if flushed:
+                logger.info(f"[FAVORITES] MySQL 반영: {flushed}개 회사")
+        except Exception as e:
+            logger.error(f"[FAVORITES] 주기적 반영 실패: {e}")
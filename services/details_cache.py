@@ -0,0 +1,58 @@
+# /services/details_cache.py
+
+"""
+details 전체 응답 캐시 (직렬화가 끝난 JSON 본문).
+
+- details:response:{name} = "{corp_code}|{JSON 본문}" (L0 + Redis, cache_get / cache_set)
+  적중하면 섹션 캐시 조회 / Pydantic 검증 / 직렬화 없이 본문을 그대로 응답합니다.
+- 모든 섹션이 fresh 인 응답만 DETAILS_RESPONSE_TTL 동안 저장 (stale / degraded / pending 은 저장하지 않음)
+- 섹션 캐시가 바뀌면 무효화: 회사명으로 바로, 또는 details:alias:{corp_code} 로 회사명을 찾아 삭제
+  (무효화는 모든 워커의 L0 에도 전파. 조립 중에 섹션이 바뀌는 경합은 TTL 로 제한)
+"""
+
+import redis.asyncio as redis
+from typing import Tuple
+
+from core.cache import cache_get, cache_set, cache_delete
+from core.config import DETAILS_RESPONSE_TTL
+
+
+def _response_key(name: str) -> str:
+    return f"details:response:{name}"
+
+
+def _alias_key(corp_code: str) -> str:
+    return f"details:alias:{corp_code}"
+
+
+def _loads(raw: str) -> Tuple[str, str]:
+    corp_code, _, body = raw.partition("|")
+    return corp_code, body
+
+
+async def get_cached_response(redis_client: redis.Redis, name: str) -> Tuple[str, str] | None:
+    """(corp_code, JSON 본문) 또는 None"""
+    if DETAILS_RESPONSE_TTL <= 0:
+        return None
+    return await cache_get(redis_client, _response_key(name), loads=_loads)
+
+
+async def cache_response(redis_client: redis.Redis, name: str, corp_code: str, body: str):
+    if DETAILS_RESPONSE_TTL <= 0:
+        return
+    await redis_client.set(_alias_key(corp_code), name, ex=DETAILS_RESPONSE_TTL)
+    await cache_set(
+        redis_client, _response_key(name), (corp_code, body), ex=DETAILS_RESPONSE_TTL,
+        dumps=lambda value: f"{value[0]}|{value[1]}",
+    )
+
+
+async def invalidate_by_name(redis_client: redis.Redis, name: str):
+    await cache_delete(redis_client, _response_key(name))
+
+
+async def invalidate_by_corp_code(redis_client: redis.Redis, corp_code: str):
+    """회사명을 모르는 쪽(재무 등)에서 쓰는 무효화"""
+    name = await redis_client.get(_alias_key(corp_code))
+    if name:
+        await invalidate_by_name(redis_client, name)
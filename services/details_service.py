@@ -2,81 +2,208 @@
 
 import asyncio 
 import json
+from contextlib import aclosing
 from fastapi import HTTPException
 from fastapi.logger import logger
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
-from typing import Dict, List, Any
-from core.database import SessionLocal
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from core.database import AsyncSessionLocal
+from core.cache import cache_get, cache_set, cache_prefetch, count_redis_commands
+from core.config import DETAILS_FETCH_SHARE, DETAILS_FALLBACK_GRACE, DETAILS_PREFETCH, L0_CACHE_MAX_ENTRIES
+from core.local_cache import LocalCache
+from core.deadline import Deadline, DeadlineStats
+from core.tasks import spawn_background
 
 from repository import company_repository 
 from services.financial_service import FinancialService
 from services.news_service import NewsService
-from services.summary_service import SummaryService
+from services.summary_service import SummaryService, SUMMARY_DELTA, SUMMARY_FINAL
+from services.refresh_ahead import record_access
+from services import details_cache
 from schemas.company import CompanyInfo
-from schemas.details import CompanyDetailResponse 
+from schemas.details import CompanyDetailResponse, DetailMeta
 from schemas.summary import RawFinancialEntry
 from schemas.news import NewsArticle
 
 INFO_TTL = 86400
+SUMMARY_PENDING_TEXT = "AI 요약을 준비 중입니다. 잠시 후 다시 확인해주세요."
 
-async def get_company_details(
-    name: str, 
-    db: Session,
-    redis_client: redis.Redis
-) -> CompanyDetailResponse:
-    
-    # --- 1. 회사 개황 정보 (Info) ---
+# 요청 기한 단계별 초과 / 대체 집계
+deadline_stats = DeadlineStats(("company_info", "financial_data", "news_data", "ai_summary"))
+
+# 회사명 -> corp_code (워커 로컬). 알고 있으면 재무 키도 첫 프리페치에 포함
+corp_codes = LocalCache(max_entries=L0_CACHE_MAX_ENTRIES, default_ttl=INFO_TTL)
+
+# 요청당 Redis 명령 / 왕복 수 (stream 생략 경로, 이 워커 기준)
+_redis_stats = {"requests": 0, "commands": 0, "round_trips": 0, "prefetched_keys": 0}
+
+
+def details_redis_stats() -> dict:
+    requests = _redis_stats["requests"]
+    return {
+        **_redis_stats,
+        "commands_per_request": round(_redis_stats["commands"] / requests, 2) if requests else None,
+        "round_trips_per_request": round(_redis_stats["round_trips"] / requests, 2) if requests else None,
+    }
+
+
+async def prefetch_sections(name: str, redis_client: redis.Redis) -> int:
+    """
+    details 가 읽을 섹션 캐시 키(개황 / 뉴스 / 요약, corp_code 를 알면 재무까지)를
+    한 번의 왕복으로 L0 에 채웁니다. Redis 에도 없는 키만 각 서비스의 조회 경로로 갑니다.
+    """
+    if not DETAILS_PREFETCH:
+        return 0
+    keys = {f"details:info:{name}": CompanyInfo.parse_raw, f"details:summary:{name}": None}
+    swr_keys = [f"details:news:{name}"]
+    known, corp_code = corp_codes.get(name)
+    if known:
+        swr_keys.append(f"details:financials:{corp_code}")
+    return await cache_prefetch(redis_client, keys, swr_keys)
+
+
+async def get_company_info(name: str, db: AsyncSession, redis_client: redis.Redis) -> CompanyInfo:
+    """(1단계) 회사 개황 정보 (L0/L1 캐시 -> DB)"""
     info_key = f"details:info:{name}"
-    company_info: CompanyInfo = None
     try:
-        cached_info = await redis_client.get(info_key)
-        if cached_info:
-            company_info = CompanyInfo.parse_raw(cached_info)
-        else:
-            company_info_orm = await asyncio.to_thread(
-                company_repository.get_company_by_name_exact, db, name
-            )
+        company_info = await cache_get(redis_client, info_key, loads=CompanyInfo.parse_raw)
+        if company_info is None:
+            company_info_orm = await company_repository.get_company_by_name_exact_async(db, name)
             if not company_info_orm:
                 raise HTTPException(status_code=404, detail="해당 회사명을 찾을 수 없습니다.")
             company_info = CompanyInfo.from_orm(company_info_orm)
-            await redis_client.set(info_key, company_info.json(), ex=INFO_TTL)
+            await cache_set(
+                redis_client, info_key, company_info, ex=INFO_TTL, dumps=lambda m: m.json()
+            )
+    except HTTPException:
+        raise  # 404 를 500 으로 감싸지 않도록
     except Exception as e:
-        await asyncio.to_thread(db.rollback)
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"회사 정보 조회 중 오류: {e}")
-    
-    corp_code = str(company_info.corp_code) 
 
-    # --- 2 & 3. 재무 및 뉴스 정보 (병렬 호출) ---
-    fin_service = FinancialService(redis_client, SessionLocal)
-    news_service = NewsService(redis_client, SessionLocal)
-    
+    corp_codes.set(name, str(company_info.corp_code))
+    # 인기도 기록 (refresh-ahead 대상 선정용, 응답 지연 없이)
+    spawn_background(record_access(redis_client, str(company_info.corp_code), name))
+    return company_info
+
+
+def _validate_financials(raw_financial_data: Dict[str, Any]) -> Dict[str, RawFinancialEntry]:
+    return {
+        k: RawFinancialEntry.parse_obj(v)
+        for k, v in raw_financial_data.items()
+        if isinstance(v, dict) and all(k in v for k in ["자본총계", "매출액"])
+    }
+
+
+def _validate_news(raw_news_data: Dict[str, List[Dict]]) -> Dict[str, List[NewsArticle]]:
+    return {k: [NewsArticle.parse_obj(a) for a in v] for k, v in raw_news_data.items()}
+
+
+def _meta(fin_service: FinancialService, news_service: NewsService, summary_service: SummaryService) -> DetailMeta:
+    return DetailMeta(sections={
+        "financial_data": "stale" if fin_service.stale else "fresh",
+        "news_data": "stale" if news_service.stale else "fresh",
+        "ai_summary": "stale" if summary_service.stale else "fresh",
+    })
+
+
+def _ready(task: asyncio.Task) -> bool:
+    return task.done() and not task.cancelled() and task.exception() is None
+
+
+async def _fallback(stage: str, load, empty, overrun: bool = True) -> Tuple[Any, str]:
+    """기한 안에 준비되지 않은 섹션: L2 의 마지막 값으로 대체(degraded), 없으면 빈 값(pending)"""
+    if overrun:
+        deadline_stats.count(stage, "overruns")
     try:
-        results = await asyncio.gather(
-            fin_service.get_financials(corp_code),
-            news_service.get_news(name, corp_code)
-        )
-        raw_financial_data: Dict[str, Any] = results[0]
-        raw_news_data: Dict[str, List[Dict]] = results[1]
+        value = await asyncio.wait_for(load(), timeout=DETAILS_FALLBACK_GRACE)
     except Exception as e:
-        await asyncio.to_thread(db.rollback)
-        raise HTTPException(status_code=500, detail=f"재무/뉴스 처리 오류: {e}")
+        logger.warning(f"[DETAILS] {stage} L2 대체 실패: {e!r}")
+        value = None
+    if value:
+        deadline_stats.count(stage, "degraded")
+        return value, "degraded"
+    deadline_stats.count(stage, "pending")
+    return empty, "pending"
+
 
+async def get_company_details(
+    name: str, 
+    db: AsyncSession,
+    redis_client: redis.Redis,
+    deadline: Deadline | None = None,
+) -> CompanyDetailResponse:
+    """
+    요청 기한(deadline) 안에서 준비된 만큼 응답합니다.
+    - 회사 개황: 필수 (기한을 넘기면 504)
+    - 재무 / 뉴스: 예산의 DETAILS_FETCH_SHARE 시점까지, AI 요약: 남은 예산 전부
+    - 기한을 넘긴 섹션은 L2 값(degraded) 또는 빈 값(pending)으로 채우고 meta 에 표시합니다.
+      넘긴 작업은 취소하지 않고 백그라운드에서 끝내 다음 요청을 위해 캐시를 채웁니다.
+    """
+    deadline = deadline or Deadline.from_header(None)
+    deadline_stats.requests += 1
 
-    # --- 4. AI 요약 (순차 호출) ---
-    summary_service = SummaryService(redis_client, SessionLocal)
+    # --- 1. 회사 개황 정보 (Info) ---
     try:
-        ai_summary_text = await summary_service.get_summary(
-            name, raw_financial_data, raw_news_data
+        company_info = await asyncio.wait_for(
+            get_company_info(name, db, redis_client), timeout=deadline.remaining()
+        )
+    except TimeoutError:
+        deadline_stats.count("company_info", "overruns")
+        raise HTTPException(status_code=504, detail="회사 정보 조회가 요청 기한을 넘었습니다.")
+    corp_code = str(company_info.corp_code) 
+
+    # --- 2 & 3. 재무 및 뉴스 정보 (병렬 호출, 기한까지) ---
+    fin_service = FinancialService(redis_client, AsyncSessionLocal)
+    news_service = NewsService(redis_client, AsyncSessionLocal)
+    fin_task = spawn_background(fin_service.get_financials(corp_code))
+    news_task = spawn_background(news_service.get_news(name, corp_code))
+    await asyncio.wait({fin_task, news_task}, timeout=deadline.until(DETAILS_FETCH_SHARE))
+
+    sections: Dict[str, str] = {}
+
+    async def section_result(section: str, task: asyncio.Task, service, load_l2):
+        if _ready(task):
+            sections[section] = "stale" if service.stale else "fresh"
+            return task.result()
+        value, sections[section] = await _fallback(section, load_l2, {}, overrun=not task.done())
+        return value
+
+    raw_financial_data, raw_news_data = await asyncio.gather(
+        section_result("financial_data", fin_task, fin_service, lambda: fin_service.get_from_l2(corp_code)),
+        section_result("news_data", news_task, news_service, lambda: news_service.get_from_l2(corp_code)),
+    )
+
+    # --- 4. AI 요약 (남은 기한까지) ---
+    summary_service = SummaryService(redis_client, AsyncSessionLocal)
+
+    def load_summary_l2():
+        return summary_service.get_from_l2(name)
+
+    if all(sections[s] in ("fresh", "stale") for s in ("financial_data", "news_data")):
+        summary_task = spawn_background(summary_service.get_summary(name, raw_financial_data, raw_news_data))
+        await asyncio.wait({summary_task}, timeout=deadline.remaining())
+        if _ready(summary_task):
+            ai_summary_text = summary_task.result()
+            sections["ai_summary"] = "stale" if summary_service.stale else "fresh"
+        else:
+            ai_summary_text, sections["ai_summary"] = await _fallback(
+                "ai_summary", load_summary_l2, SUMMARY_PENDING_TEXT, overrun=not summary_task.done()
+            )
+    else:
+        # 입력이 일부만 준비됨: 그 입력으로 요약을 새로 만들지 않고 저장된 요약으로만
+        ai_summary_text, sections["ai_summary"] = await _fallback(
+            "ai_summary", load_summary_l2, SUMMARY_PENDING_TEXT, overrun=False
         )
-    except Exception as e:
-        await asyncio.to_thread(db.rollback)
-        raise HTTPException(status_code=500, detail=f"AI 요약 처리 오류: {e}")
+
+    if any(state in ("degraded", "pending") for state in sections.values()):
+        deadline_stats.partial_responses += 1
 
     # --- 5. 최종 조합 및 반환 ---
     try:
-        final_validated_financials = {k: RawFinancialEntry.parse_obj(v) for k, v in raw_financial_data.items() if isinstance(v, dict) and all(k in v for k in ["자본총계", "매출액"])}
-        final_validated_news = {k: [NewsArticle.parse_obj(a) for a in v] for k, v in raw_news_data.items()}
+        final_validated_financials = _validate_financials(raw_financial_data)
+        final_validated_news = _validate_news(raw_news_data)
     except Exception as e:
         raise HTTPException(status_code=500, detail="데이터 조합 중 오류 발생")
 
@@ -84,5 +211,94 @@ async def get_company_details(
         company_info=company_info,
         financial_data=final_validated_financials,
         news_data=final_validated_news,
-        ai_summary=ai_summary_text
-    )
\ No newline at end of file
+        ai_summary=ai_summary_text,
+        meta=DetailMeta(sections=sections),
+    )
+
+
+async def get_company_details_body(
+    name: str,
+    db: AsyncSession,
+    redis_client: redis.Redis,
+    deadline: Deadline | None = None,
+) -> Tuple[str, bool]:
+    """
+    직렬화된 응답 본문(JSON)과 전체 응답 캐시 적중 여부.
+    적중하면 섹션 조회 / 검증 / 직렬화 없이 저장된 본문을 그대로 돌려주고,
+    아니면 get_company_details 결과를 한 번만 직렬화해 (모든 섹션이 fresh 일 때만) 저장합니다.
+    응답 캐시 미스면 섹션 캐시 키를 한 번의 왕복으로 프리페치한 뒤 조립하며, 요청당 Redis 명령 / 왕복 수를 집계합니다.
+    (요청이 띄운 백그라운드 작업의 명령은 응답 뒤 실행될 때 더해짐)
+    """
+    _redis_stats["requests"] += 1
+    with count_redis_commands(_redis_stats):
+        return await _details_body(name, db, redis_client, deadline)
+
+
+async def _details_body(
+    name: str, db: AsyncSession, redis_client: redis.Redis, deadline: Deadline | None
+) -> Tuple[str, bool]:
+    cached = await details_cache.get_cached_response(redis_client, name)
+    if cached is not None:
+        corp_code, body = cached
+        spawn_background(record_access(redis_client, corp_code, name))
+        return body, True
+
+    _redis_stats["prefetched_keys"] += await prefetch_sections(name, redis_client)
+    details = await get_company_details(name, db, redis_client, deadline)
+    body = details.json()
+    if all(state == "fresh" for state in details.meta.sections.values()):
+        spawn_background(details_cache.cache_response(redis_client, name, str(details.company_info.corp_code), body))
+    return body, False
+
+
+async def stream_company_details(
+    name: str,
+    company_info: CompanyInfo,
+    redis_client: redis.Redis,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    get_company_details 의 점진(progressive) 버전: 섹션이 준비되는 대로 (event, data) 를 냅니다.
+    company_info -> financial_data / news_data (먼저 끝나는 순) -> ai_summary_delta* -> ai_summary -> meta
+    섹션 처리 중 오류가 나면 ("error", {...}) 를 내고 종료합니다.
+    """
+    corp_code = str(company_info.corp_code)
+    yield "company_info", company_info.dict()
+
+    fin_service = FinancialService(redis_client, AsyncSessionLocal)
+    news_service = NewsService(redis_client, AsyncSessionLocal)
+    summary_service = SummaryService(redis_client, AsyncSessionLocal)
+    validators = {"financial_data": _validate_financials, "news_data": _validate_news}
+
+    tasks = {
+        asyncio.create_task(fin_service.get_financials(corp_code)): "financial_data",
+        asyncio.create_task(news_service.get_news(name, corp_code)): "news_data",
+    }
+    raw: Dict[str, Any] = {}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                section = tasks[task]
+                raw[section] = task.result()
+                validated = validators[section](raw[section])
+                yield section, {
+                    k: [a.dict() for a in v] if isinstance(v, list) else v.dict()
+                    for k, v in validated.items()
+                }
+
+        # 클라이언트가 끊겨 이 제너레이터가 닫히면 요약 스트림도 바로 닫아 락 / 게이트웨이 슬롯 반환
+        async with aclosing(
+            summary_service.stream_summary(name, raw["financial_data"], raw["news_data"])
+        ) as events:
+            async for kind, text in events:
+                yield ("ai_summary_delta" if kind == SUMMARY_DELTA else "ai_summary"), text
+    except Exception as e:
+        logger.error(f"[DETAILS] 스트리밍 처리 오류({name}): {e}")
+        yield "error", {"detail": f"상세 정보 처리 오류: {e}"}
+        return
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    yield "meta", _meta(fin_service, news_service, summary_service).dict()
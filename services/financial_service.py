@@ -1,92 +1,182 @@
-import json
-import asyncio
-import pandas as pd
 import redis.asyncio as redis
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from fastapi import HTTPException
+from core.config import DART_YEAR_WINDOW, FINANCIAL_RECHECK_INTERVAL, latest_bsns_year
+from core.cache import swr_get, swr_set
+from core.lock import RedisLock
+from core.resilience import CircuitOpenError
+from core.tasks import spawn_background
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from repository import financials_repository
+from services import details_cache
 from clients import dart_api_client
-from utils.utils import clean, normalize, calculate_ratios, _format_financials_from_orm
-from core.database import SessionLocal
+from utils.utils import _format_financials_from_orm
+from utils.financial_parser import ANNUAL_REPORT_CODE, parse_financials
 from fastapi.logger import logger
+import pytz
+
+SEOUL_TZ = pytz.timezone("Asia/Seoul")
+
+FINANCIALS_SOFT_TTL = 86400      # 24시간 (이후엔 stale 응답 + 백그라운드 갱신)
+FINANCIALS_HARD_TTL = 86400 * 7  # 7일 (이후엔 요청이 갱신을 기다림)
+FINANCIALS_LOCK_TTL = 30         # 백그라운드 갱신 중복 방지 락
+FINANCIALS_DEGRADED_SOFT_TTL = 60  # DART 장애/회로 차단으로 L2 만으로 응답한 경우, 이 시간 뒤 갱신 재시도
+
+
+def window_years() -> List[int]:
+    """조회 대상 사업연도 (최신 → 과거, 호출 시점 기준)"""
+    latest = latest_bsns_year()
+    return [latest - i for i in range(DART_YEAR_WINDOW)]
 
-FINANCIALS_TTL = 86400  # 24시간
 
 class FinancialService:
-    def __init__(self, redis_client: redis.Redis, SessionLocal):
+    def __init__(self, redis_client: redis.Redis, SessionLocal: async_sessionmaker):
         self.redis = redis_client
         self.SessionLocal = SessionLocal
-
-    async def _save_to_l2_background(self, corp_code: str, data: dict):
-        """(Helper) L2 저장을 별도 스레드와 세션에서 'Fire and Forget'으로 실행"""
-        db: Session = SessionLocal() # 3. 이 작업을 위한 새 세션 생성
+        self.stale = False  # 마지막 응답이 stale 계층에서 나왔는지
+
+    async def _save_to_l2_background(self, corp_code: str, data: dict, checks: Dict[int, str | None]):
+        """(Helper) L2 저장 + DART 확인 시점 기록을 별도 세션에서 'Fire and Forget'으로 실행"""
+        async with self.SessionLocal() as db: # 이 작업을 위한 새 세션 생성
+            try:
+                await financials_repository.upsert_financials_async(db, corp_code, data, ANNUAL_REPORT_CODE)
+                for bsns_year, rcept_no in checks.items():
+                    await financials_repository.record_report_checks_async(
+                        db, {corp_code: rcept_no}, bsns_year, ANNUAL_REPORT_CODE
+                    )
+                await db.commit() # 작업 단위 커밋
+            except Exception as e:
+                await db.rollback()
+
+    async def _load(self, corp_code: str, key: str, refetch: bool = False):
+        """
+        L2 를 기본으로, 조회 기간 중 L2 에 없는 사업연도만 DART 에서 가져와 합칩니다. (증분 갱신)
+        - 사업보고서 하나가 3개 연도를 채우므로 최신 연도부터 확인
+        - 최근(FINANCIAL_RECHECK_INTERVAL)에 확인한 연도는 건너뜀
+        - refetch=True(stale 갱신)면 L2 에 있는 연도도 DART 에서 다시 받아 덮어씀 (정정 공시 반영)
+        - refetch=False 라도 L2 에서 바로 낸 연도 중 최근에 확인하지 않은 연도가 있으면 백그라운드로 재확인
+        - 값을 가져온 연도는 그 값을 담은 보고서의 접수번호로 확인 시점을 기록
+        - DART 오류로 L2 만으로 응답하면 stale 로 표시하고 FINANCIALS_DEGRADED_SOFT_TTL 뒤 재시도
+        """
+        years = window_years()
+        since = datetime.now(SEOUL_TZ) - timedelta(seconds=FINANCIAL_RECHECK_INTERVAL)
+        async with self.SessionLocal() as db:
+            try:
+                # 2. (L2) RDB 조회
+                l2_data = await financials_repository.get_financials_by_code_async(
+                    db, corp_code, ANNUAL_REPORT_CODE, years
+                )
+                checked = await financials_repository.get_recent_checks_async(
+                    db, [corp_code], ANNUAL_REPORT_CODE, years, since
+                )
+            except Exception as e:
+                await db.rollback()
+                raise
+
+        result = _format_financials_from_orm(l2_data)
+        checked_years = {bsns_year for _, bsns_year in checked}
+        fetched: Dict[str, Any] = {}
+        checks: Dict[int, str | None] = {}
+        message = None
+        degraded = False
+        recheck = False
+
+        # 3. (L3) 빠진 연도만 DART API 호출
+        for bsns_year in years:
+            if str(bsns_year) in fetched or bsns_year in checked_years:
+                continue
+            if str(bsns_year) in result and not refetch:
+                recheck = True  # L2 값으로 응답하고 정정 공시는 백그라운드에서 확인
+                continue
+            try:
+                raw = await dart_api_client.fetch_financial_raw(corp_code, bsns_year, ANNUAL_REPORT_CODE)
+            except CircuitOpenError as e:
+                # DART 회로 차단: 호출 없이 L2 데이터로 바로 응답
+                if not result and not fetched:
+                    raise
+                logger.info(f"[FINANCIALS] L2 로 대체({corp_code}): {e}")
+                degraded = True
+                break
+            except HTTPException as e:
+                if e.status_code != 404:
+                    if not result and not fetched:
+                        raise
+                    degraded = True
+                    break  # DART 오류: 가진 데이터로 응답하고 잠시 뒤 갱신 때 재시도
+                checks[bsns_year] = None  # 아직 공시 없음
+                continue
+
+            rows = raw["list"]
+            rcept_no = rows[0].get("rcept_no") if rows else None
+            checks[bsns_year] = rcept_no
+            parsed = parse_financials(rows, bsns_year, ANNUAL_REPORT_CODE)
+            if "message" in parsed:
+                message = parsed
+                continue
+            for year, values in parsed.items():
+                # 최신 보고서의 (정정된) 값을 우선
+                if int(year) in years and year not in fetched:
+                    fetched[year] = values
+                    checks.setdefault(int(year), rcept_no)
+
+        if fetched or checks:
+            # L2 저장
+            # [수정] L2 저장은 "백그라운드"로 실행 (Fire and Forget)
+            spawn_background(self._save_to_l2_background(corp_code, fetched, checks))
+        if recheck and not degraded:
+            spawn_background(self._refresh_in_background(corp_code, key))
+
+        result.update(fetched)
+        if not result:
+            return message or {}
+
+        result = {year: result[year] for year in sorted(result)}
+        if degraded:
+            self.stale = True
+        soft_ttl = FINANCIALS_DEGRADED_SOFT_TTL if degraded else FINANCIALS_SOFT_TTL
+        await swr_set(self.redis, key, result, soft_ttl, FINANCIALS_HARD_TTL)
+        await details_cache.invalidate_by_corp_code(self.redis, corp_code)
+        return result
+
+    async def get_from_l2(self, corp_code: str) -> dict:
+        """(기한 초과 대체) L2 에 있는 조회 기간 재무만 (DART 호출 / 캐시 저장 없음)"""
+        async with self.SessionLocal() as db:
+            l2_data = await financials_repository.get_financials_by_code_async(
+                db, corp_code, ANNUAL_REPORT_CODE, window_years()
+            )
+        result = _format_financials_from_orm(l2_data)
+        return {year: result[year] for year in sorted(result)}
+
+    async def _refresh_in_background(self, corp_code: str, key: str):
+        """stale 값 갱신: DART 에 다시 확인 (락으로 워커 간 중복 갱신 방지)"""
+        lock = RedisLock(self.redis, f"details:financials_lock:{corp_code}", ttl=FINANCIALS_LOCK_TTL)
+        if not await lock.acquire():
+            return  # 다른 요청이 이미 갱신 중
         try:
-            await asyncio.to_thread(financials_repository.upsert_financials, db, corp_code, data)
-            await asyncio.to_thread(db.commit) # 4. 작업 단위 커밋
+            await self._load(corp_code, key, refetch=True)
         except Exception as e:
-            await asyncio.to_thread(db.rollback)
+            logger.warning(f"[FINANCIALS] 백그라운드 갱신 실패({corp_code}): {e}")
         finally:
-            await asyncio.to_thread(db.close) # 5. 세션 닫기
+            await lock.release()
 
+    async def refresh(self, corp_code: str):
+        """(refresh-ahead) soft TTL 만료 전에 미리 갱신합니다."""
+        await self._refresh_in_background(corp_code, f"details:financials:{corp_code}")
 
     async def get_financials(self, corp_code: str):
         """(Worker) 재무 정보의 L1 -> L2 -> L3 캐싱 로직을 담당"""
         key = f"details:financials:{corp_code}"
 
-        # Redis 먼저 확인
-        cached = await self.redis.get(key)
-        if cached:
-            return json.loads(cached)
-
-        db = SessionLocal()
+        # Redis 먼저 확인 (soft TTL 지났으면 stale 값을 바로 반환하고 백그라운드 갱신)
+        cached, stale = await swr_get(self.redis, key)
+        if cached is not None:
+            if stale:
+                self.stale = True
+                spawn_background(self._refresh_in_background(corp_code, key))
+            return cached
 
         try:
-            # 2. (L2) RDB 조회
-            l2_data = await asyncio.to_thread(
-                financials_repository.get_financials_by_code, db, corp_code
-            )
-            if l2_data:
-                raw_data = _format_financials_from_orm(l2_data)
-                await self.redis.set(key, json.dumps(raw_data), ex=FINANCIALS_TTL)
-                return raw_data
-
-            # 3. (L3) DART API 호출
-            raw = await dart_api_client.fetch_financial_raw(corp_code)
-
-            df = pd.DataFrame(raw["list"])
-            if "fs_div" not in df.columns:
-                return {"message": "'fs_div' 정보가 없습니다."}
-
-            if (df["fs_div"] == "CFS").any():
-                df = df[df["fs_div"] == "CFS"]
-            elif (df["fs_div"] == "OFS").any():
-                df = df[df["fs_div"] == "OFS"]
-            else:
-                return {"message": "CFS/OFS 기준 데이터가 없습니다."}
-
-            keywords = ["매출액", "영업이익", "당기순이익", "자본총계", "자산총계"]
-            df_filtered = df[df["account_nm"].apply(lambda x: any(k in x for k in keywords))]
-
-            result = {"2022": {}, "2023": {}, "2024": {}}
-            for _, row in df_filtered.iterrows():
-                account = normalize(row["account_nm"])
-                result["2022"][account] = clean(row.get("bfefrmtrm_amount"))
-                result["2023"][account] = clean(row.get("frmtrm_amount"))
-                result["2024"][account] = clean(row.get("thstrm_amount"))
-
-            for year in result:
-                result[year]["ratio"] = calculate_ratios(result[year])
-
-            
-            await self.redis.set(key, json.dumps(result), ex=FINANCIALS_TTL)
-
-            # L2 저장
-            # [수정] L2 저장은 "백그라운드"로 실행 (Fire and Forget)
-            asyncio.create_task(self._save_to_l2_background(corp_code, result))
-
-            return result
-
+            return await self._load(corp_code, key)
         except Exception as e:
-            await asyncio.to_thread(db.rollback)
             return {}
-        finally:
-            await asyncio.to_thread(db.close)
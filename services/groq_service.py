@@ -1,6 +1,14 @@
-import httpx
-from fastapi import HTTPException
-from core.config import GROQ_API_KEY, GROQ_URL
+import redis.asyncio as redis
+from typing import AsyncIterator, List, Tuple
+from core.config import (
+    GROQ_API_KEY, GROQ_URL, GROQ_MODEL, GROQ_FALLBACK_MODELS,
+    GROQ_RPM, GROQ_TPM, GROQ_RPD, GROQ_TPD, GROQ_COMPLETION_RESERVE, GROQ_BACKGROUND_RESERVE,
+    GROQ_MAX_CONCURRENCY, GROQ_QUEUE_TIMEOUT, GROQ_TIMEOUT,
+    GROQ_FAILOVER_P95_MS, GROQ_FAILOVER_ERROR_RATE, GROQ_FAILOVER_COOLDOWN,
+)
+from core.llm_gateway import LLMGateway, estimate_tokens
+from core.rate_limit import INTERACTIVE
+from core.resilience import groq_breaker
 
 
 
@@ -18,31 +26,49 @@ SYSTEM_PROMPT = [
 ]
 
 
-async def summarize(company_name: str, fin_text: str, news_text: str) -> str:
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        payload = {
-            "model": "openai/gpt-oss-120b",
-            "messages": [
-                {"role": "system", "content": " ".join(SYSTEM_PROMPT)},
-                {
-                    "role": "user",
-                    "content": (
-                        f"회사: {company_name}\n\n" f"{fin_text}\n\n" f"{news_text}"
-                    ),
-                },
-            ],
-        }
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json",
-        }
-        resp = await client.post(GROQ_URL, headers=headers, json=payload)
-        try:
-            resp.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"Groq API error: {e.response.text}",
-            )
-        data = resp.json()
-        return data["choices"][0]["message"]["content"]
+# SYSTEM_PROMPT / 입력 형식을 바꾸면 올려야 저장된 요약(입력 지문)이 다시 생성됩니다.
+PROMPT_VERSION = "1"
+
+# 모든 요약 호출은 게이트웨이(동시성 / 모델별 RPM·TPM 예산 / 모델 전환)를 거칩니다.
+groq_gateway = LLMGateway(
+    "groq", GROQ_URL, GROQ_API_KEY, [GROQ_MODEL, *GROQ_FALLBACK_MODELS],
+    rpm=GROQ_RPM, tpm=GROQ_TPM, rpd=GROQ_RPD, tpd=GROQ_TPD,
+    completion_reserve=GROQ_COMPLETION_RESERVE, background_reserve=GROQ_BACKGROUND_RESERVE,
+    max_concurrency=GROQ_MAX_CONCURRENCY, queue_timeout=GROQ_QUEUE_TIMEOUT, timeout=GROQ_TIMEOUT,
+    failover_p95_ms=GROQ_FAILOVER_P95_MS, failover_error_rate=GROQ_FAILOVER_ERROR_RATE,
+    failover_cooldown=GROQ_FAILOVER_COOLDOWN, breaker=groq_breaker,
+)
+
+
+def _messages(company_name: str, fin_text: str, news_text: str) -> List[dict]:
+    return [
+        {"role": "system", "content": " ".join(SYSTEM_PROMPT)},
+        {
+            "role": "user",
+            "content": (
+                f"회사: {company_name}\n\n" f"{fin_text}\n\n" f"{news_text}"
+            ),
+        },
+    ]
+
+
+def estimate_summary_tokens(company_name: str, fin_text: str, news_text: str) -> int:
+    """요약 1회 호출의 예상 토큰 (프롬프트 추정 + 응답 예약분, 게이트웨이 TPM 차감과 같은 계산)"""
+    return estimate_tokens(_messages(company_name, fin_text, news_text)) + GROQ_COMPLETION_RESERVE
+
+
+async def summarize(
+    redis_client: redis.Redis, company_name: str, fin_text: str, news_text: str, priority: str = INTERACTIVE
+) -> Tuple[str, str]:
+    """(요약, 실제로 응답한 모델) — 기본 모델이 아니면 대체 모델 결과"""
+    return await groq_gateway.complete(redis_client, _messages(company_name, fin_text, news_text), priority)
+
+
+def summarize_stream(
+    redis_client: redis.Redis, company_name: str, fin_text: str, news_text: str, priority: str = INTERACTIVE
+) -> AsyncIterator[Tuple[str, str]]:
+    """
+    summarize 의 스트리밍 버전: Groq(OpenAI 호환) SSE 응답의 토큰 조각을 도착하는 대로 (모델, 조각) 으로 반환합니다.
+    (첫 조각 전에 실패하면 게이트웨이가 대체 모델로 넘깁니다)
+    """
+    return groq_gateway.stream(redis_client, _messages(company_name, fin_text, news_text), priority)
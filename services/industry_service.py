@@ -0,0 +1,226 @@
+# /services/industry_service.py
+
+import asyncio
+import hashlib
+import json
+import redis.asyncio as redis
+from redis.client import NEVER_DECODE
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+from fastapi import Request, Response
+from fastapi.logger import logger
+
+from core.cache import codec, pubsub, redis_pool
+from core.codec import CodecError
+from core.database import SessionLocal
+from repository import industry_repository
+from schemas.user import IndustryCategoryNode
+
+LEVELS = 5
+CURRENT_KEY = "industries:current"          # 현재 스냅샷의 content hash
+TREE_KEY = "industries:tree:{hash}"
+FLAT_KEY = "industries:flat:{hash}"
+INVALIDATION_CHANNEL = "industries:invalidate"
+SUPERSEDED_SNAPSHOT_TTL = 300               # 밀려난 스냅샷 키를 남겨 둘 시간(초)
+
+
+@dataclass
+class IndustrySnapshot:
+    """KSIC 산업 분류의 사전 계산 결과 (직렬화된 JSON + 이름 → 코드 조회표)"""
+    content_hash: str
+    flat_json: bytes
+    tree_json: bytes
+    lookup: Dict[Tuple[str, int], str] = field(default_factory=dict)
+
+    @property
+    def flat_etag(self) -> str:
+        return f'"{self.content_hash}-flat"'
+
+    @property
+    def tree_etag(self) -> str:
+        return f'"{self.content_hash}-tree"'
+
+
+_snapshot: IndustrySnapshot | None = None
+_snapshot_lock = asyncio.Lock()
+
+
+def _on_invalidate(_: str):
+    global _snapshot
+    _snapshot = None
+
+pubsub.subscribe(INVALIDATION_CHANNEL, _on_invalidate)
+
+
+def _build_lookup(flat: List[Dict[str, Any]]) -> Dict[Tuple[str, int], str]:
+    """(name_n, n) -> code_n (같은 이름은 먼저 나온 행 우선)"""
+    lookup = {}
+    for row in flat:
+        for level in range(1, LEVELS + 1):
+            name, code = row.get(f"name_{level}"), row.get(f"code_{level}")
+            if name and code:
+                lookup.setdefault((name, level), code)
+    return lookup
+
+
+def _build_tree(flat: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """평평한 code_n/name_n 행을 5단계 중첩 트리로 변환합니다."""
+    root: Dict[str, Dict[str, Any]] = {}
+    for row in flat:
+        children = root
+        for level in range(1, LEVELS + 1):
+            code = row.get(f"code_{level}")
+            if not code:
+                break
+            node = children.get(code)
+            if node is None:
+                node = children[code] = {
+                    "code": code,
+                    "name": row.get(f"name_{level}"),
+                    "level": level,
+                    "_children": {},
+                }
+            children = node["_children"]
+
+    def finalize(nodes: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        result = []
+        for code in sorted(nodes):
+            node = nodes[code]
+            children = finalize(node.pop("_children"))
+            node["child_count"] = len(children)
+            node["children"] = children
+            result.append(node)
+        return result
+
+    return finalize(root)
+
+
+def build_snapshot(flat: List[Dict[str, Any]]) -> IndustrySnapshot:
+    flat_json = json.dumps(flat, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    tree_json = json.dumps(_build_tree(flat), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return IndustrySnapshot(
+        content_hash=hashlib.sha256(flat_json).hexdigest()[:32],
+        flat_json=flat_json,
+        tree_json=tree_json,
+        lookup=_build_lookup(flat),
+    )
+
+
+def _load_flat_from_db() -> List[Dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        return [
+            IndustryCategoryNode.from_orm(row).dict()
+            for row in industry_repository.get_all_industries(db)
+        ]
+    finally:
+        db.close()
+
+
+async def _load_from_redis(redis_client: redis.Redis) -> IndustrySnapshot | None:
+    content_hash = await redis_client.get(CURRENT_KEY)
+    if not content_hash:
+        return None
+    flat_key, tree_key = FLAT_KEY.format(hash=content_hash), TREE_KEY.format(hash=content_hash)
+    # 코덱 값(압축될 수 있음)이므로 bytes 로 읽음
+    flat_raw, tree_raw = await redis_client.execute_command("MGET", flat_key, tree_key, **{NEVER_DECODE: True})
+    if not flat_raw or not tree_raw:
+        return None
+    try:
+        _, flat_text = codec.decode(flat_key, flat_raw, loads=_identity)
+        _, tree_text = codec.decode(tree_key, tree_raw, loads=_identity)
+    except CodecError as e:
+        logger.warning(f"[INDUSTRY] Redis 스냅샷 디코딩 실패: {e}")
+        return None
+    return IndustrySnapshot(
+        content_hash=content_hash,
+        flat_json=flat_text.encode("utf-8"),
+        tree_json=tree_text.encode("utf-8"),
+        lookup=_build_lookup(json.loads(flat_text)),
+    )
+
+
+def _identity(text: str) -> str:
+    return text
+
+
+async def _store_to_redis(redis_client: redis.Redis, snapshot: IndustrySnapshot):
+    """
+    새 스냅샷을 저장하고 CURRENT_KEY 를 바꿉니다. (WATCH + MULTI, 동시 저장 시 재시도)
+    밀려난 이전 해시의 키는 같은 트랜잭션에서 SUPERSEDED_SNAPSHOT_TTL 뒤 만료되도록 합니다.
+    (이미 이전 해시를 읽은 워커가 MGET 할 수 있도록 바로 지우지 않음)
+    """
+    flat_key, tree_key = FLAT_KEY.format(hash=snapshot.content_hash), TREE_KEY.format(hash=snapshot.content_hash)
+    flat_value = codec.encode(flat_key, snapshot.flat_json.decode("utf-8"), dumps=_identity)
+    tree_value = codec.encode(tree_key, snapshot.tree_json.decode("utf-8"), dumps=_identity)
+
+    async def store(pipe):
+        previous = await pipe.get(CURRENT_KEY)
+        pipe.multi()
+        # SET 은 TTL 을 지우므로, 만료 예정이던 해시로 되돌아와도 다시 영구 보관
+        pipe.set(flat_key, flat_value)
+        pipe.set(tree_key, tree_value)
+        pipe.set(CURRENT_KEY, snapshot.content_hash)
+        if previous and previous != snapshot.content_hash:
+            pipe.expire(FLAT_KEY.format(hash=previous), SUPERSEDED_SNAPSHOT_TTL)
+            pipe.expire(TREE_KEY.format(hash=previous), SUPERSEDED_SNAPSHOT_TTL)
+
+    await redis_client.transaction(store, CURRENT_KEY)
+
+
+async def get_snapshot(redis_client: redis.Redis) -> IndustrySnapshot:
+    """메모리 -> Redis -> DB 순서로 산업 분류 스냅샷을 가져옵니다."""
+    global _snapshot
+    if _snapshot is not None:
+        return _snapshot
+
+    async with _snapshot_lock:
+        if _snapshot is not None:
+            return _snapshot
+
+        snapshot = None
+        try:
+            snapshot = await _load_from_redis(redis_client)
+        except Exception as e:
+            logger.warning(f"[INDUSTRY] Redis 스냅샷 조회 실패: {e}")
+
+        if snapshot is None:
+            flat = await asyncio.to_thread(_load_flat_from_db)
+            snapshot = build_snapshot(flat)
+            try:
+                await _store_to_redis(redis_client, snapshot)
+            except Exception as e:
+                logger.warning(f"[INDUSTRY] Redis 스냅샷 저장 실패: {e}")
+
+        _snapshot = snapshot
+        return snapshot
+
+
+async def reload_snapshot(redis_client: redis.Redis) -> IndustrySnapshot:
+    """KSIC 테이블 재적재 후 호출: DB에서 다시 만들고 모든 워커의 메모리 스냅샷을 무효화합니다."""
+    global _snapshot
+    flat = await asyncio.to_thread(_load_flat_from_db)
+    snapshot = build_snapshot(flat)
+    await _store_to_redis(redis_client, snapshot)
+    await redis_client.publish(INVALIDATION_CHANNEL, snapshot.content_hash)
+    _snapshot = snapshot
+    return snapshot
+
+
+def etag_response(request: Request, body: bytes, etag: str) -> Response:
+    """If-None-Match 가 일치하면 본문 없이 304 를 반환합니다."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+if __name__ == "__main__":
+    # KSIC 테이블 재적재 후: python -m services.industry_service
+    async def _main():
+        async with redis.Redis(connection_pool=redis_pool) as client:
+            snapshot = await reload_snapshot(client)
+            print(f"industries snapshot: {snapshot.content_hash} ({len(snapshot.lookup)} names)")
+
+    asyncio.run(_main())
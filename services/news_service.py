@@ -1,104 +1,139 @@
-import json
-import asyncio
 import redis.asyncio as redis
+from core.cache import swr_get, swr_set
+from core.lock import RedisLock, wait_for_release
+from core.tasks import spawn_background
 from repository import news_repository
+from services import details_cache
 from clients import naver_news_client
+from core.rate_limit import RateLimitExceeded, INTERACTIVE, BACKGROUND
+from core.resilience import CircuitOpenError
 from utils.utils import _format_news_from_orm
-from core.database import SessionLocal
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from fastapi.logger import logger
 
 CATEGORIES = ["전체", "채용", "주가", "노사", "IT"]
-NEWS_TTL = 600
-NEWS_LOCK_TTL = 30          # 뉴스 생성 락 TTL
+NEWS_SOFT_TTL = 600         # 10분 (이후엔 stale 응답 + 백그라운드 갱신)
+NEWS_HARD_TTL = 3600        # 1시간 (이후엔 요청이 갱신을 기다림)
+NEWS_LOCK_TTL = 30          # 뉴스 생성 락 TTL (잡고 있는 동안 자동 연장)
 LOCK_WAIT_TIMEOUT = 8       # 최대 대기
-LOCK_POLL_INTERVAL = 0.3
+NEWS_DEGRADED_SOFT_TTL = 60 # L2 값을 대신 낸 경우(호출 한도/오류/대기 초과), 이 시간 뒤 백그라운드 갱신 재시도
 
 class NewsService:
-    def __init__(self, redis_client: redis.Redis, SessionLocal):
+    def __init__(self, redis_client: redis.Redis, SessionLocal: async_sessionmaker):
         self.redis = redis_client
         self.SessionLocal = SessionLocal
+        self.stale = False  # 마지막 응답이 stale 계층에서 나왔는지
 
     async def _save_to_l2_background(self, corp_code: str, data: dict):
-        """(Helper) L2 저장을 별도 스레드와 세션에서 'Fire and Forget'으로 실행"""
-        db: Session = SessionLocal() # 3. 이 작업을 위한 새 세션 생성
+        """(Helper) L2 저장을 별도 세션에서 'Fire and Forget'으로 실행"""
+        async with self.SessionLocal() as db: # 이 작업을 위한 새 세션 생성
+            try:
+                await news_repository.upsert_news_articles_async(db, corp_code, data)
+                await db.commit() # 작업 단위 커밋
+            except Exception as e:
+                await db.rollback()
+
+    async def _fetch_and_store(self, name: str, corp_code: str, key: str, priority: str = INTERACTIVE):
+        """(L3) Naver 카테고리별 뉴스를 (호출 한도 허가 후) 병렬 조회해 캐시/L2에 저장합니다."""
+        queries = [name if cat == "전체" else f"{name} {cat}" for cat in CATEGORIES]
+        results = await naver_news_client.fetch_news_batch(self.redis, queries, priority)
+        raw_data = {cat: [a.dict() for a in lst] for cat, lst in zip(CATEGORIES, results)}
+
+        await swr_set(self.redis, key, raw_data, NEWS_SOFT_TTL, NEWS_HARD_TTL)
+        await details_cache.invalidate_by_name(self.redis, name)
+        spawn_background(self._save_to_l2_background(corp_code, raw_data))
+        return raw_data
+
+    async def _load_from_l2(self, corp_code: str, key: str):
+        """
+        (L2 Fallback) RDB에 저장된 마지막 뉴스
+        stale 로 표시하고, NEWS_DEGRADED_SOFT_TTL 뒤 백그라운드 갱신이 Naver 를 다시 시도하도록 저장
+        """
+        self.stale = True
+        async with self.SessionLocal() as db:
+            l2_data = await news_repository.get_cached_news_by_code_async(db, corp_code)
+        if l2_data:
+            raw_data = _format_news_from_orm(l2_data)
+            await swr_set(self.redis, key, raw_data, NEWS_DEGRADED_SOFT_TTL, NEWS_HARD_TTL)
+            await details_cache.invalidate_by_corp_code(self.redis, corp_code)
+            return raw_data
+        return {}
+
+    async def get_from_l2(self, corp_code: str) -> dict:
+        """(기한 초과 대체) RDB 에 저장된 마지막 뉴스 (진행 중인 조회가 캐시를 채우도록 캐시 저장 없음)"""
+        async with self.SessionLocal() as db:
+            l2_data = await news_repository.get_cached_news_by_code_async(db, corp_code)
+        return _format_news_from_orm(l2_data) if l2_data else {}
+
+    async def _refresh_in_background(self, name: str, corp_code: str, key: str, lock_key: str):
+        """stale 값 갱신 (생성 락을 그대로 사용해 중복 갱신 방지)"""
+        lock = RedisLock(self.redis, lock_key, ttl=NEWS_LOCK_TTL)
+        if not await lock.acquire():
+            return  # 다른 요청이 이미 생성/갱신 중
         try:
-            await asyncio.to_thread(news_repository.upsert_news_articles, db, corp_code, data)
-            await asyncio.to_thread(db.commit) # 4. 작업 단위 커밋
+            await self._fetch_and_store(name, corp_code, key, priority=BACKGROUND)
+        except (RateLimitExceeded, CircuitOpenError) as e:
+            logger.info(f"[NEWS] 백그라운드 갱신 보류({name}): {e}")  # stale 값 유지, 다음 요청 때 재시도
         except Exception as e:
-            await asyncio.to_thread(db.rollback)
+            logger.warning(f"[NEWS] 백그라운드 갱신 실패({name}): {e}")
         finally:
-            await asyncio.to_thread(db.close) # 5. 세션 닫기
-    
+            await lock.release()
 
-    async def get_news(self, name: str, corp_code: str):
+    async def refresh(self, name: str, corp_code: str):
+        """(refresh-ahead) soft TTL 만료 전에 미리 갱신합니다. (background 우선순위, 생성 락 공유)"""
+        await self._refresh_in_background(
+            name, corp_code, f"details:news:{name}", f"details:news_lock:{name}"
+        )
+
+    async def get_news(self, name: str, corp_code: str, priority: str = INTERACTIVE):
+        """priority: Naver 호출 우선순위 (배치 작업은 BACKGROUND, 한도에 걸리면 L2 로 대체)"""
         key = f"details:news:{name}"
         lock_key = f"details:news_lock:{name}"
 
-        cached = await self.redis.get(key)
-        if cached:
-            return json.loads(cached)
+        # soft TTL 지났으면 stale 값을 바로 반환하고 백그라운드 갱신
+        cached, stale = await swr_get(self.redis, key)
+        if cached is not None:
+            if stale:
+                self.stale = True
+                spawn_background(self._refresh_in_background(name, corp_code, key, lock_key))
+            return cached
 
         # 락 시도
-        got_lock = await self.redis.set(lock_key, "1", ex=NEWS_LOCK_TTL, nx=True)
-
-        # 락 실패: 누군가 생성 중 → 잠깐 기다렸다 캐시 재조회
-        if not got_lock:
-            waited = 0.0
-            while waited < LOCK_WAIT_TIMEOUT:
-                await asyncio.sleep(LOCK_POLL_INTERVAL)
-                waited += LOCK_POLL_INTERVAL
+        lock = RedisLock(self.redis, lock_key, ttl=NEWS_LOCK_TTL)
 
-                cached = await self.redis.get(key)
-                if cached:
-                    return json.loads(cached)
+        # 락 실패: 누군가 생성 중 → 해제 알림을 받으면 바로 캐시 재조회
+        if not await lock.acquire():
+            cached = await wait_for_release(
+                self.redis, lock_key, lambda: self._get_cached_value(key), LOCK_WAIT_TIMEOUT
+            )
+            if cached is not None:
+                return cached
 
             # 너무 오래 걸리면 L2 fallback
-            db: Session = SessionLocal()
-            try:
-                l2_data = await asyncio.to_thread(news_repository.get_cached_news_by_code, db, corp_code)
-                if l2_data:
-                    raw_data = _format_news_from_orm(l2_data)
-                    await self.redis.set(key, json.dumps(raw_data), ex=NEWS_TTL)
-                    return raw_data
-                return {}
-            finally:
-                await asyncio.to_thread(db.close)
+            return await self._load_from_l2(corp_code, key)
 
         # 락 성공: 내가 생성자
-        db: Session = SessionLocal()
         try:
             # 더블체크
-            cached = await self.redis.get(key)
-            if cached:
-                return json.loads(cached)
+            cached = await self._get_cached_value(key)
+            if cached is not None:
+                return cached
 
-            async def fetch_category(cat: str):
-                query = name if cat == "전체" else f"{name} {cat}"
-                return await naver_news_client.fetch_news_by_query(query)
+            return await self._fetch_and_store(name, corp_code, key, priority)
 
-            tasks = [fetch_category(cat) for cat in CATEGORIES]
-            results = await asyncio.gather(*tasks)
-            raw_data = {cat: [a.dict() for a in lst] for cat, lst in zip(CATEGORIES, results)}
-
-            await self.redis.set(key, json.dumps(raw_data), ex=NEWS_TTL)
-            asyncio.create_task(self._save_to_l2_background(corp_code, raw_data))
-            return raw_data
+        except (RateLimitExceeded, CircuitOpenError) as e:
+            # 호출 한도 소진 / Naver 회로 차단: 실패 대신 L2 값을 stale 로 내고, 잠시 뒤 백그라운드 갱신
+            logger.info(f"[NEWS] L2 로 대체({name}): {e}")
+            return await self._load_from_l2(corp_code, key)
 
         except Exception as e:
-            await asyncio.to_thread(db.rollback)
             # fallback
-            l2_data = await asyncio.to_thread(news_repository.get_cached_news_by_code, db, corp_code)
-            if l2_data:
-                raw_data = _format_news_from_orm(l2_data)
-                await self.redis.set(key, json.dumps(raw_data), ex=NEWS_TTL)
-                return raw_data
-            return {}
+            return await self._load_from_l2(corp_code, key)
 
         finally:
-            # 락 해제
-            try:
-                await self.redis.delete(lock_key)
-            except Exception:
-                pass
-            await asyncio.to_thread(db.close)
+            # 락 해제 (내 토큰일 때만) + 대기자 알림
+            await lock.release()
+
+    async def _get_cached_value(self, key: str):
+        cached, _ = await swr_get(self.redis, key)
+        return cached
@@ -0,0 +1,191 @@
+# /services/refresh_ahead.py
+
+"""
+인기 회사 refresh-ahead 스케줄러.
+
+- details 조회마다 POPULARITY_KEY(ZSET) 점수를 1 올리고, 스케줄러가 주기마다
+  경과 시간만큼 반감기(POPULARITY_HALF_LIFE)로 전체 점수를 감쇠시킵니다.
+- 주기마다 리더 워커 하나가 상위 K 개 회사의 details 캐시(재무/뉴스) 중
+  soft TTL 만료가 REFRESH_AHEAD_LEAD 이내로 남은(또는 없는) 섹션을 미리 갱신하고,
+  그 뒤 요약은 입력 지문이 바뀐 경우에만 다시 생성합니다.
+- 동시 갱신 수(concurrency)와 주기당 갱신 섹션 수(budget)로 업스트림 호출량을 제한합니다.
+"""
+
+import asyncio
+import time
+import redis.asyncio as redis
+from typing import Dict, List, Tuple
+from fastapi.logger import logger
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from core.cache import redis_pool, swr_get, swr_soft_expiries
+from core.config import (
+    POPULARITY_HALF_LIFE, REFRESH_AHEAD_TOP_K, REFRESH_AHEAD_LEAD,
+    REFRESH_AHEAD_CONCURRENCY, REFRESH_AHEAD_BUDGET,
+)
+from core.lock import RedisLock
+from services.financial_service import FinancialService
+from services.news_service import NewsService
+from services.summary_service import SummaryService
+
+POPULARITY_KEY = "details:popularity"                    # member "{corp_code}|{name}", score = 감쇠 조회수
+POPULARITY_DECAYED_AT_KEY = "details:popularity:decayed_at"
+POPULARITY_MAX_MEMBERS = 5000                            # 꼬리 정리 (상위만 유지)
+POPULARITY_MIN_SCORE = 0.01                              # 이보다 식은 회사는 제거
+LEADER_KEY = "refresh_ahead:leader"
+
+FINANCIALS, NEWS, SUMMARY = "financial_data", "news_data", "ai_summary"
+SECTIONS = (FINANCIALS, NEWS, SUMMARY)
+
+
+def _section_keys(corp_code: str, name: str) -> Tuple[str, str, str]:
+    return (
+        f"details:financials:{corp_code}",
+        f"details:news:{name}",
+        f"details:summary:{name}",
+    )
+
+
+async def record_access(redis_client: redis.Redis, corp_code: str, name: str):
+    """details 조회 1회를 인기도에 반영합니다. (감쇠는 스케줄러가 일괄 적용)"""
+    await redis_client.zincrby(POPULARITY_KEY, 1, f"{corp_code}|{name}")
+
+
+async def decay_popularity(redis_client: redis.Redis):
+    """마지막 감쇠 이후 경과 시간만큼 전체 점수를 반감기로 줄이고 식은 회사는 정리합니다."""
+    now = time.time()
+    last = await redis_client.set(POPULARITY_DECAYED_AT_KEY, now, get=True)
+    if last is None:
+        return
+    factor = 0.5 ** (max(0.0, now - float(last)) / POPULARITY_HALF_LIFE)
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.zunionstore(POPULARITY_KEY, {POPULARITY_KEY: factor})
+        pipe.zremrangebyscore(POPULARITY_KEY, "-inf", POPULARITY_MIN_SCORE)
+        pipe.zremrangebyrank(POPULARITY_KEY, 0, -(POPULARITY_MAX_MEMBERS + 1))
+        await pipe.execute()
+
+
+class RefreshAheadScheduler:
+    def __init__(
+        self,
+        top_k: int = REFRESH_AHEAD_TOP_K,
+        lead: float = REFRESH_AHEAD_LEAD,
+        concurrency: int = REFRESH_AHEAD_CONCURRENCY,
+        budget: int = REFRESH_AHEAD_BUDGET,
+    ):
+        self.top_k = top_k
+        self.lead = lead
+        self.concurrency = concurrency
+        self.budget = budget
+        self._counters: Dict[str, float] = {
+            "cycles": 0, "leader_cycles": 0, "timeouts": 0, "skipped_budget": 0,
+            "last_cycle_seconds": 0.0, "last_due_companies": 0,
+            **{f"refreshed_{section}": 0 for section in SECTIONS},
+        }
+
+    async def _plan(self, redis_client: redis.Redis) -> List[Tuple[str, str, List[str]]]:
+        """상위 K 개 회사 중 갱신할 섹션 목록 (인기순, budget 까지)"""
+        members = await redis_client.zrevrange(POPULARITY_KEY, 0, self.top_k - 1)
+        companies = []
+        for member in members:
+            corp_code, _, name = member.partition("|")
+            companies.append((corp_code, name))
+        keys = [key for corp_code, name in companies for key in _section_keys(corp_code, name)]
+        expiries = await swr_soft_expiries(redis_client, keys) if keys else []
+
+        due_before = time.time() + self.lead
+        budget = self.budget
+        plan = []
+        for i, (corp_code, name) in enumerate(companies):
+            financials_expiry, news_expiry, summary_entry = expiries[i * 3:i * 3 + 3]
+            sections = [
+                section
+                for section, expires_at in ((FINANCIALS, financials_expiry), (NEWS, news_expiry))
+                if expires_at is None or expires_at <= due_before
+            ]
+            # 요약은 시간으로 만료되지 않음: 없거나, 입력(재무/뉴스)이 갱신될 때만 확인
+            if sections or summary_entry is None:
+                sections.append(SUMMARY)
+            if not sections:
+                continue
+            if len(sections) > budget:
+                self._counters["skipped_budget"] += 1
+                continue
+            budget -= len(sections)
+            plan.append((corp_code, name, sections))
+        return plan
+
+    async def _refresh_company(
+        self, redis_client: redis.Redis, SessionLocal: async_sessionmaker,
+        semaphore: asyncio.Semaphore, corp_code: str, name: str, sections: List[str],
+    ):
+        async with semaphore:
+            # 요약은 재무/뉴스 캐시를 입력으로 쓰므로 그 다음에
+            first = []
+            if FINANCIALS in sections:
+                first.append(FinancialService(redis_client, SessionLocal).refresh(corp_code))
+            if NEWS in sections:
+                first.append(NewsService(redis_client, SessionLocal).refresh(name, corp_code))
+            await asyncio.gather(*first)
+
+            if SUMMARY in sections:
+                financials_key, news_key, _ = _section_keys(corp_code, name)
+                financial_data, _ = await swr_get(redis_client, financials_key)
+                news_data, _ = await swr_get(redis_client, news_key)
+                if financial_data is not None and news_data is not None:
+                    await SummaryService(redis_client, SessionLocal).refresh(name, financial_data, news_data)
+                else:
+                    sections = [section for section in sections if section != SUMMARY]
+
+            for section in sections:
+                self._counters[f"refreshed_{section}"] += 1
+
+    async def run_cycle(self, redis_client: redis.Redis, SessionLocal: async_sessionmaker, interval: float):
+        """주기 1회: 리더만 감쇠 + 갱신 (리더 키는 해제하지 않고 interval 뒤 만료)"""
+        self._counters["cycles"] += 1
+        leader = RedisLock(redis_client, LEADER_KEY, ttl=interval, renew=False)
+        if not await leader.acquire():
+            return
+        self._counters["leader_cycles"] += 1
+        start = time.monotonic()
+
+        await decay_popularity(redis_client)
+        plan = await self._plan(redis_client)
+        self._counters["last_due_companies"] = len(plan)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        try:
+            # 다음 주기(다른 워커가 리더가 될 수 있음)와 겹치지 않도록 interval 안에 마무리
+            await asyncio.wait_for(
+                asyncio.gather(*(
+                    self._refresh_company(redis_client, SessionLocal, semaphore, corp_code, name, sections)
+                    for corp_code, name, sections in plan
+                )),
+                timeout=interval,
+            )
+        except asyncio.TimeoutError:
+            self._counters["timeouts"] += 1
+            logger.warning(f"[REFRESH-AHEAD] 주기 시간 초과 ({len(plan)}개 회사 예정)")
+        self._counters["last_cycle_seconds"] = round(time.monotonic() - start, 3)
+
+    async def run_forever(self, SessionLocal: async_sessionmaker, interval: float):
+        """lifespan 에서 실행되는 주기 루프"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with redis.Redis(connection_pool=redis_pool) as redis_client:
+                    await self.run_cycle(redis_client, SessionLocal, interval)
+            except Exception as e:
+                logger.error(f"[REFRESH-AHEAD] 주기 실행 실패: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "top_k": self.top_k,
+            "lead_seconds": self.lead,
+            "concurrency": self.concurrency,
+            "budget": self.budget,
+            **self._counters,
+        }
+
+
+refresh_ahead = RefreshAheadScheduler()
@@ -1,105 +1,334 @@
 # /services/summary_service.py
 
-import asyncio
+import hashlib
+import json
+import time
 import redis.asyncio as redis
-from sqlalchemy.orm import Session
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Set, Tuple
+from core.cache import cache_get, cache_set
+from core.config import GROQ_FAILOVER_COOLDOWN
+from core.lock import RedisLock, wait_for_release
+from core.rate_limit import INTERACTIVE, BACKGROUND
+from core.tasks import spawn_background
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from repository import summary_repository
-from services import groq_service
+from services import details_cache, groq_service
 from schemas.summary import SummaryCreate
 from utils.utils import _format_financial, _format_news
 from fastapi.logger import logger
 
-SUMMARY_TTL = 600          # 요약 캐시 TTL (10분)
-SUMMARY_LOCK_TTL = 60      # 락 TTL (60초)
+# 요약은 입력(모델 + 프롬프트 버전 + 재무/채용뉴스) 지문이 같으면 기한 없이 유효합니다.
+# Redis 보관 기간은 메모리 한도용이며, 만료돼도 summaries.input_hash 로 다시 찾습니다.
+SUMMARY_CACHE_TTL = 86400 * 7
+SUMMARY_LOCK_TTL = 60      # 락 TTL (60초, 잡고 있는 동안 자동 연장)
 LOCK_WAIT_TIMEOUT = 10     # 락 못 잡았을 때 최대 대기 시간(초)
-LOCK_POLL_INTERVAL = 0.4   # 폴링 간격(초)
+LEGACY_REGENERATE_AFTER = 600  # 지문 도입 전(10분 TTL)이라면 다시 생성했을 경과 시간 (절약 집계용)
+# 대체 모델로 만든 요약은 stale: 기본 모델이 다시 선택될 수 있는 시점(전환 cooldown) 이후에만 다시 생성
+FALLBACK_REGENERATE_AFTER = GROQ_FAILOVER_COOLDOWN
+
+# refresh() 결과
+REFRESH_FRESH = "fresh"          # 저장된 요약의 지문이 현재 입력과 같음 (호출 없음)
+REFRESH_GENERATED = "generated"  # 다시 생성해 저장함
+REFRESH_SKIPPED = "skipped"      # 다른 요청이 생성 중이거나 생성에 실패함 (또는 방금 대체 모델로 만듦)
+
+SUMMARY_DELTA = "delta"    # (스트리밍) 생성 중인 요약 조각
+SUMMARY_FINAL = "final"    # 최종 요약 전체
+
+# 워커별 지문 캐시 통계
+_stats: Dict[str, int] = {
+    "lookups": 0, "hits_redis": 0, "hits_db": 0, "misses": 0,
+    "generated": 0, "llm_calls_saved": 0, "fallback_model": 0,
+}
+
+
+def summary_cache_stats() -> dict:
+    hits = _stats["hits_redis"] + _stats["hits_db"]
+    return {
+        **_stats,
+        "hit_rate": round(hits / _stats["lookups"], 4) if _stats["lookups"] else None,
+    }
+
+
+def summary_fingerprint(name: str, financial_data, news_data, model: str | None = None) -> str:
+    """
+    요약 입력 지문: 모델 / 프롬프트 버전 / 회사명 / 재무 텍스트 / 채용 뉴스
+    - model 은 실제로 요약을 만든 모델 (기본: 설정된 기본 모델). 대체 모델 요약은 기본 모델 지문과 달라 stale
+    - 재무는 프롬프트에 들어가는 텍스트를 공백 정규화해서 사용
+    - 뉴스는 (링크, 제목) 정렬 목록 (검색 순위 변동 / 날짜 표기 차이(L2 fallback)는 무시)
+    """
+    articles = sorted((a.get("link") or "", a.get("title") or "") for a in news_data.get("채용", []))
+    payload = json.dumps(
+        {
+            "model": model or groq_service.GROQ_MODEL,
+            "prompt": groq_service.PROMPT_VERSION,
+            "company": name,
+            "financial": " ".join(_format_financial(financial_data).split()),
+            "news": articles,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _generated_hash(input_hash: str, model: str | None, name: str, financial_data, news_data) -> str:
+    """생성된 요약을 저장할 지문: 기본 모델이 아닌 모델이 응답했으면 그 모델의 지문"""
+    if model is None or model == groq_service.GROQ_MODEL:
+        return input_hash
+    return summary_fingerprint(name, financial_data, news_data, model)
+
+
+def _fallback_fingerprints(name: str, financial_data, news_data) -> Set[str]:
+    """같은 입력을 대체 모델로 요약했을 때의 지문들"""
+    return {
+        summary_fingerprint(name, financial_data, news_data, model)
+        for model in groq_service.GROQ_FALLBACK_MODELS
+        if model != groq_service.GROQ_MODEL
+    }
+
 
 class SummaryService:
-    def __init__(self, redis_client: redis.Redis, SessionLocal):
+    def __init__(self, redis_client: redis.Redis, SessionLocal: async_sessionmaker):
         self.redis = redis_client
         self.SessionLocal = SessionLocal
+        self.stale = False  # 마지막 응답이 현재 입력과 다른 입력으로 만든 요약인지
+
+    async def _get_cached_entry(self, summary_key: str) -> dict | None:
+        """(L0/L1) {"input_hash", "text", "generated_at"}"""
+        entry = await cache_get(self.redis, summary_key)
+        # 지문 도입 전 형식(요약 문자열)은 없는 것으로 취급
+        return entry if isinstance(entry, dict) else None
+
+    async def _cache_entry(self, summary_key: str, input_hash: str | None, text: str, generated_at: float):
+        entry = {"input_hash": input_hash, "text": text, "generated_at": generated_at}
+        await cache_set(self.redis, summary_key, entry, ex=SUMMARY_CACHE_TTL)
+
+    async def _get_cached_value(self, summary_key: str, input_hash: str) -> str | None:
+        entry = await self._get_cached_entry(summary_key)
+        if entry and entry.get("input_hash") == input_hash:
+            return entry["text"]
+        return None
+
+    def _prompt_inputs(self, financial_data, news_data):
+        return _format_financial(financial_data), _format_news(news_data.get("채용", []))
+
+    async def _store(self, name: str, summary_key: str, input_hash: str, ai_summary_text: str):
+        """생성한 요약을 입력 지문과 함께 L2(DB), L1(Redis) 에 저장합니다."""
+        if not ai_summary_text or not ai_summary_text.strip():
+            # 스트림이 본문 없이 끝난 경우 등: 빈 요약이 같은 지문의 '적중'으로 남지 않도록 실패 처리
+            raise ValueError(f"빈 요약은 저장하지 않습니다: {name}")
+        # (L2 저장) DB upsert
+        async with self.SessionLocal() as db:
+            try:
+                summary_data = SummaryCreate(company_name=name, summary_text=ai_summary_text, input_hash=input_hash)
+                await summary_repository.upsert_summary_async(db, summary_data)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+        # (L1 저장) Redis
+        await self._cache_entry(summary_key, input_hash, ai_summary_text, time.time())
+        await details_cache.invalidate_by_name(self.redis, name)
+        _stats["generated"] += 1
+
+    async def _generate_and_store(
+        self, name: str, summary_key: str, input_hash: str, financial_data, news_data, priority: str = INTERACTIVE
+    ) -> str:
+        """Groq 로 요약을 생성해 L2(DB), L1(Redis) 에 저장합니다. (응답한 모델의 지문으로)"""
+        ai_summary_text, model = await groq_service.summarize(
+            self.redis, name, *self._prompt_inputs(financial_data, news_data), priority=priority
+        )
+        await self._store(name, summary_key, _generated_hash(input_hash, model, name, financial_data, news_data), ai_summary_text)
+        return ai_summary_text
+
+    async def _lookup(
+        self, name: str, summary_key: str, input_hash: str, fallback_hashes: Set[str]
+    ) -> Tuple[str | None, bool, bool]:
+        """
+        저장된 요약을 찾습니다. 반환: (요약, 현재 입력과 지문이 같은지, 다시 생성할지)
+        L1(Redis) 에 같은 지문이 없으면 L2(DB) 를 보고, 찾은 값은 L1 에 다시 채웁니다.
+        같은 입력을 대체 모델로 만든 요약은 stale 이지만, FALLBACK_REGENERATE_AFTER 안에는 다시 생성하지 않습니다.
+        """
+        _stats["lookups"] += 1
+        entry = await self._get_cached_entry(summary_key)
+        if entry and entry.get("input_hash") == input_hash:
+            _stats["hits_redis"] += 1
+            if time.time() - entry.get("generated_at", 0) > LEGACY_REGENERATE_AFTER:
+                _stats["llm_calls_saved"] += 1
+            return entry["text"], True, False
+
+        if entry and entry.get("input_hash") in fallback_hashes:
+            stored_hash, text, generated_at = entry["input_hash"], entry["text"], entry.get("generated_at", 0)
+        else:
+            async with self.SessionLocal() as db:
+                rdb_summary = await summary_repository.get_recent_summary_async(db, name)
+            if rdb_summary is None:
+                _stats["misses"] += 1
+                return (entry or {}).get("text"), False, True
+
+            stored_hash, text = rdb_summary.input_hash, rdb_summary.summary_text
+            generated_at = rdb_summary.updated_at.timestamp() if rdb_summary.updated_at else time.time()
+            await self._cache_entry(summary_key, stored_hash, text, generated_at)
+            if stored_hash == input_hash:
+                _stats["hits_db"] += 1
+                _stats["llm_calls_saved"] += 1
+                return text, True, False
+
+        _stats["misses"] += 1
+        if stored_hash in fallback_hashes:
+            _stats["fallback_model"] += 1
+            return text, False, time.time() - generated_at >= FALLBACK_REGENERATE_AFTER
+        return text, False, True
+
+    async def _load_from_l2(self, name: str, summary_key: str) -> str | None:
+        """(L2 Fallback) DB에 저장된 마지막 요약 (입력 지문과 무관하므로 stale 로 표시)"""
+        async with self.SessionLocal() as db:
+            rdb_summary = await summary_repository.get_recent_summary_async(db, name)
+        if rdb_summary:
+            self.stale = True
+            generated_at = rdb_summary.updated_at.timestamp() if rdb_summary.updated_at else time.time()
+            await self._cache_entry(summary_key, rdb_summary.input_hash, rdb_summary.summary_text, generated_at)
+            return rdb_summary.summary_text
+        return None
+
+    async def get_from_l2(self, name: str) -> str | None:
+        """
+        (기한 초과 대체) DB 에 저장된 마지막 요약 (입력 지문과 무관)
+        진행 중인 생성이 캐시를 채우도록 캐시 저장 / stale 표시 없음 (이전 지문으로 새 요약을 덮어쓰지 않게)
+        """
+        async with self.SessionLocal() as db:
+            rdb_summary = await summary_repository.get_recent_summary_async(db, name)
+        return rdb_summary.summary_text if rdb_summary else None
 
-    async def get_summary(self, name: str, financial_data, news_data):
+    async def _refresh_in_background(
+        self, name: str, summary_key: str, lock_key: str, input_hash: str, financial_data, news_data
+    ) -> str:
+        """입력이 바뀐 요약 갱신 (생성 락을 그대로 사용해 중복 갱신 방지)"""
+        lock = RedisLock(self.redis, lock_key, ttl=SUMMARY_LOCK_TTL)
+        if not await lock.acquire():
+            return REFRESH_SKIPPED  # 다른 요청이 이미 생성/갱신 중
+        try:
+            if await self._get_cached_value(summary_key, input_hash) is not None:
+                return REFRESH_FRESH
+            await self._generate_and_store(
+                name, summary_key, input_hash, financial_data, news_data, priority=BACKGROUND
+            )
+            return REFRESH_GENERATED
+        except Exception as e:
+            logger.warning(f"[SUMMARY] 백그라운드 갱신 실패({name}): {e}")
+            return REFRESH_SKIPPED
+        finally:
+            await lock.release()
+
+    async def refresh(self, name: str, financial_data, news_data) -> str:
+        """(refresh-ahead / 배치) 입력이 바뀌었으면 미리 다시 생성합니다. (같으면 Groq 호출 없음)"""
         summary_key = f"details:summary:{name}"
-        lock_key = f"details:summary_lock:{name}"
+        input_hash = summary_fingerprint(name, financial_data, news_data)
+        _, matched, regenerate = await self._lookup(
+            name, summary_key, input_hash, _fallback_fingerprints(name, financial_data, news_data)
+        )
+        if matched:
+            return REFRESH_FRESH
+        if not regenerate:
+            return REFRESH_SKIPPED  # 방금 대체 모델로 만든 요약 (기본 모델 복귀 전)
+        return await self._refresh_in_background(
+            name, summary_key, f"details:summary_lock:{name}", input_hash, financial_data, news_data
+        )
 
-        # 1) (L1) Redis 조회
-        cached = await self.redis.get(summary_key)
-        if cached:
-            return cached
+    def estimate_tokens(self, name: str, financial_data, news_data) -> int:
+        """요약을 새로 만들 때 드는 예상 토큰 (배치 비용 예산용)"""
+        return groq_service.estimate_summary_tokens(name, *self._prompt_inputs(financial_data, news_data))
 
-        # 2) 락 획득 시도 (SET NX EX)
-        # - nx=True: 키가 없을 때만 set (락)
-        # - ex=SUMMARY_LOCK_TTL: TTL로 데드락 방지
-        got_lock = await self.redis.set(lock_key, "1", ex=SUMMARY_LOCK_TTL, nx=True)
+    async def get_summary(self, name: str, financial_data, news_data) -> str:
+        async with aclosing(self._summary_events(name, financial_data, news_data, stream=False)) as events:
+            async for kind, text in events:
+                if kind == SUMMARY_FINAL:
+                    return text
 
-        # 2-1) 락을 못 잡았으면: 누군가 요약 생성 중 → 잠깐 기다렸다가 캐시를 재조회
-        if not got_lock:
-            waited = 0.0
-            while waited < LOCK_WAIT_TIMEOUT:
-                await asyncio.sleep(LOCK_POLL_INTERVAL)
-                waited += LOCK_POLL_INTERVAL
+    def stream_summary(self, name: str, financial_data, news_data) -> AsyncIterator[Tuple[str, str]]:
+        """
+        get_summary 의 스트리밍 버전.
+        새로 생성할 때는 Groq 토큰을 (SUMMARY_DELTA, 조각) 으로 도착하는 대로 내보내고,
+        마지막에 항상 (SUMMARY_FINAL, 전체 요약) 을 냅니다. (캐시/fallback 이면 FINAL 만)
+        중간에 실패하면 FINAL 은 fallback 문구이므로 클라이언트는 받은 조각을 FINAL 로 교체합니다.
+        """
+        return self._summary_events(name, financial_data, news_data, stream=True)
 
-                cached = await self.redis.get(summary_key)
-                if cached:
-                    return cached
+    async def _summary_events(
+        self, name: str, financial_data, news_data, stream: bool
+    ) -> AsyncIterator[Tuple[str, str]]:
+        summary_key = f"details:summary:{name}"
+        lock_key = f"details:summary_lock:{name}"
+        input_hash = summary_fingerprint(name, financial_data, news_data)
+
+        # 1) 같은 입력으로 만든 요약이 있으면 그대로 (L1 -> L2)
+        #    입력이 바뀐 이전 요약만 있으면 그것을 stale 로 바로 반환하고 백그라운드 재생성
+        stored, matched, regenerate = await self._lookup(
+            name, summary_key, input_hash, _fallback_fingerprints(name, financial_data, news_data)
+        )
+        if stored:
+            if not matched:
+                self.stale = True
+            if regenerate:
+                spawn_background(self._refresh_in_background(
+                    name, summary_key, lock_key, input_hash, financial_data, news_data
+                ))
+            yield SUMMARY_FINAL, stored
+            return
+
+        # 2) 락 획득 시도 (토큰 펜싱 SET NX PX)
+        # - 토큰을 가진 생성자만 해제 가능
+        # - TTL로 데드락 방지, Groq 호출이 길어지면 자동 연장
+        lock = RedisLock(self.redis, lock_key, ttl=SUMMARY_LOCK_TTL)
+
+        # 2-1) 락을 못 잡았으면: 누군가 요약 생성 중 → 해제 알림을 받으면 바로 캐시를 재조회
+        if not await lock.acquire():
+            cached = await wait_for_release(
+                self.redis, lock_key, lambda: self._get_cached_value(summary_key, input_hash), LOCK_WAIT_TIMEOUT
+            )
+            if cached:
+                yield SUMMARY_FINAL, cached
+                return
 
             # 여기까지 왔으면 "생성자"가 너무 오래 걸렸거나 실패했을 수 있음
             # → DB fallback 시도
-            db = self.SessionLocal()
-            try:
-                rdb_summary = await asyncio.to_thread(
-                    summary_repository.get_recent_summary, db, name
-                )
-                if rdb_summary:
-                    await self.redis.set(summary_key, rdb_summary.summary_text, ex=SUMMARY_TTL)
-                    return rdb_summary.summary_text
-                return "AI 요약 생성 중 지연이 발생했습니다. 잠시 후 다시 시도해주세요."
-            finally:
-                await asyncio.to_thread(db.close)
+            rdb_summary_text = await self._load_from_l2(name, summary_key)
+            yield SUMMARY_FINAL, rdb_summary_text or "AI 요약 생성 중 지연이 발생했습니다. 잠시 후 다시 시도해주세요."
+            return
 
         # 3) 락을 잡은 경우: 내가 '생성자'
-        db = self.SessionLocal()
         try:
             # (중요) 락 잡고 나서도 혹시 누가 이미 만들어뒀을 수 있으니 더블체크
-            cached = await self.redis.get(summary_key)
-            if cached:
-                return cached
-
-            fin_text = _format_financial(financial_data)
-            news_text = _format_news(news_data.get("채용", []))
-
-            ai_summary_text = await groq_service.summarize(name, fin_text, news_text)
-
-            # (L2 저장) DB upsert
-            summary_data = SummaryCreate(company_name=name, summary_text=ai_summary_text)
-            await asyncio.to_thread(summary_repository.upsert_summary, db, summary_data)
-            await asyncio.to_thread(db.commit)
-
-            # (L1 저장) Redis
-            await self.redis.set(summary_key, ai_summary_text, ex=SUMMARY_TTL)
-            return ai_summary_text
+            ai_summary_text = await self._get_cached_value(summary_key, input_hash)
+            if not ai_summary_text and stream:
+                parts, model = [], None
+                # 클라이언트가 끊겨도 게이트웨이 슬롯이 바로 반환되도록 aclosing
+                async with aclosing(groq_service.summarize_stream(
+                    self.redis, name, *self._prompt_inputs(financial_data, news_data)
+                )) as tokens:
+                    async for model, token in tokens:
+                        parts.append(token)
+                        yield SUMMARY_DELTA, token
+                ai_summary_text = "".join(parts)
+                await self._store(
+                    name, summary_key, _generated_hash(input_hash, model, name, financial_data, news_data), ai_summary_text
+                )
+            elif not ai_summary_text:
+                ai_summary_text = await self._generate_and_store(
+                    name, summary_key, input_hash, financial_data, news_data
+                )
 
         except Exception as e:
             logger.error(f"[SUMMARY] 생성 실패: {e}")
 
-            await asyncio.to_thread(db.rollback)
-
             # 4) (L2 Fallback) Groq 실패 시 DB 조회
-            rdb_summary = await asyncio.to_thread(
-                summary_repository.get_recent_summary, db, name
-            )
-            if rdb_summary:
-                await self.redis.set(summary_key, rdb_summary.summary_text, ex=SUMMARY_TTL)
-                return rdb_summary.summary_text
-
-            return "AI 요약 생성에 실패했으며, 저장된 정보도 없습니다."
+            rdb_summary_text = await self._load_from_l2(name, summary_key)
+            ai_summary_text = rdb_summary_text or "AI 요약 생성에 실패했으며, 저장된 정보도 없습니다."
 
         finally:
-            # 5) 락 해제 + DB close (락은 생성자만 해제)
-            try:
-                await self.redis.delete(lock_key)
-            except Exception as e:
-                logger.error(f"[SUMMARY] 락 해제 실패: {e}")
+            # 5) 락 해제 (락은 토큰을 가진 생성자만 해제)
+            await lock.release()
 
-            await asyncio.to_thread(db.close)
+        yield SUMMARY_FINAL, ai_summary_text
@@ -0,0 +1,135 @@
+"""
+pytest 공용 설정
+- DB: 임시 SQLite 파일 (동기 = pysqlite, 비동기 = aiosqlite). 테스트마다 테이블을 새로 만듭니다.
+- Redis: fakeredis (테스트마다 새 서버)
+- 비동기 테스트는 anyio 플러그인으로 실행합니다. (@pytest.mark.anyio, asyncio 백엔드)
+"""
+
+import os
+import tempfile
+
+# core.config 가 import 시점에 환경 변수를 읽으므로 다른 import 보다 먼저 설정
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="corpview-test-"), "test.sqlite3")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import fakeredis  # noqa: E402
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+import models  # noqa: E402,F401  (테이블 등록)
+from core.cache import local_cache  # noqa: E402
+from core.database import Base, engine, async_engine, SessionLocal, AsyncSessionLocal  # noqa: E402
+
+engine.echo = False
+async_engine.echo = False
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    """테이블과 L0 캐시를 비운 상태로 시작합니다."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    local_cache.clear()
+    yield
+    local_cache.clear()
+
+
+@pytest.fixture
+async def async_db():
+    from core.tasks import drain_background
+
+    async with AsyncSessionLocal() as db:
+        yield db
+    # 남은 백그라운드 저장이 끝난 뒤, 테스트마다 바뀌는 이벤트 루프에 묶인 커넥션을 버림
+    await drain_background(5)
+    await async_engine.dispose()
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+async def redis_client():
+    client = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+async def upstream():
+    """
+    업스트림 클라이언트를 httpx.MockTransport 로 바꿔 끼웁니다.
+        upstream("dart", handler)  # handler(request) -> httpx.Response
+    """
+    from core.http_client import http_clients
+
+    def install(name: str, handler):
+        http_clients._clients[name] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    yield install
+    await http_clients.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_upstreams(monkeypatch):
+    """회로 차단기 상태를 테스트마다 새로 만들고, 재시도 대기를 없앱니다."""
+    from core import resilience
+
+    for upstream_ in (resilience.dart_upstream, resilience.naver_upstream):
+        monkeypatch.setattr(upstream_, "breaker", resilience.CircuitBreaker(upstream_.name))
+        monkeypatch.setattr(upstream_, "base_delay", 0.0)
+        monkeypatch.setattr(upstream_, "max_delay", 0.0)
+    monkeypatch.setattr(resilience, "groq_breaker", resilience.CircuitBreaker("groq"))
+
+
+@pytest.fixture
+def groq(upstream, monkeypatch):
+    """
+    요약 게이트웨이를 테스트마다 새로 만들고(대기열 / 모델 상태 초기화) Groq 응답을 정합니다.
+        gateway = groq(handler)  # handler(request) -> httpx.Response
+    """
+    from core import config
+    from core.llm_gateway import LLMGateway
+    from services import groq_service
+
+    def install(handler, **overrides) -> LLMGateway:
+        options = dict(
+            models=[config.GROQ_MODEL, *config.GROQ_FALLBACK_MODELS],
+            rpm=config.GROQ_RPM, tpm=config.GROQ_TPM, rpd=0, tpd=0,
+            completion_reserve=config.GROQ_COMPLETION_RESERVE, background_reserve=config.GROQ_BACKGROUND_RESERVE,
+            max_concurrency=config.GROQ_MAX_CONCURRENCY, queue_timeout=1.0, timeout=5.0,
+            failover_p95_ms=config.GROQ_FAILOVER_P95_MS, failover_error_rate=config.GROQ_FAILOVER_ERROR_RATE,
+            failover_cooldown=config.GROQ_FAILOVER_COOLDOWN, breaker=None,
+        )
+        options.update(overrides)
+        gateway = LLMGateway("groq", "https://groq.test/openai/v1/chat/completions", "test-key", **options)
+        monkeypatch.setattr(groq_service, "groq_gateway", gateway)
+        upstream("groq", handler)
+        return gateway
+
+    return install
+
+
+@pytest.fixture
+async def api(redis_client):
+    """lifespan 없이 앱을 직접 호출하는 클라이언트 (Redis 는 fakeredis 로 주입)"""
+    import main
+    from core.cache import get_redis
+
+    async def _get_redis():
+        yield redis_client
+
+    main.app.dependency_overrides[get_redis] = _get_redis
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+        yield client
+    main.app.dependency_overrides.clear()
+    await async_engine.dispose()
@@ -0,0 +1,73 @@
+"""테스트용 업스트림 응답 / 행 생성 함수"""
+
+import json
+from typing import Dict, List
+
+
+def dart_rows(amounts: Dict[str, List[int]], fs_div: str = "CFS", rcept_no: str = "20250311000001", corp_code: str | None = None):
+    """
+    DART 주요계정 응답의 list 행
+    amounts: 계정명 -> [전전기, 전기, 당기] 금액
+    """
+    rows = []
+    for account, (bfefrmtrm, frmtrm, thstrm) in amounts.items():
+        row = {
+            "rcept_no": rcept_no,
+            "fs_div": fs_div,
+            "account_nm": account,
+            "bfefrmtrm_amount": f"{bfefrmtrm:,}",
+            "frmtrm_amount": f"{frmtrm:,}",
+            "thstrm_amount": f"{thstrm:,}",
+        }
+        if corp_code is not None:
+            row["corp_code"] = corp_code
+        rows.append(row)
+    return rows
+
+
+def revenue_rows(revenues: List[int], **kwargs):
+    """매출액만 다르고 나머지 계정은 고정인 DART 행 (전전기, 전기, 당기)"""
+    return dart_rows(
+        {
+            "매출액": revenues,
+            "영업이익": [10, 10, 10],
+            "당기순이익": [5, 5, 5],
+            "자산총계": [300, 300, 300],
+            "자본총계": [200, 200, 200],
+        },
+        **kwargs,
+    )
+
+
+def naver_items(query: str, count: int = 3) -> dict:
+    """Naver 뉴스 검색 응답"""
+    return {
+        "items": [
+            {
+                "title": f"{query} 기사 {i}",
+                "originallink": f"https://news.example.com/{query}/{i}",
+                "link": f"https://n.news.naver.com/{query}/{i}",
+                "description": "",
+                "pubDate": "Mon, 01 Jan 2024 09:00:00 +0900",
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def groq_completion(text: str, model: str = "openai/gpt-oss-120b", total_tokens: int = 100) -> dict:
+    """Groq(OpenAI 호환) Chat Completions 응답"""
+    return {
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}}],
+        "usage": {"total_tokens": total_tokens},
+    }
+
+
+def groq_sse(tokens: List[str]) -> bytes:
+    """Groq 스트리밍(SSE) 응답 본문"""
+    events = [
+        f'data: {{"choices": [{{"index": 0, "delta": {{"content": {json.dumps(token)}}}}}]}}\n\n'
+        for token in tokens
+    ]
+    return ("".join(events) + "data: [DONE]\n\n").encode()
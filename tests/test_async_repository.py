@@ -0,0 +1,133 @@
+"""비동기 repository (AsyncSession, sqlite+aiosqlite)"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, func
+
+from models import CompanyOverviews, CachedNewsArticle
+from repository import company_repository, financials_repository, news_repository, summary_repository
+from schemas.summary import SummaryCreate
+
+pytestmark = pytest.mark.anyio
+
+CORP_CODE = "00126380"
+
+
+async def _add_companies(db):
+    db.add_all([
+        CompanyOverviews(corp_code=CORP_CODE, corp_name="삼성전자", favorite_count=5),
+        CompanyOverviews(corp_code="00164779", corp_name="SK하이닉스", favorite_count=9),
+        CompanyOverviews(corp_code="00401731", corp_name="LG전자", favorite_count=1),
+    ])
+    await db.commit()
+
+
+async def test_company_lookups(async_db):
+    await _add_companies(async_db)
+
+    company = await company_repository.get_company_by_name_exact_async(async_db, "삼성전자")
+    assert company.corp_code == CORP_CODE
+    assert await company_repository.get_company_by_name_exact_async(async_db, "없는회사") is None
+    assert (await company_repository.get_company_by_code_async(async_db, CORP_CODE)).corp_name == "삼성전자"
+
+    found = await company_repository.get_companies_by_codes_async(async_db, [CORP_CODE, "00401731"])
+    assert {c.corp_name for c in found} == {"삼성전자", "LG전자"}
+    assert await company_repository.get_companies_by_codes_async(async_db, []) == []
+
+    best = await company_repository.get_best_companies_async(async_db, limit=2)
+    assert [c.corp_name for c in best] == ["SK하이닉스", "삼성전자"]
+
+    assert await company_repository.get_corp_codes_after_async(async_db, None, 2) == ["00126380", "00164779"]
+    assert await company_repository.get_corp_codes_after_async(async_db, "00164779", 2) == ["00401731"]
+
+
+async def test_apply_favorite_deltas(async_db):
+    await _add_companies(async_db)
+
+    affected = await company_repository.apply_favorite_deltas_async(
+        async_db, {CORP_CODE: 2, "00164779": 2, "00401731": -1}
+    )
+    await async_db.commit()
+
+    assert affected == 3
+    counts = dict(await company_repository.get_all_favorite_counts_async(async_db))
+    assert counts == {CORP_CODE: 7, "00164779": 11, "00401731": 0}
+
+
+async def test_financials_upsert_and_read(async_db):
+    await _add_companies(async_db)
+    financial_data = {
+        "2023": {"매출액": 100, "영업이익": 10, "당기순이익": 5, "자산총계": 300, "자본총계": 200, "ratio": {"ROE": 2.5}},
+        "2024": {"매출액": 120, "영업이익": 12, "당기순이익": 6, "자산총계": 320, "자본총계": 210, "ratio": {"ROE": 2.9}},
+    }
+
+    # 6자리 코드는 저장 형식(8자리)으로 맞춰 저장/조회
+    await financials_repository.upsert_financials_async(async_db, "126380", financial_data)
+    await async_db.commit()
+    financial_data["2024"]["매출액"] = 130
+    await financials_repository.upsert_financials_async(async_db, "126380", financial_data)
+    await async_db.commit()
+
+    rows = await financials_repository.get_financials_by_code_async(async_db, "126380")
+    assert [(row.year, row.revenue) for row in rows] == [(2023, 100), (2024, 130)]
+    rows = await financials_repository.get_financials_by_code_async(async_db, CORP_CODE, years=[2024])
+    assert [row.year for row in rows] == [2024]
+
+    stored = await financials_repository.get_stored_periods_async(async_db, [CORP_CODE, "00164779"], "11011", [2023, 2024, 2025])
+    assert stored == {(CORP_CODE, 2023), (CORP_CODE, 2024)}
+    assert [code for code, *_ in await company_repository.get_companies_with_financials_async(async_db, "11011")] == [CORP_CODE]
+
+
+async def test_report_checks(async_db):
+    await _add_companies(async_db)
+    since = datetime.now() - timedelta(minutes=1)
+
+    await financials_repository.record_report_checks_async(async_db, {CORP_CODE: "20240312000736", "00164779": None}, 2024, "11011")
+    await async_db.commit()
+
+    checked = await financials_repository.get_recent_checks_async(
+        async_db, [CORP_CODE, "00164779", "00401731"], "11011", [2024], since
+    )
+    assert checked == {(CORP_CODE, 2024), ("00164779", 2024)}
+
+
+async def test_news_upsert_keeps_history_and_limits_latest(async_db):
+    await _add_companies(async_db)
+    pub_date = "Mon, 01 Jan 2024 09:00:00 +0900"
+    first = {"채용": [
+        {"id": str(i), "title": f"기사 {i}", "link": f"https://news.example.com/{i}", "pubDate": pub_date}
+        for i in range(7)
+    ]}
+
+    await news_repository.upsert_news_articles_async(async_db, CORP_CODE, first)
+    await async_db.commit()
+    # 같은 기사를 다시 받아도 중복 행이 생기지 않음
+    await news_repository.upsert_news_articles_async(async_db, CORP_CODE, first)
+    await async_db.commit()
+
+    stored = await async_db.scalar(
+        select(func.count()).select_from(CachedNewsArticle).where(CachedNewsArticle.corp_code == CORP_CODE)
+    )
+    assert stored == 7
+
+    latest = await news_repository.get_cached_news_by_code_async(async_db, CORP_CODE)
+    assert len(latest) == 5
+    assert {article.category for article in latest} == {"채용"}
+    # details 는 6자리 코드("126380")로 조회
+    assert len(await news_repository.get_cached_news_by_code_async(async_db, str(int(CORP_CODE)))) == 5
+    sync_latest = await async_db.run_sync(news_repository.get_cached_news_by_code, str(int(CORP_CODE)))
+    assert [article.link for article in sync_latest] == [article.link for article in latest]
+
+
+async def test_summary_upsert(async_db):
+    await _add_companies(async_db)
+
+    await summary_repository.upsert_summary_async(async_db, SummaryCreate(company_name="삼성전자", summary_text="v1", input_hash="a"))
+    await async_db.commit()
+    await summary_repository.upsert_summary_async(async_db, SummaryCreate(company_name="삼성전자", summary_text="v2", input_hash="b"))
+    await async_db.commit()
+
+    summary = await summary_repository.get_recent_summary_async(async_db, "삼성전자")
+    assert (summary.summary_text, summary.input_hash) == ("v2", "b")
+    assert await summary_repository.get_recent_summary_async(async_db, "LG전자") is None
@@ -0,0 +1,71 @@
+"""집합 기반 bulk upsert (repository.bulk) 와 뉴스 L2 반영 시각"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql
+
+from models import CompanyOverviews, FinancialStatement, CachedNewsArticle
+from repository import news_repository
+from repository.bulk import build_upsert, bulk_upsert
+from repository.financials_repository import FINANCIALS_CONFLICT_COLS
+from tests.factories import naver_items
+
+CORP_CODE = "00126380"
+
+
+def _row(year, revenue):
+    return {"corp_code": CORP_CODE, "year": year, "reprt_code": "11011", "revenue": revenue}
+
+
+def _revenues(db):
+    return dict(db.execute(select(FinancialStatement.year, FinancialStatement.revenue).order_by(FinancialStatement.year)).all())
+
+
+@pytest.fixture
+def company(db):
+    db.add(CompanyOverviews(corp_code=CORP_CODE, corp_name="삼성전자"))
+    db.commit()
+
+
+def test_sqlite_upsert_inserts_and_updates(db, company):
+    assert bulk_upsert(db, FinancialStatement, [_row(2023, 100), _row(2024, 200)], FINANCIALS_CONFLICT_COLS) == 2
+    # 같은 키는 갱신, 한 문장 안의 중복 키는 뒤의 행 우선, 청크로 나눠도 결과 동일
+    sent = bulk_upsert(
+        db, FinancialStatement, [_row(2024, 210), _row(2024, 220), _row(2022, 50)], FINANCIALS_CONFLICT_COLS,
+        chunk_size=1,
+    )
+    db.commit()
+    assert sent == 2
+    assert _revenues(db) == {2022: 50, 2023: 100, 2024: 220}
+
+
+def test_sqlite_insert_only_keeps_existing_rows(db, company):
+    bulk_upsert(db, FinancialStatement, [_row(2024, 200)], FINANCIALS_CONFLICT_COLS)
+    bulk_upsert(db, FinancialStatement, [_row(2024, 999), _row(2023, 100)], FINANCIALS_CONFLICT_COLS, update_cols=())
+    db.commit()
+    assert _revenues(db) == {2023: 100, 2024: 200}
+
+
+def test_mysql_statement_shape():
+    sql = str(build_upsert("mysql", FinancialStatement, FINANCIALS_CONFLICT_COLS, ["revenue"]).compile(dialect=mysql.dialect()))
+    assert "ON DUPLICATE KEY UPDATE revenue = VALUES(revenue)" in sql
+    # insert-only 도 ON DUPLICATE KEY UPDATE 가 필요하므로 키를 자기 자신으로
+    sql = str(build_upsert("mysql", FinancialStatement, FINANCIALS_CONFLICT_COLS, []).compile(dialect=mysql.dialect()))
+    assert "ON DUPLICATE KEY UPDATE corp_code = VALUES(corp_code)" in sql
+    with pytest.raises(NotImplementedError):
+        build_upsert("oracle", FinancialStatement, FINANCIALS_CONFLICT_COLS, [])
+
+
+def test_news_upsert_uses_whole_seconds(db, company):
+    news_data = {"채용": [
+        {"id": str(i), "title": item["title"], "link": item["link"], "pubDate": item["pubDate"]}
+        for i, item in enumerate(naver_items("삼성전자 채용")["items"])
+    ]}
+    news_repository.upsert_news_articles(db, CORP_CODE, news_data)
+    news_repository.upsert_news_articles(db, CORP_CODE, news_data)  # 기존 기사는 cached_at 만 갱신
+    db.commit()
+
+    cached_at = db.scalars(select(CachedNewsArticle.cached_at)).all()
+    assert len(cached_at) == 3
+    # DATETIME(0) 반올림으로 방금 저장한 행이 정리 기준보다 앞서지 않도록 초 단위로 저장
+    assert all(value.microsecond == 0 for value in cached_at)
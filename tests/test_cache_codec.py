@@ -0,0 +1,104 @@
+"""Redis 캐시 값 코덱과 이전 형식 호환 (core.codec, core.cache)"""
+
+import json
+import time
+
+import pytest
+
+from core import cache
+from core.cache import cache_get, cache_set, local_cache, swr_get, swr_set, swr_soft_expiries
+from core.codec import CacheCodec, CodecError, VERSION, _AVAILABLE, ZSTD
+
+pytestmark = pytest.mark.anyio
+
+NEWS = {"채용": [{"id": str(i), "title": f"삼성전자 채용 기사 {i}", "link": f"https://news.example.com/{i}"} for i in range(50)]}
+COMBOS = [("json", "none"), ("orjson", "none"), ("json", "zstd"), ("orjson", "zstd")]
+
+
+@pytest.fixture
+def use_codec(monkeypatch):
+    """core.cache 가 쓰는 코덱을 바꿉니다. (쓰기 형식 전환 흉내)"""
+
+    def install(**options) -> CacheCodec:
+        codec = CacheCodec(**options)
+        monkeypatch.setattr(cache, "codec", codec)
+        local_cache.clear()
+        return codec
+
+    return install
+
+
+@pytest.mark.parametrize("serializer,compression", COMBOS)
+def test_round_trip(serializer, compression):
+    codec = CacheCodec(serializer, compression, compress_min_bytes=64)
+    raw = codec.encode("details:news:x", NEWS, soft_expires_at=1234.5)
+    assert raw[0] == VERSION
+    assert codec.decode("details:news:x", raw) == (1234.5, NEWS)
+    assert codec.soft_expiry(raw[:32]) == 1234.5
+
+    raw = codec.encode("details:info:x", {"a": 1}, dumps=lambda v: "텍스트")
+    assert codec.decode("details:info:x", raw, loads=lambda text: text) == (None, "텍스트")
+    assert codec.soft_expiry(raw) == 0.0
+
+
+@pytest.mark.skipif(not _AVAILABLE[ZSTD], reason="zstandard 미설치")
+def test_compresses_only_large_payloads():
+    codec = CacheCodec("json", "zstd", compress_min_bytes=1024)
+    codec.encode("details:summary:a", {"text": "짧음"})
+    codec.encode("details:news:a", NEWS)
+    namespaces = codec.stats()["namespaces"]
+    assert namespaces["details:summary"]["compressed"] == 0
+    assert namespaces["details:news"]["compressed"] == 1
+    assert namespaces["details:news"]["saved_ratio"] > 0
+
+
+def test_reads_legacy_text_values():
+    codec = CacheCodec("orjson", "zstd")
+    assert codec.decode("details:news:x", f"swr1:1234.500|{json.dumps(NEWS)}".encode()) == (1234.5, NEWS)
+    assert codec.decode("details:summary:x", json.dumps({"text": "요약"}).encode()) == (None, {"text": "요약"})
+    assert codec.soft_expiry(b"swr1:1234.500|{\"") == 1234.5
+    assert codec.stats()["namespaces"]["details:news"]["legacy_reads"] == 1
+
+    with pytest.raises(CodecError):
+        codec.decode("details:news:x", bytes((VERSION, 0x70)) + b"??")  # 알 수 없는 압축
+
+
+def test_legacy_write_version_writes_text():
+    codec = CacheCodec(write_version=0)
+    assert codec.encode("details:summary:x", {"text": "요약"}) == json.dumps({"text": "요약"})
+    assert codec.encode("details:news:x", NEWS, soft_expires_at=1234.5) == f"swr1:1234.500|{json.dumps(NEWS)}"
+
+
+def test_default_config_writes_legacy_format():
+    from core.config import CACHE_CODEC_WRITE_VERSION
+
+    assert CACHE_CODEC_WRITE_VERSION == 0
+    assert cache.codec.write_version == 0
+
+
+async def test_mixed_formats_through_redis(redis_client, use_codec):
+    # 이전 형식으로 쓴 값(배포 전 / 되돌린 워커)을 새 형식 워커가 읽고, 그 반대도 읽음
+    use_codec(write_version=0)
+    await swr_set(redis_client, "details:news:legacy", NEWS, 600, 3600)
+    await cache_set(redis_client, "details:summary:legacy", {"text": "요약"}, 3600)
+    assert (await redis_client.get("details:news:legacy")).startswith("swr1:")
+
+    use_codec(serializer="orjson", compression="zstd", compress_min_bytes=64, write_version=1)
+    await swr_set(redis_client, "details:news:binary", NEWS, 600, 3600)
+    await cache_set(redis_client, "details:summary:binary", {"text": "요약"}, 3600)
+
+    for reader in ({"write_version": 0}, {"write_version": 1}):
+        use_codec(**reader)
+        for suffix in ("legacy", "binary"):
+            assert await swr_get(redis_client, f"details:news:{suffix}") == (NEWS, False)
+            assert await cache_get(redis_client, f"details:summary:{suffix}") == {"text": "요약"}
+
+    soft = await swr_soft_expiries(redis_client, ["details:news:legacy", "details:news:binary", "details:news:none"])
+    assert all(time.time() < expires_at <= time.time() + 600 for expires_at in soft[:2])
+    assert soft[2] is None
+
+
+async def test_undecodable_value_is_a_miss(redis_client, use_codec):
+    use_codec()
+    await redis_client.set("details:summary:broken", bytes((VERSION, 0x70)) + b"??")
+    assert await cache_get(redis_client, "details:summary:broken") is None
@@ -0,0 +1,63 @@
+"""회사 목록 API 의 keyset 페이지 / 스트리밍 (routers.companies)"""
+
+import json
+
+import pytest
+
+from models import CompanyOverviews
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def industry_companies(db):
+    names = ["가나전자", "다라전자", "마바전자", "사아전자", "자차전자"]
+    db.add_all([
+        CompanyOverviews(corp_code=f"0000000{i}", corp_name=name, induty_code="264")
+        for i, name in enumerate(names)
+    ])
+    db.add(CompanyOverviews(corp_code="00000009", corp_name="다른업종", induty_code="101"))
+    db.commit()
+    return names
+
+
+async def test_by_industry_returns_full_list_without_paging_params(api, industry_companies):
+    response = await api.get("/companies/by-industry", params={"industry_code": 26})
+
+    assert response.status_code == 200
+    assert sorted(c["corp_name"] for c in response.json()) == industry_companies
+    assert "X-Next-Cursor" not in response.headers
+
+
+async def test_by_industry_pages_with_limit_and_cursor(api, industry_companies):
+    pages, params = [], {"industry_code": 26, "limit": 2}
+    while True:
+        response = await api.get("/companies/by-industry", params=params)
+        pages.append([c["corp_name"] for c in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    assert pages == [industry_companies[0:2], industry_companies[2:4], industry_companies[4:]]
+
+
+async def test_by_industry_stream_and_bad_cursor(api, industry_companies):
+    response = await api.get("/companies/by-industry", params={"industry_code": 26, "stream": "true"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["corp_name"] for line in response.text.splitlines()] == industry_companies
+
+    response = await api.get("/companies/by-industry", params={"industry_code": 26, "cursor": "???"})
+    assert response.status_code == 400
+
+
+async def test_search_relevance_rejects_limit_over_cap(api, industry_companies):
+    response = await api.get("/companies/search", params={"keyword": "전자", "limit": 500})
+    assert response.status_code == 422
+
+    response = await api.get("/companies/search", params={"keyword": "전자", "limit": 100})
+    assert sorted(c["corp_name"] for c in response.json()) == industry_companies
+
+    # 회사명 순 페이지는 큰 limit 허용
+    response = await api.get("/companies/search", params={"keyword": "전자", "limit": 500, "sort": "name"})
+    assert [c["corp_name"] for c in response.json()] == industry_companies
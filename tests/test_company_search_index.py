@@ -0,0 +1,82 @@
+"""회사명 인메모리 검색 인덱스 (services.company_search_index)"""
+
+from models import CompanyOverviews
+from services.company_search_index import CompanySearchIndex, IndexedCompany, to_chosung, is_chosung_query
+
+
+def _company(corp_code: str, corp_name: str, favorite_count: int = 0) -> IndexedCompany:
+    return IndexedCompany(corp_code, corp_name, favorite_count, hm_url=None, category=None, logo=None)
+
+
+def _names(results):
+    return [c.corp_name for c in results]
+
+
+def _index() -> CompanySearchIndex:
+    index = CompanySearchIndex()
+    index.build([
+        _company("1", "삼성전자", 10),
+        _company("2", "삼성전자서비스", 3),
+        _company("3", "삼성SDI", 7),
+        _company("4", "한국삼성정밀", 50),
+        _company("5", "SK하이닉스", 20),
+    ])
+    return index
+
+
+def test_chosung_helpers():
+    assert to_chosung("삼성전자") == "ㅅㅅㅈㅈ"
+    assert to_chosung("SK하이닉스") == "SKㅎㅇㄴㅅ"
+    assert is_chosung_query("ㅅㅅ")
+    assert not is_chosung_query("삼ㅅ")
+
+
+def test_exact_then_prefix_then_infix():
+    index = _index()
+    # 정확 일치 > prefix(좋아요 순) > infix
+    assert _names(index.search("삼성전자")) == ["삼성전자", "삼성전자서비스"]
+    assert _names(index.search("삼성")) == ["삼성전자", "삼성SDI", "삼성전자서비스", "한국삼성정밀"]
+    assert _names(index.search("하이닉스")) == ["SK하이닉스"]
+    # 대소문자 / 공백 무시
+    assert _names(index.search(" sk 하이")) == ["SK하이닉스"]
+    assert _names(index.search("삼성", limit=2)) == ["삼성전자", "삼성SDI"]
+
+
+def test_chosung_prefix_and_infix():
+    index = _index()
+    assert _names(index.search("ㅅㅅㅈㅈ")) == ["삼성전자", "삼성전자서비스"]
+    assert _names(index.search("ㅈㅁ")) == ["한국삼성정밀"]
+
+
+def test_incremental_apply_rows():
+    index = _index()
+    result = index.apply_rows([
+        _company("1", "삼성전자", 11),       # 필드만 변경
+        _company("2", "삼성전자서비스", 3),  # 그대로
+        _company("3", "삼성에스디아이", 7),  # 이름 변경 → 재색인
+        _company("6", "LG전자", 1),          # 추가
+    ])
+
+    assert result == {"changed": 3, "removed": 2}
+    assert index.search("삼성SDI") == []
+    assert _names(index.search("에스디")) == ["삼성에스디아이"]
+    assert _names(index.search("전자")) == ["삼성전자", "삼성전자서비스", "LG전자"]
+    assert index.search("하이닉스") == []
+    assert index.stats()["companies"] == 4
+
+
+def test_refresh_from_db(db):
+    db.add_all([
+        CompanyOverviews(corp_code="00126380", corp_name="삼성전자", favorite_count=1),
+        CompanyOverviews(corp_code="00164779", corp_name="SK하이닉스", favorite_count=2),
+    ])
+    db.commit()
+    index = CompanySearchIndex()
+    index.refresh_from_db()
+    assert index.ready
+    assert _names(index.search("ㅎㅇㄴㅅ")) == ["SK하이닉스"]
+
+    db.query(CompanyOverviews).filter_by(corp_code="00126380").update({"corp_name": "삼성전자우"})
+    db.commit()
+    index.refresh_from_db()
+    assert _names(index.search("전자우")) == ["삼성전자우"]
@@ -0,0 +1,108 @@
+"""'좋아요' write-behind 카운터 / Redis 랭킹 (services.company_service)"""
+
+import pytest
+import redis.asyncio as redis
+from redis.asyncio.retry import Retry
+from redis.backoff import NoBackoff
+from fastapi import HTTPException
+
+from core.database import AsyncSessionLocal
+from models import CompanyOverviews
+from repository import company_repository
+from services import company_service
+from services.company_service import FAVORITES_KEY, FAVORITES_FLUSHING_KEY
+
+pytestmark = pytest.mark.anyio
+
+SAMSUNG, HYNIX = 126380, 164779
+
+
+@pytest.fixture(autouse=True)
+def _no_diverged(monkeypatch):
+    monkeypatch.setattr(company_service, "_diverged", set())
+
+
+@pytest.fixture
+async def companies(async_db):
+    async_db.add_all([
+        CompanyOverviews(corp_code="00126380", corp_name="삼성전자", favorite_count=5),
+        CompanyOverviews(corp_code="00164779", corp_name="SK하이닉스", favorite_count=9),
+    ])
+    await async_db.commit()
+
+
+@pytest.fixture
+async def redis_down():
+    """연결할 수 없는 Redis (모든 명령이 ConnectionError)"""
+    client = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1, retry=Retry(NoBackoff(), 0))
+    yield client
+    await client.aclose()
+
+
+async def _db_counts():
+    async with AsyncSessionLocal() as db:
+        return dict(await company_repository.get_all_favorite_counts_async(db))
+
+
+async def test_counts_in_redis_then_flushes_to_db(async_db, redis_client, companies):
+    assert await company_service.add_favorite_count(redis_client, async_db, AsyncSessionLocal, SAMSUNG) == 6
+    assert await company_service.add_favorite_count(redis_client, async_db, AsyncSessionLocal, SAMSUNG) == 7
+    assert await company_service.subtract_favorite_count(redis_client, async_db, AsyncSessionLocal, HYNIX) == 8
+
+    best = await company_service.get_best_companies(redis_client, async_db, AsyncSessionLocal, 2)
+    assert [(c["corp_name"], c["favorite_count"], c["rank"]) for c in best] == [("SK하이닉스", 8, 1), ("삼성전자", 7, 2)]
+
+    assert (await _db_counts())["00126380"] == 5  # 아직 반영 전
+    assert await company_service.flush_favorite_deltas(redis_client, AsyncSessionLocal) == 2
+    assert await _db_counts() == {"00126380": 7, "00164779": 8}
+
+
+async def test_company_added_after_build_is_seeded_from_db(async_db, redis_client, companies):
+    await company_service.ensure_leaderboard(redis_client, AsyncSessionLocal)
+    async_db.add(CompanyOverviews(corp_code="00401731", corp_name="LG전자", favorite_count=3))
+    await async_db.commit()
+
+    assert await company_service.add_favorite_count(redis_client, async_db, AsyncSessionLocal, 401731) == 4
+    assert await redis_client.zscore(FAVORITES_KEY, "00401731") == 4
+
+    with pytest.raises(HTTPException) as e:
+        await company_service.add_favorite_count(redis_client, async_db, AsyncSessionLocal, 999999)
+    assert e.value.status_code == 404
+
+
+async def test_redis_outage_falls_back_to_db_and_reconciles(async_db, redis_client, redis_down, companies):
+    await company_service.add_favorite_count(redis_client, async_db, AsyncSessionLocal, SAMSUNG)  # Redis: 6, 미반영 +1
+
+    assert await company_service.add_favorite_count(redis_down, async_db, AsyncSessionLocal, SAMSUNG) == 6
+    best = await company_service.get_best_companies(redis_down, async_db, AsyncSessionLocal, 1)
+    assert best[0]["corp_name"] == "SK하이닉스"
+    assert (await _db_counts())["00126380"] == 6
+
+    # Redis 복구: MySQL 값(6) + 미반영 증감분(+1) 로 점수를 다시 맞춘 뒤 증가
+    assert await company_service.add_favorite_count(redis_client, async_db, AsyncSessionLocal, SAMSUNG) == 8
+    await company_service.flush_favorite_deltas(redis_client, AsyncSessionLocal)
+    assert (await _db_counts())["00126380"] == 8
+
+
+async def test_flush_is_not_reapplied_after_crash(async_db, redis_client, companies, monkeypatch):
+    await company_service.add_favorite_count(redis_client, async_db, AsyncSessionLocal, SAMSUNG)
+    await company_service.add_favorite_count(redis_client, async_db, AsyncSessionLocal, SAMSUNG)
+
+    delete = redis_client.delete
+
+    async def crash_on_flushing_delete(*keys):
+        if FAVORITES_FLUSHING_KEY in keys:
+            raise redis.ConnectionError("crash")
+        return await delete(*keys)
+
+    # commit 은 됐지만 flushing 키를 지우기 전에 실패
+    monkeypatch.setattr(redis_client, "delete", crash_on_flushing_delete)
+    with pytest.raises(redis.ConnectionError):
+        await company_service.flush_favorite_deltas(redis_client, AsyncSessionLocal)
+    monkeypatch.setattr(redis_client, "delete", delete)
+    assert (await _db_counts())["00126380"] == 7
+
+    # 다음 주기: 같은 묶음은 다시 적용하지 않고 정리만
+    assert await company_service.flush_favorite_deltas(redis_client, AsyncSessionLocal) == 0
+    assert await redis_client.exists(FAVORITES_FLUSHING_KEY) == 0
+    assert (await _db_counts())["00126380"] == 7
@@ -0,0 +1,150 @@
+"""DART 클라이언트 상태 코드 / 재시도와 다중회사 적재 작업 (clients.dart_api_client, jobs.ingest_financials)"""
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from clients import dart_api_client
+from core.database import AsyncSessionLocal
+from jobs import ingest_financials
+from jobs.ingest_financials import FinancialsIngestor, DartIngestError
+from models import CompanyOverviews, FinancialReportCheck
+from repository import financials_repository
+from tests.factories import revenue_rows
+
+pytestmark = pytest.mark.anyio
+
+
+def _responses(*responses):
+    """순서대로 응답하는 MockTransport 핸들러 (예외를 넣으면 그 예외를 발생)"""
+    queue = list(responses)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        response = queue.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return httpx.Response(200, json=response) if isinstance(response, dict) else response
+
+    return handler, calls
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr(dart_api_client, "DART_RATE_LIMIT_BACKOFF", 0.0)
+    monkeypatch.setattr(ingest_financials, "BACKOFF_BASE", 0.0)
+
+
+# --- 단일회사 (fnlttSinglAcnt) ---
+
+async def test_single_status_000_returns_rows(upstream):
+    handler, calls = _responses({"status": "000", "list": revenue_rows([1, 2, 3])})
+    upstream("dart", handler)
+
+    data = await dart_api_client.fetch_financial_raw("126380", 2024)
+    assert len(data["list"]) == 5
+    assert calls[0].url.params["corp_code"] == "00126380"
+
+
+async def test_single_status_013_is_404_without_retry(upstream):
+    handler, calls = _responses({"status": "013", "message": "조회된 데이타가 없습니다."})
+    upstream("dart", handler)
+
+    with pytest.raises(HTTPException) as e:
+        await dart_api_client.fetch_financial_raw("00126380", 2024)
+    assert e.value.status_code == 404
+    assert len(calls) == 1
+
+
+async def test_single_retries_020_and_network_errors(upstream):
+    handler, calls = _responses(
+        {"status": "020", "message": "요청 제한을 초과하였습니다."},
+        httpx.ConnectError("reset"),
+        {"status": "000", "list": revenue_rows([1, 2, 3])},
+    )
+    upstream("dart", handler)
+
+    data = await dart_api_client.fetch_financial_raw("00126380", 2024)
+    assert data["list"]
+    assert len(calls) == 3
+
+
+async def test_single_status_800_fails_without_retry(upstream):
+    handler, calls = _responses({"status": "800", "message": "시스템 점검"})
+    upstream("dart", handler)
+
+    with pytest.raises(HTTPException) as e:
+        await dart_api_client.fetch_financial_raw("00126380", 2024)
+    assert e.value.status_code == 502
+    assert len(calls) == 1
+
+
+# --- 다중회사 적재 (fnlttMultiAcnt) ---
+
+def _ingestor(tmp_path, **kwargs) -> FinancialsIngestor:
+    return FinancialsIngestor(
+        AsyncSessionLocal, bsns_year=2024, reprt_code="11011",
+        checkpoint_path=str(tmp_path / "checkpoint.json"), rps=0, **kwargs,
+    )
+
+
+async def test_multi_fetch_statuses(upstream, tmp_path):
+    handler, calls = _responses(
+        {"status": "000", "list": revenue_rows([1, 2, 3], corp_code="00126380")},
+        {"status": "013", "message": "조회된 데이타가 없습니다."},
+        {"status": "020", "message": "요청 제한을 초과하였습니다."},
+        httpx.ReadTimeout("timeout"),
+        {"status": "000", "list": []},
+        {"status": "800", "message": "시스템 점검"},
+    )
+    upstream("dart", handler)
+    ingestor = _ingestor(tmp_path)
+
+    assert len(await ingestor._fetch(["00126380"])) == 5
+    assert await ingestor._fetch(["00126380"]) == []
+    assert await ingestor._fetch(["00126380"]) == []  # 020, 타임아웃 뒤 성공
+    with pytest.raises(DartIngestError):
+        await ingestor._fetch(["00126380"])
+    assert len(calls) == 6
+    assert calls[0].url.params["corp_code"] == "00126380"
+
+
+async def test_multi_fetch_gives_up_after_max_retries(upstream, tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest_financials, "MAX_RETRIES", 2)
+    handler, calls = _responses({"status": "020"}, {"status": "020"})
+    upstream("dart", handler)
+
+    with pytest.raises(DartIngestError):
+        await _ingestor(tmp_path)._fetch(["00126380"])
+    assert len(calls) == 2
+
+
+async def test_run_ingests_batches_and_records_checks(async_db, upstream, tmp_path):
+    codes = ["00126380", "00164779", "00401731"]
+    async_db.add_all([CompanyOverviews(corp_code=code, corp_name=code) for code in codes])
+    await async_db.commit()
+
+    def dart(request):
+        requested = request.url.params["corp_code"].split(",")
+        rows = []
+        for code in requested:
+            if code != "00401731":  # 아직 미공시
+                rows += revenue_rows([1, 2, 3], corp_code=code, rcept_no=f"2025{code}")
+        return httpx.Response(200, json={"status": "000", "list": rows})
+
+    upstream("dart", dart)
+    cp = await _ingestor(tmp_path, batch_size=2).run()
+
+    assert (cp.companies, cp.statements, cp.failed) == (2, 6, [])
+    assert not (tmp_path / "checkpoint.json").exists()  # 한 바퀴 완료
+    stored = await financials_repository.get_stored_periods_async(async_db, codes, "11011", [2022, 2023, 2024])
+    assert len(stored) == 6
+    checks = dict((await async_db.execute(select(FinancialReportCheck.corp_code, FinancialReportCheck.rcept_no))).all())
+    assert checks == {"00126380": "202500126380", "00164779": "202500164779", "00401731": None}
+
+    # 다시 실행하면 적재/확인된 회사는 DART 에 묻지 않음
+    upstream("dart", lambda request: pytest.fail("이미 적재된 회사를 다시 조회함"))
+    cp = await _ingestor(tmp_path).run()
+    assert cp.skipped == 3
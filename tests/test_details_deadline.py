@@ -0,0 +1,133 @@
+"""details 요청 기한과 부분 응답 (services.details_service.get_company_details)"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from clients import naver_news_client
+from core import deadline as deadline_module
+from core.cache import cache_get, local_cache, swr_set
+from core.database import AsyncSessionLocal
+from core.deadline import Deadline
+from core.tasks import drain_background
+from models import CompanyOverviews, Summary
+from repository import news_repository
+from services import details_service
+from services.details_service import SUMMARY_PENDING_TEXT, deadline_stats, get_company_details
+from services.summary_service import SummaryService, summary_fingerprint
+from tests.factories import groq_completion, naver_items
+
+pytestmark = pytest.mark.anyio
+
+NAME = "삼성전자"
+CORP_CODE = "00126380"
+FINANCIALS = {"2024": {"매출액": 100, "영업이익": 10, "당기순이익": 5, "자산총계": 300, "자본총계": 200, "ratio": {}}}
+NEWS = {"채용": [{"id": "1", "title": "채용 기사", "link": "https://news.example.com/1",
+                 "pubDate": "Mon, 01 Jan 2024 09:00:00 +0900"}]}
+
+
+@pytest.fixture(autouse=True)
+def _naver_keys(monkeypatch):
+    monkeypatch.setattr(naver_news_client, "NAVER_CLIENT_ID", "id")
+    monkeypatch.setattr(naver_news_client, "NAVER_CLIENT_SECRET", "secret")
+
+
+@pytest.fixture
+async def company(async_db, redis_client, groq):
+    async_db.add(CompanyOverviews(corp_code=CORP_CODE, corp_name=NAME))
+    await news_repository.upsert_news_articles_async(async_db, CORP_CODE, {
+        "채용": [{"id": "1", "title": "저장된 기사", "link": "https://news.example.com/1",
+                 "pubDate": "Mon, 01 Jan 2024 09:00:00 +0900"}],
+    })
+    await async_db.commit()
+    await swr_set(redis_client, f"details:financials:{int(CORP_CODE)}", FINANCIALS, 3600, 7200)
+    groq(lambda request: httpx.Response(200, json=groq_completion("요약")))
+
+
+def test_header_deadline_is_clamped(monkeypatch):
+    monkeypatch.setattr(deadline_module, "DETAILS_DEADLINE_MIN_MS", 300)
+    monkeypatch.setattr(deadline_module, "DETAILS_DEADLINE_MAX_MS", 20000)
+    assert Deadline.from_header(10).budget == 0.3
+    assert Deadline.from_header(60_000).budget == 20.0
+    assert Deadline.from_header(1500).budget == 1.5
+
+
+async def test_all_sections_ready_in_time(api, upstream, company):
+    upstream("naver", lambda request: httpx.Response(200, json=naver_items(request.url.params["query"])))
+
+    response = await api.get("/details-final/company-details", params={"name": NAME})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["meta"]["sections"] == {"financial_data": "fresh", "news_data": "fresh", "ai_summary": "fresh"}
+    assert body["ai_summary"] == "요약"
+
+
+async def test_slow_upstream_returns_partial_response_by_deadline(api, redis_client, upstream, company):
+    async def slow_naver(request):
+        await asyncio.sleep(1.0)
+        return httpx.Response(200, json=naver_items(request.url.params["query"]))
+
+    upstream("naver", slow_naver)
+    partial_before = deadline_stats.partial_responses
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    response = await api.get(
+        "/details-final/company-details", params={"name": NAME}, headers={"X-Deadline-Ms": "300"}
+    )
+    elapsed = loop.time() - started
+
+    assert response.status_code == 200
+    assert elapsed < 1.0  # Naver 응답을 기다리지 않음
+    body = response.json()
+    # 재무는 캐시에서 제때, 뉴스는 L2 의 마지막 값, 요약은 입력이 다 준비되지 않아 저장된 것도 없으므로 pending
+    assert body["meta"]["sections"] == {"financial_data": "fresh", "news_data": "degraded", "ai_summary": "pending"}
+    assert [a["title"] for a in body["news_data"]["채용"]] == ["저장된 기사"]
+    assert body["ai_summary"] == SUMMARY_PENDING_TEXT
+    assert deadline_stats.partial_responses == partial_before + 1
+    # 부분 응답은 전체 응답 캐시에 넣지 않음
+    await drain_background(5)
+    assert await redis_client.get(f"details:response:{NAME}") is None
+
+
+async def test_summary_fallback_does_not_overwrite_generated_entry(async_db, redis_client, company, groq, monkeypatch):
+    """기한 대체(L2 읽기)가 생성 완료 전에 시작해 그 뒤에 끝나도, 새 지문의 요약 캐시를 덮어쓰지 않음"""
+    await swr_set(redis_client, f"details:news:{NAME}", NEWS, 3600, 7200)
+    monkeypatch.setattr(details_service, "DETAILS_FALLBACK_GRACE", 2.0)
+    stored = asyncio.Event()
+
+    async def slow_groq(request):
+        # 생성 중에 다른 곳에서 이전 입력으로 만든 요약이 L2 에 들어옴 -> 기한 대체가 이 행을 읽음
+        async with AsyncSessionLocal() as db:
+            db.add(Summary(company_name=NAME, summary_text="이전 요약", input_hash="old"))
+            await db.commit()
+        await asyncio.sleep(0.6)
+        return httpx.Response(200, json=groq_completion("새 요약"))
+
+    groq(slow_groq)
+    original_store, original_cache_entry = SummaryService._store, SummaryService._cache_entry
+
+    async def store(self, *args):
+        await original_store(self, *args)
+        stored.set()
+
+    async def cache_entry(self, summary_key, input_hash, text, generated_at):
+        if input_hash == "old":
+            await stored.wait()  # 이전 행을 읽은 쪽의 캐시 쓰기가 생성 저장보다 늦게 도착
+        await original_cache_entry(self, summary_key, input_hash, text, generated_at)
+
+    monkeypatch.setattr(SummaryService, "_store", store)
+    monkeypatch.setattr(SummaryService, "_cache_entry", cache_entry)
+
+    details = await get_company_details(NAME, async_db, redis_client, Deadline(300))
+    assert details.meta.sections["ai_summary"] == "degraded"
+    assert details.ai_summary == "이전 요약"
+
+    await drain_background(5)
+    assert stored.is_set()
+    local_cache.clear()
+    entry = await cache_get(redis_client, f"details:summary:{NAME}")
+    assert entry["input_hash"] == summary_fingerprint(NAME, FINANCIALS, NEWS)
+    assert entry["text"] == "새 요약"
@@ -0,0 +1,79 @@
+"""details 캐시 키 프리페치와 요청당 Redis 명령 / 왕복 집계 (services.details_service)"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from core.cache import CountingRedis, local_cache, swr_set
+from core.database import AsyncSessionLocal
+from core.tasks import drain_background
+from models import CompanyOverviews
+from services import details_cache, details_service
+from services.details_service import details_redis_stats, get_company_details_body
+from tests.factories import groq_completion
+
+pytestmark = pytest.mark.anyio
+
+NAME = "삼성전자"
+CORP_CODE = "00126380"
+FINANCIALS = {"2024": {"매출액": 100, "영업이익": 10, "당기순이익": 5, "자산총계": 300, "자본총계": 200, "ratio": {}}}
+NEWS = {"채용": [{"id": "1", "title": "채용 기사", "link": "https://news.example.com/1",
+                 "pubDate": "Mon, 01 Jan 2024 09:00:00 +0900"}]}
+
+
+@pytest.fixture
+async def counting_redis(redis_client, async_db, groq, monkeypatch):
+    """섹션 캐시가 모두 Redis 에 있는 상태의 CountingRedis (전체 응답 캐시는 끔)"""
+    monkeypatch.setattr(details_cache, "DETAILS_RESPONSE_TTL", 0)
+    async_db.add(CompanyOverviews(corp_code=CORP_CODE, corp_name=NAME))
+    await async_db.commit()
+    await swr_set(redis_client, f"details:financials:{int(CORP_CODE)}", FINANCIALS, 3600, 7200)
+    await swr_set(redis_client, f"details:news:{NAME}", NEWS, 3600, 7200)
+    groq(lambda request: httpx.Response(200, json=groq_completion("요약")))
+
+    client = CountingRedis(connection_pool=redis_client.connection_pool)
+    async with AsyncSessionLocal() as db:
+        await get_company_details_body(NAME, db, client)  # 개황 / 요약 캐시 채움
+    await drain_background(5)
+    return client
+
+
+async def _round_trips(client, prefetch: bool, monkeypatch) -> float:
+    monkeypatch.setattr(details_service, "DETAILS_PREFETCH", prefetch)
+    before = details_redis_stats()
+    local_cache.clear()  # 다른 워커가 Redis 를 채운 경우
+    async with AsyncSessionLocal() as db:
+        body, hit = await get_company_details_body(NAME, db, client)
+    await drain_background(5)
+    assert not hit and "요약" in body
+    return details_redis_stats()["round_trips"] - before["round_trips"]
+
+
+async def test_prefetch_reduces_round_trips(counting_redis, monkeypatch):
+    without = await _round_trips(counting_redis, False, monkeypatch)
+    with_prefetch = await _round_trips(counting_redis, True, monkeypatch)
+    assert with_prefetch < without
+
+
+async def test_background_commands_are_counted_after_they_finish(counting_redis, monkeypatch):
+    release = asyncio.Event()
+
+    async def slow_record_access(redis_client, corp_code, name):
+        await release.wait()
+        await redis_client.incr("test:access")
+
+    monkeypatch.setattr(details_service, "record_access", slow_record_access)
+    before = details_redis_stats()
+    async with AsyncSessionLocal() as db:
+        await get_company_details_body(NAME, db, counting_redis)
+    returned = details_redis_stats()
+    assert returned["requests"] == before["requests"] + 1
+
+    release.set()
+    await drain_background(5)
+    after = details_redis_stats()
+    # 응답 뒤 실행된 백그라운드 작업의 명령도 요청 집계에 들어감
+    assert after["commands"] == returned["commands"] + 1
+    assert after["round_trips"] == returned["round_trips"] + 1
+    assert await counting_redis.get("test:access") == "1"
@@ -0,0 +1,85 @@
+"""details 전체 응답 캐시 (services.details_cache)"""
+
+import httpx
+import pytest
+
+from clients import naver_news_client
+from core.cache import swr_set
+from core.database import AsyncSessionLocal
+from core.tasks import drain_background
+from models import CompanyOverviews
+from services import details_cache
+from services.news_service import NewsService, CATEGORIES
+from tests.factories import groq_completion, naver_items
+
+pytestmark = pytest.mark.anyio
+
+NAME = "삼성전자"
+CORP_CODE = "00126380"
+FINANCIALS = {"2024": {"매출액": 100, "영업이익": 10, "당기순이익": 5, "자산총계": 300, "자본총계": 200, "ratio": {}}}
+
+
+@pytest.fixture(autouse=True)
+def _naver_keys(monkeypatch):
+    monkeypatch.setattr(naver_news_client, "NAVER_CLIENT_ID", "id")
+    monkeypatch.setattr(naver_news_client, "NAVER_CLIENT_SECRET", "secret")
+    monkeypatch.setattr(details_cache, "DETAILS_RESPONSE_TTL", 60)
+
+
+@pytest.fixture
+async def queries(async_db, redis_client, upstream, groq):
+    async_db.add(CompanyOverviews(corp_code=CORP_CODE, corp_name=NAME))
+    await async_db.commit()
+    await swr_set(redis_client, f"details:financials:{int(CORP_CODE)}", FINANCIALS, 3600, 7200)
+    groq(lambda request: httpx.Response(200, json=groq_completion("요약")))
+    sent = []
+
+    def naver(request):
+        sent.append(request.url.params["query"])
+        return httpx.Response(200, json=naver_items(request.url.params["query"], count=len(sent)))
+
+    upstream("naver", naver)
+    return sent
+
+
+async def _details(api):
+    response = await api.get("/details-final/company-details", params={"name": NAME})
+    assert response.status_code == 200
+    await drain_background(5)  # 응답 캐시 저장
+    return response
+
+
+async def test_fresh_response_is_served_from_cache(api, queries):
+    first = await _details(api)
+    assert first.headers["X-Cache"] == "MISS"
+
+    second = await _details(api)
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.content == first.content
+    assert len(queries) == len(CATEGORIES)  # 적중하면 섹션을 다시 읽지 않음
+
+
+async def test_section_update_invalidates_cached_response(api, redis_client, queries):
+    first = await _details(api)
+    assert (await _details(api)).headers["X-Cache"] == "HIT"
+
+    # 뉴스를 새로 받으면 회사명으로 무효화
+    await NewsService(redis_client, AsyncSessionLocal).refresh(NAME, str(int(CORP_CODE)))
+    after_news = await _details(api)
+    assert after_news.headers["X-Cache"] == "MISS"
+    assert after_news.json()["news_data"] != first.json()["news_data"]
+    # 뉴스가 바뀌어 요약이 stale 인 응답은 저장하지 않음 -> 요약이 다시 만들어진 다음 응답부터 저장
+    assert after_news.json()["meta"]["sections"]["ai_summary"] == "stale"
+    assert (await _details(api)).headers["X-Cache"] == "MISS"
+
+    # 회사명을 모르는 쪽(재무)은 corp_code 별칭으로 무효화
+    assert (await _details(api)).headers["X-Cache"] == "HIT"
+    await details_cache.invalidate_by_corp_code(redis_client, str(int(CORP_CODE)))
+    assert (await _details(api)).headers["X-Cache"] == "MISS"
+
+
+async def test_disabled_ttl_skips_cache(api, redis_client, queries, monkeypatch):
+    monkeypatch.setattr(details_cache, "DETAILS_RESPONSE_TTL", 0)
+    await _details(api)
+    assert (await _details(api)).headers["X-Cache"] == "MISS"
+    assert await redis_client.get(f"details:response:{NAME}") is None
@@ -0,0 +1,71 @@
+"""details 점진 스트리밍 (services.details_service.stream_company_details)"""
+
+import httpx
+import pytest
+from sqlalchemy import select, func
+
+from core.cache import swr_set
+from core.tasks import drain_background
+from models import CompanyOverviews, Summary
+from schemas.company import CompanyInfo
+from services.details_service import stream_company_details
+from tests.factories import groq_sse
+
+pytestmark = pytest.mark.anyio
+
+NAME = "삼성전자"
+FINANCIALS = {"2024": {"매출액": 100, "영업이익": 10, "당기순이익": 5, "자산총계": 300, "자본총계": 200, "ratio": {}}}
+NEWS = {"채용": [{"id": "1", "title": "채용 기사", "link": "https://news.example.com/1",
+                 "pubDate": "Mon, 01 Jan 2024 09:00:00 +0900"}]}
+
+
+@pytest.fixture
+async def company(async_db, redis_client):
+    async_db.add(CompanyOverviews(corp_code="00126380", corp_name=NAME))
+    await async_db.commit()
+    await swr_set(redis_client, "details:financials:126380", FINANCIALS, 3600, 3600)
+    await swr_set(redis_client, f"details:news:{NAME}", NEWS, 3600, 3600)
+    return CompanyInfo(corp_code=126380, corp_name=NAME)
+
+
+async def _summaries(async_db) -> int:
+    return await async_db.scalar(select(func.count()).select_from(Summary))
+
+
+async def test_streams_sections_then_summary_deltas(async_db, redis_client, groq, company):
+    groq(lambda request: httpx.Response(200, content=groq_sse(["매출이 ", "늘었습니다."])))
+
+    events = [event async for event in stream_company_details(NAME, company, redis_client)]
+    kinds = [kind for kind, _ in events]
+    assert kinds[0] == "company_info"
+    assert sorted(kinds[1:3]) == ["financial_data", "news_data"]
+    assert kinds[3:] == ["ai_summary_delta", "ai_summary_delta", "ai_summary", "meta"]
+    assert events[-2][1] == "매출이 늘었습니다."
+    await drain_background(5)
+    assert await _summaries(async_db) == 1
+
+
+async def test_empty_stream_is_not_stored(async_db, redis_client, groq, company):
+    groq(lambda request: httpx.Response(200, content=groq_sse([])))
+
+    events = dict([event async for event in stream_company_details(NAME, company, redis_client)])
+    assert "ai_summary_delta" not in events
+    assert events["ai_summary"]  # 빈 문자열 대신 실패 안내
+    assert await _summaries(async_db) == 0
+    assert await redis_client.get(f"details:summary:{NAME}") is None
+
+
+async def test_client_disconnect_closes_summary_stream(async_db, redis_client, groq, company):
+    gateway = groq(lambda request: httpx.Response(200, content=groq_sse(["첫 조각", "둘째 조각"])))
+
+    stream = stream_company_details(NAME, company, redis_client)
+    async for kind, _ in stream:
+        if kind == "ai_summary_delta":
+            break
+    assert await redis_client.exists(f"details:summary_lock:{NAME}")
+    await stream.aclose()  # 응답 도중 연결 종료
+
+    # 요약 스트림까지 닫혀 락과 게이트웨이 슬롯이 바로 반환됨
+    assert not await redis_client.exists(f"details:summary_lock:{NAME}")
+    assert gateway.stats()["active"] == 0
+    assert await _summaries(async_db) == 0
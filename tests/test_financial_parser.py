@@ -0,0 +1,45 @@
+"""DART 주요계정 파서 (utils.financial_parser)"""
+
+from utils.financial_parser import parse_financials, parse_financials_batch
+from tests.factories import dart_rows, revenue_rows
+
+
+def test_annual_report_fills_three_years_with_ratios():
+    result = parse_financials(revenue_rows([80, 90, 100]), 2024)
+
+    assert list(result) == ["2022", "2023", "2024"]
+    assert result["2024"]["매출액"] == 100
+    assert result["2022"]["매출액"] == 80
+    assert result["2024"]["ratio"] == {"영업이익률": 10.0, "순이익률": 5.0, "ROE": 2.5}
+
+
+def test_prefers_consolidated_rows_and_normalizes_account_names():
+    rows = dart_rows({"매출액(수익)": [1, 2, 3]}, fs_div="OFS") + dart_rows({"매출액(수익)": [10, 20, 30]}, fs_div="CFS")
+    rows.append({"fs_div": "CFS", "account_nm": "이익잉여금", "thstrm_amount": "999"})
+    rows.append({"fs_div": "CFS", "account_nm": "영업이익", "thstrm_amount": "-", "frmtrm_amount": "", "bfefrmtrm_amount": None})
+
+    result = parse_financials(rows, 2024)
+
+    assert result["2024"] == {"매출액": 30, "영업이익": None, "ratio": {"영업이익률": None, "순이익률": None}}
+    # 개별(OFS) 만 있으면 개별 기준
+    assert parse_financials(dart_rows({"매출액": [1, 2, 3]}, fs_div="OFS"), 2024)["2024"]["매출액"] == 3
+
+
+def test_quarter_report_uses_current_period_only():
+    assert list(parse_financials(revenue_rows([1, 2, 3]), 2025, "11013")) == ["2025"]
+
+
+def test_missing_fs_div_is_reported():
+    assert "message" in parse_financials([{"account_nm": "매출액", "thstrm_amount": "1"}], 2024)
+    assert "message" in parse_financials(dart_rows({"매출액": [1, 2, 3]}, fs_div="XX"), 2024)
+
+
+def test_batch_matches_single_company_parse():
+    samsung = revenue_rows([80, 90, 100], corp_code="00126380")
+    hynix = revenue_rows([40, 50, 60], corp_code="00164779")
+
+    result = parse_financials_batch(samsung + hynix, 2024)
+
+    assert set(result) == {"00126380", "00164779"}
+    assert result["00126380"] == parse_financials(samsung, 2024)
+    assert result["00164779"]["2024"]["매출액"] == 60
@@ -0,0 +1,117 @@
+"""재무 SWR 갱신 / L2 대체 (services.financial_service)"""
+
+import time
+from datetime import datetime
+
+import httpx
+import pytest
+
+from core import config
+from core.cache import local_cache, swr_get, swr_soft_expiries
+from core.database import AsyncSessionLocal
+from core.tasks import drain_background
+from models import CompanyOverviews
+from repository import financials_repository
+from services import financial_service
+from services.financial_service import FinancialService, FINANCIALS_DEGRADED_SOFT_TTL, window_years
+from tests.factories import revenue_rows
+
+pytestmark = pytest.mark.anyio
+
+CORP_CODE = "126380"
+KEY = f"details:financials:{CORP_CODE}"
+
+
+async def _seed_l2(async_db, revenues):
+    async_db.add(CompanyOverviews(corp_code="00" + CORP_CODE, corp_name="삼성전자"))
+    years = sorted(window_years())
+    await financials_repository.upsert_financials_async(async_db, CORP_CODE, {
+        str(year): {"매출액": revenue, "영업이익": 10, "당기순이익": 5, "자산총계": 300, "자본총계": 200, "ratio": {}}
+        for year, revenue in zip(years, revenues)
+    })
+    await async_db.commit()
+
+
+def test_window_years_follow_the_clock(monkeypatch):
+    monkeypatch.setattr(config, "DART_LATEST_BSNS_YEAR", 0)
+    assert window_years()[0] == datetime.now().year - 1
+    monkeypatch.setattr(config, "DART_LATEST_BSNS_YEAR", 2030)
+    assert window_years() == [2030, 2029, 2028]
+
+
+async def test_recently_checked_l2_hit_does_not_call_dart(async_db, redis_client, upstream):
+    await _seed_l2(async_db, [100, 110, 120])
+    for year in window_years():
+        await financials_repository.record_report_checks_async(async_db, {CORP_CODE: None}, year, "11011")
+    await async_db.commit()
+    upstream("dart", lambda request: pytest.fail("최근 확인한 L2 연도는 DART 를 부르지 않음"))
+
+    service = FinancialService(redis_client, AsyncSessionLocal)
+    result = await service.get_financials(CORP_CODE)
+    await drain_background(5)
+    assert [result[str(year)]["매출액"] for year in sorted(window_years())] == [100, 110, 120]
+
+
+async def test_unchecked_l2_hit_is_rechecked_in_background(async_db, redis_client, upstream):
+    await _seed_l2(async_db, [100, 110, 120])
+    requests = []
+
+    def dart(request):
+        requests.append(request.url.params["bsns_year"])
+        return httpx.Response(200, json={"status": "000", "list": revenue_rows([101, 111, 121])})
+
+    upstream("dart", dart)
+    service = FinancialService(redis_client, AsyncSessionLocal)
+    result = await service.get_financials(CORP_CODE)
+    assert [result[str(year)]["매출액"] for year in sorted(window_years())] == [100, 110, 120]  # L2 로 바로 응답
+    await drain_background(5)
+
+    # 정정 공시 확인: 최신 보고서 1회로 3개 연도를 덮어쓰고 모두 확인한 것으로 기록
+    assert requests == [str(max(window_years()))]
+    rows = await financials_repository.get_financials_by_code_async(async_db, CORP_CODE)
+    assert [row.revenue for row in rows] == [101, 111, 121]
+    checked = await financials_repository.get_recent_checks_async(
+        async_db, [CORP_CODE], "11011", window_years(), datetime(2000, 1, 1)
+    )
+    assert checked == {("00" + CORP_CODE, year) for year in window_years()}
+
+    await service.refresh(CORP_CODE)
+    await drain_background(5)
+    assert len(requests) == 1
+
+
+async def test_background_refresh_refetches_from_dart(async_db, redis_client, upstream):
+    await _seed_l2(async_db, [100, 110, 120])
+    requests = []
+
+    def dart(request):
+        requests.append(request.url.params["bsns_year"])
+        return httpx.Response(200, json={"status": "000", "list": revenue_rows([101, 111, 121])})
+
+    upstream("dart", dart)
+    service = FinancialService(redis_client, AsyncSessionLocal)
+    await service.refresh(CORP_CODE)
+    await drain_background(5)
+
+    # 최신 사업보고서 한 번으로 조회 기간 3개 연도를 정정값으로 덮어씀
+    assert requests == [str(max(window_years()))]
+    local_cache.clear()
+    cached, stale = await swr_get(redis_client, KEY)
+    assert [cached[str(year)]["매출액"] for year in sorted(window_years())] == [101, 111, 121]
+    assert not stale
+
+    rows = await financials_repository.get_financials_by_code_async(async_db, CORP_CODE)
+    assert [row.revenue for row in rows] == [101, 111, 121]
+
+
+async def test_dart_failure_serves_l2_as_degraded(async_db, redis_client, upstream):
+    await _seed_l2(async_db, [100, 110, 120])
+    upstream("dart", lambda request: httpx.Response(503))
+
+    service = FinancialService(redis_client, AsyncSessionLocal)
+    await service.refresh(CORP_CODE)
+
+    # 갱신 실패: L2 값을 짧은 soft TTL 로 저장해 곧 다시 시도
+    [soft_expires_at] = await swr_soft_expiries(redis_client, [KEY])
+    assert soft_expires_at <= time.time() + FINANCIALS_DEGRADED_SOFT_TTL
+    assert service.stale
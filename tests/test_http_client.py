@@ -0,0 +1,90 @@
+"""업스트림별 공유 커넥션 풀 (core.http_client)"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from core.http_client import HttpClientRegistry, UpstreamConfig, UPSTREAMS
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_startup_builds_one_pooled_client_per_upstream():
+    registry = HttpClientRegistry(UPSTREAMS)
+    await registry.startup()
+    try:
+        clients = {name: registry.get(name) for name in UPSTREAMS}
+        # 같은 업스트림은 같은 클라이언트(커넥션 풀)를 재사용
+        assert all(registry.get(name) is client for name, client in clients.items())
+        assert len({id(client) for client in clients.values()}) == len(UPSTREAMS)
+
+        dart = clients["dart"]
+        assert dart.timeout.read == UPSTREAMS["dart"].read_timeout
+        assert dart.timeout.pool == UPSTREAMS["dart"].pool_timeout
+        assert set(registry.stats()) == set(UPSTREAMS)
+    finally:
+        await registry.shutdown()
+
+    assert all(client.is_closed for client in clients.values())
+
+
+async def test_get_outside_lifespan_builds_lazily_and_replaces_closed_client():
+    registry = HttpClientRegistry(UPSTREAMS)
+    client = registry.get("naver")
+    await client.aclose()
+
+    rebuilt = registry.get("naver")
+    assert rebuilt is not client and not rebuilt.is_closed
+    await registry.shutdown()
+
+
+
+async def test_stats_counts_requests_waiting_for_a_connection():
+    """max_connections 보다 많은 요청이 동시에 진행되면 남는 요청은 waiting"""
+    release = asyncio.Event()
+
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        await release.wait()
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    config = UpstreamConfig(
+        max_connections=2, max_keepalive_connections=2, keepalive_expiry=5.0,
+        connect_timeout=1.0, read_timeout=5.0, pool_timeout=5.0,
+    )
+    registry = HttpClientRegistry({"test": config})
+    await registry.startup()
+    try:
+        client = registry.get("test")
+        requests = [asyncio.create_task(client.get(f"http://127.0.0.1:{port}/")) for _ in range(5)]
+        for _ in range(100):
+            stats = registry.stats()["test"]
+            if stats["active"] == 2 and stats["waiting"] == 3:
+                break
+            await asyncio.sleep(0.01)
+        assert stats == {"open": 2, "idle": 0, "active": 2, "waiting": 3, "max_connections": 2}
+
+        release.set()
+        assert all(r.status_code == 200 for r in await asyncio.gather(*requests))
+        assert registry.stats()["test"]["waiting"] == 0
+    finally:
+        await registry.shutdown()
+        server.close()
+        await server.wait_closed()
+
+
+async def test_stats_reports_unavailable_when_pool_internals_change():
+    registry = HttpClientRegistry(UPSTREAMS)
+    await registry.startup()
+    try:
+        registry._clients["naver"] = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(200)))
+        stats = registry.stats()
+        assert stats["naver"] == "unavailable"
+        assert stats["dart"]["max_connections"] == UPSTREAMS["dart"].max_connections
+    finally:
+        await registry.shutdown()
@@ -0,0 +1,69 @@
+"""산업 분류 스냅샷 / ETag (services.industry_service)"""
+
+import json
+
+import pytest
+
+from models import IndustryClassification
+from services import industry_service
+from services.industry_service import CURRENT_KEY, FLAT_KEY, TREE_KEY, SUPERSEDED_SNAPSHOT_TTL
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def _no_snapshot(monkeypatch):
+    monkeypatch.setattr(industry_service, "_snapshot", None)
+
+
+def _add_industry(db, code_5: str, name_5: str):
+    db.add(IndustryClassification(
+        code_1="C", name_1="제조업", code_2="26", name_2="전자부품 제조업",
+        code_3="261", name_3="반도체 제조업", code_4="2611", name_4="전자집적회로 제조업",
+        code_5=code_5, name_5=name_5,
+    ))
+    db.commit()
+
+
+def test_build_snapshot_tree_and_lookup():
+    flat = [
+        {"code_1": "C", "name_1": "제조업", "code_2": "26", "name_2": "전자부품"},
+        {"code_1": "C", "name_1": "제조업", "code_2": "10", "name_2": "식료품"},
+    ]
+    snapshot = industry_service.build_snapshot(flat)
+
+    [root] = json.loads(snapshot.tree_json)
+    assert (root["code"], root["child_count"]) == ("C", 2)
+    assert [child["code"] for child in root["children"]] == ["10", "26"]
+    assert snapshot.lookup[("전자부품", 2)] == "26"
+    assert industry_service.build_snapshot(flat).content_hash == snapshot.content_hash
+
+
+async def test_etag_round_trip(api, db):
+    _add_industry(db, "26110", "메모리용 전자집적회로 제조업")
+
+    response = await api.get("/industries/tree")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = await api.get("/industries/tree", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+async def test_reload_expires_superseded_snapshot_keys(db, redis_client):
+    _add_industry(db, "26110", "메모리용 전자집적회로 제조업")
+    first = await industry_service.get_snapshot(redis_client)
+
+    _add_industry(db, "26120", "다이오드, 트랜지스터 및 유사 반도체소자 제조업")
+    second = await industry_service.reload_snapshot(redis_client)
+
+    assert second.content_hash != first.content_hash
+    assert await redis_client.get(CURRENT_KEY) == second.content_hash
+    for key in (FLAT_KEY, TREE_KEY):
+        assert 0 < await redis_client.ttl(key.format(hash=first.content_hash)) <= SUPERSEDED_SNAPSHOT_TTL
+        assert await redis_client.ttl(key.format(hash=second.content_hash)) == -1
+
+    # 다른 워커: 메모리 스냅샷 없이 Redis 에서 새 스냅샷을 읽음
+    industry_service._snapshot = None
+    assert (await industry_service.get_snapshot(redis_client)).tree_json == second.tree_json
@@ -0,0 +1,52 @@
+"""앱 종료 순서 (main.lifespan)"""
+
+import asyncio
+
+import pytest
+
+import main
+from core.tasks import spawn_background
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_shutdown_waits_for_loops_and_background_saves(monkeypatch):
+    events = []
+
+    def loop(name):
+        async def run_forever(*args):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                await asyncio.sleep(0.01)  # 정리 중인 DB / HTTP 작업
+                events.append(f"{name} stopped")
+                raise
+        return run_forever
+
+    async def save():
+        await asyncio.sleep(0.05)
+        events.append("l2 saved")
+
+    class FakePubSub:
+        async def start(self):
+            pass
+
+        async def stop(self):
+            events.append("pubsub stopped")
+
+    class FakeEngine:
+        async def dispose(self):
+            events.append("engine disposed")
+
+    monkeypatch.setattr(main.company_search_index, "refresh_forever", loop("search index"))
+    monkeypatch.setattr(main, "flush_favorites_forever", loop("favorites"))
+    monkeypatch.setattr(main.refresh_ahead, "run_forever", loop("refresh-ahead"))
+    monkeypatch.setattr(main, "pubsub", FakePubSub())
+    monkeypatch.setattr(main, "async_engine", FakeEngine())
+
+    async with main.lifespan(main.app):
+        await asyncio.sleep(0)
+        spawn_background(save())  # 요청이 띄운 L2 저장
+
+    assert sorted(events[:3]) == ["favorites stopped", "refresh-ahead stopped", "search index stopped"]
+    assert events[3:] == ["l2 saved", "pubsub stopped", "engine disposed"]
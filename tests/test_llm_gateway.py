@@ -0,0 +1,119 @@
+"""LLM 게이트웨이: 모델 전환 / 대기열 / RPM·TPM 예산 (core.llm_gateway)"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from core import config
+from core.llm_gateway import LLMUnavailable, estimate_tokens
+from core.rate_limit import BACKGROUND
+from tests.factories import groq_completion, groq_sse
+
+pytestmark = pytest.mark.anyio
+
+PRIMARY, FALLBACK = config.GROQ_MODEL, config.GROQ_FALLBACK_MODELS[0]
+MESSAGES = [{"role": "user", "content": "요약해 주세요"}]
+
+
+def _model(request) -> str:
+    return json.loads(request.content)["model"]
+
+
+async def test_failover_to_next_model_on_upstream_error(redis_client, groq):
+    gateway = groq(lambda request: (
+        httpx.Response(503) if _model(request) == PRIMARY else httpx.Response(200, json=groq_completion("대체 요약"))
+    ))
+
+    assert await gateway.complete(redis_client, MESSAGES) == ("대체 요약", FALLBACK)
+    stats = gateway.stats()
+    assert stats["failovers"] == 1
+    assert stats["per_model"][PRIMARY]["errors"] == 1
+    assert stats["per_model"][FALLBACK]["used_tokens"] == 100
+
+
+async def test_request_error_is_not_failed_over(redis_client, groq):
+    requested = []
+    gateway = groq(lambda request: requested.append(_model(request)) or httpx.Response(400))
+
+    with pytest.raises(HTTPException) as e:
+        await gateway.complete(redis_client, MESSAGES)
+    assert e.value.status_code == 502
+    assert requested == [PRIMARY]
+
+
+async def test_stream_fails_over_before_first_token(redis_client, groq):
+    gateway = groq(lambda request: (
+        httpx.Response(500) if _model(request) == PRIMARY else httpx.Response(200, content=groq_sse(["가", "나"]))
+    ))
+
+    assert [event async for event in gateway.stream(redis_client, MESSAGES)] == [(FALLBACK, "가"), (FALLBACK, "나")]
+    assert gateway.stats()["active"] == 0
+
+
+async def test_queue_timeout_when_all_slots_busy(redis_client, groq):
+    release = asyncio.Event()
+
+    async def slow(request):
+        await release.wait()
+        return httpx.Response(200, json=groq_completion("요약"))
+
+    gateway = groq(slow, max_concurrency=1, queue_timeout=0.1)
+    first = asyncio.create_task(gateway.complete(redis_client, MESSAGES))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(LLMUnavailable):
+        await gateway.complete(redis_client, MESSAGES)
+    assert gateway.stats()["queue_timeouts"] == 1
+
+    release.set()
+    assert await first == ("요약", PRIMARY)
+
+
+async def test_rpm_rejection_does_not_spend_tpm(redis_client, groq):
+    tokens = estimate_tokens(MESSAGES)
+    gateway = groq(
+        lambda request: httpx.Response(200, json=groq_completion("요약")),
+        models=[PRIMARY], rpm=1, tpm=tokens * 10, completion_reserve=0, queue_timeout=0.1,
+    )
+    rpm, tpm = gateway._budgets[PRIMARY]
+
+    await gateway.complete(redis_client, MESSAGES)
+    with pytest.raises(LLMUnavailable):
+        await gateway.complete(redis_client, MESSAGES)
+
+    # RPM 이 모자라 거절된 호출은 TPM 도 차감하지 않음
+    assert (await rpm.stats(redis_client))["daily_used"] == 1
+    assert (await tpm.stats(redis_client))["daily_used"] == tokens
+
+
+async def test_budget_wait_is_bounded_by_one_queue_timeout(redis_client, groq):
+    tokens = estimate_tokens(MESSAGES)
+    gateway = groq(
+        lambda request: httpx.Response(200, json=groq_completion("요약")),
+        models=[PRIMARY], rpm=1, tpm=tokens, completion_reserve=0, queue_timeout=0.2,
+    )
+    await gateway.complete(redis_client, MESSAGES)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    with pytest.raises(LLMUnavailable):
+        await gateway.complete(redis_client, MESSAGES)  # RPM / TPM 둘 다 모자람
+    assert loop.time() - start < 0.35
+
+
+async def test_exhausted_model_is_skipped_and_background_keeps_reserve(redis_client, groq):
+    requested = []
+    gateway = groq(
+        lambda request: requested.append(_model(request)) or httpx.Response(200, json=groq_completion("요약")),
+        rpm=2, background_reserve=0.5, queue_timeout=0.05,
+    )
+
+    await gateway.complete(redis_client, MESSAGES, priority=BACKGROUND)
+    # 기본 모델의 남은 RPM 은 interactive 몫 -> background 는 대체 모델로
+    await gateway.complete(redis_client, MESSAGES, priority=BACKGROUND)
+    await gateway.complete(redis_client, MESSAGES)
+    assert requested == [PRIMARY, FALLBACK, PRIMARY]
+    assert gateway.stats()["per_model"][PRIMARY]["rate_limited"] == 1
@@ -0,0 +1,102 @@
+"""(L0) 워커 로컬 캐시와 Pub/Sub 무효화 (core.local_cache / core.cache / core.pubsub)"""
+
+import asyncio
+
+import pytest
+
+from core import cache
+from core.cache import local_cache, cache_get, cache_set, cache_delete, INVALIDATION_CHANNEL, WORKER_ID
+from core.local_cache import LocalCache
+from core.pubsub import PubSubDispatcher
+
+
+def test_local_cache_ttl_and_lru(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("core.local_cache.time.monotonic", lambda: now[0])
+    lc = LocalCache(max_entries=2, default_ttl=10)
+
+    lc.set("details:info:a", 1)
+    lc.set("details:info:b", 2, ttl=60)  # default_ttl 보다 길게 보관하지 않음
+    assert lc.get("details:info:a") == (True, 1)
+    lc.set("details:info:c", 3)  # 가장 오래 안 쓴 b 가 밀려남
+    assert lc.get("details:info:b") == (False, None)
+
+    now[0] += 10
+    assert lc.get("details:info:a") == (False, None)
+    assert lc.stats()["namespaces"]["details:info"]["evictions"] == 2
+
+
+@pytest.mark.anyio
+async def test_cache_get_serves_l0_until_invalidated(redis_client):
+    await cache_set(redis_client, "details:info:a", {"v": 1}, ex=60)
+    await redis_client.delete("details:info:a")
+
+    # Redis 에서 사라져도 L0 사본으로 응답
+    assert await cache_get(redis_client, "details:info:a") == {"v": 1}
+
+    # 다른 워커가 보낸 무효화 메시지만 반영 (자신이 보낸 메시지는 무시)
+    cache._on_invalidate(f"{WORKER_ID}|details:info:a")
+    assert local_cache.contains("details:info:a")
+    cache._on_invalidate("other-worker|details:info:a")
+    assert await cache_get(redis_client, "details:info:a") is None
+
+
+@pytest.mark.anyio
+async def test_cache_delete_clears_redis_and_l0(redis_client):
+    await cache_set(redis_client, "details:info:a", "x", ex=60, dumps=str)
+    await cache_delete(redis_client, "details:info:a")
+
+    assert not local_cache.contains("details:info:a")
+    assert await redis_client.exists("details:info:a") == 0
+
+
+@pytest.mark.anyio
+async def test_pubsub_dispatcher_delivers_invalidations(redis_client):
+    received = asyncio.Queue()
+    dispatcher = PubSubDispatcher(redis_client.connection_pool)
+    dispatcher.subscribe(INVALIDATION_CHANNEL, received.put_nowait)
+    await dispatcher.start()
+    try:
+        for _ in range(50):  # 구독이 붙을 때까지 재전송
+            await redis_client.publish(INVALIDATION_CHANNEL, "w|details:info:a")
+            try:
+                assert await asyncio.wait_for(received.get(), 0.05) == "w|details:info:a"
+                break
+            except asyncio.TimeoutError:
+                continue
+        else:
+            pytest.fail("무효화 메시지를 받지 못했습니다.")
+    finally:
+        await dispatcher.stop()
+    assert not dispatcher.running
+
+
+@pytest.mark.anyio
+async def test_invalidation_during_redis_read_is_not_undone(redis_client, monkeypatch):
+    """Redis 읽기 도중 도착한 무효화 / 새 값 저장 뒤에 이전 값을 L0 에 다시 채우지 않음"""
+    await cache_set(redis_client, "details:info:a", {"v": 1}, ex=60)
+    await cache.swr_set(redis_client, "details:news:a", {"v": 1}, 60, 60)
+    local_cache.clear()
+    get_raw = cache._get_raw
+
+    async def read_then_invalidate(client, key):
+        raw = await get_raw(client, key)  # 이전 값을 읽은 직후
+        cache._on_invalidate(f"other-worker|{key}")  # 다른 워커의 갱신 알림이 먼저 처리됨
+        return raw
+
+    monkeypatch.setattr(cache, "_get_raw", read_then_invalidate)
+    assert await cache_get(redis_client, "details:info:a") == {"v": 1}  # 이번 응답은 읽은 값
+    assert not local_cache.contains("details:info:a")
+    assert await cache.swr_get(redis_client, "details:news:a") == ({"v": 1}, False)
+    assert not local_cache.contains("details:news:a")
+    assert local_cache.stats()["namespaces"]["details:info"]["stale_fills"] == 1
+
+    # 같은 워커의 새 값 저장도 진행 중인 읽기보다 우선
+    async def read_then_write(client, key):
+        raw = await get_raw(client, key)
+        await cache_set(client, key, {"v": 2}, ex=60)
+        return raw
+
+    monkeypatch.setattr(cache, "_get_raw", read_then_write)
+    await cache_get(redis_client, "details:info:a")
+    assert local_cache.get("details:info:a") == (True, {"v": 2})
@@ -0,0 +1,69 @@
+"""토큰 펜싱 락과 해제 알림 대기 (core.lock)"""
+
+import asyncio
+import time
+
+import pytest
+
+from core import lock as lock_module
+from core.lock import RedisLock, wait_for_release
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_only_token_holder_can_release(redis_client):
+    holder = RedisLock(redis_client, "lock:a", ttl=5, renew=False)
+    other = RedisLock(redis_client, "lock:a", ttl=5, renew=False)
+
+    assert await holder.acquire()
+    assert not await other.acquire()
+    assert not await other.release()
+    assert await redis_client.get("lock:a") == holder.token
+
+    assert await holder.release()
+    assert await redis_client.exists("lock:a") == 0
+
+
+async def test_wait_returns_at_once_when_lock_already_gone(redis_client):
+    calls = []
+
+    async def check():
+        calls.append(1)
+        return "value" if len(calls) > 1 else None
+
+    # 락 키가 없으면 알림을 기다리지 않고 한 번 더 확인한 결과를 반환
+    start = time.monotonic()
+    assert await wait_for_release(redis_client, "lock:gone", check, timeout=5) == "value"
+    assert time.monotonic() - start < lock_module.FALLBACK_POLL_INTERVAL
+    assert len(calls) == 2
+
+
+async def test_wait_wakes_on_release_notification(redis_client):
+    holder = RedisLock(redis_client, "lock:b", ttl=5, renew=False)
+    await holder.acquire()
+    cache = {}
+
+    async def produce():
+        await asyncio.sleep(0.05)
+        cache["value"] = "done"
+        await holder.release()
+        lock_module._on_released("lock:b")  # pub/sub 디스패처가 전달하는 해제 알림
+
+    async def check():
+        return cache.get("value")
+
+    task = asyncio.create_task(produce())
+    assert await wait_for_release(redis_client, "lock:b", check, timeout=5) == "done"
+    await task
+    assert "lock:b" not in lock_module._waiters
+
+
+async def test_wait_times_out_while_lock_is_held(redis_client):
+    holder = RedisLock(redis_client, "lock:c", ttl=5, renew=False)
+    await holder.acquire()
+
+    async def check():
+        return None
+
+    assert await wait_for_release(redis_client, "lock:c", check, timeout=0.1) is None
+    await holder.release()
@@ -0,0 +1,60 @@
+"""뉴스 SWR / L2 대체 (services.news_service)"""
+
+import time
+
+import httpx
+import pytest
+
+from clients import naver_news_client
+from core.cache import swr_soft_expiries
+from core.database import AsyncSessionLocal
+from models import CompanyOverviews
+from repository import news_repository
+from services.news_service import NewsService, NEWS_DEGRADED_SOFT_TTL, CATEGORIES
+from tests.factories import naver_items
+
+pytestmark = pytest.mark.anyio
+
+NAME = "삼성전자"
+CORP_CODE = "00126380"
+KEY = f"details:news:{NAME}"
+
+
+@pytest.fixture(autouse=True)
+def _naver_keys(monkeypatch):
+    monkeypatch.setattr(naver_news_client, "NAVER_CLIENT_ID", "id")
+    monkeypatch.setattr(naver_news_client, "NAVER_CLIENT_SECRET", "secret")
+
+
+async def _seed(async_db):
+    async_db.add(CompanyOverviews(corp_code=CORP_CODE, corp_name=NAME))
+    await news_repository.upsert_news_articles_async(async_db, CORP_CODE, {
+        "채용": [{"id": "1", "title": "저장된 기사", "link": "https://news.example.com/1",
+                 "pubDate": "Mon, 01 Jan 2024 09:00:00 +0900"}],
+    })
+    await async_db.commit()
+
+
+async def test_fetches_all_categories_from_naver(async_db, redis_client, upstream):
+    await _seed(async_db)
+    upstream("naver", lambda request: httpx.Response(200, json=naver_items(request.url.params["query"])))
+
+    service = NewsService(redis_client, AsyncSessionLocal)
+    news = await service.get_news(NAME, CORP_CODE)
+
+    assert list(news) == CATEGORIES
+    assert news["채용"][0]["title"] == f"{NAME} 채용 기사 0"
+    assert not service.stale
+
+
+async def test_naver_failure_serves_l2_as_degraded(async_db, redis_client, upstream):
+    await _seed(async_db)
+    upstream("naver", lambda request: httpx.Response(500))
+
+    service = NewsService(redis_client, AsyncSessionLocal)
+    news = await service.get_news(NAME, str(int(CORP_CODE)))  # details 와 같은 6자리 코드
+
+    assert [a["title"] for a in news["채용"]] == ["저장된 기사"]
+    assert service.stale
+    [soft_expires_at] = await swr_soft_expiries(redis_client, [KEY])
+    assert soft_expires_at <= time.time() + NEWS_DEGRADED_SOFT_TTL
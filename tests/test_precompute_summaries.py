@@ -0,0 +1,66 @@
+"""AI 요약 일괄 사전 생성의 비용 예산 (jobs.precompute_summaries)"""
+
+import httpx
+import pytest
+
+from clients import naver_news_client
+from core.cache import swr_set
+from core.database import AsyncSessionLocal
+from jobs.precompute_summaries import SummaryPrecomputer
+from models import CompanyOverviews, FinancialStatement
+from services.news_service import CATEGORIES
+from tests.factories import groq_completion, naver_items
+
+pytestmark = pytest.mark.anyio
+
+COMPANIES = [("00126380", "삼성전자", 3), ("00164779", "SK하이닉스", 2), ("00401731", "LG전자", 1)]
+FINANCIALS = {"2024": {"매출액": 100, "영업이익": 10, "당기순이익": 5, "자산총계": 300, "자본총계": 200, "ratio": {}}}
+
+
+@pytest.fixture(autouse=True)
+def _naver_keys(monkeypatch):
+    monkeypatch.setattr(naver_news_client, "NAVER_CLIENT_ID", "id")
+    monkeypatch.setattr(naver_news_client, "NAVER_CLIENT_SECRET", "secret")
+
+
+async def _seed(async_db, redis_client):
+    for corp_code, name, favorite_count in COMPANIES:
+        async_db.add(CompanyOverviews(corp_code=corp_code, corp_name=name, favorite_count=favorite_count))
+        async_db.add(FinancialStatement(corp_code=corp_code, year=2024, revenue=100))
+        await swr_set(redis_client, f"details:financials:{int(corp_code)}", FINANCIALS, 3600, 7200)
+    await async_db.commit()
+
+
+async def test_naver_calls_are_capped_before_fetching(async_db, redis_client, upstream, groq):
+    await _seed(async_db, redis_client)
+    # 삼성전자는 뉴스 캐시가 fresh -> Naver 를 부르지 않으므로 차감 없음
+    await swr_set(redis_client, "details:news:삼성전자", {"채용": []}, 3600, 7200)
+    queries = []
+
+    def naver(request):
+        queries.append(request.url.params["query"])
+        return httpx.Response(200, json=naver_items(request.url.params["query"]))
+
+    upstream("naver", naver)
+    groq(lambda request: httpx.Response(200, json=groq_completion("요약")))
+
+    precomputer = SummaryPrecomputer(redis_client, AsyncSessionLocal, concurrency=1, max_naver_calls=len(CATEGORIES))
+    report = await precomputer.run()
+
+    # SK하이닉스까지 한 번 받고 나면 상한 -> LG전자는 Naver 를 부르기 전에 건너뜀
+    assert {query.split()[0] for query in queries} == {"SK하이닉스"}
+    assert len(queries) == len(CATEGORIES)
+    assert report.naver_calls == len(CATEGORIES)
+    assert (report.generated, report.over_budget) == (2, 1)
+
+
+async def test_exhausted_call_budget_skips_before_upstream(async_db, redis_client, upstream, groq):
+    await _seed(async_db, redis_client)
+    upstream("naver", lambda request: pytest.fail("예산이 없는데 Naver 호출"))
+    groq(lambda request: pytest.fail("예산이 없는데 Groq 호출"))
+
+    precomputer = SummaryPrecomputer(redis_client, AsyncSessionLocal, concurrency=1, max_calls=0)
+    report = await precomputer.run()
+
+    assert report.over_budget == len(COMPANIES)
+    assert report.naver_calls == 0
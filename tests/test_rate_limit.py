@@ -0,0 +1,93 @@
+"""분산 토큰 버킷 / 일일 한도 (core.rate_limit) 와 한도 초과 시 L2 대체"""
+
+import pytest
+import redis.asyncio as redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+
+from clients import naver_news_client
+from core.database import AsyncSessionLocal
+from core.rate_limit import TokenBucketScheduler, RateLimitExceeded, INTERACTIVE, BACKGROUND
+from models import CompanyOverviews
+from repository import news_repository
+from services.news_service import NewsService
+
+pytestmark = pytest.mark.anyio
+
+
+def _scheduler(rate=0.001, burst=4, daily_limit=100, reserve=0.5) -> TokenBucketScheduler:
+    # rate 가 매우 낮아 테스트 중에는 사실상 다시 차지 않음
+    return TokenBucketScheduler("test", rate=rate, burst=burst, daily_limit=daily_limit, reserve=reserve)
+
+
+async def _reason(coro) -> str:
+    with pytest.raises(RateLimitExceeded) as e:
+        await coro
+    return e.value.reason
+
+
+async def test_bucket_grants_up_to_burst_then_times_out(redis_client):
+    scheduler = _scheduler()
+    await scheduler.acquire(redis_client, cost=3)
+    await scheduler.acquire(redis_client, cost=1)
+    assert await _reason(scheduler.acquire(redis_client, cost=1, timeout=0.05)) == "timeout"
+
+    stats = await scheduler.stats(redis_client)
+    assert stats["daily_used"] == 4
+    assert stats["priorities"][INTERACTIVE]["granted"] == 2
+    assert stats["priorities"][INTERACTIVE]["rejected_timeout"] == 1
+
+
+async def test_background_leaves_reserve_for_interactive(redis_client):
+    scheduler = _scheduler()
+    await scheduler.acquire(redis_client, cost=2, priority=BACKGROUND)
+    # 버킷의 절반(reserve)은 background 가 쓰지 못함
+    assert await _reason(scheduler.acquire(redis_client, cost=1, priority=BACKGROUND)) == "timeout"
+    await scheduler.acquire(redis_client, cost=2, priority=INTERACTIVE)
+
+
+async def test_daily_quota(redis_client):
+    scheduler = _scheduler(rate=1000, daily_limit=4)
+    await scheduler.acquire(redis_client, cost=2)
+    assert await _reason(scheduler.acquire(redis_client, cost=1, priority=BACKGROUND)) == "quota"  # 4 * 0.5 소진
+    await scheduler.acquire(redis_client, cost=2)
+    assert await _reason(scheduler.acquire(redis_client, cost=1, timeout=5)) == "quota"  # 기다리지 않음
+    assert (await scheduler.stats(redis_client))["daily_remaining"] == 0
+
+
+async def test_oversize_batch_is_rejected_without_charging(redis_client):
+    scheduler = _scheduler()
+    assert await _reason(scheduler.acquire(redis_client, cost=5, timeout=5)) == "oversize"
+    assert await _reason(scheduler.acquire(redis_client, cost=3, priority=BACKGROUND)) == "oversize"
+
+    stats = await scheduler.stats(redis_client)
+    assert stats["daily_used"] == 0
+    assert stats["priorities"][INTERACTIVE]["rejected_oversize"] == 1
+    await scheduler.acquire(redis_client, cost=4)  # 버킷은 그대로
+
+
+async def test_redis_outage_fails_open():
+    down = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1, retry=Retry(NoBackoff(), 0))
+    scheduler = _scheduler(daily_limit=1)
+    for _ in range(3):
+        await scheduler.acquire(down, cost=1)
+    await down.aclose()
+
+
+async def test_news_quota_exhausted_serves_l2(async_db, redis_client, upstream, monkeypatch):
+    monkeypatch.setattr(naver_news_client, "NAVER_CLIENT_ID", "id")
+    monkeypatch.setattr(naver_news_client, "NAVER_CLIENT_SECRET", "secret")
+    monkeypatch.setattr(naver_news_client, "naver_scheduler", _scheduler(rate=1000, burst=10, daily_limit=0))
+    upstream("naver", lambda request: pytest.fail("한도가 소진되면 Naver 를 부르지 않음"))
+
+    async_db.add(CompanyOverviews(corp_code="00126380", corp_name="삼성전자"))
+    await news_repository.upsert_news_articles_async(async_db, "00126380", {
+        "채용": [{"id": "1", "title": "저장된 기사", "link": "https://news.example.com/1",
+                 "pubDate": "Mon, 01 Jan 2024 09:00:00 +0900"}],
+    })
+    await async_db.commit()
+
+    service = NewsService(redis_client, AsyncSessionLocal)
+    news = await service.get_news("삼성전자", "126380")
+    assert [a["title"] for a in news["채용"]] == ["저장된 기사"]
+    assert service.stale
@@ -0,0 +1,90 @@
+"""인기도 감쇠 / refresh-ahead 계획과 리더 주기 (services.refresh_ahead)"""
+
+import time
+
+import pytest
+
+from core.cache import swr_set, cache_set
+from core.database import AsyncSessionLocal
+from services import refresh_ahead
+from services.financial_service import FinancialService
+from services.news_service import NewsService
+from services.refresh_ahead import (
+    RefreshAheadScheduler, record_access, decay_popularity,
+    POPULARITY_KEY, POPULARITY_DECAYED_AT_KEY, FINANCIALS, NEWS, SUMMARY,
+)
+from services.summary_service import SummaryService
+
+pytestmark = pytest.mark.anyio
+
+
+async def _warm(redis_client, corp_code, name, soft_ttl):
+    await swr_set(redis_client, f"details:financials:{corp_code}", {"2024": {}}, soft_ttl, 3600)
+    await swr_set(redis_client, f"details:news:{name}", {"채용": []}, soft_ttl, 3600)
+    await cache_set(redis_client, f"details:summary:{name}", {"text": "요약"}, 3600)
+
+
+async def test_popularity_decays_by_half_life(redis_client, monkeypatch):
+    monkeypatch.setattr(refresh_ahead, "POPULARITY_HALF_LIFE", 100.0)
+    for _ in range(4):
+        await record_access(redis_client, "126380", "삼성전자")
+    await record_access(redis_client, "401731", "LG전자")
+
+    await decay_popularity(redis_client)  # 첫 주기는 기준 시각만 기록
+    assert await redis_client.zscore(POPULARITY_KEY, "126380|삼성전자") == 4
+    await redis_client.set(POPULARITY_DECAYED_AT_KEY, time.time() - 700)  # 반감기 7번
+    await decay_popularity(redis_client)
+
+    assert await redis_client.zscore(POPULARITY_KEY, "126380|삼성전자") == pytest.approx(4 / 128, rel=0.01)
+    assert await redis_client.zscore(POPULARITY_KEY, "401731|LG전자") is None  # 식은 회사 정리
+
+
+async def test_plan_picks_due_sections_by_popularity(redis_client):
+    await redis_client.zadd(POPULARITY_KEY, {"126380|삼성전자": 10, "164779|SK하이닉스": 5, "401731|LG전자": 1})
+    await _warm(redis_client, "126380", "삼성전자", soft_ttl=3600)  # 여유 있음
+    await _warm(redis_client, "164779", "SK하이닉스", soft_ttl=60)   # lead 안에 만료
+    # LG전자는 캐시 없음
+
+    plan = await RefreshAheadScheduler(top_k=10, lead=180, budget=10)._plan(redis_client)
+    assert plan == [
+        ("164779", "SK하이닉스", [FINANCIALS, NEWS, SUMMARY]),
+        ("401731", "LG전자", [FINANCIALS, NEWS, SUMMARY]),
+    ]
+
+    # 주기당 갱신 섹션 수를 넘는 회사는 다음 주기로
+    scheduler = RefreshAheadScheduler(top_k=10, lead=180, budget=4)
+    assert [corp_code for corp_code, _, _ in await scheduler._plan(redis_client)] == ["164779"]
+    assert scheduler.stats()["skipped_budget"] == 1
+
+
+async def test_cycle_runs_on_leader_only(redis_client, monkeypatch):
+    calls = []
+
+    async def financials(self, corp_code):
+        calls.append((FINANCIALS, corp_code))
+        await swr_set(self.redis, f"details:financials:{corp_code}", {"2024": {}}, 3600, 3600)
+
+    async def news(self, name, corp_code):
+        calls.append((NEWS, name))
+        await swr_set(self.redis, f"details:news:{name}", {"채용": []}, 3600, 3600)
+
+    async def summary(self, name, financial_data, news_data):
+        calls.append((SUMMARY, name))
+
+    monkeypatch.setattr(FinancialService, "refresh", financials)
+    monkeypatch.setattr(NewsService, "refresh", news)
+    monkeypatch.setattr(SummaryService, "refresh", summary)
+    await redis_client.zadd(POPULARITY_KEY, {"126380|삼성전자": 10})
+
+    scheduler = RefreshAheadScheduler(top_k=10, lead=180, budget=10)
+    await scheduler.run_cycle(redis_client, AsyncSessionLocal, interval=60)
+    # 요약은 재무/뉴스 갱신 뒤, 그 캐시 값으로
+    assert calls[-1] == (SUMMARY, "삼성전자")
+    assert sorted(calls[:2]) == [(FINANCIALS, "126380"), (NEWS, "삼성전자")]
+
+    # 같은 주기 안의 다른 워커(스케줄러)는 리더가 아님
+    other = RefreshAheadScheduler(top_k=10, lead=180, budget=10)
+    await other.run_cycle(redis_client, AsyncSessionLocal, interval=60)
+    assert len(calls) == 3
+    assert other.stats()["leader_cycles"] == 0
+    assert scheduler.stats()["refreshed_ai_summary"] == 1
@@ -0,0 +1,142 @@
+"""회로 차단기 / 재시도 / hedging (core.resilience)"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from core.resilience import CircuitBreaker, CircuitOpenError, Upstream, CLOSED, OPEN, HALF_OPEN
+
+pytestmark = pytest.mark.anyio
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://upstream.test")
+    return httpx.HTTPStatusError(str(status), request=request, response=httpx.Response(status, request=request))
+
+
+class Flaky:
+    """앞의 errors 만큼 차례로 실패한 뒤 "ok" 를 돌려주는 요청 함수"""
+
+    def __init__(self, *errors: Exception, delay: float = 0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+async def _fail(breaker: CircuitBreaker, times: int):
+    for _ in range(times):
+        with pytest.raises(httpx.HTTPStatusError):
+            await breaker.call(Flaky(_status_error(503)))
+
+
+async def test_breaker_opens_on_failure_rate_and_rejects_without_calling():
+    breaker = CircuitBreaker("test", window=4, min_calls=4, failure_rate=0.5, open_seconds=30)
+    await breaker.call(Flaky())
+    await breaker.call(Flaky())
+    await _fail(breaker, 1)
+    assert breaker.state == CLOSED  # 최소 호출 수 전
+    await _fail(breaker, 1)
+    assert breaker.state == OPEN
+
+    fn = Flaky()
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(fn)
+    assert fn.calls == 0
+    assert breaker.stats()["rejected"] == 1
+
+
+async def test_client_errors_do_not_open_breaker():
+    breaker = CircuitBreaker("test", window=2, min_calls=2, failure_rate=0.5)
+    for _ in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            await breaker.call(Flaky(_status_error(404)))
+    assert breaker.state == CLOSED
+    assert breaker.stats()["failures"] == 0
+
+
+async def test_half_open_probe_closes_or_reopens():
+    breaker = CircuitBreaker("test", window=2, min_calls=2, failure_rate=0.5, open_seconds=30, half_open_probes=1)
+    await _fail(breaker, 2)
+    assert breaker.state == OPEN
+
+    breaker.opened_at -= 30  # open_seconds 경과
+    await _fail(breaker, 1)  # 시험 호출 실패 -> 다시 열림
+    assert breaker.state == OPEN
+    assert breaker.stats()["opened"] == 2
+
+    breaker.opened_at -= 30
+    probe = breaker.before_call()
+    assert probe and breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # 시험 호출 수 초과
+    breaker.after_call(True, probe)
+    assert breaker.state == CLOSED
+
+
+async def test_retries_transient_errors_up_to_attempts():
+    upstream = Upstream("test", attempts=3, attempt_timeout=1.0, base_delay=0.0, max_delay=0.0)
+    upstream.breaker = CircuitBreaker("test", min_calls=100)
+    fn = Flaky(_status_error(503), httpx.ConnectError("down"))
+    assert await upstream.call(fn) == "ok"
+    assert fn.calls == 3
+    assert upstream.stats()["retries"] == 2
+
+    fn = Flaky(*[_status_error(503)] * 5)
+    with pytest.raises(httpx.HTTPStatusError):
+        await upstream.call(fn)
+    assert fn.calls == 3
+
+
+async def test_does_not_retry_client_errors_or_open_circuit():
+    upstream = Upstream("test", attempts=3, attempt_timeout=1.0, base_delay=0.0, max_delay=0.0)
+    fn = Flaky(_status_error(400))
+    with pytest.raises(httpx.HTTPStatusError):
+        await upstream.call(fn)
+    assert fn.calls == 1
+
+    # 첫 실패로 회로가 열리면 남은 재시도 없이 CircuitOpenError
+    upstream.breaker = CircuitBreaker("test", window=1, min_calls=1, failure_rate=1.0)
+    fn = Flaky(*[_status_error(503)] * 3)
+    with pytest.raises(CircuitOpenError):
+        await upstream.call(fn)
+    assert fn.calls == 1
+
+
+async def test_attempt_timeout_is_retried():
+    upstream = Upstream("test", attempts=2, attempt_timeout=0.05, base_delay=0.0, max_delay=0.0)
+    upstream.breaker = CircuitBreaker("test", min_calls=100)
+    slow = Flaky(delay=1.0)
+    with pytest.raises(TimeoutError):
+        await upstream.call(slow)
+    assert slow.calls == 2
+
+
+async def test_hedge_sends_second_request_after_delay():
+    upstream = Upstream("test", attempts=1, attempt_timeout=1.0, hedge_delay=0.02)
+    calls = []
+
+    async def fn():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            await asyncio.sleep(0.5)  # 첫 요청은 느림
+            return "first"
+        return "hedge"
+
+    assert await upstream.call(fn, hedge=True) == "hedge"
+    assert upstream.stats()["hedges"] == 1
+    assert upstream.stats()["hedge_wins"] == 1
+
+    # hedge_delay 안에 오면 하나만 보냄
+    fast = Flaky()
+    assert await upstream.call(fast, hedge=True) == "ok"
+    assert fast.calls == 1
+    assert upstream.stats()["hedges"] == 1
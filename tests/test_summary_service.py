@@ -0,0 +1,119 @@
+"""입력 지문 기반 AI 요약 캐시 (services.summary_service)"""
+
+import json
+
+import httpx
+import pytest
+
+from core import config
+from core.cache import local_cache
+from core.database import AsyncSessionLocal
+from core.tasks import drain_background
+from models import CompanyOverviews
+from services import summary_service
+from services.summary_service import SummaryService, summary_fingerprint, REFRESH_FRESH, REFRESH_GENERATED
+from tests.factories import groq_completion
+
+pytestmark = pytest.mark.anyio
+
+NAME = "삼성전자"
+FINANCIALS = {"2024": {"매출액": 100, "영업이익": 10, "당기순이익": 5, "자산총계": 300, "자본총계": 200, "ratio": {}}}
+
+
+def _news(*articles, pub_date="Mon, 01 Jan 2024 09:00:00 +0900"):
+    return {"채용": [
+        {"id": str(i), "title": title, "link": f"https://news.example.com/{i}", "pubDate": pub_date}
+        for i, title in articles
+    ]}
+
+
+@pytest.fixture
+async def calls(async_db, groq):
+    async_db.add(CompanyOverviews(corp_code="00126380", corp_name=NAME))
+    await async_db.commit()
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=groq_completion(f"요약 {len(requests)}"))
+
+    groq(handler)
+    return requests
+
+
+def test_fingerprint_ignores_order_and_dates():
+    news = _news((1, "기사 A"), (2, "기사 B"))
+    reordered = {"채용": list(reversed(_news((1, "기사 A"), (2, "기사 B"), pub_date="2024-01-01")["채용"]))}
+    assert summary_fingerprint(NAME, FINANCIALS, news) == summary_fingerprint(NAME, FINANCIALS, reordered)
+    assert summary_fingerprint(NAME, FINANCIALS, news) != summary_fingerprint(NAME, FINANCIALS, _news((1, "기사 A")))
+    changed = {"2024": {**FINANCIALS["2024"], "매출액": 101}}
+    assert summary_fingerprint(NAME, FINANCIALS, news) != summary_fingerprint(NAME, changed, news)
+
+
+async def test_same_input_reuses_summary_from_redis_and_db(redis_client, calls):
+    news = _news((1, "기사 A"))
+    service = SummaryService(redis_client, AsyncSessionLocal)
+    assert await service.get_summary(NAME, FINANCIALS, news) == "요약 1"
+    assert await service.get_summary(NAME, FINANCIALS, news) == "요약 1"
+
+    # Redis 에서 사라져도 DB 의 같은 지문으로 찾음
+    await redis_client.flushall()
+    local_cache.clear()
+    assert await service.get_summary(NAME, FINANCIALS, news) == "요약 1"
+    assert len(calls) == 1
+    assert not service.stale
+    assert await service.refresh(NAME, FINANCIALS, news) == REFRESH_FRESH
+
+
+async def test_changed_input_serves_previous_summary_and_regenerates(redis_client, calls):
+    service = SummaryService(redis_client, AsyncSessionLocal)
+    await service.get_summary(NAME, FINANCIALS, _news((1, "기사 A")))
+
+    news = _news((1, "기사 A"), (2, "새 기사"))
+    assert await service.get_summary(NAME, FINANCIALS, news) == "요약 1"  # 이전 요약을 바로
+    assert service.stale
+    await drain_background(5)
+    assert len(calls) == 2
+
+    fresh = SummaryService(redis_client, AsyncSessionLocal)
+    assert await fresh.get_summary(NAME, FINANCIALS, news) == "요약 2"
+    assert not fresh.stale
+    assert await fresh.refresh(NAME, {"2024": {**FINANCIALS["2024"], "매출액": 1}}, news) == REFRESH_GENERATED
+
+
+async def test_fallback_model_summary_is_stale_until_primary_regenerates(async_db, redis_client, groq, monkeypatch):
+    async_db.add(CompanyOverviews(corp_code="00126380", corp_name=NAME))
+    await async_db.commit()
+    primary_down = True
+    requested = []
+
+    def handler(request):
+        model = json.loads(request.content)["model"]
+        requested.append(model)
+        if primary_down and model == config.GROQ_MODEL:
+            return httpx.Response(503)
+        return httpx.Response(200, json=groq_completion(f"{model} 요약", model=model))
+
+    groq(handler)
+    news = _news((1, "기사 A"))
+    service = SummaryService(redis_client, AsyncSessionLocal)
+    fallback_text = await service.get_summary(NAME, FINANCIALS, news)
+    assert fallback_text == f"{config.GROQ_FALLBACK_MODELS[0]} 요약"
+
+    # 대체 모델 요약은 stale, 전환 cooldown 안에는 다시 만들지 않음
+    again = SummaryService(redis_client, AsyncSessionLocal)
+    assert await again.get_summary(NAME, FINANCIALS, news) == fallback_text
+    assert again.stale
+    await drain_background(5)
+    assert len(requested) == 2
+
+    # cooldown 이 지나면 백그라운드에서 기본 모델로 다시 생성
+    primary_down = False
+    monkeypatch.setattr(summary_service, "FALLBACK_REGENERATE_AFTER", 0)
+    assert await again.get_summary(NAME, FINANCIALS, news) == fallback_text
+    await drain_background(5)
+    assert requested[-1] == config.GROQ_MODEL
+
+    fresh = SummaryService(redis_client, AsyncSessionLocal)
+    assert await fresh.get_summary(NAME, FINANCIALS, news) == f"{config.GROQ_MODEL} 요약"
+    assert not fresh.stale
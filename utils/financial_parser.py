@@ -0,0 +1,109 @@
+"""
+DART 단일회사/다중회사 주요계정(fnlttSinglAcnt / fnlttMultiAcnt) 응답 파서.
+
+raw["list"] 의 dict 행들을 한 번만 훑어서 아래 구조로 변환합니다. (pandas 불필요)
+    {"2022": {"매출액": ..., "영업이익": ..., ..., "ratio": {...}}, "2023": {...}, "2024": {...}}
+- 연결(CFS) 행이 하나라도 있으면 CFS, 없으면 개별(OFS) 기준
+- 계정명에 KEYWORDS 중 하나가 포함된 행만 사용 (같은 계정은 뒤의 행이 덮어씀)
+- 사업보고서는 당기/전기/전전기 3개 연도, 반기/분기보고서는 당기(해당 연도)만 사용
+"""
+
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from utils.utils import clean, normalize, calculate_ratios
+
+KEYWORDS = ["매출액", "영업이익", "당기순이익", "자본총계", "자산총계"]
+_KEYWORD_RE = re.compile("|".join(map(re.escape, KEYWORDS)))
+
+# (금액 필드, 사업연도 기준 연도 차이): 전전기 / 전기 / 당기
+AMOUNT_FIELDS: Tuple[Tuple[str, int], ...] = (
+    ("bfefrmtrm_amount", -2),
+    ("frmtrm_amount", -1),
+    ("thstrm_amount", 0),
+)
+ANNUAL_REPORT_CODE = "11011"
+
+
+class _CompanyRows:
+    """한 회사의 CFS/OFS 후보 행 (단일 패스 누적용)"""
+    __slots__ = ("has_fs_div", "has_cfs", "has_ofs", "cfs", "ofs")
+
+    def __init__(self):
+        self.has_fs_div = False
+        self.has_cfs = False
+        self.has_ofs = False
+        self.cfs: List[Dict[str, Any]] = []
+        self.ofs: List[Dict[str, Any]] = []
+
+    def add(self, row: Dict[str, Any]):
+        fs_div = row.get("fs_div")
+        if fs_div is None:
+            return
+        self.has_fs_div = True
+        if fs_div == "CFS":
+            self.has_cfs = True
+            target = self.cfs
+        elif fs_div == "OFS":
+            self.has_ofs = True
+            target = self.ofs
+        else:
+            return
+        account_nm = row.get("account_nm")
+        if isinstance(account_nm, str) and _KEYWORD_RE.search(account_nm):
+            target.append(row)
+
+    def build(self, years: List[Tuple[str, str]]) -> Dict[str, Any]:
+        if not self.has_fs_div:
+            return {"message": "'fs_div' 정보가 없습니다."}
+        if self.has_cfs:
+            rows = self.cfs
+        elif self.has_ofs:
+            rows = self.ofs
+        else:
+            return {"message": "CFS/OFS 기준 데이터가 없습니다."}
+
+        result: Dict[str, Dict[str, Any]] = {year: {} for _, year in years}
+        for row in rows:
+            account = normalize(row["account_nm"])
+            for field, year in years:
+                result[year][account] = clean(row.get(field))
+
+        for values in result.values():
+            values["ratio"] = calculate_ratios(values)
+        return result
+
+
+def _year_fields(bsns_year: int, reprt_code: str) -> List[Tuple[str, str]]:
+    # 분기/반기보고서의 전기 금액은 기준 시점이 계정마다 달라(재무상태표는 전기말) 당기만 사용
+    fields = AMOUNT_FIELDS if reprt_code == ANNUAL_REPORT_CODE else AMOUNT_FIELDS[-1:]
+    return [(field, str(bsns_year + offset)) for field, offset in fields]
+
+
+def parse_financials(
+    rows: Iterable[Dict[str, Any]], bsns_year: int, reprt_code: str = ANNUAL_REPORT_CODE
+) -> Dict[str, Any]:
+    """한 회사의 raw["list"] 를 연도별 주요 계정 + 비율로 변환합니다."""
+    company = _CompanyRows()
+    for row in rows:
+        company.add(row)
+    return company.build(_year_fields(bsns_year, reprt_code))
+
+
+def parse_financials_batch(
+    rows: Iterable[Dict[str, Any]], bsns_year: int, reprt_code: str = ANNUAL_REPORT_CODE
+) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 회사의 행(fnlttMultiAcnt 응답처럼 각 행에 corp_code 포함)을 한 번에 변환합니다.
+    전체 행을 한 번만 훑으며 회사별로 나눠 담고, 연도 필드 매핑은 한 번만 계산합니다.
+    반환: {corp_code: parse_financials 와 같은 구조}
+    """
+    companies: Dict[str, _CompanyRows] = defaultdict(_CompanyRows)
+    for row in rows:
+        corp_code = row.get("corp_code")
+        if corp_code:
+            companies[corp_code].add(row)
+
+    years = _year_fields(bsns_year, reprt_code)
+    return {corp_code: company.build(years) for corp_code, company in companies.items()}
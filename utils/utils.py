@@ -1,6 +1,8 @@
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+import base64
 import hashlib
+import json
 from schemas.summary import (
     NewsArticle,
     RawFinancialEntry,
@@ -47,6 +49,22 @@ def _make_id(text: str) -> str:
     return hashlib.md5(text.encode("utf-8")).hexdigest()
 
 
+# 페이지네이션 헬퍼 함수
+def encode_cursor(corp_name: str, corp_code: str) -> str:
+    """keyset 정렬 키 (corp_name, corp_code) 를 불투명한 커서 문자열로 변환합니다."""
+    raw = json.dumps([corp_name, corp_code], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """encode_cursor 의 역변환. 형식이 잘못되면 ValueError"""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        corp_name, corp_code = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+    return str(corp_name), str(corp_code)
+
+
 # dart api 헬퍼 함수
 def clean(val):
     if not isinstance(val, str):